@@ -0,0 +1,42 @@
+"""paper embeddings and full-text search index
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "002"
+down_revision: str | None = "001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "paper_embeddings",
+        sa.Column("paper_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("model", sa.String(128), nullable=False),
+        sa.Column("dim", sa.Integer, nullable=False),
+        sa.Column("vector", sa.LargeBinary, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["paper_id"], ["papers.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("paper_id", "model"),
+    )
+
+    # Weighted title/abstract document; must match app.services.search._pg_document
+    op.execute(
+        "CREATE INDEX ix_papers_fts ON papers USING gin ("
+        "setweight(to_tsvector('english'::regconfig, title), 'A') || "
+        "setweight(to_tsvector('english'::regconfig, coalesce(abstract, '')), 'B'))"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_papers_fts")
+    op.drop_table("paper_embeddings")
@@ -0,0 +1,35 @@
+"""MinHash LSH buckets for near-duplicate paper detection
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "003"
+down_revision: str | None = "002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Existing papers are indexed lazily by POST /projects/{id}/papers/dedup.
+    op.create_table(
+        "paper_lsh_buckets",
+        sa.Column("band", sa.SmallInteger, nullable=False),
+        sa.Column("bucket", sa.String(16), nullable=False),
+        sa.Column("paper_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.ForeignKeyConstraint(["paper_id"], ["papers.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("band", "bucket", "paper_id"),
+    )
+    op.create_index("ix_paper_lsh_buckets_paper_id", "paper_lsh_buckets", ["paper_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_paper_lsh_buckets_paper_id", table_name="paper_lsh_buckets")
+    op.drop_table("paper_lsh_buckets")
@@ -0,0 +1,35 @@
+"""citation graph edges
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "004"
+down_revision: str | None = "003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "citations",
+        sa.Column("citing_paper_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("cited_paper_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["citing_paper_id"], ["papers.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["cited_paper_id"], ["papers.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("citing_paper_id", "cited_paper_id"),
+    )
+    op.create_index("ix_citations_cited_paper_id", "citations", ["cited_paper_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_citations_cited_paper_id", table_name="citations")
+    op.drop_table("citations")
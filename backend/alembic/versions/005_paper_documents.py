@@ -0,0 +1,43 @@
+"""uploaded PDF documents and parsed full text
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "005"
+down_revision: str | None = "004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "paper_documents",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("paper_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("content_hash", sa.String(64), nullable=False, unique=True),
+        sa.Column("storage_key", sa.String(255), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger, nullable=False),
+        sa.Column("status", sa.String(32), nullable=False),
+        sa.Column("page_count", sa.Integer, nullable=True),
+        sa.Column("text", sa.Text, nullable=True),
+        sa.Column("sections", postgresql.JSONB, nullable=False),
+        sa.Column("references", postgresql.JSONB, nullable=False),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("parsed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["paper_id"], ["papers.id"], ondelete="CASCADE"),
+    )
+    op.create_index("ix_paper_documents_paper_id", "paper_documents", ["paper_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_paper_documents_paper_id", table_name="paper_documents")
+    op.drop_table("paper_documents")
@@ -0,0 +1,43 @@
+"""resumable chunked PDF uploads
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "006"
+down_revision: str | None = "005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "pdf_uploads",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("paper_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("filename", sa.String(255), nullable=False),
+        sa.Column("size", sa.BigInteger, nullable=False),
+        sa.Column("offset", sa.BigInteger, nullable=False),
+        sa.Column("status", sa.String(32), nullable=False),
+        sa.Column("backend_state", postgresql.JSONB, nullable=False),
+        sa.Column("document_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["paper_id"], ["papers.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["document_id"], ["paper_documents.id"], ondelete="SET NULL"),
+    )
+    op.create_index("ix_pdf_uploads_project_id", "pdf_uploads", ["project_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_pdf_uploads_project_id", table_name="pdf_uploads")
+    op.drop_table("pdf_uploads")
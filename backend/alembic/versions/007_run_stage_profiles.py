@@ -0,0 +1,46 @@
+"""per-stage pipeline performance records
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "007"
+down_revision: str | None = "006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "run_stage_profiles",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("run_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("stage", sa.String(64), nullable=False),
+        sa.Column("position", sa.Integer, nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("wall_seconds", sa.Float, nullable=False),
+        sa.Column("cpu_seconds", sa.Float, nullable=False),
+        sa.Column("peak_rss_bytes", sa.BigInteger, nullable=False),
+        sa.Column("db_seconds", sa.Float, nullable=False),
+        sa.Column("db_statements", sa.Integer, nullable=False),
+        sa.Column("llm_calls", sa.Integer, nullable=False),
+        sa.Column("llm_prompt_tokens", sa.Integer, nullable=False),
+        sa.Column("llm_completion_tokens", sa.Integer, nullable=False),
+        sa.Column("cache", postgresql.JSONB, nullable=False),
+        sa.Column("samples", postgresql.JSONB, nullable=True),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.ForeignKeyConstraint(["run_id"], ["runs.id"], ondelete="CASCADE"),
+    )
+    op.create_index("ix_run_stage_profiles_run_id", "run_stage_profiles", ["run_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_run_stage_profiles_run_id", table_name="run_stage_profiles")
+    op.drop_table("run_stage_profiles")
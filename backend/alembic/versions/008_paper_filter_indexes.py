@@ -0,0 +1,40 @@
+"""indexes for paper list filters, sorting and facets
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "008"
+down_revision: str | None = "007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_papers_year", "papers", ["year"])
+    op.create_index(
+        "ix_project_papers_project_added", "project_papers", ["project_id", "added_at"]
+    )
+    op.create_index(
+        "ix_project_papers_project_score", "project_papers", ["project_id", "score"]
+    )
+    # text_pattern_ops so the inclusion_reason prefix filter (LIKE 'x%') can use it
+    op.execute(
+        "CREATE INDEX ix_project_papers_project_reason "
+        "ON project_papers (project_id, inclusion_reason text_pattern_ops)"
+    )
+    # Serves the author filter's JSONB containment test (authors @> '["name"]')
+    op.execute("CREATE INDEX ix_papers_authors ON papers USING gin (authors jsonb_path_ops)")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_papers_authors", table_name="papers")
+    op.drop_index("ix_project_papers_project_reason", table_name="project_papers")
+    op.drop_index("ix_project_papers_project_score", table_name="project_papers")
+    op.drop_index("ix_project_papers_project_added", table_name="project_papers")
+    op.drop_index("ix_papers_year", table_name="papers")
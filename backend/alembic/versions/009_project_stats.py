@@ -0,0 +1,72 @@
+"""materialized per-project statistics
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "009"
+down_revision: str | None = "008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "project_stats",
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("paper_count", sa.Integer, nullable=False),
+        sa.Column("run_count", sa.Integer, nullable=False),
+        sa.Column("latest_run_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("latest_run_status", sa.String(32), nullable=True),
+        sa.Column("latest_run_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("year_min", sa.Integer, nullable=True),
+        sa.Column("year_max", sa.Integer, nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+    )
+    # Backfill existing projects; from here on the API keeps rows current.
+    op.execute(
+        """
+        INSERT INTO project_stats (
+            project_id, paper_count, run_count, latest_run_id, latest_run_status,
+            latest_run_at, year_min, year_max, updated_at
+        )
+        SELECT
+            p.id,
+            COALESCE(pp.paper_count, 0),
+            COALESCE(r.run_count, 0),
+            latest.id,
+            latest.status,
+            latest.created_at,
+            pp.year_min,
+            pp.year_max,
+            now()
+        FROM projects p
+        LEFT JOIN (
+            SELECT project_papers.project_id, count(*) AS paper_count,
+                   min(papers.year) AS year_min, max(papers.year) AS year_max
+            FROM project_papers JOIN papers ON papers.id = project_papers.paper_id
+            GROUP BY project_papers.project_id
+        ) pp ON pp.project_id = p.id
+        LEFT JOIN (
+            SELECT project_id, count(*) AS run_count FROM runs GROUP BY project_id
+        ) r ON r.project_id = p.id
+        LEFT JOIN LATERAL (
+            SELECT id, status, created_at FROM runs
+            WHERE runs.project_id = p.id
+            ORDER BY created_at DESC, id DESC
+            LIMIT 1
+        ) latest ON true
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("project_stats")
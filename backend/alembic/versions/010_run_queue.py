@@ -0,0 +1,33 @@
+"""run queue: scheduling lane, claiming worker and start time
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "010"
+down_revision: str | None = "009"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "runs", sa.Column("lane", sa.String(16), nullable=False, server_default="bulk")
+    )
+    op.alter_column("runs", "lane", server_default=None)
+    op.add_column("runs", sa.Column("worker_id", sa.String(128), nullable=True))
+    op.add_column("runs", sa.Column("started_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("ix_runs_status_lane_created", "runs", ["status", "lane", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_runs_status_lane_created", table_name="runs")
+    op.drop_column("runs", "started_at")
+    op.drop_column("runs", "worker_id")
+    op.drop_column("runs", "lane")
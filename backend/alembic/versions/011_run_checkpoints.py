@@ -0,0 +1,43 @@
+"""run checkpoints, worker heartbeats and cancellation requests
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "011"
+down_revision: str | None = "010"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("runs", sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column(
+        "runs", sa.Column("cancel_requested_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.create_table(
+        "run_checkpoints",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("run_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("stage", sa.String(64), nullable=False),
+        sa.Column("position", sa.Integer, nullable=False),
+        sa.Column("output", postgresql.JSONB, nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["run_id"], ["runs.id"], ondelete="CASCADE"),
+        sa.UniqueConstraint("run_id", "stage", name="uq_run_checkpoint_stage"),
+    )
+    op.create_index("ix_run_checkpoints_run_id", "run_checkpoints", ["run_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_run_checkpoints_run_id", table_name="run_checkpoints")
+    op.drop_table("run_checkpoints")
+    op.drop_column("runs", "cancel_requested_at")
+    op.drop_column("runs", "heartbeat_at")
@@ -0,0 +1,43 @@
+"""run artifact manifests
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "012"
+down_revision: str | None = "011"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "run_artifacts",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("run_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("name", sa.String(128), nullable=False),
+        sa.Column("kind", sa.String(16), nullable=False),
+        sa.Column("format", sa.String(16), nullable=False),
+        sa.Column("content_hash", sa.String(64), nullable=False),
+        sa.Column("storage_key", sa.String(255), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger, nullable=False),
+        sa.Column("rows", sa.BigInteger, nullable=True),
+        sa.Column("shape", postgresql.JSONB, nullable=True),
+        sa.Column("dtype", sa.String(32), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["run_id"], ["runs.id"], ondelete="CASCADE"),
+        sa.UniqueConstraint("run_id", "name", name="uq_run_artifact_name"),
+    )
+    op.create_index("ix_run_artifacts_run_id", "run_artifacts", ["run_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_run_artifacts_run_id", table_name="run_artifacts")
+    op.drop_table("run_artifacts")
@@ -0,0 +1,72 @@
+"""editable idea tree with materialized paths
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "013"
+down_revision: str | None = "012"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "idea_trees",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("source_run_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("version", sa.Integer, nullable=False),
+        sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["source_run_id"], ["runs.id"], ondelete="SET NULL"),
+        sa.UniqueConstraint("project_id"),
+    )
+    op.create_table(
+        "idea_nodes",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("tree_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("parent_id", postgresql.UUID(as_uuid=True), nullable=True),
+        # Byte order, so a subtree is the range [path, path || '~')
+        sa.Column("path", sa.String(2048, collation="C"), nullable=False),
+        sa.Column("depth", sa.Integer, nullable=False),
+        sa.Column("position", sa.Integer, nullable=False),
+        sa.Column("label", sa.Text, nullable=False),
+        sa.Column("paper_count", sa.Integer, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["tree_id"], ["idea_trees.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["parent_id"], ["idea_nodes.id"], ondelete="CASCADE"),
+    )
+    op.create_index("ix_idea_nodes_parent_position", "idea_nodes", ["parent_id", "position"])
+    op.create_index("ix_idea_nodes_tree_path", "idea_nodes", ["tree_id", "path"])
+    op.create_table(
+        "idea_node_papers",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("tree_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("node_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("paper_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.ForeignKeyConstraint(["tree_id"], ["idea_trees.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["node_id"], ["idea_nodes.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["paper_id"], ["papers.id"], ondelete="CASCADE"),
+        sa.UniqueConstraint("tree_id", "paper_id", name="uq_idea_node_paper"),
+    )
+    op.create_index("ix_idea_node_papers_node_id", "idea_node_papers", ["node_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_idea_node_papers_node_id", table_name="idea_node_papers")
+    op.drop_table("idea_node_papers")
+    op.drop_index("ix_idea_nodes_tree_path", table_name="idea_nodes")
+    op.drop_index("ix_idea_nodes_parent_position", table_name="idea_nodes")
+    op.drop_table("idea_nodes")
+    op.drop_table("idea_trees")
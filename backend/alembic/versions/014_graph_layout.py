@@ -0,0 +1,65 @@
+"""paper graph edges and persisted layout coordinates
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "014"
+down_revision: str | None = "013"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "graph_layouts",
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("version", sa.Integer, nullable=False),
+        sa.Column("run_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("seed", sa.Integer, nullable=False),
+        sa.Column("node_count", sa.Integer, nullable=False),
+        sa.Column("edge_count", sa.Integer, nullable=False),
+        sa.Column("clusters", postgresql.JSONB, nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["run_id"], ["runs.id"], ondelete="SET NULL"),
+    )
+    op.create_table(
+        "graph_nodes",
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("paper_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("x", sa.Float, nullable=False),
+        sa.Column("y", sa.Float, nullable=False),
+        sa.Column("cluster", sa.Integer, nullable=True),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["paper_id"], ["papers.id"], ondelete="CASCADE"),
+    )
+    op.create_table(
+        "graph_edges",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("source_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("target_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("weight", sa.Float, nullable=False),
+        sa.Column("kind", sa.String(16), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["source_id"], ["papers.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["target_id"], ["papers.id"], ondelete="CASCADE"),
+    )
+    op.create_index("ix_graph_edges_project_source", "graph_edges", ["project_id", "source_id"])
+    op.create_index("ix_graph_edges_project_target", "graph_edges", ["project_id", "target_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_graph_edges_project_target", table_name="graph_edges")
+    op.drop_index("ix_graph_edges_project_source", table_name="graph_edges")
+    op.drop_table("graph_edges")
+    op.drop_table("graph_nodes")
+    op.drop_table("graph_layouts")
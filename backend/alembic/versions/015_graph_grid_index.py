@@ -0,0 +1,58 @@
+"""grid index on graph node coordinates, cluster edge counts
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "015"
+down_revision: str | None = "014"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Existing layouts get a fixed cell size until their next graph stage
+BACKFILL_CELL_SIZE = 8.0
+
+
+def upgrade() -> None:
+    op.add_column(
+        "graph_layouts",
+        sa.Column("cluster_edges", postgresql.JSONB, nullable=False, server_default="[]"),
+    )
+    op.alter_column("graph_layouts", "cluster_edges", server_default=None)
+    op.add_column(
+        "graph_layouts",
+        sa.Column(
+            "cell_size", sa.Float, nullable=False, server_default=str(BACKFILL_CELL_SIZE)
+        ),
+    )
+    op.alter_column("graph_layouts", "cell_size", server_default=None)
+    op.add_column(
+        "graph_nodes", sa.Column("cell_x", sa.Integer, nullable=False, server_default="0")
+    )
+    op.add_column(
+        "graph_nodes", sa.Column("cell_y", sa.Integer, nullable=False, server_default="0")
+    )
+    op.execute(
+        f"UPDATE graph_nodes SET cell_x = floor(x / {BACKFILL_CELL_SIZE})::int, "
+        f"cell_y = floor(y / {BACKFILL_CELL_SIZE})::int"
+    )
+    op.alter_column("graph_nodes", "cell_x", server_default=None)
+    op.alter_column("graph_nodes", "cell_y", server_default=None)
+    op.create_index(
+        "ix_graph_nodes_project_cell", "graph_nodes", ["project_id", "cell_x", "cell_y"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_graph_nodes_project_cell", table_name="graph_nodes")
+    op.drop_column("graph_nodes", "cell_y")
+    op.drop_column("graph_nodes", "cell_x")
+    op.drop_column("graph_layouts", "cell_size")
+    op.drop_column("graph_layouts", "cluster_edges")
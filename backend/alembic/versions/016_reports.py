@@ -0,0 +1,69 @@
+"""report stage: reports, their parts, and the section cache
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "016"
+down_revision: str | None = "015"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "reports",
+        sa.Column("run_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("status", sa.String(16), nullable=False),
+        sa.Column("total", sa.Integer, nullable=False),
+        sa.Column("done", sa.Integer, nullable=False),
+        sa.Column("content", sa.Text, nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["run_id"], ["runs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+    )
+    op.create_index("ix_reports_project_id", "reports", ["project_id"])
+    op.create_table(
+        "report_parts",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("run_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("position", sa.Integer, nullable=False),
+        sa.Column("depth", sa.Integer, nullable=False),
+        sa.Column("node_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("label", sa.Text, nullable=False),
+        sa.Column("section_key", sa.String(64), nullable=True),
+        sa.Column("sequence", sa.Integer, nullable=True),
+        sa.Column("cached", sa.Boolean, nullable=False),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["run_id"], ["reports.run_id"], ondelete="CASCADE"),
+        sa.UniqueConstraint("run_id", "position", name="uq_report_part_position"),
+    )
+    op.create_index("ix_report_parts_run_sequence", "report_parts", ["run_id", "sequence"])
+    op.create_table(
+        "report_sections",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("key", sa.String(64), nullable=False),
+        sa.Column("model", sa.String(128), nullable=False),
+        sa.Column("content", sa.Text, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.UniqueConstraint("project_id", "key", name="uq_report_section_key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("report_sections")
+    op.drop_index("ix_report_parts_run_sequence", table_name="report_parts")
+    op.drop_table("report_parts")
+    op.drop_index("ix_reports_project_id", table_name="reports")
+    op.drop_table("reports")
@@ -0,0 +1,51 @@
+"""export jobs rendered by background workers
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "017"
+down_revision: str | None = "016"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "export_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("run_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("format", sa.String(16), nullable=False),
+        sa.Column("filters", postgresql.JSONB, nullable=False),
+        sa.Column("layout_version", sa.Integer, nullable=False),
+        sa.Column("cache_key", sa.String(64), nullable=False),
+        sa.Column("status", sa.String(16), nullable=False),
+        sa.Column("worker_id", sa.String(255), nullable=True),
+        sa.Column("storage_key", sa.String(255), nullable=True),
+        sa.Column("content_hash", sa.String(64), nullable=True),
+        sa.Column("media_type", sa.String(64), nullable=True),
+        sa.Column("filename", sa.String(255), nullable=True),
+        sa.Column("size_bytes", sa.BigInteger, nullable=True),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["run_id"], ["runs.id"], ondelete="CASCADE"),
+    )
+    op.create_index("ix_export_jobs_project_key", "export_jobs", ["project_id", "cache_key"])
+    op.create_index("ix_export_jobs_status_created", "export_jobs", ["status", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_export_jobs_status_created", table_name="export_jobs")
+    op.drop_index("ix_export_jobs_project_key", table_name="export_jobs")
+    op.drop_table("export_jobs")
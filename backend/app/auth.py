@@ -0,0 +1,230 @@
+"""
+Authenticated request context.
+
+``get_current_user`` resolves the caller once per credential and caches the
+result, so a request costs no ``users`` query once its user is known:
+
+1. an in-process TTL cache (``AUTH_CACHE_TTL`` seconds),
+2. Redis (``REDIS_URL``) when ``AUTH_CACHE_REDIS`` is on and the optional
+   ``redis`` package is installed, shared by every API process,
+3. the primary database, through a short session of its own rather than
+   the request's, where an unknown user is inserted (idempotently, with
+   ``ON CONFLICT DO NOTHING``) and committed before the result is cached.
+
+The credential is still the stub ``X-User-Id`` header; real tokens slot
+into ``get_current_user`` without changing its callers.
+
+Ownership is enforced by ``require_project_owner``, the one check every
+``/projects/{id}/...`` route makes. A project's owner never changes, so the
+owner is cached the same way under the project id and a hit answers the
+check without a query. Deleting a project evicts it with
+``forget_project``, which drops the shared Redis entry before the delete
+commits. Other processes' in-memory entries may outlive the project by up
+to the TTL; in that window the project's own queries find nothing, and
+routes that insert rows under the project pass ``lock=True`` so the row's
+existence is confirmed (and held against a concurrent delete) first.
+"""
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Generic, Optional, Tuple, TypeVar
+
+from fastapi import Header, HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import database
+from app.config import settings
+from app.models.project import Project
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Entries kept per in-process cache; the oldest are dropped first
+CACHE_ENTRIES = 10_000
+REDIS_PREFIX = "lrweb:auth:"
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """A small dict with per-entry expiry, for one process."""
+
+    def __init__(self, ttl: float, max_entries: int = CACHE_ENTRIES) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Any, Tuple[float, V]] = {}
+
+    def get(self, key: Any) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return None
+        return entry[1]
+
+    def set(self, key: Any, value: V) -> None:
+        if len(self._entries) >= self.max_entries:
+            # Dicts keep insertion order: drop the oldest tenth
+            for old in list(self._entries)[: self.max_entries // 10 or 1]:
+                del self._entries[old]
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def discard(self, key: Any) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+@dataclass(frozen=True)
+class AuthUser:
+    id: uuid.UUID
+    email: str
+
+
+_users: TTLCache[AuthUser] = TTLCache(settings.auth_cache_ttl)
+_owners: TTLCache[uuid.UUID] = TTLCache(settings.auth_cache_ttl)
+_redis_client: Any = None
+
+
+def _redis() -> Any:
+    """The shared Redis client, or None when disabled or not installed."""
+    global _redis_client
+    if not settings.auth_cache_redis:
+        return None
+    if _redis_client is None:
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            return None
+        _redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+    return _redis_client
+
+
+async def _redis_get(key: str) -> Optional[str]:
+    client = _redis()
+    if client is None:
+        return None
+    try:
+        return await client.get(REDIS_PREFIX + key)
+    except Exception as exc:
+        # The database still answers; Redis is only a cache
+        logger.warning("Auth cache read failed: %s", exc)
+        return None
+
+
+async def _redis_set(key: str, value: str) -> None:
+    client = _redis()
+    if client is None:
+        return
+    try:
+        await client.set(REDIS_PREFIX + key, value, ex=max(1, int(settings.auth_cache_ttl)))
+    except Exception as exc:
+        logger.warning("Auth cache write failed: %s", exc)
+
+
+async def _redis_delete(key: str) -> None:
+    client = _redis()
+    if client is None:
+        return
+    try:
+        await client.delete(REDIS_PREFIX + key)
+    except Exception as exc:
+        logger.warning("Auth cache delete failed: %s", exc)
+
+
+def clear_caches() -> None:
+    """Empty this process's caches (tests, and after restoring a database)."""
+    _users.clear()
+    _owners.clear()
+
+
+async def resolve_user(db: AsyncSession, user_id: uuid.UUID) -> AuthUser:
+    """The user behind ``user_id``, created on first sight; commits when it inserts."""
+    user = _users.get(user_id)
+    if user is not None:
+        return user
+    email = await _redis_get(f"user:{user_id}")
+    if email is None:
+        email = await db.scalar(select(User.email).where(User.id == user_id))
+    if email is None:
+        email = f"{user_id}@stub.local"
+        dialect = db.bind.dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        await db.execute(
+            insert(User)
+            .values(id=user_id, email=email, created_at=datetime.utcnow())
+            .on_conflict_do_nothing()
+        )
+        # Committed before it is cached, so no cache entry outlives a rollback
+        await db.commit()
+    user = AuthUser(id=user_id, email=email)
+    _users.set(user_id, user)
+    await _redis_set(f"user:{user_id}", email)
+    return user
+
+
+# Stub auth: caller passes X-User-Id header. Real auth is Phase 2.
+async def get_current_user(x_user_id: Optional[str] = Header(default=None)) -> AuthUser:
+    if not x_user_id:
+        raise HTTPException(status_code=401, detail="X-User-Id header required")
+    try:
+        user_id = uuid.UUID(x_user_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid X-User-Id")
+    user = _users.get(user_id)
+    if user is not None:
+        return user
+    # A short primary session of its own, not the request's: read endpoints
+    # served by a replica never hold a primary connection for auth.
+    async with database.sessions.primary() as db:
+        return await resolve_user(db, user_id)
+
+
+async def project_owner(db: AsyncSession, project_id: uuid.UUID) -> Optional[uuid.UUID]:
+    """The project's owner id, or None when there is no such project."""
+    owner = _owners.get(project_id)
+    if owner is not None:
+        return owner
+    cached = await _redis_get(f"owner:{project_id}")
+    if cached is not None:
+        owner = uuid.UUID(cached)
+    else:
+        owner = await db.scalar(select(Project.owner_id).where(Project.id == project_id))
+        if owner is None:
+            return None
+        await _redis_set(f"owner:{project_id}", str(owner))
+    _owners.set(project_id, owner)
+    return owner
+
+
+async def require_project_owner(
+    db: AsyncSession, project_id: uuid.UUID, user_id: uuid.UUID, *, lock: bool = False
+) -> None:
+    """404 unless ``user_id`` owns the project (another user's project does not exist).
+
+    With ``lock`` the project row is also read ``FOR SHARE``: a cached owner
+    that outlived a delete elsewhere is caught here instead of as a foreign
+    key error, and a delete arriving meanwhile waits for this transaction.
+    """
+    if await project_owner(db, project_id) != user_id:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if lock:
+        exists = await db.scalar(
+            select(Project.id).where(Project.id == project_id).with_for_update(read=True)
+        )
+        if exists is None:
+            await forget_project(project_id)
+            raise HTTPException(status_code=404, detail="Project not found")
+
+
+async def forget_project(project_id: uuid.UUID) -> None:
+    _owners.discard(project_id)
+    await _redis_delete(f"owner:{project_id}")
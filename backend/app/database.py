@@ -1,12 +1,32 @@
+"""
+Engines and request sessions.
+
+Writes go to the primary (``DATABASE_URL``) through ``get_db``. Read-only
+endpoints take ``get_read_db``, which hands out a session on one of the
+read replicas (``DATABASE_REPLICA_URLS``, round robin) or on the primary
+when none are configured.
+
+Replicas lag the primary, so a client that just changed something reads
+its own writes from the primary for a while: every request that writes
+(any method but GET/HEAD/OPTIONS) sets the ``lrweb_primary`` cookie for
+``DATABASE_REPLICA_STICKY_SECONDS``, and reads carrying it stay on the
+primary. Clients that do not keep cookies can send ``X-Read-Primary: 1``.
+"""
 from __future__ import annotations
 
+import itertools
 from collections.abc import AsyncGenerator
+from typing import Sequence
 
+from fastapi import Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import settings
 
+PRIMARY_COOKIE = "lrweb_primary"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
 
 class Base(DeclarativeBase):
     pass
@@ -21,11 +41,69 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
+class SessionRouter:
+    """Picks the session factory for a request: the primary or a replica."""
+
+    def __init__(
+        self,
+        primary: async_sessionmaker,
+        replicas: Sequence[async_sessionmaker] = (),
+        sticky_seconds: float = 5.0,
+    ) -> None:
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.sticky_seconds = sticky_seconds
+        self._next = itertools.cycle(range(len(self.replicas) or 1))
+
+    def for_read(self, request: Request) -> async_sessionmaker:
+        if not self.replicas or self.sticky(request):
+            return self.primary
+        return self.replicas[next(self._next)]
+
+    @staticmethod
+    def sticky(request: Request) -> bool:
+        return (
+            PRIMARY_COOKIE in request.cookies or request.headers.get("x-read-primary") == "1"
+        )
+
+    def mark_write(self, request: Request, response: Response) -> None:
+        """Keep this client's reads on the primary until replicas have caught up."""
+        if self.replicas and request.method not in SAFE_METHODS:
+            response.set_cookie(
+                PRIMARY_COOKIE,
+                "1",
+                max_age=max(1, round(self.sticky_seconds)),
+                httponly=True,
+                samesite="lax",
+            )
+
+
+def _replica_factory(url: str) -> async_sessionmaker:
+    return async_sessionmaker(
+        bind=create_async_engine(url, echo=False), class_=AsyncSession, expire_on_commit=False
+    )
+
+
+sessions = SessionRouter(
+    AsyncSessionLocal,
+    [_replica_factory(url) for url in settings.database_replica_urls],
+    settings.database_replica_sticky_seconds,
+)
+
+
+async def get_db(request: Request, response: Response) -> AsyncGenerator[AsyncSession, None]:
+    # Set before the handler runs; headers added after the yield would be too late
+    sessions.mark_write(request, response)
+    async with sessions.primary() as session:
         try:
             yield session
             await session.commit()
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """A session for read-only endpoints; never committed, whatever it points at."""
+    async with sessions.for_read(request)() as session:
+        yield session
@@ -1,23 +1,49 @@
 from __future__ import annotations
 
-from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+import secrets
+import time
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+_import_started = time.perf_counter()
 
-from app.config import settings
-from app.database import Base, engine
-from app.routers import papers, projects, runs
+from contextlib import asynccontextmanager  # noqa: E402
+from typing import Any, AsyncGenerator, Dict, Optional  # noqa: E402
+
+from fastapi import Depends, FastAPI, Header, HTTPException  # noqa: E402
+from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import engine, get_read_db  # noqa: E402
+from app.pipeline.pdf import shutdown_parse_pool  # noqa: E402
+from app.pipeline.scheduler import queue_metrics  # noqa: E402
+from app.routers import (  # noqa: E402
+    documents,
+    exports,
+    graph,
+    idea_tree,
+    papers,
+    projects,
+    reports,
+    runs,
+)
+from app.schemas.run import QueueMetrics  # noqa: E402
+from app.startup import StartupTimer, logger, prepare_database  # noqa: E402
+
+startup = StartupTimer()
+startup.record("imports", time.perf_counter() - _import_started)
+_app_started = time.perf_counter()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    # Auto-create tables on startup (used in dev/SQLite mode).
-    # In production, Alembic migrations run instead.
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # dev: create_all; production: only verify the Alembic revision.
+    with startup.phase("database"):
+        await prepare_database(engine, settings.startup_mode)
+    logger.info(
+        "Startup (%s) ready in %s ms: %s", settings.startup_mode, startup.total_ms, startup.phases
+    )
     yield
+    shutdown_parse_pool()
 
 
 app = FastAPI(
@@ -38,8 +64,45 @@ app.add_middleware(
 app.include_router(projects.router, prefix="/projects", tags=["projects"])
 app.include_router(runs.router, prefix="/projects", tags=["runs"])
 app.include_router(papers.router, prefix="/projects", tags=["papers"])
+app.include_router(documents.router, prefix="/projects", tags=["documents"])
+app.include_router(idea_tree.router, prefix="/projects", tags=["idea-tree"])
+app.include_router(graph.router, prefix="/projects", tags=["graph"])
+app.include_router(reports.router, prefix="/projects", tags=["reports"])
+app.include_router(exports.router, prefix="/projects", tags=["exports"])
+startup.record("app", time.perf_counter() - _app_started)
 
 
 @app.get("/health", tags=["health"])
 async def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/health/startup", tags=["health"])
+async def startup_timings() -> Dict[str, Any]:
+    """Where this worker's start-up time went, per phase."""
+    return {
+        "mode": settings.startup_mode,
+        "total_ms": startup.total_ms,
+        "phases_ms": startup.phases,
+    }
+
+
+def require_metrics_token(x_metrics_token: Optional[str] = Header(default=None)) -> None:
+    """Internal-only: the caller must present ``METRICS_TOKEN``; unset, the route is off."""
+    if not settings.metrics_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_metrics_token is None or not secrets.compare_digest(
+        x_metrics_token, settings.metrics_token
+    ):
+        raise HTTPException(status_code=403, detail="Invalid metrics token")
+
+
+@app.get(
+    "/health/queue",
+    response_model=QueueMetrics,
+    tags=["health"],
+    dependencies=[Depends(require_metrics_token)],
+)
+async def run_queue(db: AsyncSession = Depends(get_read_db)) -> QueueMetrics:
+    """Run queue depth and claim wait times per lane, across all workers and tenants."""
+    return QueueMetrics(**await queue_metrics(db))
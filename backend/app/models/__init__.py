@@ -1,6 +1,44 @@
+from app.models.artifact import RunArtifact
+from app.models.checkpoint import RunCheckpoint
+from app.models.citation import Citation
+from app.models.dedup import PaperLSHBucket
+from app.models.document import PaperDocument
+from app.models.embedding import PaperEmbedding
+from app.models.export import ExportJob
+from app.models.graph import GraphEdge, GraphLayout, GraphNode
+from app.models.idea_tree import IdeaNode, IdeaNodePaper, IdeaTree
 from app.models.paper import Paper, ProjectPaper
+from app.models.profile import RunStageProfile
 from app.models.project import Project
+from app.models.report import Report, ReportPart, ReportSection
 from app.models.run import Run
+from app.models.stats import ProjectStats
+from app.models.upload import PdfUpload
 from app.models.user import User
 
-__all__ = ["User", "Project", "Run", "Paper", "ProjectPaper"]
+__all__ = [
+    "User",
+    "Project",
+    "ProjectStats",
+    "Run",
+    "RunStageProfile",
+    "RunCheckpoint",
+    "RunArtifact",
+    "Paper",
+    "ProjectPaper",
+    "PaperEmbedding",
+    "PaperLSHBucket",
+    "Citation",
+    "PaperDocument",
+    "PdfUpload",
+    "IdeaTree",
+    "IdeaNode",
+    "IdeaNodePaper",
+    "GraphLayout",
+    "GraphNode",
+    "GraphEdge",
+    "Report",
+    "ReportPart",
+    "ReportSection",
+    "ExportJob",
+]
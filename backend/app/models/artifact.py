@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Optional
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.types import JSON
+
+from app.database import Base
+
+if TYPE_CHECKING:
+    from app.models.run import Run
+
+
+class RunArtifact(Base):
+    """Manifest of one run output stored as a blob (see ``app.services.artifacts``)."""
+
+    __tablename__ = "run_artifacts"
+    __table_args__ = (UniqueConstraint("run_id", "name", name="uq_run_artifact_name"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("runs.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    # e.g. "embeddings", "embedding_index", "clusters"
+    name: Mapped[str] = mapped_column(String(128), nullable=False)
+    # "array" (.npy) | "table" (compressed NDJSON)
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)
+    # "npy" | "ndjson.zst" | "ndjson.gz"
+    format: Mapped[str] = mapped_column(String(16), nullable=False)
+    # SHA-256 of the stored bytes; also determines storage_key
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    storage_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # Tables: row count; arrays: first dimension
+    rows: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    shape: Mapped[Optional[Any]] = mapped_column(JSON, nullable=True)
+    dtype: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
+
+    run: Mapped[Run] = relationship(back_populates="artifacts")
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import JSON
+
+from app.database import Base
+
+
+class RunCheckpoint(Base):
+    """A completed pipeline stage of a run; resumed runs skip these stages."""
+
+    __tablename__ = "run_checkpoints"
+    __table_args__ = (UniqueConstraint("run_id", "stage", name="uq_run_checkpoint_stage"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("runs.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    stage: Mapped[str] = mapped_column(String(64), nullable=False)
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    # The stage's return value as JSON, handed to later stages on resume
+    output: Mapped[Optional[Any]] = mapped_column(JSON, nullable=True)
+    completed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import ForeignKey, Index, SmallInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class PaperLSHBucket(Base):
+    """One MinHash LSH band hash of a paper's normalised title."""
+
+    __tablename__ = "paper_lsh_buckets"
+    __table_args__ = (Index("ix_paper_lsh_buckets_paper_id", "paper_id"),)
+
+    band: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    bucket: Mapped[str] = mapped_column(String(16), primary_key=True)
+    paper_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("papers.id", ondelete="CASCADE"), primary_key=True
+    )
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import JSON
+
+from app.database import Base
+
+
+class PaperDocument(Base):
+    """An uploaded full-text PDF and its parsed content, keyed by content hash."""
+
+    __tablename__ = "paper_documents"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    paper_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("papers.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    # SHA-256 of the PDF bytes; identical uploads are stored and parsed once
+    content_hash: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    storage_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # pending | parsed | failed
+    status: Mapped[str] = mapped_column(String(32), nullable=False, default="pending")
+    page_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    sections: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    references: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
+    parsed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import JSON
+
+from app.database import Base
+
+
+class ExportJob(Base):
+    """A requested export, rendered by an export worker (``app.pipeline.exports``)."""
+
+    __tablename__ = "export_jobs"
+    __table_args__ = (
+        Index("ix_export_jobs_project_key", "project_id", "cache_key"),
+        Index("ix_export_jobs_status_created", "status", "created_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("runs.id", ondelete="CASCADE"), nullable=False
+    )
+    # "markdown" | "latex" | "pdf" | "slides"
+    format: Mapped[str] = mapped_column(String(16), nullable=False)
+    # Paper filter fields (see PaperFilter), None values dropped
+    filters: Mapped[Any] = mapped_column(JSON, nullable=False, default=dict)
+    layout_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # SHA-256 of (run, filters, layout version, format); equal keys share one render
+    cache_key: Mapped[str] = mapped_column(String(64), nullable=False)
+    # "queued" | "running" | "completed" | "failed"
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="queued")
+    worker_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    storage_key: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    media_type: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    filename: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    size_bytes: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Refreshed by the rendering worker; a stale value means the worker died
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import JSON
+
+from app.database import Base
+
+
+class GraphLayout(Base):
+    """The project's current paper-graph layout (see ``app.pipeline.graph``)."""
+
+    __tablename__ = "graph_layouts"
+
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Bumped whenever any coordinate changes; exports key their caches on it
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Run that last rebuilt the edges and placed papers
+    run_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        ForeignKey("runs.id", ondelete="SET NULL"), nullable=True
+    )
+    seed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    node_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    edge_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Taxonomy leaves of that run: [{"id", "label", "size", "x", "y"}]
+    clusters: Mapped[Any] = mapped_column(JSON, nullable=False, default=list)
+    # Edge counts between leaves: [{"source", "target", "weight"}], source < target
+    cluster_edges: Mapped[Any] = mapped_column(JSON, nullable=False, default=list)
+    # Side of a square cell of the node grid index (see app.services.graph_view)
+    cell_size: Mapped[float] = mapped_column(Float, nullable=False, default=1.0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
+
+
+class GraphNode(Base):
+    __tablename__ = "graph_nodes"
+    __table_args__ = (Index("ix_graph_nodes_project_cell", "project_id", "cell_x", "cell_y"),)
+
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    paper_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("papers.id", ondelete="CASCADE"), primary_key=True
+    )
+    x: Mapped[float] = mapped_column(Float, nullable=False)
+    y: Mapped[float] = mapped_column(Float, nullable=False)
+    # Taxonomy leaf id within GraphLayout.clusters
+    cluster: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # floor(x / cell_size), floor(y / cell_size)
+    cell_x: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cell_y: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class GraphEdge(Base):
+    """Undirected edge between two project papers, stored once (either order)."""
+
+    __tablename__ = "graph_edges"
+    __table_args__ = (
+        Index("ix_graph_edges_project_source", "project_id", "source_id"),
+        Index("ix_graph_edges_project_target", "project_id", "target_id"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    source_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("papers.id", ondelete="CASCADE"), nullable=False
+    )
+    target_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("papers.id", ondelete="CASCADE"), nullable=False
+    )
+    # Cosine similarity for "similar" edges, 1.0 for "cites"
+    weight: Mapped[float] = mapped_column(Float, nullable=False)
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)
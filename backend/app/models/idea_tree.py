@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.database import Base
+
+
+class IdeaTree(Base):
+    """A project's editable idea tree, seeded from a run's taxonomy.
+
+    ``version`` increases with every accepted edit; edits name the version
+    they were made against (see ``app.services.idea_tree``).
+    """
+
+    __tablename__ = "idea_trees"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, unique=True
+    )
+    source_run_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        ForeignKey("runs.id", ondelete="SET NULL"), nullable=True
+    )
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    # A locked tree accepts no edits and is not replaced by later runs
+    locked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False,
+    )
+
+    # Left to ON DELETE CASCADE; a tree can have thousands of nodes
+    nodes: Mapped[List[IdeaNode]] = relationship(
+        cascade="all, delete-orphan", passive_deletes=True
+    )
+
+
+class IdeaNode(Base):
+    __tablename__ = "idea_nodes"
+    __table_args__ = (
+        # Children of a node, in order
+        Index("ix_idea_nodes_parent_position", "parent_id", "position"),
+        # Subtree reads: the range [<ancestor path>, <ancestor path> || '~')
+        Index("ix_idea_nodes_tree_path", "tree_id", "path"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    tree_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("idea_trees.id", ondelete="CASCADE"), nullable=False
+    )
+    parent_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        ForeignKey("idea_nodes.id", ondelete="CASCADE"), nullable=True
+    )
+    # Materialized path: the hex ids of the root..this node, each followed by "/"
+    # Compared in byte order, which the subtree range relies on: collation "C"
+    # on Postgres (as in migration 013); SQLite's default BINARY already is.
+    path: Mapped[str] = mapped_column(
+        String(2048).with_variant(String(2048, collation="C"), "postgresql"), nullable=False
+    )
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Order among siblings
+    position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    label: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    # Papers attached to this node itself, not counting descendants
+    paper_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False,
+    )
+
+
+class IdeaNodePaper(Base):
+    """Placement of a paper in the tree; a paper sits in at most one node."""
+
+    __tablename__ = "idea_node_papers"
+    __table_args__ = (UniqueConstraint("tree_id", "paper_id", name="uq_idea_node_paper"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    tree_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("idea_trees.id", ondelete="CASCADE"), nullable=False
+    )
+    node_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("idea_nodes.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    paper_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("papers.id", ondelete="CASCADE"), nullable=False
+    )
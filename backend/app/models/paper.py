@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.types import JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -22,7 +22,7 @@ class Paper(Base):
     arxiv_id: Mapped[Optional[str]] = mapped_column(String(64), unique=True, nullable=True)
     title: Mapped[str] = mapped_column(Text, nullable=False)
     authors: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
-    year: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    year: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
     abstract: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow, nullable=False
@@ -33,7 +33,13 @@ class Paper(Base):
 
 class ProjectPaper(Base):
     __tablename__ = "project_papers"
-    __table_args__ = (UniqueConstraint("project_id", "paper_id", name="uq_project_paper"),)
+    __table_args__ = (
+        UniqueConstraint("project_id", "paper_id", name="uq_project_paper"),
+        # Default list order and the score/inclusion_reason filters of list_papers
+        Index("ix_project_papers_project_added", "project_id", "added_at"),
+        Index("ix_project_papers_project_score", "project_id", "score"),
+        Index("ix_project_papers_project_reason", "project_id", "inclusion_reason"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     project_id: Mapped[uuid.UUID] = mapped_column(
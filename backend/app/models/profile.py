@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import JSON
+
+from app.database import Base
+
+
+class RunStageProfile(Base):
+    """Performance record for one pipeline stage of one run."""
+
+    __tablename__ = "run_stage_profiles"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("runs.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    stage: Mapped[str] = mapped_column(String(64), nullable=False)
+    # Execution order within the run
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    wall_seconds: Mapped[float] = mapped_column(Float, nullable=False)
+    cpu_seconds: Mapped[float] = mapped_column(Float, nullable=False)
+    peak_rss_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    db_seconds: Mapped[float] = mapped_column(Float, nullable=False)
+    db_statements: Mapped[int] = mapped_column(Integer, nullable=False)
+    llm_calls: Mapped[int] = mapped_column(Integer, nullable=False)
+    llm_prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=False)
+    llm_completion_tokens: Mapped[int] = mapped_column(Integer, nullable=False)
+    # cache name -> {"hits": n, "misses": n}
+    cache: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    # Sampling-profiler stacks, only for the stage it was enabled on
+    samples: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
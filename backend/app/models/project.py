@@ -10,8 +10,10 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
 if TYPE_CHECKING:
+    from app.models.idea_tree import IdeaTree
     from app.models.paper import ProjectPaper
     from app.models.run import Run
+    from app.models.stats import ProjectStats
     from app.models.user import User
 
 
@@ -37,3 +39,5 @@ class Project(Base):
     owner: Mapped[User] = relationship(back_populates="projects")
     runs: Mapped[List[Run]] = relationship(back_populates="project", cascade="all, delete-orphan")
     project_papers: Mapped[List[ProjectPaper]] = relationship(back_populates="project", cascade="all, delete-orphan")
+    stats: Mapped[Optional[ProjectStats]] = relationship(cascade="all, delete-orphan")
+    idea_tree: Mapped[Optional[IdeaTree]] = relationship(cascade="all, delete-orphan")
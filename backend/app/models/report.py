@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class Report(Base):
+    """A run's literature review, written by the report stage (``app.pipeline.report``)."""
+
+    __tablename__ = "reports"
+
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("runs.id", ondelete="CASCADE"), primary_key=True
+    )
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    # "writing" | "completed" | "failed" | "cancelled" (the run was cancelled mid-report)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="writing")
+    # Parts planned and parts finished so far
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    done: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # The assembled Markdown, once every part is finished
+    content: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+class ReportPart(Base):
+    """One heading of a report: the introduction or the section of an idea node."""
+
+    __tablename__ = "report_parts"
+    __table_args__ = (
+        UniqueConstraint("run_id", "position", name="uq_report_part_position"),
+        Index("ix_report_parts_run_sequence", "run_id", "sequence"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("reports.run_id", ondelete="CASCADE"), nullable=False
+    )
+    # Reading order; 0 is the introduction
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    depth: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Idea node the section covers; not a foreign key, the tree may be re-seeded
+    node_id: Mapped[Optional[uuid.UUID]] = mapped_column(nullable=True)
+    label: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    # ReportSection.key once written; None while pending
+    section_key: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # Completion order within the report (1, 2, ...); streams resume after it
+    sequence: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    cached: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+class ReportSection(Base):
+    """Cached section text, keyed by the SHA-256 of the model, prompt and inputs."""
+
+    __tablename__ = "report_sections"
+    __table_args__ = (UniqueConstraint("project_id", "key", name="uq_report_section_key"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    key: Mapped[str] = mapped_column(String(64), nullable=False)
+    model: Mapped[str] = mapped_column(String(128), nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
@@ -2,34 +2,53 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, Index, String
 from sqlalchemy.types import JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
 if TYPE_CHECKING:
+    from app.models.artifact import RunArtifact
     from app.models.project import Project
 
 
 class Run(Base):
     __tablename__ = "runs"
+    # Queue scans: pending runs per lane in arrival order, running runs per project
+    __table_args__ = (Index("ix_runs_status_lane_created", "status", "lane", "created_at"),)
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     project_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
     )
-    # pending | running | completed | failed
+    # pending | running | completed | failed | cancelled
     status: Mapped[str] = mapped_column(String(32), nullable=False, default="pending")
+    # Scheduling lane: "interactive" runs are claimed before "bulk" ones
+    lane: Mapped[str] = mapped_column(String(16), nullable=False, default="bulk")
+    # Worker process that claimed the run ("host:pid")
+    worker_id: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
     # Immutable after creation — never update this column
     config_snapshot: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow, nullable=False
     )
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Refreshed by the executing worker; a stale heartbeat means the worker died
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Set by POST .../cancel; the worker stops at its next cancellation check
+    cancel_requested_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
     completed_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
 
     project: Mapped[Project] = relationship(back_populates="runs")
+    artifacts: Mapped[List[RunArtifact]] = relationship(
+        back_populates="run", cascade="all, delete-orphan", order_by="RunArtifact.name"
+    )
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class ProjectStats(Base):
+    """Per-project counters, kept current by the writes that change them.
+
+    See ``app.services.project_stats``; ``list_projects`` reads this row
+    instead of aggregating papers and runs.
+    """
+
+    __tablename__ = "project_stats"
+
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    paper_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    run_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Most recently created run
+    latest_run_id: Mapped[Optional[uuid.UUID]] = mapped_column(nullable=True)
+    latest_run_status: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    latest_run_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Publication year span of the project's papers
+    year_min: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    year_max: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import JSON
+
+from app.database import Base
+
+
+class PdfUpload(Base):
+    """A resumable, chunked PDF upload in progress (or finished) for one paper."""
+
+    __tablename__ = "pdf_uploads"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    paper_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("papers.id", ondelete="CASCADE"), nullable=False
+    )
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Declared total size and bytes received so far
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    offset: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    # uploading | completed | aborted | failed (bytes attached to another paper)
+    status: Mapped[str] = mapped_column(String(32), nullable=False, default="uploading")
+    # Storage-backend bookkeeping, e.g. S3 multipart upload id and part ETags
+    backend_state: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    document_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        ForeignKey("paper_documents.id", ondelete="SET NULL"), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
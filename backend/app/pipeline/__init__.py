@@ -0,0 +1,5 @@
+"""Run pipeline stages (PROJECT_PLAN.md §8)."""
+
+
+class RunCancelled(Exception):
+    """Raised inside a stage once cancellation of its run has been requested."""
@@ -0,0 +1,372 @@
+"""
+Citation-graph expansion (plan Step 3: "expands via citation graph").
+
+Breadth-first search from the project's seed papers up to ``depth`` hops.
+Each BFS level is fetched concurrently through a ``CitationSource`` that
+bounds in-flight requests and rate-limits request starts; a visited set keeps
+every node to a single fetch. Discovered papers are scored by how strongly
+they connect to the seeds and the best ``budget`` are added to the project
+with an inclusion reason. Citation edges between stored papers are persisted
+in ``citations``.
+"""
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Protocol, Set, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.citation import Citation
+from app.models.paper import Paper, ProjectPaper
+from app.schemas.paper import PaperCreate
+from app.services.embeddings import store_paper_embeddings
+from app.services.papers import find_or_create_paper
+from app.services.project_stats import record_papers_added
+
+if TYPE_CHECKING:
+    import httpx
+
+# Score multiplier per extra hop away from the seeds.
+DEPTH_DECAY = 0.5
+# Weight of a link to another discovered paper relative to a link to a seed.
+PEER_LINK_WEIGHT = 0.25
+
+
+@dataclass
+class CitationRecord:
+    source_id: str
+    title: str
+    authors: List[str] = field(default_factory=list)
+    year: Optional[int] = None
+    abstract: Optional[str] = None
+    doi: Optional[str] = None
+    arxiv_id: Optional[str] = None
+    # Source ids of papers this one cites / that cite this one
+    references: List[str] = field(default_factory=list)
+    citations: List[str] = field(default_factory=list)
+
+
+class CitationSource(Protocol):
+    async def fetch(self, key: str) -> Optional[CitationRecord]:
+        """Look up ``key`` (a source id, ``DOI:...`` or ``ARXIV:...``); None if unknown."""
+        ...
+
+
+class RateLimiter:
+    """Spaces request starts at least ``1 / rate`` seconds apart."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class HttpCitationSource:
+    """Client for a Semantic Scholar Graph API compatible service."""
+
+    FIELDS = "title,authors,year,abstract,externalIds,references.paperId,citations.paperId"
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        *,
+        concurrency: int = 8,
+        requests_per_second: float = 10.0,
+        max_retries: int = 3,
+    ) -> None:
+        self._client = client
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._limiter = RateLimiter(requests_per_second)
+        self.max_retries = max_retries
+
+    async def fetch(self, key: str) -> Optional[CitationRecord]:
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self._limiter.wait()
+                resp = await self._client.get(f"/paper/{key}", params={"fields": self.FIELDS})
+                if resp.status_code == 404:
+                    return None
+                retryable = resp.status_code == 429 or resp.status_code >= 500
+                if retryable and attempt < self.max_retries:
+                    await asyncio.sleep(_retry_after(resp, attempt))
+                    continue
+                resp.raise_for_status()
+                return parse_record(resp.json())
+        return None
+
+
+def _retry_after(resp: httpx.Response, attempt: int) -> float:
+    try:
+        return float(resp.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return 0.5 * 2**attempt
+
+
+def parse_record(data: Dict[str, Any]) -> CitationRecord:
+    external = data.get("externalIds") or {}
+    return CitationRecord(
+        source_id=data["paperId"],
+        title=data.get("title") or "",
+        authors=[a["name"] for a in data.get("authors") or [] if a.get("name")],
+        year=data.get("year"),
+        abstract=data.get("abstract"),
+        doi=external.get("DOI"),
+        arxiv_id=external.get("ArXiv"),
+        references=[r["paperId"] for r in data.get("references") or [] if r.get("paperId")],
+        citations=[c["paperId"] for c in data.get("citations") or [] if c.get("paperId")],
+    )
+
+
+async def get_citation_source() -> AsyncGenerator[CitationSource, None]:
+    import httpx
+
+    headers = {"x-api-key": settings.citation_api_key} if settings.citation_api_key else {}
+    async with httpx.AsyncClient(
+        base_url=settings.citation_api_url, headers=headers, timeout=30.0
+    ) as client:
+        yield HttpCitationSource(
+            client,
+            concurrency=settings.citation_concurrency,
+            requests_per_second=settings.citation_requests_per_second,
+        )
+
+
+def seed_key(paper: Paper) -> Optional[str]:
+    if paper.doi:
+        return f"DOI:{paper.doi}"
+    if paper.arxiv_id:
+        return f"ARXIV:{paper.arxiv_id}"
+    return None
+
+
+@dataclass
+class ExpansionResult:
+    seeds: int = 0
+    fetched: int = 0
+    failed: int = 0
+    discovered: int = 0
+    added: int = 0
+    edges: int = 0
+
+
+@dataclass
+class _Candidate:
+    record: CitationRecord
+    depth: int
+    seed_links: int
+    score: float
+
+
+async def crawl(
+    source: CitationSource,
+    seed_keys: List[str],
+    *,
+    depth: int,
+    max_fetches: int,
+) -> Tuple[Dict[str, CitationRecord], Dict[str, int], Set[str], int, int]:
+    """BFS over the citation graph.
+
+    Returns (records by source id, hop distance, seed source ids, fetched, failed).
+    """
+    records: Dict[str, CitationRecord] = {}
+    hops: Dict[str, int] = {}
+    seed_ids: Set[str] = set()
+    visited: Set[str] = set()
+    fetched = failed = 0
+
+    frontier = list(dict.fromkeys(seed_keys))
+    for level in range(depth + 1):
+        batch = [key for key in frontier if key not in visited][: max(0, max_fetches - fetched)]
+        if not batch:
+            break
+        visited.update(batch)
+        fetched += len(batch)
+        results = await asyncio.gather(*(source.fetch(k) for k in batch), return_exceptions=True)
+
+        fetched_now: List[CitationRecord] = []
+        for record in results:
+            if isinstance(record, Exception):
+                failed += 1
+            elif record is not None and record.source_id not in records:
+                visited.add(record.source_id)
+                records[record.source_id] = record
+                hops[record.source_id] = level
+                fetched_now.append(record)
+        if level == 0:
+            seed_ids = set(records)
+
+        # Expand only after the whole level is registered, so nodes already
+        # fetched at this level are never queued again.
+        next_frontier: List[str] = []
+        if level < depth:
+            for record in fetched_now:
+                for neighbor in record.references + record.citations:
+                    if neighbor not in visited and neighbor not in hops:
+                        hops[neighbor] = level + 1
+                        next_frontier.append(neighbor)
+        frontier = next_frontier
+    return records, hops, seed_ids, fetched, failed
+
+
+def citation_edges(records: Dict[str, CitationRecord]) -> Set[Tuple[str, str]]:
+    """(citing, cited) pairs whose endpoints were both fetched."""
+    edges: Set[Tuple[str, str]] = set()
+    for record in records.values():
+        for cited in record.references:
+            if cited in records:
+                edges.add((record.source_id, cited))
+        for citing in record.citations:
+            if citing in records:
+                edges.add((citing, record.source_id))
+    return edges
+
+
+def score_candidates(
+    records: Dict[str, CitationRecord],
+    hops: Dict[str, int],
+    seed_ids: Set[str],
+    edges: Set[Tuple[str, str]],
+) -> List[_Candidate]:
+    """Rank non-seed papers by (decayed) connectivity to the seed set, best first."""
+    neighbors: Dict[str, Set[str]] = {}
+    for citing, cited in edges:
+        neighbors.setdefault(citing, set()).add(cited)
+        neighbors.setdefault(cited, set()).add(citing)
+
+    raw: List[Tuple[float, int, CitationRecord]] = []
+    for source_id, record in records.items():
+        if source_id in seed_ids or not record.title:
+            continue
+        adjacent = neighbors.get(source_id, set())
+        seed_links = len(adjacent & seed_ids)
+        peer_links = len(adjacent) - seed_links
+        value = (seed_links + PEER_LINK_WEIGHT * peer_links) * DEPTH_DECAY ** (hops[source_id] - 1)
+        raw.append((value, seed_links, record))
+
+    top = max((value for value, _, _ in raw), default=0.0) or 1.0
+    candidates = [
+        _Candidate(record, hops[record.source_id], seed_links, round(value / top, 4))
+        for value, seed_links, record in raw
+    ]
+    candidates.sort(key=lambda c: (-c.score, c.record.title, c.record.source_id))
+    return candidates
+
+
+async def expand_citations(
+    db: AsyncSession,
+    project_id: uuid.UUID,
+    source: CitationSource,
+    *,
+    depth: int = 1,
+    budget: int = 50,
+    min_score: float = 0.0,
+    max_fetches: Optional[int] = None,
+) -> ExpansionResult:
+    result = await db.execute(
+        select(Paper)
+        .join(ProjectPaper, ProjectPaper.paper_id == Paper.id)
+        .where(ProjectPaper.project_id == project_id)
+    )
+    project_papers = list(result.scalars().all())
+    in_project = {p.id for p in project_papers}
+    seeds_by_key = {key: p for p in project_papers if (key := seed_key(p))}
+    if max_fetches is None:
+        max_fetches = len(seeds_by_key) + budget * 4
+
+    records, hops, seed_ids, fetched, failed = await crawl(
+        source, list(seeds_by_key), depth=depth, max_fetches=max_fetches
+    )
+    outcome = ExpansionResult(
+        seeds=len(seeds_by_key),
+        fetched=fetched,
+        failed=failed,
+        discovered=len(records) - len(seed_ids),
+    )
+
+    # Map fetched seed records back to their rows.
+    paper_of: Dict[str, uuid.UUID] = {}
+    for source_id in seed_ids:
+        record = records[source_id]
+        for key in (f"DOI:{record.doi}", f"ARXIV:{record.arxiv_id}"):
+            if key in seeds_by_key:
+                paper_of[source_id] = seeds_by_key[key].id
+                break
+
+    edges = citation_edges(records)
+    created: List[Paper] = []
+    added_years: List[Optional[int]] = []
+    now = datetime.utcnow()
+    for candidate in score_candidates(records, hops, seed_ids, edges):
+        if outcome.added >= budget or candidate.score < min_score:
+            break
+        record = candidate.record
+        paper, was_created = await find_or_create_paper(
+            db,
+            PaperCreate(
+                doi=record.doi,
+                arxiv_id=record.arxiv_id,
+                title=record.title,
+                authors=record.authors,
+                year=record.year,
+                abstract=record.abstract,
+            ),
+        )
+        paper_of[record.source_id] = paper.id
+        if was_created:
+            created.append(paper)
+        if paper.id in in_project:
+            continue
+        in_project.add(paper.id)
+        added_years.append(paper.year)
+        db.add(
+            ProjectPaper(
+                project_id=project_id,
+                paper_id=paper.id,
+                inclusion_reason=(
+                    f"citation expansion: linked to {candidate.seed_links} seed paper(s) "
+                    f"at depth {candidate.depth}"
+                ),
+                score=candidate.score,
+                added_at=now,
+            )
+        )
+        outcome.added += 1
+    await store_paper_embeddings(db, created)
+    await record_papers_added(db, project_id, added_years)
+
+    pairs = {
+        (paper_of[citing], paper_of[cited])
+        for citing, cited in edges
+        if citing in paper_of and cited in paper_of and paper_of[citing] != paper_of[cited]
+    }
+    if pairs:
+        result = await db.execute(
+            select(Citation.citing_paper_id, Citation.cited_paper_id).where(
+                tuple_(Citation.citing_paper_id, Citation.cited_paper_id).in_(list(pairs))
+            )
+        )
+        new_pairs = pairs - {tuple(row) for row in result.all()}
+        db.add_all(
+            Citation(citing_paper_id=citing, cited_paper_id=cited, created_at=now)
+            for citing, cited in sorted(new_pairs, key=lambda pair: (str(pair[0]), str(pair[1])))
+        )
+        outcome.edges = len(new_pairs)
+    await db.flush()
+    return outcome
@@ -0,0 +1,292 @@
+"""
+Export renderers (PROJECT_PLAN.md §8, step 10): pure functions from an
+export payload to file bytes, run by export workers off the request path.
+
+The payload is plain JSON gathered by ``app.pipeline.exports``: the
+project title, the run's report parts, the papers passing the export's
+filters and their graph positions. Rendering is deterministic (no
+timestamps, stable ordering), so equal inputs give byte-identical files.
+
+Formats need no third-party packages:
+
+* ``markdown`` — the report, a map of clusters and a bibliography
+* ``latex`` — the same as an ``article`` source with ``thebibliography``
+* ``pdf`` — the same laid out by a small built-in PDF writer (Helvetica,
+  WinAnsi text; characters outside Latin-1 print as "?")
+* ``slides`` — a self-contained HTML deck: introduction, one slide per
+  top-level theme, and the graph layout drawn as SVG
+"""
+from __future__ import annotations
+
+import html
+import re
+import textwrap
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+FORMATS = ("markdown", "latex", "pdf", "slides")
+# Characters of a theme's text shown on its slide
+SLIDE_CHARS = 700
+# Distinct cluster colours on the map, cycled
+PALETTE = ("#4e79a7", "#f28e2b", "#e15759", "#76b7b2", "#59a14f", "#edc948", "#b07aa1")
+
+
+@dataclass(frozen=True)
+class Rendered:
+    data: bytes
+    media_type: str
+    extension: str
+
+
+def _citation(paper: Dict[str, Any]) -> str:
+    authors = ", ".join(paper.get("authors") or []) or "Anonymous"
+    year = f" ({paper['year']})" if paper.get("year") else ""
+    link = f" doi:{paper['doi']}" if paper.get("doi") else ""
+    if not link and paper.get("arxiv_id"):
+        link = f" arXiv:{paper['arxiv_id']}"
+    return f"{authors}{year}. {paper['title']}.{link}"
+
+
+def _filter_note(payload: Dict[str, Any]) -> str:
+    filters = {k: v for k, v in (payload.get("filters") or {}).items() if v is not None}
+    if not filters:
+        return f"All {len(payload['papers'])} papers of the project."
+    shown = ", ".join(f"{k.replace('_', ' ')} {v}" for k, v in sorted(filters.items()))
+    return f"{len(payload['papers'])} papers matching {shown}."
+
+
+def _clusters(payload: Dict[str, Any]) -> List[Tuple[str, int]]:
+    """(label, papers in the export) per cluster, largest first."""
+    counts: Dict[Any, int] = {}
+    for _, _, cluster in payload["nodes"]:
+        counts[cluster] = counts.get(cluster, 0) + 1
+    labels = {c["id"]: c["label"] for c in payload["clusters"]}
+    return sorted(
+        ((labels.get(c, "Unclustered"), n) for c, n in counts.items()),
+        key=lambda item: (-item[1], item[0]),
+    )
+
+
+def _parts(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [p for p in payload["sections"] if p.get("content")]
+
+
+def render_markdown(payload: Dict[str, Any]) -> Rendered:
+    lines = [f"# {payload['title']}", ""]
+    for part in _parts(payload):
+        lines += ["#" * min(part["depth"] + 2, 6) + f" {part['label']}", "", part["content"], ""]
+    lines += ["## Map", "", "| Cluster | Papers |", "| --- | ---: |"]
+    lines += [f"| {label.replace('|', '/')} | {n} |" for label, n in _clusters(payload)]
+    lines += ["", "## References", "", _filter_note(payload), ""]
+    lines += [f"{i}. {_citation(p)}" for i, p in enumerate(payload["papers"], 1)]
+    return Rendered(("\n".join(lines) + "\n").encode(), "text/markdown; charset=utf-8", "md")
+
+
+_LATEX_SPECIAL = {
+    "\\": r"\textbackslash{}",
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    "{": r"\{",
+    "}": r"\}",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+}
+_LATEX_RE = re.compile("|".join(re.escape(c) for c in _LATEX_SPECIAL))
+_LATEX_HEADINGS = ("section", "subsection", "subsubsection", "paragraph", "subparagraph")
+
+
+def latex_escape(text: str) -> str:
+    return _LATEX_RE.sub(lambda m: _LATEX_SPECIAL[m.group()], text)
+
+
+def render_latex(payload: Dict[str, Any]) -> Rendered:
+    lines = [
+        r"\documentclass[11pt]{article}",
+        r"\usepackage[utf8]{inputenc}",
+        r"\usepackage[T1]{fontenc}",
+        rf"\title{{{latex_escape(payload['title'])}}}",
+        r"\date{}",
+        r"\begin{document}",
+        r"\maketitle",
+        "",
+    ]
+    for part in _parts(payload):
+        command = _LATEX_HEADINGS[min(part["depth"], len(_LATEX_HEADINGS) - 1)]
+        star = "*" if part.get("node_id") is None else ""
+        lines += [rf"\{command}{star}{{{latex_escape(part['label'])}}}", ""]
+        lines += [latex_escape(part["content"]), ""]
+    lines += [r"\section*{Map}", r"\begin{tabular}{lr}", r"Cluster & Papers \\ \hline"]
+    lines += [rf"{latex_escape(label)} & {n} \\" for label, n in _clusters(payload)]
+    lines += [r"\end{tabular}", "", latex_escape(_filter_note(payload)), ""]
+    lines.append(r"\begin{thebibliography}{99}")
+    for i, paper in enumerate(payload["papers"], 1):
+        lines.append(rf"\bibitem{{p{i}}} {latex_escape(_citation(paper))}")
+    lines += [r"\end{thebibliography}", r"\end{document}", ""]
+    return Rendered("\n".join(lines).encode(), "application/x-latex", "tex")
+
+
+# -- PDF ----------------------------------------------------------------------
+
+PAGE_WIDTH, PAGE_HEIGHT, MARGIN = 595, 842, 56
+BODY_SIZE, LEADING = 10, 13
+# Helvetica at 10pt fits about this many characters in the text width
+BODY_CHARS = 92
+
+
+def _pdf_text(text: str) -> str:
+    raw = text.encode("cp1252", errors="replace").decode("latin-1")
+    return raw.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _pdf_lines(payload: Dict[str, Any]) -> List[Tuple[str, int, str]]:
+    """(font, size, text) per output line; an empty text is a blank line."""
+    out: List[Tuple[str, int, str]] = [("F2", 18, payload["title"]), ("F1", BODY_SIZE, "")]
+
+    def heading(text: str, size: int) -> None:
+        out.append(("F1", BODY_SIZE, ""))
+        for line in textwrap.wrap(text, int(BODY_CHARS * BODY_SIZE / size)) or [""]:
+            out.append(("F2", size, line))
+
+    def para(text: str, indent: str = "") -> None:
+        for paragraph in text.split("\n"):
+            wrapped = textwrap.wrap(
+                paragraph, BODY_CHARS, initial_indent=indent, subsequent_indent=" " * len(indent)
+            )
+            out.extend(("F1", BODY_SIZE, line) for line in wrapped)
+        out.append(("F1", BODY_SIZE, ""))
+
+    for part in _parts(payload):
+        heading(part["label"], max(16 - 2 * part["depth"], 11))
+        para(part["content"])
+    heading("Map", 14)
+    for label, n in _clusters(payload):
+        para(f"{label}: {n} papers", "- ")
+    heading("References", 14)
+    para(_filter_note(payload))
+    for i, paper in enumerate(payload["papers"], 1):
+        para(_citation(paper), f"[{i}] ")
+    return out
+
+
+def render_pdf(payload: Dict[str, Any]) -> Rendered:
+    pages: List[List[str]] = [[]]
+    y = PAGE_HEIGHT - MARGIN
+    for font, size, text in _pdf_lines(payload):
+        step = max(LEADING, size + 4)
+        if y - step < MARGIN:
+            pages.append([])
+            y = PAGE_HEIGHT - MARGIN
+        y -= step
+        if text:
+            pages[-1].append(f"BT /{font} {size} Tf {MARGIN} {y} Td ({_pdf_text(text)}) Tj ET")
+
+    # Objects: 1 catalog, 2 page tree, 3-4 fonts, then a page and its content per page
+    objects: List[bytes] = [b"", b"", b"", b""]
+    kids = []
+    for index, commands in enumerate(pages):
+        page_id, content_id = 5 + 2 * index, 6 + 2 * index
+        kids.append(f"{page_id} 0 R")
+        stream = "\n".join(commands).encode("latin-1")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> "
+            f"/Contents {content_id} 0 R >>".encode()
+        )
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode()
+    for slot, name in ((2, "Helvetica"), (3, "Helvetica-Bold")):
+        objects[slot] = (
+            f"<< /Type /Font /Subtype /Type1 /BaseFont /{name} "
+            f"/Encoding /WinAnsiEncoding >>".encode()
+        )
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return Rendered(bytes(out), "application/pdf", "pdf")
+
+
+# -- Slides -------------------------------------------------------------------
+
+SLIDES_STYLE = """
+body{margin:0;font-family:system-ui,sans-serif;background:#222}
+section{display:none;box-sizing:border-box;width:100vw;height:100vh;padding:6vh 8vw;
+background:#fff;overflow:hidden}
+section.current{display:block}
+h1{font-size:6vh}h2{font-size:5vh}p,li{font-size:2.6vh;line-height:1.4}
+svg{width:100%;height:70vh}
+"""
+SLIDES_SCRIPT = """
+const slides=[...document.querySelectorAll("section")];let i=0;
+const show=n=>{slides[i].classList.remove("current");i=Math.max(0,Math.min(slides.length-1,n));
+slides[i].classList.add("current")};
+document.addEventListener("keydown",e=>{if(["ArrowRight","PageDown"," "].includes(e.key))show(i+1);
+if(["ArrowLeft","PageUp"].includes(e.key))show(i-1)});
+"""
+
+
+def _map_svg(payload: Dict[str, Any]) -> str:
+    nodes = payload["nodes"]
+    if not nodes:
+        return "<p>No papers to draw.</p>"
+    xs = [x for x, _, _ in nodes]
+    ys = [y for _, y, _ in nodes]
+    x0, y0 = min(xs), min(ys)
+    span = max(max(xs) - x0, max(ys) - y0, 1e-9)
+    radius = max(span / 200, 1e-3)
+    dots = "".join(
+        f'<circle cx="{(x - x0) / span * 1000:.1f}" cy="{(y - y0) / span * 1000:.1f}" '
+        f'r="{radius / span * 1000:.1f}" fill="{PALETTE[(c or 0) % len(PALETTE)]}"/>'
+        for x, y, c in nodes
+    )
+    return f'<svg viewBox="-10 -10 1020 1020" role="img">{dots}</svg>'
+
+
+def render_slides(payload: Dict[str, Any]) -> Rendered:
+    esc = html.escape
+    slides = [f"<h1>{esc(payload['title'])}</h1><p>{esc(_filter_note(payload))}</p>"]
+    for part in _parts(payload):
+        if part["depth"] > 0:
+            continue
+        text = part["content"]
+        if len(text) > SLIDE_CHARS:
+            text = text[:SLIDE_CHARS].rsplit(" ", 1)[0] + " …"
+        slides.append(f"<h2>{esc(part['label'])}</h2><p>{esc(text)}</p>")
+    items = "".join(f"<li>{esc(label)} ({n})</li>" for label, n in _clusters(payload)[:12])
+    slides.append(f"<h2>Map</h2>{_map_svg(payload)}")
+    slides.append(f"<h2>Clusters</h2><ul>{items}</ul>")
+    opening = ['<section class="current">'] + ["<section>"] * (len(slides) - 1)
+    body = "".join(f"{tag}{slide}</section>" for tag, slide in zip(opening, slides))
+    document = (
+        f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        f"<title>{esc(payload['title'])}</title><style>{SLIDES_STYLE}</style></head>"
+        f"<body>{body}<script>{SLIDES_SCRIPT}</script></body></html>\n"
+    )
+    return Rendered(document.encode(), "text/html; charset=utf-8", "html")
+
+
+RENDERERS: Dict[str, Callable[[Dict[str, Any]], Rendered]] = {
+    "markdown": render_markdown,
+    "latex": render_latex,
+    "pdf": render_pdf,
+    "slides": render_slides,
+}
+
+
+def render(fmt: str, payload: Dict[str, Any]) -> Rendered:
+    return RENDERERS[fmt](payload)
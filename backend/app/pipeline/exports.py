@@ -0,0 +1,288 @@
+"""
+Export jobs (PROJECT_PLAN.md §8, step 10): a run's report, map and
+bibliography rendered as Markdown, LaTeX, PDF or slides for the papers
+passing the current Explore filters and the current graph layout.
+
+Rendering can take seconds, so requests only enqueue an ``ExportJob``;
+export workers (``python -m app.worker --export-processes N``) claim jobs
+with ``claim_next_export`` and render them with ``execute_export``, while
+``export_heartbeat`` shows the job is still being worked on. A job whose
+heartbeat goes silent for ``EXPORT_JOB_TIMEOUT`` is claimed again.
+
+A job's ``cache_key`` is the SHA-256 of (run id, filters, layout version,
+format). ``request_export`` returns the existing job for a key unless it
+failed, so exporting the same view twice is served from the first render
+without queueing anything. The rendered file is content-addressed in
+``app.storage`` (``exports/<sha256>.<ext>``).
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.models.export import ExportJob
+from app.models.graph import GraphLayout, GraphNode
+from app.models.paper import Paper, ProjectPaper
+from app.models.project import Project
+from app.models.report import Report, ReportPart, ReportSection
+from app.pipeline.export_render import FORMATS, render
+from app.services.paper_queries import PaperFilter
+from app.storage import Storage, content_key, get_storage
+
+logger = logging.getLogger(__name__)
+
+
+class ExportError(Exception):
+    """The export cannot be requested (unknown format, run without a report)."""
+
+
+def export_key(
+    run_id: uuid.UUID, filters: Dict[str, Any], layout_version: int, fmt: str
+) -> str:
+    """SHA-256 of the export's inputs; filters are compared without their None values."""
+    canonical = json.dumps(
+        [str(run_id), {k: v for k, v in filters.items() if v is not None}, layout_version, fmt],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+async def request_export(
+    db: AsyncSession,
+    project_id: uuid.UUID,
+    run_id: uuid.UUID,
+    fmt: str,
+    flt: PaperFilter,
+) -> Tuple[ExportJob, bool]:
+    """The job for this export and whether it was created; flushes, does not commit.
+
+    A queued, running or completed job with the same key is returned as is.
+    """
+    if fmt not in FORMATS:
+        raise ExportError(f"Unknown export format {fmt!r}")
+    report_status = await db.scalar(
+        select(Report.status).where(Report.run_id == run_id, Report.project_id == project_id)
+    )
+    if report_status != "completed":
+        raise ExportError("The run has no completed report to export")
+
+    filters = {k: v for k, v in asdict(flt).items() if v is not None}
+    layout_version = (
+        await db.scalar(select(GraphLayout.version).where(GraphLayout.project_id == project_id))
+        or 0
+    )
+    key = export_key(run_id, filters, layout_version, fmt)
+    existing = await db.scalar(
+        select(ExportJob)
+        .where(
+            ExportJob.project_id == project_id,
+            ExportJob.cache_key == key,
+            ExportJob.status != "failed",
+        )
+        .order_by(ExportJob.created_at.desc())
+        .limit(1)
+    )
+    if existing is not None:
+        return existing, False
+    job = ExportJob(
+        project_id=project_id,
+        run_id=run_id,
+        format=fmt,
+        filters=filters,
+        layout_version=layout_version,
+        cache_key=key,
+        status="queued",
+    )
+    db.add(job)
+    await db.flush()
+    return job, True
+
+
+async def claim_next_export(
+    db: AsyncSession, worker_id: str, timeout: Optional[timedelta] = None
+) -> Optional[ExportJob]:
+    """Claim the oldest queued job, or one whose worker stopped heart-beating; commits.
+
+    Returns None when there is nothing to render.
+    """
+    if timeout is None:
+        timeout = timedelta(seconds=settings.export_job_timeout)
+    cutoff = datetime.utcnow() - timeout
+    job = await db.scalar(
+        select(ExportJob)
+        .where(
+            or_(
+                ExportJob.status == "queued",
+                and_(ExportJob.status == "running", ExportJob.heartbeat_at < cutoff),
+            )
+        )
+        .order_by(ExportJob.created_at, ExportJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    if job is None:
+        await db.rollback()
+        return None
+    if job.status == "running":
+        logger.warning("Reclaiming export %s from worker %s", job.id, job.worker_id)
+    job.status = "running"
+    job.worker_id = worker_id
+    job.started_at = job.heartbeat_at = datetime.utcnow()
+    await db.commit()
+    return job
+
+
+@asynccontextmanager
+async def export_heartbeat(
+    session_factory: async_sessionmaker,
+    job_id: uuid.UUID,
+    worker_id: str,
+    interval: Optional[float] = None,
+) -> AsyncIterator[None]:
+    """Refresh the job's heartbeat in the background while ``worker_id`` holds it."""
+    interval = settings.export_heartbeat_interval if interval is None else interval
+
+    stop = asyncio.Event()
+
+    async def beat() -> None:
+        while True:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                async with session_factory() as db:
+                    # Once another worker has reclaimed the job, stop vouching for it
+                    await db.execute(
+                        update(ExportJob)
+                        .where(
+                            ExportJob.id == job_id,
+                            ExportJob.worker_id == worker_id,
+                            ExportJob.status == "running",
+                        )
+                        .values(heartbeat_at=datetime.utcnow())
+                    )
+                    await db.commit()
+            except Exception:
+                logger.exception("Heartbeat for export %s failed", job_id)
+
+    task = asyncio.create_task(beat())
+    try:
+        yield
+    finally:
+        stop.set()
+        await task
+
+
+async def gather_payload(db: AsyncSession, job: ExportJob) -> Dict[str, Any]:
+    """The renderer input: report parts, filtered papers and their positions."""
+    title = await db.scalar(select(Project.name).where(Project.id == job.project_id))
+    parts = await db.execute(
+        select(ReportPart.depth, ReportPart.label, ReportPart.node_id, ReportSection.content)
+        .outerjoin(
+            ReportSection,
+            and_(
+                ReportSection.project_id == job.project_id,
+                ReportSection.key == ReportPart.section_key,
+            ),
+        )
+        .where(ReportPart.run_id == job.run_id)
+        .order_by(ReportPart.position)
+    )
+
+    flt = PaperFilter(**job.filters)
+    dialect = db.bind.dialect.name
+    rows = await db.execute(
+        select(Paper.title, Paper.authors, Paper.year, Paper.doi, Paper.arxiv_id)
+        .join(ProjectPaper, ProjectPaper.paper_id == Paper.id)
+        .where(ProjectPaper.project_id == job.project_id, *flt.conditions(dialect))
+        .order_by(Paper.year.nulls_last(), Paper.title, Paper.id)
+    )
+    papers = [dict(row) for row in rows.mappings()]
+
+    nodes = []
+    clusters = []
+    layout = await db.get(GraphLayout, job.project_id)
+    if layout is not None and papers:
+        positions = await db.execute(
+            select(GraphNode.x, GraphNode.y, GraphNode.cluster)
+            .join(
+                ProjectPaper,
+                and_(
+                    ProjectPaper.project_id == GraphNode.project_id,
+                    ProjectPaper.paper_id == GraphNode.paper_id,
+                ),
+            )
+            .join(Paper, Paper.id == GraphNode.paper_id)
+            .where(GraphNode.project_id == job.project_id, *flt.conditions(dialect))
+            .order_by(GraphNode.x, GraphNode.y)
+        )
+        nodes = [list(row) for row in positions]
+        clusters = layout.clusters
+    return {
+        "title": title or "Untitled project",
+        "filters": job.filters,
+        "layout_version": job.layout_version,
+        "sections": [dict(row) for row in parts.mappings()],
+        "clusters": clusters,
+        "nodes": nodes,
+        "papers": papers,
+    }
+
+
+def _write_scratch(data: bytes) -> Path:
+    fd, name = tempfile.mkstemp(prefix="export-")
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(data)
+    return Path(name)
+
+
+async def execute_export(
+    db: AsyncSession, job: ExportJob, storage: Optional[Storage] = None
+) -> ExportJob:
+    """Render a claimed job and store the file; commits, marking it completed or failed."""
+    storage = storage or get_storage()
+    job_id = job.id
+    try:
+        payload = await gather_payload(db, job)
+        rendered = await asyncio.to_thread(render, job.format, payload)
+        digest = hashlib.sha256(rendered.data).hexdigest()
+        path = await asyncio.to_thread(_write_scratch, rendered.data)
+        key = content_key("exports", digest, "." + rendered.extension)
+        await storage.put_file(key, path)
+    except Exception as exc:
+        logger.exception("Export %s failed", job_id)
+        await db.rollback()
+        # The rollback expired the job; load it again before marking it
+        job = await db.get(ExportJob, job_id)
+        job.status = "failed"
+        job.error = str(exc) or type(exc).__name__
+        job.completed_at = datetime.utcnow()
+        await db.commit()
+        return job
+    job.storage_key = key
+    job.content_hash = digest
+    job.media_type = rendered.media_type
+    job.filename = f"report-{str(job.run_id)[:8]}.{rendered.extension}"
+    job.size_bytes = len(rendered.data)
+    job.status = "completed"
+    job.error = None
+    job.completed_at = datetime.utcnow()
+    await db.commit()
+    return job
@@ -0,0 +1,504 @@
+"""
+Paper graph and its layout (PROJECT_PLAN.md §8, step 7), computed once per
+run on the server so every client sees the same picture.
+
+Edges join each paper to its ``neighbors`` most similar papers within the
+same taxonomy leaf, if the cosine similarity is at least ``min_similarity``.
+Citations between project papers are added as well. Restricting the
+similarity search to leaves keeps it near-linear in the number of papers.
+
+The first layout of a project is computed in two levels, with a fixed seed:
+
+* Leaf clusters are placed by classical MDS on their centroid distances,
+  each given a disc of radius proportional to sqrt(size), and pushed apart
+  until the discs do not overlap.
+* Within its disc, a cluster's papers start from a 2-D PCA of their
+  embeddings and are refined by a vectorised force-directed pass
+  (Fruchterman-Reingold). Repulsion is exact for small clusters and
+  sampled for large ones.
+
+Later runs keep every stored coordinate. Only papers without one are placed:
+at the weighted mean of their already-placed neighbours, then relaxed for a
+few iterations with everyone else held fixed. ``graph_relayout`` in the run
+config forces a fresh layout. Coordinates live in ``graph_nodes``, edges in
+``graph_edges``, and ``graph_layouts.version`` changes whenever coordinates
+do. Each node also stores its cell in a uniform grid over the layout, which
+``app.services.graph_view`` uses to answer viewport queries.
+"""
+from __future__ import annotations
+
+import asyncio
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.citation import Citation
+from app.models.graph import GraphEdge, GraphLayout, GraphNode
+from app.models.paper import ProjectPaper
+from app.pipeline.taxonomy import load_taxonomy
+from app.services.artifacts import get_artifact, load_array, read_table
+from app.services.graph_view import cluster_edge_counts, grid_cell_size, grid_cells
+from app.storage import Storage
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Exact all-pairs repulsion up to this many nodes; sampled above it
+EXACT_REPULSION = 1024
+REPULSION_SAMPLE = 256
+# Distance between neighbouring papers in layout units
+SPACING = 1.0
+# Gap between cluster discs, as a fraction of the smaller radius
+CLUSTER_GAP = 0.25
+RELAX_ITERATIONS = 20
+CHUNK_ROWS = 2048
+INSERT_BATCH = 5000
+
+
+@dataclass
+class GraphOptions:
+    neighbors: int
+    min_similarity: float
+    iterations: int
+    seed: int
+    relayout: bool = False
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "GraphOptions":
+        """Options from a run's ``config_snapshot``, defaulting to settings."""
+        return cls(
+            neighbors=max(1, int(config.get("graph_neighbors", settings.graph_neighbors))),
+            min_similarity=float(
+                config.get("graph_min_similarity", settings.graph_min_similarity)
+            ),
+            iterations=max(0, int(config.get("graph_iterations", settings.graph_iterations))),
+            seed=int(config.get("graph_seed", settings.graph_seed)),
+            relayout=bool(config.get("graph_relayout", False)),
+        )
+
+
+@dataclass
+class GraphSummary:
+    nodes: int
+    edges: int
+    # Papers given a position by this run (all of them on a full layout)
+    placed: int
+    layout_version: int
+
+
+def similarity_edges(
+    matrix: "np.ndarray", groups: Sequence["np.ndarray"], neighbors: int, min_similarity: float
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Top-``neighbors`` cosine edges within each group of rows, as (src, dst, weight).
+
+    Undirected and deduplicated: ``src < dst``, keeping the larger weight.
+    """
+    import numpy as np
+
+    pairs: List[np.ndarray] = []
+    weights: List[np.ndarray] = []
+    for rows in groups:
+        if len(rows) < 2:
+            continue
+        vectors = np.asarray(matrix[rows], dtype=np.float32)
+        k = min(neighbors, len(rows) - 1)
+        for start in range(0, len(rows), CHUNK_ROWS):
+            scores = vectors[start : start + CHUNK_ROWS] @ vectors.T
+            local = np.arange(start, start + len(scores))
+            scores[np.arange(len(scores)), local] = -np.inf
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            keep = top_scores >= min_similarity
+            src = rows[np.broadcast_to(local[:, None], top.shape)[keep]]
+            dst = rows[top[keep]]
+            pairs.append(np.stack([np.minimum(src, dst), np.maximum(src, dst)], axis=1))
+            weights.append(top_scores[keep])
+    if not pairs:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0, dtype=np.float32)
+    pair = np.concatenate(pairs)
+    weight = np.concatenate(weights).astype(np.float32)
+    # Highest weight first, then keep the first occurrence of each pair
+    order = np.lexsort((-weight, pair[:, 1], pair[:, 0]))
+    pair, weight = pair[order], weight[order]
+    first = np.ones(len(pair), dtype=bool)
+    first[1:] = np.any(pair[1:] != pair[:-1], axis=1)
+    return pair[first, 0], pair[first, 1], weight[first]
+
+
+def _mds(centroids: "np.ndarray") -> "np.ndarray":
+    """Classical MDS of the centroids' cosine distances into 2-D."""
+    import numpy as np
+
+    k = len(centroids)
+    if k == 1:
+        return np.zeros((1, 2))
+    distance = np.clip(1.0 - centroids @ centroids.T, 0.0, 2.0).astype(np.float64)
+    centering = np.eye(k) - 1.0 / k
+    gram = -0.5 * centering @ (distance**2) @ centering
+    values, vectors = np.linalg.eigh(gram)
+    top = np.argsort(values)[::-1][:2]
+    coords = vectors[:, top] * np.sqrt(np.maximum(values[top], 1e-12))
+    if coords.shape[1] < 2:
+        coords = np.hstack([coords, np.zeros((k, 1))])
+    # eigh's sign is arbitrary; fix it so the layout is reproducible
+    signs = np.sign(coords[np.argmax(np.abs(coords), axis=0), [0, 1]])
+    return coords * np.where(signs == 0, 1, signs)
+
+
+def _separate(centers: "np.ndarray", radii: "np.ndarray", iterations: int = 200) -> "np.ndarray":
+    """Push discs apart until none overlap (or ``iterations`` run out)."""
+    import numpy as np
+
+    centers = centers.copy()
+    order = np.arange(len(centers))
+    for _ in range(iterations):
+        delta = centers[:, None, :] - centers[None, :, :]
+        dist = np.linalg.norm(delta, axis=2)
+        np.fill_diagonal(dist, np.inf)
+        needed = radii[:, None] + radii[None, :] + CLUSTER_GAP * np.minimum(
+            radii[:, None], radii[None, :]
+        )
+        overlap = np.maximum(needed - dist, 0.0)
+        np.fill_diagonal(overlap, 0.0)
+        if not overlap.any():
+            break
+        direction = delta / np.maximum(dist, 1e-9)[:, :, None]
+        # Coincident centres separate along x, in opposite directions
+        coincident = dist < 1e-9
+        direction[coincident] = 0.0
+        direction[..., 0] += coincident * np.sign(order[:, None] - order[None, :])
+        centers += 0.5 * (overlap[:, :, None] * direction).sum(axis=1)
+    return centers
+
+
+def _pca_2d(vectors: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    centered = vectors - vectors.mean(axis=0)
+    if len(vectors) < 2:
+        return np.zeros((len(vectors), 2))
+    values, axes = np.linalg.eigh(centered.T.astype(np.float64) @ centered)
+    coords = centered @ axes[:, ::-1][:, :2]
+    signs = np.sign(coords[np.argmax(np.abs(coords), axis=0), [0, 1]])
+    return coords * np.where(signs == 0, 1, signs)
+
+
+def force_layout(
+    pos: "np.ndarray",
+    src: "np.ndarray",
+    dst: "np.ndarray",
+    weight: "np.ndarray",
+    *,
+    movable: "np.ndarray",
+    ideal: float,
+    iterations: int,
+    rng: "np.random.Generator",
+) -> "np.ndarray":
+    """Fruchterman-Reingold over ``pos``; only rows where ``movable`` move."""
+    import numpy as np
+
+    pos = pos.astype(np.float64, copy=True)
+    n = len(pos)
+    if n < 2 or iterations <= 0 or not movable.any():
+        return pos
+    moving = np.flatnonzero(movable)
+    for step in range(iterations):
+        disp = np.zeros_like(pos)
+        if n <= EXACT_REPULSION:
+            others, scale = pos, 1.0
+        else:
+            others = pos[rng.choice(n, size=REPULSION_SAMPLE, replace=False)]
+            scale = n / REPULSION_SAMPLE
+        delta = pos[moving, None, :] - others[None, :, :]
+        dist2 = np.maximum((delta**2).sum(axis=2), 1e-6)
+        disp[moving] = scale * (ideal**2 * delta / dist2[:, :, None]).sum(axis=1)
+
+        if len(src):
+            edge = pos[src] - pos[dst]
+            length = np.sqrt(np.maximum((edge**2).sum(axis=1), 1e-12))
+            pull = (weight * length / ideal)[:, None] * edge
+            np.add.at(disp, src, -pull)
+            np.add.at(disp, dst, pull)
+
+        # Linear cooling from one ideal length down to a tenth of it
+        temperature = ideal * (1.0 - 0.9 * step / max(iterations - 1, 1))
+        length = np.linalg.norm(disp[moving], axis=1, keepdims=True)
+        pos[moving] += disp[moving] / np.maximum(length, 1e-9) * np.minimum(length, temperature)
+    return pos
+
+
+def layout_full(
+    matrix: "np.ndarray",
+    groups: Sequence["np.ndarray"],
+    src: "np.ndarray",
+    dst: "np.ndarray",
+    weight: "np.ndarray",
+    options: GraphOptions,
+) -> "np.ndarray":
+    """Coordinates for every row of ``matrix``, clusters first, then papers."""
+    import numpy as np
+
+    rng = np.random.default_rng(options.seed)
+    n = matrix.shape[0]
+    pos = np.zeros((n, 2))
+    groups = [g for g in groups if len(g)]
+    if not groups:
+        return pos
+    centroids = np.stack([np.asarray(matrix[g], dtype=np.float32).mean(axis=0) for g in groups])
+    centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+    radii = SPACING * np.sqrt(np.array([len(g) for g in groups], dtype=np.float64))
+    coords = _mds(centroids)
+    # Spread MDS coordinates to roughly the scale of the discs before separating
+    coords *= radii.sum() / max(np.abs(coords).max(), 1e-9)
+    centers = _separate(coords, radii)
+
+    cluster = np.full(n, -1, dtype=np.int64)
+    for index, rows in enumerate(groups):
+        cluster[rows] = index
+    internal = cluster[src] == cluster[dst]
+    # Row -> position within its cluster, to renumber edge endpoints
+    local_index = np.zeros(n, dtype=np.int64)
+    for rows in groups:
+        local_index[rows] = np.arange(len(rows))
+    for index, rows in enumerate(groups):
+        local = _pca_2d(np.asarray(matrix[rows], dtype=np.float32))
+        local += rng.normal(scale=1e-3, size=local.shape)
+        local *= radii[index] / max(np.linalg.norm(local, axis=1).max(), 1e-9)
+        member = internal & (cluster[src] == index)
+        local = force_layout(
+            local,
+            local_index[src[member]],
+            local_index[dst[member]],
+            weight[member],
+            movable=np.ones(len(rows), dtype=bool),
+            ideal=SPACING,
+            iterations=options.iterations,
+            rng=rng,
+        )
+        local -= local.mean(axis=0)
+        local *= radii[index] / max(np.linalg.norm(local, axis=1).max(), 1e-9)
+        pos[rows] = centers[index] + local
+    return pos
+
+
+def place_new(
+    pos: "np.ndarray",
+    placed: "np.ndarray",
+    groups: Sequence["np.ndarray"],
+    src: "np.ndarray",
+    dst: "np.ndarray",
+    weight: "np.ndarray",
+    options: GraphOptions,
+) -> "np.ndarray":
+    """Fill in the rows of ``pos`` where ``placed`` is False; others never move."""
+    import numpy as np
+
+    rng = np.random.default_rng(options.seed)
+    pos = pos.astype(np.float64, copy=True)
+    new = np.flatnonzero(~placed)
+    if not len(new):
+        return pos
+
+    # Weighted mean of already-placed neighbours
+    totals = np.zeros((len(pos), 2))
+    mass = np.zeros(len(pos))
+    for a, b in ((src, dst), (dst, src)):
+        known = placed[b] & ~placed[a]
+        np.add.at(totals, a[known], weight[known, None] * pos[b[known]])
+        np.add.at(mass, a[known], weight[known])
+
+    cluster = np.full(len(pos), -1, dtype=np.int64)
+    for index, rows in enumerate(groups):
+        cluster[rows] = index
+    if placed.any():
+        lo, hi = pos[placed].min(axis=0), pos[placed].max(axis=0)
+    else:
+        lo, hi = np.zeros(2), np.zeros(2)
+    outer = 0.5 * np.linalg.norm(hi - lo) + SPACING
+    middle = (lo + hi) / 2
+
+    for row in new:
+        if mass[row] > 0:
+            pos[row] = totals[row] / mass[row]
+        else:
+            mates = groups[cluster[row]] if cluster[row] >= 0 else new[:0]
+            mates = mates[placed[mates]]
+            if len(mates):
+                pos[row] = pos[mates].mean(axis=0)
+            else:
+                # Nothing to anchor on: a ring just outside the current layout
+                angle = rng.uniform(0, 2 * np.pi)
+                pos[row] = middle + outer * np.array([np.cos(angle), np.sin(angle)])
+        pos[row] += rng.normal(scale=0.1 * SPACING, size=2)
+
+    # Relax the new nodes among their neighbourhood, everyone else pinned
+    touched = np.zeros(len(pos), dtype=bool)
+    touched[new] = True
+    near = ~placed[src] | ~placed[dst]
+    touched[src[near]] = True
+    touched[dst[near]] = True
+    rows = np.flatnonzero(touched)
+    lookup = np.full(len(pos), -1, dtype=np.int64)
+    lookup[rows] = np.arange(len(rows))
+    local = force_layout(
+        pos[rows],
+        lookup[src[near]],
+        lookup[dst[near]],
+        weight[near],
+        movable=~placed[rows],
+        ideal=SPACING,
+        iterations=min(options.iterations, RELAX_ITERATIONS),
+        rng=rng,
+    )
+    pos[rows] = local
+    return pos
+
+
+async def build_graph(
+    db: AsyncSession,
+    project_id: uuid.UUID,
+    run_id: uuid.UUID,
+    options: GraphOptions,
+    *,
+    storage: Optional[Storage] = None,
+) -> GraphSummary:
+    """Recompute the project's edges and place its papers; store both."""
+    import numpy as np
+
+    embeddings = await get_artifact(db, run_id, "embeddings")
+    index = await get_artifact(db, run_id, "embedding_index")
+    taxonomy = await load_taxonomy(db, run_id, storage)
+    if embeddings is None or index is None or taxonomy is None:
+        raise RuntimeError("graph needs the run's embeddings and taxonomy artifacts")
+    matrix = await load_array(embeddings, storage)
+    paper_ids = [row["paper_id"] for row in await read_table(index, storage)]
+    row_of = {pid: i for i, pid in enumerate(paper_ids)}
+
+    leaves = [node for node in taxonomy if not node.children and node.paper_ids]
+    groups = [np.array([row_of[p] for p in leaf.paper_ids], dtype=np.int64) for leaf in leaves]
+    cluster_of = np.full(len(paper_ids), -1, dtype=np.int64)
+    for leaf, rows in zip(leaves, groups):
+        cluster_of[rows] = leaf.id
+
+    src, dst, weight = await asyncio.to_thread(
+        similarity_edges, matrix, groups, options.neighbors, options.min_similarity
+    )
+    kind = np.zeros(len(src), dtype=np.int8)
+
+    project_papers = select(ProjectPaper.paper_id).where(ProjectPaper.project_id == project_id)
+    result = await db.execute(
+        select(Citation.citing_paper_id, Citation.cited_paper_id).where(
+            Citation.citing_paper_id.in_(project_papers),
+            Citation.cited_paper_id.in_(project_papers),
+        )
+    )
+    cited = [
+        (row_of[str(a)], row_of[str(b)])
+        for a, b in result
+        if str(a) in row_of and str(b) in row_of and a != b
+    ]
+    if cited:
+        pairs = np.array(cited, dtype=np.int64)
+        pairs = np.unique(np.sort(pairs, axis=1), axis=0)
+        existing = {(int(a), int(b)) for a, b in zip(src, dst)}
+        extra = np.array([(a, b) not in existing for a, b in pairs.tolist()], dtype=bool)
+        # A cited pair that is also similar keeps one edge, marked as a citation
+        is_cited = np.isin(src * len(paper_ids) + dst, pairs[:, 0] * len(paper_ids) + pairs[:, 1])
+        kind[is_cited] = 1
+        weight[is_cited] = 1.0
+        src = np.concatenate([src, pairs[extra, 0]])
+        dst = np.concatenate([dst, pairs[extra, 1]])
+        weight = np.concatenate([weight, np.ones(int(extra.sum()), dtype=np.float32)])
+        kind = np.concatenate([kind, np.ones(int(extra.sum()), dtype=np.int8)])
+
+    result = await db.execute(
+        select(GraphNode.paper_id, GraphNode.x, GraphNode.y).where(
+            GraphNode.project_id == project_id
+        )
+    )
+    stored = {str(pid): (x, y) for pid, x, y in result}
+    pos = np.zeros((len(paper_ids), 2))
+    placed = np.zeros(len(paper_ids), dtype=bool)
+    if not options.relayout:
+        for pid, xy in stored.items():
+            row = row_of.get(pid)
+            if row is not None:
+                pos[row] = xy
+                placed[row] = True
+
+    if placed.any():
+        pos = await asyncio.to_thread(place_new, pos, placed, groups, src, dst, weight, options)
+    else:
+        pos = await asyncio.to_thread(layout_full, matrix, groups, src, dst, weight, options)
+    newly_placed = int((~placed).sum())
+    removed = len(set(stored) - set(row_of))
+
+    cell_size = grid_cell_size(pos)
+    cells = grid_cells(pos, cell_size)
+
+    await db.execute(delete(GraphNode).where(GraphNode.project_id == project_id))
+    await db.execute(delete(GraphEdge).where(GraphEdge.project_id == project_id))
+    node_rows = [
+        {
+            "project_id": project_id,
+            "paper_id": uuid.UUID(pid),
+            "x": float(pos[i, 0]),
+            "y": float(pos[i, 1]),
+            "cluster": int(cluster_of[i]) if cluster_of[i] >= 0 else None,
+            "cell_x": int(cells[i, 0]),
+            "cell_y": int(cells[i, 1]),
+        }
+        for i, pid in enumerate(paper_ids)
+    ]
+    for start in range(0, len(node_rows), INSERT_BATCH):
+        await db.execute(insert(GraphNode), node_rows[start : start + INSERT_BATCH])
+    kinds = ("similar", "cites")
+    edge_rows = [
+        {
+            "project_id": project_id,
+            "source_id": uuid.UUID(paper_ids[a]),
+            "target_id": uuid.UUID(paper_ids[b]),
+            "weight": float(w),
+            "kind": kinds[k],
+        }
+        for a, b, w, k in zip(src.tolist(), dst.tolist(), weight.tolist(), kind.tolist())
+    ]
+    for start in range(0, len(edge_rows), INSERT_BATCH):
+        await db.execute(insert(GraphEdge), edge_rows[start : start + INSERT_BATCH])
+
+    layout = await db.get(GraphLayout, project_id)
+    if layout is None:
+        layout = GraphLayout(project_id=project_id, version=0)
+        db.add(layout)
+    if newly_placed or removed or not stored:
+        layout.version += 1
+    layout.run_id = run_id
+    layout.seed = options.seed
+    layout.node_count = len(paper_ids)
+    layout.edge_count = len(edge_rows)
+    layout.clusters = [
+        {
+            "id": leaf.id,
+            "label": leaf.label,
+            "size": len(rows),
+            "x": float(pos[rows, 0].mean()),
+            "y": float(pos[rows, 1].mean()),
+        }
+        for leaf, rows in zip(leaves, groups)
+    ]
+    layout.cluster_edges = cluster_edge_counts(cluster_of, src, dst)
+    layout.cell_size = cell_size
+    layout.updated_at = datetime.utcnow()
+    await db.flush()
+    return GraphSummary(
+        nodes=len(paper_ids),
+        edges=len(edge_rows),
+        placed=newly_placed,
+        layout_version=layout.version,
+    )
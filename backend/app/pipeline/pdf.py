@@ -0,0 +1,148 @@
+"""
+PDF parsing stage (pipeline step 2).
+
+Extraction is CPU-bound, so it runs in a ``ProcessPoolExecutor`` sized to
+the machine's cores and never on the event loop. Each file has a timeout;
+a worker that hangs or crashes takes the pool down with it, so the pool is
+recycled and the other in-flight files are retried once on a fresh pool.
+Only the file that actually misbehaves ends up failed.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import uuid
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Union
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.document import PaperDocument
+from app.pipeline.pdf_extract import extract
+from app.storage import get_storage
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+
+class ParseError(Exception):
+    pass
+
+
+class PdfParsePool:
+    def __init__(self, max_workers: Optional[int] = None, timeout: float = 60.0) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Imported here: multiprocessing is only needed once a PDF arrives.
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # spawn: forking a process that runs an event loop and DB pool threads is unsafe.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def _recycle(self, pool: ProcessPoolExecutor) -> None:
+        if self._pool is not pool:
+            return  # another task already replaced it
+        self._pool = None
+        # ProcessPoolExecutor has no public way to stop a running task; kill the
+        # workers so a hung parse can't hold a core forever.
+        for process in list(getattr(pool, "_processes", {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def parse(self, path: str, *, retry: bool = True) -> Dict[str, Any]:
+        from concurrent.futures.process import BrokenProcessPool
+
+        loop = asyncio.get_running_loop()
+        pool = self._executor()
+        try:
+            future = loop.run_in_executor(pool, extract, path)
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            self._recycle(pool)
+            raise ParseError(f"Timed out after {self.timeout:g}s")
+        except BrokenProcessPool:
+            self._recycle(pool)
+            if retry:
+                # Most likely another file crashed the pool; try once more.
+                return await self.parse(path, retry=False)
+            raise ParseError("Parser process crashed")
+        except ImportError:
+            raise ParseError("PDF support not installed: pip install 'lrweb-backend[pdf]'")
+        except Exception as exc:
+            raise ParseError(f"{type(exc).__name__}: {exc}") from exc
+
+    async def parse_many(
+        self, paths: Sequence[str]
+    ) -> List[Union[Dict[str, Any], ParseError]]:
+        return await asyncio.gather(*(self.parse(p) for p in paths), return_exceptions=True)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_parse_pool: Optional[PdfParsePool] = None
+
+
+def get_parse_pool() -> PdfParsePool:
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = PdfParsePool(settings.pdf_workers or None, settings.pdf_parse_timeout)
+    return _parse_pool
+
+
+def shutdown_parse_pool() -> None:
+    if _parse_pool is not None:
+        _parse_pool.shutdown()
+
+
+def apply_result(document: PaperDocument, result: Union[Dict[str, Any], BaseException]) -> None:
+    document.parsed_at = datetime.utcnow()
+    if isinstance(result, BaseException):
+        document.status = "failed"
+        document.error = str(result)
+        return
+    document.status = "parsed"
+    document.error = None
+    document.page_count = result["page_count"]
+    # Postgres text columns reject NUL bytes, which some PDFs emit.
+    document.text = result["text"].replace("\x00", "")
+    document.sections = result["sections"]
+    document.references = result["references"]
+
+
+async def parse_documents(
+    db: AsyncSession, documents: Sequence[PaperDocument], pool: PdfParsePool
+) -> None:
+    storage = get_storage()
+    paths = [str(await storage.local_path(d.storage_key)) for d in documents]
+    results = await pool.parse_many(paths)
+    for document, result in zip(documents, results):
+        apply_result(document, result)
+    await db.flush()
+
+
+async def parse_pending_documents(
+    db: AsyncSession,
+    pool: PdfParsePool,
+    paper_ids: Optional[Sequence[uuid.UUID]] = None,
+) -> int:
+    """Parse every pending document (optionally only for ``paper_ids``)."""
+    query = select(PaperDocument).where(PaperDocument.status == "pending")
+    if paper_ids is not None:
+        query = query.where(PaperDocument.paper_id.in_(paper_ids))
+    documents = list((await db.execute(query)).scalars().all())
+    if documents:
+        await parse_documents(db, documents, pool)
+    return len(documents)
@@ -0,0 +1,85 @@
+"""
+CPU-bound PDF extraction, executed inside parse worker processes.
+
+Deliberately free of app imports so spawned workers start fast. Files are
+memory-mapped read-only, so the parser pages bytes in on demand instead of
+copying whole PDFs into each worker's heap.
+"""
+from __future__ import annotations
+
+import mmap
+import re
+from typing import Any, Dict, List
+
+_KNOWN_HEADINGS = (
+    "abstract|introduction|background|related work|preliminaries|method|methods|methodology"
+    "|approach|experiments?|experimental setup|evaluation|results|discussion|limitations"
+    "|conclusions?|acknowledge?ments|references|bibliography|appendix"
+)
+_HEADING_RE = re.compile(
+    rf"^(?:(?:\d+(?:\.\d+)*|[IVX]+)\.?\s+)?(?:{_KNOWN_HEADINGS})\b.{{0,60}}$", re.IGNORECASE
+)
+_NUMBERED_HEADING_RE = re.compile(r"^\d+(?:\.\d+)*\.?\s+[A-Z][^.!?]{1,80}$")
+_REFERENCES_RE = re.compile(r"^(?:references|bibliography)$", re.IGNORECASE)
+_BRACKET_REF_RE = re.compile(r"(?:^|\s)\[\d+\]\s+")
+_NUMBERED_REF_RE = re.compile(r"^\d+\.\s+", re.MULTILINE)
+
+MAX_REFERENCES = 1000
+
+
+def split_sections(text: str) -> List[Dict[str, str]]:
+    """Split on recognised headings; text before the first heading is "Front matter"."""
+    sections: List[Dict[str, Any]] = [{"title": "Front matter", "lines": []}]
+    in_references = False
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        # Reference entries often start with a number; only "Appendix" ends them.
+        is_heading = _HEADING_RE.match(line) is not None or (
+            not in_references and _NUMBERED_HEADING_RE.match(line) is not None
+        )
+        if in_references and not line.lower().startswith("appendix"):
+            is_heading = False
+        if is_heading:
+            sections.append({"title": line, "lines": []})
+            in_references = _REFERENCES_RE.match(line) is not None
+        else:
+            sections[-1]["lines"].append(line)
+    return [
+        {"title": s["title"], "text": "\n".join(s["lines"])}
+        for s in sections
+        if s["lines"] or s["title"] != "Front matter"
+    ]
+
+
+def extract_references(sections: List[Dict[str, str]]) -> List[str]:
+    body = next((s["text"] for s in sections if _REFERENCES_RE.match(s["title"])), "")
+    if not body:
+        return []
+    if _BRACKET_REF_RE.search(body):
+        entries = _BRACKET_REF_RE.split(body)
+    elif _NUMBERED_REF_RE.search(body):
+        entries = _NUMBERED_REF_RE.split(body)
+    else:
+        entries = body.split("\n")
+    cleaned = [" ".join(entry.split()) for entry in entries]
+    return [entry for entry in cleaned if entry][:MAX_REFERENCES]
+
+
+def extract(path: str) -> Dict[str, Any]:
+    from pypdf import PdfReader
+
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        reader = PdfReader(mapped)
+        pages = [page.extract_text() or "" for page in reader.pages]
+        # Drop parser references into the map before it is closed.
+        del reader
+    text = "\n\n".join(pages)
+    sections = split_sections(text)
+    return {
+        "page_count": len(pages),
+        "text": text,
+        "sections": sections,
+        "references": extract_references(sections),
+    }
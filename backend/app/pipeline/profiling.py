@@ -0,0 +1,177 @@
+"""
+Per-stage performance accounting for pipeline runs (PROJECT_PLAN.md §12).
+
+``profile_stage`` wraps one stage and measures wall time, CPU time, peak
+RSS and database time. Code running inside the stage reports LLM usage and
+cache lookups through ``record_llm_usage`` / ``record_cache``; the active
+stage is found through a context variable, so callers never thread a
+profiler object through. Outside a stage those calls are no-ops.
+
+CPU time and RSS are process-wide: concurrent runs in one process blur each
+other's numbers, and work done in PDF parser processes is not included.
+
+With ``sample=True`` a background thread also samples the stage's Python
+stack every few milliseconds and keeps the most frequent stacks in folded
+("a;b;c count") form, ready for a flame graph.
+"""
+from __future__ import annotations
+
+import os
+import resource
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Interval of the RSS watcher thread.
+RSS_INTERVAL = 0.05
+# Stack frames kept per sample, and distinct stacks kept per stage.
+MAX_STACK_DEPTH = 40
+TOP_STACKS = 50
+
+
+@dataclass
+class StageMetrics:
+    stage: str
+    started_at: datetime
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_bytes: int = 0
+    db_seconds: float = 0.0
+    db_statements: int = 0
+    llm_calls: int = 0
+    llm_prompt_tokens: int = 0
+    llm_completion_tokens: int = 0
+    # cache name -> {"hits": n, "misses": n}
+    cache: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    # Sampling profiler output, when requested
+    samples: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+_current: ContextVar[Optional[StageMetrics]] = ContextVar("stage_metrics", default=None)
+
+
+def current_stage() -> Optional[StageMetrics]:
+    return _current.get()
+
+
+def record_llm_usage(calls: int = 1, prompt_tokens: int = 0, completion_tokens: int = 0) -> None:
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.llm_calls += calls
+        metrics.llm_prompt_tokens += prompt_tokens
+        metrics.llm_completion_tokens += completion_tokens
+
+
+def record_cache(name: str, hits: int = 0, misses: int = 0) -> None:
+    metrics = _current.get()
+    if metrics is not None:
+        counts = metrics.cache.setdefault(name, {"hits": 0, "misses": 0})
+        counts["hits"] += hits
+        counts["misses"] += misses
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("stage_query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    metrics = _current.get()
+    starts = conn.info.get("stage_query_start")
+    if metrics is not None and starts:
+        metrics.db_seconds += time.perf_counter() - starts.pop()
+        metrics.db_statements += 1
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # Not Linux: fall back to the lifetime peak (KiB on Linux, bytes on macOS).
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _Watcher(threading.Thread):
+    """Polls RSS (and optionally the stage thread's stack) until stopped."""
+
+    def __init__(self, target_thread: int, sample_interval: Optional[float]) -> None:
+        super().__init__(name="stage-profiler", daemon=True)
+        self.target_thread = target_thread
+        self.sample_interval = sample_interval
+        self.peak_rss = current_rss()
+        self.stacks: Counter = Counter()
+        self.sample_count = 0
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        interval = self.sample_interval or RSS_INTERVAL
+        next_rss = 0.0
+        while not self._done.wait(interval):
+            now = time.perf_counter()
+            if now >= next_rss:
+                self.peak_rss = max(self.peak_rss, current_rss())
+                next_rss = now + RSS_INTERVAL
+            if self.sample_interval:
+                self._sample()
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.target_thread)
+        names: List[str] = []
+        while frame is not None and len(names) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        if names:
+            self.stacks[";".join(reversed(names))] += 1
+            self.sample_count += 1
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+        self.peak_rss = max(self.peak_rss, current_rss())
+
+
+@contextmanager
+def profile_stage(
+    stage: str, *, sample: bool = False, sample_interval: float = 0.005
+) -> Iterator[StageMetrics]:
+    metrics = StageMetrics(stage=stage, started_at=datetime.utcnow())
+    token = _current.set(metrics)
+    watcher = _Watcher(threading.get_ident(), sample_interval if sample else None)
+    watcher.start()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield metrics
+    except BaseException as exc:
+        metrics.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        metrics.wall_seconds = time.perf_counter() - wall
+        metrics.cpu_seconds = time.process_time() - cpu
+        watcher.stop()
+        _current.reset(token)
+        metrics.peak_rss_bytes = watcher.peak_rss
+        if sample:
+            metrics.samples = {
+                "interval_ms": sample_interval * 1000,
+                "total": watcher.sample_count,
+                "stacks": [
+                    {"stack": stack, "count": count}
+                    for stack, count in watcher.stacks.most_common(TOP_STACKS)
+                ],
+            }
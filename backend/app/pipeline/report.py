@@ -0,0 +1,326 @@
+"""
+Report writing (PROJECT_PLAN.md §8, step 9): a literature review over the
+project's idea tree, written map-reduce so no prompt has to hold every paper.
+
+* Map: every idea node with papers of its own gets a section drafted from
+  those papers alone (at most ``papers_per_section``, abstracts cut short).
+* Reduce: a node with children gets its section from the children's drafts
+  (cut to ``CHILD_CHARS``) plus its own papers, after those drafts exist;
+  the introduction is reduced from the top-level sections last.
+
+Nodes of a level are written concurrently, at most ``concurrency`` model
+calls at a time. The outline is the project's idea tree, so user edits
+(renames, moves, merges) shape the report; nodes that only pass through
+to a single child are left out of it.
+
+Every section is cached in ``report_sections`` under the SHA-256 of the
+model, instructions and prompt, which contain the node's label, its papers
+and its children's drafts. A new run therefore re-writes only the sections
+whose inputs changed: an edited node, and the overviews above it that
+summarise its draft.
+
+The stage commits each finished part (a ``ReportPart`` row pointing at its
+cached text) so ``GET .../report/stream`` can send sections to the client
+while the rest are still being written.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.idea_tree import IdeaNode, IdeaNodePaper
+from app.models.paper import Paper
+from app.models.project import Project
+from app.models.report import Report, ReportPart, ReportSection
+from app.pipeline import RunCancelled
+from app.pipeline.profiling import record_cache, record_llm_usage
+from app.services.idea_tree import get_tree
+from app.services.llm import ReasoningModel, get_reasoner
+
+# Abstract words per paper in a section prompt
+ABSTRACT_WORDS = 80
+# Characters of each child draft shown to the overview above it
+CHILD_CHARS = 1500
+
+SECTION_PROMPT = (
+    "You are writing one section of a literature review. From the papers below, "
+    "write a few paragraphs on the topic in the first line: what the papers study, "
+    "how, and how they relate. Refer to papers as [n]. No headings."
+)
+OVERVIEW_PROMPT = (
+    "You are writing a literature review. Below are drafts of the sub-sections of "
+    "the theme in the first line, and any papers filed directly under it. Write a "
+    "short overview that connects the sub-sections. No headings."
+)
+INTRO_PROMPT = (
+    "You are writing the introduction of a literature review. Below are its main "
+    "themes with their overviews. Introduce the review's scope and themes and how "
+    "they relate. No headings."
+)
+
+
+@dataclass
+class ReportOptions:
+    section_tokens: int
+    papers_per_section: int
+    concurrency: int
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ReportOptions":
+        """Options from a run's ``config_snapshot``, defaulting to settings."""
+        return cls(
+            section_tokens=int(
+                config.get("report_section_tokens", settings.report_section_tokens)
+            ),
+            papers_per_section=max(
+                1,
+                int(config.get("report_papers_per_section", settings.report_papers_per_section)),
+            ),
+            concurrency=max(1, int(config.get("llm_concurrency", settings.llm_concurrency))),
+        )
+
+
+@dataclass
+class ReportSummary:
+    parts: int
+    # Sections written by the model; the rest came from the section cache
+    written: int
+    cached: int
+    characters: int
+
+
+@dataclass
+class _Part:
+    row: ReportPart
+    children: List["_Part"] = field(default_factory=list)
+    papers: List[Tuple[str, Optional[int], Optional[str]]] = field(default_factory=list)
+    content: str = ""
+
+
+def section_key(model: str, system: str, prompt: str) -> str:
+    digest = hashlib.sha256()
+    for piece in (model, system, prompt):
+        digest.update(piece.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def paper_lines(
+    papers: List[Tuple[str, Optional[int], Optional[str]]], limit: int
+) -> List[str]:
+    lines = []
+    for i, (title, year, abstract) in enumerate(papers[:limit], 1):
+        words = (abstract or "").split()[:ABSTRACT_WORDS]
+        when = f" ({year})" if year else ""
+        lines.append(f"[{i}] {title}{when}. {' '.join(words)}".rstrip())
+    if len(papers) > limit:
+        lines.append(f"(and {len(papers) - limit} more papers)")
+    return lines
+
+
+def section_prompt(part: _Part, limit: int) -> Tuple[str, str]:
+    """Instructions and prompt for ``part``, from its papers and child drafts."""
+    lines = [part.row.label]
+    if not part.children:
+        return SECTION_PROMPT, "\n".join(lines + paper_lines(part.papers, limit))
+    for child in part.children:
+        lines += ["", f"## {child.row.label}", child.content[:CHILD_CHARS]]
+    if part.papers:
+        lines += ["", "Papers filed directly under this theme:"]
+        lines += paper_lines(part.papers, limit)
+    return OVERVIEW_PROMPT, "\n".join(lines)
+
+
+def assemble(title: str, intro: str, parts: List[_Part]) -> str:
+    """The report as Markdown: the introduction, then sections in tree order."""
+    blocks = [f"# {title}", intro]
+    for part in parts:
+        heading = "#" * min(part.row.depth + 2, 6)
+        blocks += [f"{heading} {part.row.label}", part.content]
+    return "\n\n".join(blocks) + "\n"
+
+
+async def _plan(
+    db: AsyncSession, project_id: uuid.UUID, run_id: uuid.UUID
+) -> Tuple[Report, _Part, List[_Part]]:
+    """Create the run's report with one pending part per idea node that has papers."""
+    tree = await get_tree(db, project_id)
+    if tree is None:
+        raise RuntimeError("report needs the project's idea tree")
+    nodes = (
+        await db.execute(
+            select(IdeaNode.id, IdeaNode.parent_id, IdeaNode.depth, IdeaNode.label)
+            .where(IdeaNode.tree_id == tree.id)
+            .order_by(IdeaNode.depth, IdeaNode.position, IdeaNode.id)
+        )
+    ).all()
+    papers: Dict[uuid.UUID, List[Tuple[str, Optional[int], Optional[str]]]] = {}
+    result = await db.execute(
+        select(IdeaNodePaper.node_id, Paper.title, Paper.year, Paper.abstract)
+        .join(Paper, Paper.id == IdeaNodePaper.paper_id)
+        .where(IdeaNodePaper.tree_id == tree.id)
+        .order_by(Paper.title, Paper.id)
+    )
+    for node_id, title, year, abstract in result:
+        papers.setdefault(node_id, []).append((title, year, abstract))
+
+    children: Dict[Optional[uuid.UUID], List[Any]] = {}
+    for node in nodes:
+        children.setdefault(node.parent_id, []).append(node)
+
+    # Depth-first in sibling order. Subtrees without papers are skipped and a
+    # node with one child and no papers of its own gives its place to the child
+    ordered: List[_Part] = []
+
+    def visit(node: Any, level: int) -> Optional[_Part]:
+        below = children.get(node.id, [])
+        if len(below) == 1 and not papers.get(node.id):
+            return visit(below[0], level)
+        part = _Part(
+            row=ReportPart(
+                run_id=run_id,
+                depth=level,
+                node_id=node.id,
+                label=node.label or "Untitled",
+                cached=False,
+            ),
+            papers=papers.get(node.id, []),
+        )
+        index = len(ordered)
+        ordered.append(part)
+        part.children = [c for c in (visit(child, level + 1) for child in below) if c is not None]
+        if not part.papers and not part.children:
+            ordered.pop(index)
+            return None
+        return part
+
+    roots = [p for p in (visit(node, 0) for node in children.get(None, [])) if p is not None]
+
+    # A recovered run starts its report over; finished sections come from the cache
+    await db.execute(delete(ReportPart).where(ReportPart.run_id == run_id))
+    await db.execute(delete(Report).where(Report.run_id == run_id))
+    report = Report(
+        run_id=run_id, project_id=project_id, status="writing", total=len(ordered) + 1, done=0
+    )
+    db.add(report)
+    intro = _Part(row=ReportPart(run_id=run_id, depth=0, label="Introduction", cached=False))
+    intro.children = roots
+    for position, part in enumerate([intro, *ordered]):
+        part.row.position = position
+        db.add(part.row)
+    await db.commit()
+    return report, intro, ordered
+
+
+async def _stop_report(db: AsyncSession, run_id: uuid.UUID, status: str) -> None:
+    # Finished sections stay committed (and cached); readers learn the report stopped
+    await db.rollback()
+    await db.execute(update(Report).where(Report.run_id == run_id).values(status=status))
+    await db.commit()
+
+
+async def write_report(
+    db: AsyncSession,
+    project_id: uuid.UUID,
+    run_id: uuid.UUID,
+    options: ReportOptions,
+    *,
+    reasoner: Optional[ReasoningModel] = None,
+    check_cancelled: Optional[Callable[[], None]] = None,
+) -> ReportSummary:
+    """Write the run's report section by section, committing each one."""
+    reasoner = reasoner or get_reasoner()
+    report, intro, parts = await _plan(db, project_id, run_id)
+    gate = asyncio.Semaphore(options.concurrency)
+    # One session serves every section; its statements must not interleave
+    lock = asyncio.Lock()
+    written = cached = 0
+
+    async def write(part: _Part, system: str, prompt: str) -> None:
+        nonlocal written, cached
+        key = section_key(reasoner.model, system, prompt)
+        async with lock:
+            content = await db.scalar(
+                select(ReportSection.content).where(
+                    ReportSection.project_id == project_id, ReportSection.key == key
+                )
+            )
+        hit = content is not None
+        if content is None:
+            async with gate:
+                completion = await reasoner.complete(
+                    system, prompt, max_tokens=options.section_tokens
+                )
+            record_llm_usage(
+                prompt_tokens=completion.prompt_tokens,
+                completion_tokens=completion.completion_tokens,
+            )
+            content = completion.text.strip()
+        async with lock:
+            if not hit:
+                # Two parts of one level can share a prompt; store the text once
+                exists = await db.scalar(
+                    select(ReportSection.id).where(
+                        ReportSection.project_id == project_id, ReportSection.key == key
+                    )
+                )
+                if exists is None:
+                    db.add(
+                        ReportSection(
+                            project_id=project_id, key=key, model=reasoner.model, content=content
+                        )
+                    )
+            report.done += 1
+            part.row.section_key = key
+            part.row.sequence = report.done
+            part.row.cached = hit
+            part.row.completed_at = datetime.utcnow()
+            await db.commit()
+        part.content = content
+        if hit:
+            cached += 1
+        else:
+            written += 1
+
+    try:
+        for depth in sorted({part.row.depth for part in parts}, reverse=True):
+            if check_cancelled is not None:
+                check_cancelled()
+            await asyncio.gather(
+                *(
+                    write(part, *section_prompt(part, options.papers_per_section))
+                    for part in parts
+                    if part.row.depth == depth
+                )
+            )
+        themes = "\n\n".join(
+            f"## {p.row.label}\n{p.content[:CHILD_CHARS]}" for p in intro.children
+        )
+        title = await db.scalar(select(Project.name).where(Project.id == project_id))
+        await write(intro, INTRO_PROMPT, f"{title}\n\n{themes}")
+    except RunCancelled:
+        await _stop_report(db, run_id, "cancelled")
+        raise
+    except Exception:
+        await _stop_report(db, run_id, "failed")
+        raise
+    record_cache("report_sections", hits=cached, misses=written)
+
+    report.content = assemble(title, intro.content, parts)
+    report.status = "completed"
+    report.completed_at = datetime.utcnow()
+    await db.flush()
+    return ReportSummary(
+        parts=len(parts) + 1,
+        written=written,
+        cached=cached,
+        characters=len(report.content),
+    )
@@ -0,0 +1,349 @@
+"""
+Pipeline runner: executes a ``Run``'s stages in order (PROJECT_PLAN.md §8).
+
+Every stage runs inside ``profile_stage``; its metrics are stored as a
+``RunStageProfile`` row and committed as soon as the stage ends, so the
+profile of a long run can be inspected while it is still going.
+
+Stages read their options from the run's immutable ``config_snapshot``:
+
+* ``citation_depth`` / ``citation_budget`` — retrieval via citation
+  expansion (skipped when the depth is 0 or no citation source is given)
+* ``taxonomy_leaf_size`` / ``taxonomy_max_clusters`` / ``taxonomy_fanout`` /
+  ``taxonomy_representatives`` / ``taxonomy_seed`` — taxonomy clustering
+  (defaults from settings)
+* ``graph_neighbors`` / ``graph_min_similarity`` / ``graph_iterations`` /
+  ``graph_seed`` — paper graph and layout; ``graph_relayout`` discards the
+  stored coordinates instead of placing only new papers
+* ``report_section_tokens`` / ``report_papers_per_section`` — report
+  writing; its sections are committed as they finish so they can be streamed
+
+Each finished stage also commits a ``RunCheckpoint`` holding its output as
+JSON, in the same transaction as the stage's own writes. Executing a run
+again (after a worker crash, see ``recover_stale_runs``) skips checkpointed
+stages and hands their stored outputs to the stages that follow.
+
+Cancellation is cooperative: ``POST .../cancel`` sets
+``cancel_requested_at``, which is checked before every stage and, while a
+stage runs, surfaced through ``StageContext.cancel`` by the worker's
+heartbeat. Long stages call ``ctx.check_cancelled()`` between units of work.
+"""
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.checkpoint import RunCheckpoint
+from app.models.document import PaperDocument
+from app.models.embedding import PaperEmbedding
+from app.models.paper import Paper, ProjectPaper
+from app.models.profile import RunStageProfile
+from app.models.run import Run
+from app.pipeline import RunCancelled
+from app.pipeline.citations import CitationSource, expand_citations
+from app.pipeline.graph import GraphOptions, GraphSummary, build_graph
+from app.pipeline.pdf import PdfParsePool, get_parse_pool, parse_documents
+from app.pipeline.profiling import StageMetrics, profile_stage, record_cache
+from app.pipeline.report import ReportOptions, ReportSummary, write_report
+from app.pipeline.taxonomy import (
+    TaxonomyOptions,
+    TaxonomySummary,
+    build_taxonomy,
+    load_taxonomy,
+)
+from app.services.artifacts import save_array, save_table
+from app.services.embeddings import (
+    Embedder,
+    decode_matrix,
+    get_embedder,
+    store_paper_embeddings,
+)
+from app.services.idea_tree import get_tree, seed_from_taxonomy
+from app.services.llm import ReasoningModel
+from app.services.project_stats import record_run_status
+from app.storage import Storage
+
+
+@dataclass
+class StageContext:
+    db: AsyncSession
+    run: Run
+    citation_source: Optional[CitationSource] = None
+    parse_pool: Optional[PdfParsePool] = None
+    # Artifact storage; None means ``get_storage()``
+    storage: Optional[Storage] = None
+    # Model providers; None means ``get_embedder()`` / ``get_reasoner()``
+    embedder: Optional[Embedder] = None
+    reasoner: Optional[ReasoningModel] = None
+    # Stage name -> whatever the stage returned (its JSON form if restored
+    # from a checkpoint), for later stages to use
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    # Set when cancellation of the run has been requested
+    cancel: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def check_cancelled(self) -> None:
+        if self.cancel.is_set():
+            raise RunCancelled(str(self.run.id))
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return self.run.config_snapshot or {}
+
+    async def project_paper_ids(self) -> List[uuid.UUID]:
+        result = await self.db.execute(
+            select(ProjectPaper.paper_id).where(ProjectPaper.project_id == self.run.project_id)
+        )
+        return list(result.scalars().all())
+
+
+Stage = Callable[[StageContext], Awaitable[Any]]
+
+
+async def retrieval_stage(ctx: StageContext) -> Any:
+    depth = int(ctx.config.get("citation_depth", 0))
+    if depth <= 0 or ctx.citation_source is None:
+        return None
+    return await expand_citations(
+        ctx.db,
+        ctx.run.project_id,
+        ctx.citation_source,
+        depth=depth,
+        budget=int(ctx.config.get("citation_budget", 50)),
+    )
+
+
+async def pdf_parsing_stage(ctx: StageContext) -> int:
+    paper_ids = await ctx.project_paper_ids()
+    result = await ctx.db.execute(
+        select(PaperDocument).where(PaperDocument.paper_id.in_(paper_ids))
+    )
+    documents = list(result.scalars().all())
+    pending = [d for d in documents if d.status == "pending"]
+    record_cache("documents", hits=len(documents) - len(pending), misses=len(pending))
+    if pending:
+        await parse_documents(ctx.db, pending, ctx.parse_pool or get_parse_pool())
+    return len(pending)
+
+
+async def embeddings_stage(ctx: StageContext) -> Dict[str, int]:
+    """Embed papers that lack a vector, then snapshot the project's matrix.
+
+    The snapshot is the run's ``embeddings`` artifact (float32, one row per
+    paper) with ``embedding_index`` mapping rows to paper ids, so later
+    stages and exports read a consistent matrix without touching the table.
+    """
+    embedder = ctx.embedder or get_embedder()
+    paper_ids = await ctx.project_paper_ids()
+    result = await ctx.db.execute(
+        select(PaperEmbedding.paper_id).where(
+            PaperEmbedding.paper_id.in_(paper_ids), PaperEmbedding.model == embedder.model
+        )
+    )
+    embedded = set(result.scalars().all())
+    missing = [pid for pid in paper_ids if pid not in embedded]
+    record_cache("embeddings", hits=len(embedded), misses=len(missing))
+    if missing:
+        result = await ctx.db.execute(select(Paper).where(Paper.id.in_(missing)))
+        papers = list(result.scalars().all())
+        await store_paper_embeddings(ctx.db, papers, embedder)
+        await ctx.db.flush()
+
+    result = await ctx.db.execute(
+        select(PaperEmbedding.paper_id, PaperEmbedding.vector)
+        .where(PaperEmbedding.paper_id.in_(paper_ids), PaperEmbedding.model == embedder.model)
+        .order_by(PaperEmbedding.paper_id)
+    )
+    rows = result.all()
+    await save_array(
+        ctx.db,
+        ctx.run.id,
+        "embeddings",
+        decode_matrix([vector for _, vector in rows], embedder.dim),
+        ctx.storage,
+    )
+    await save_table(
+        ctx.db,
+        ctx.run.id,
+        "embedding_index",
+        ({"row": i, "paper_id": str(paper_id)} for i, (paper_id, _) in enumerate(rows)),
+        ctx.storage,
+    )
+    return {"embedded": len(missing), "papers": len(rows)}
+
+
+async def taxonomy_stage(ctx: StageContext) -> TaxonomySummary:
+    summary = await build_taxonomy(
+        ctx.db,
+        ctx.run.id,
+        TaxonomyOptions.from_config(ctx.config),
+        storage=ctx.storage,
+        reasoner=ctx.reasoner,
+    )
+    # The project's first taxonomy seeds its idea tree; later runs leave an
+    # existing tree (and the user's edits) alone unless re-seeded explicitly
+    if await get_tree(ctx.db, ctx.run.project_id) is None:
+        nodes = await load_taxonomy(ctx.db, ctx.run.id, ctx.storage)
+        await seed_from_taxonomy(ctx.db, ctx.run.project_id, ctx.run.id, nodes)
+    return summary
+
+
+async def graph_stage(ctx: StageContext) -> GraphSummary:
+    return await build_graph(
+        ctx.db,
+        ctx.run.project_id,
+        ctx.run.id,
+        GraphOptions.from_config(ctx.config),
+        storage=ctx.storage,
+    )
+
+
+async def report_stage(ctx: StageContext) -> ReportSummary:
+    return await write_report(
+        ctx.db,
+        ctx.run.project_id,
+        ctx.run.id,
+        ReportOptions.from_config(ctx.config),
+        reasoner=ctx.reasoner,
+        check_cancelled=ctx.check_cancelled,
+    )
+
+
+STAGES: List[Tuple[str, Stage]] = [
+    ("retrieval", retrieval_stage),
+    ("pdf_parsing", pdf_parsing_stage),
+    ("embeddings", embeddings_stage),
+    ("taxonomy", taxonomy_stage),
+    ("graph", graph_stage),
+    ("report", report_stage),
+]
+
+
+def profile_row(run_id: uuid.UUID, position: int, metrics: StageMetrics) -> RunStageProfile:
+    return RunStageProfile(
+        run_id=run_id,
+        stage=metrics.stage,
+        position=position,
+        started_at=metrics.started_at,
+        wall_seconds=metrics.wall_seconds,
+        cpu_seconds=metrics.cpu_seconds,
+        peak_rss_bytes=metrics.peak_rss_bytes,
+        db_seconds=metrics.db_seconds,
+        db_statements=metrics.db_statements,
+        llm_calls=metrics.llm_calls,
+        llm_prompt_tokens=metrics.llm_prompt_tokens,
+        llm_completion_tokens=metrics.llm_completion_tokens,
+        cache=metrics.cache,
+        samples=metrics.samples,
+        error=metrics.error,
+    )
+
+
+def checkpoint_value(output: Any) -> Any:
+    """JSON form of a stage output; dataclasses become dicts."""
+    if dataclasses.is_dataclass(output) and not isinstance(output, type):
+        return dataclasses.asdict(output)
+    return output
+
+
+async def load_checkpoints(db: AsyncSession, run_id: uuid.UUID) -> Dict[str, Any]:
+    result = await db.execute(
+        select(RunCheckpoint.stage, RunCheckpoint.output).where(RunCheckpoint.run_id == run_id)
+    )
+    return {stage: output for stage, output in result.all()}
+
+
+async def _cancel_requested(db: AsyncSession, run: Run) -> bool:
+    requested = await db.scalar(select(Run.cancel_requested_at).where(Run.id == run.id))
+    return requested is not None
+
+
+async def _finish(db: AsyncSession, run: Run, status: str) -> None:
+    run.status = status
+    run.completed_at = datetime.utcnow()
+    await record_run_status(db, run)
+    await db.commit()
+
+
+async def execute_run(
+    db: AsyncSession,
+    run: Run,
+    *,
+    stages: Optional[List[Tuple[str, Stage]]] = None,
+    citation_source: Optional[CitationSource] = None,
+    parse_pool: Optional[PdfParsePool] = None,
+    embedder: Optional[Embedder] = None,
+    reasoner: Optional[ReasoningModel] = None,
+    sample_stage: Optional[str] = None,
+    cancel: Optional[asyncio.Event] = None,
+) -> None:
+    """Run the stages of ``run`` not yet checkpointed, committing as it goes.
+
+    ``sample_stage`` (default ``settings.profile_sample_stage``) names one
+    stage to capture with the sampling profiler. ``cancel`` is set by the
+    caller (the worker heartbeat) when cancellation is requested mid-stage.
+    ``embedder`` and ``reasoner`` replace the configured model providers
+    (scale tests run the pipeline with offline fakes).
+    """
+    if sample_stage is None:
+        sample_stage = settings.profile_sample_stage
+    ctx = StageContext(
+        db,
+        run,
+        citation_source=citation_source,
+        parse_pool=parse_pool,
+        embedder=embedder,
+        reasoner=reasoner,
+    )
+    if cancel is not None:
+        ctx.cancel = cancel
+    completed = await load_checkpoints(db, run.id)
+    run.status = "running"
+    await record_run_status(db, run)
+    await db.commit()
+
+    for position, (name, stage) in enumerate(STAGES if stages is None else stages):
+        if name in completed:
+            ctx.outputs[name] = completed[name]
+            continue
+        if ctx.cancel.is_set() or await _cancel_requested(db, run):
+            await _finish(db, run, "cancelled")
+            return
+        metrics: Optional[StageMetrics] = None
+        try:
+            with profile_stage(
+                name,
+                sample=name == sample_stage,
+                sample_interval=settings.profile_sample_interval,
+            ) as metrics:
+                output = await stage(ctx)
+        except Exception as exc:
+            await db.rollback()
+            await db.refresh(run)
+            db.add(profile_row(run.id, position, metrics))
+            if isinstance(exc, RunCancelled):
+                await _finish(db, run, "cancelled")
+                return
+            await _finish(db, run, "failed")
+            raise
+        ctx.outputs[name] = output
+        db.add(profile_row(run.id, position, metrics))
+        db.add(
+            RunCheckpoint(
+                run_id=run.id,
+                stage=name,
+                position=position,
+                output=checkpoint_value(output),
+                completed_at=datetime.utcnow(),
+            )
+        )
+        await db.commit()
+
+    await _finish(db, run, "completed")
@@ -0,0 +1,298 @@
+"""
+Run queue: fair claiming of pending runs by worker processes.
+
+Pending ``Run`` rows are the queue. A worker claims one with
+``SELECT ... FOR UPDATE OF runs SKIP LOCKED``, so any number of worker
+processes on any number of nodes pull work from Postgres without extra
+coordination: a row another worker is claiming is skipped, not waited on.
+
+A run is claimable only while its project and its owner are under their
+concurrency quotas (``run_max_per_project``, ``run_max_per_user``), and a
+bulk run only while fewer than ``run_max_bulk`` bulk runs are running
+cluster-wide, which keeps worker slots free for the interactive lane.
+Candidates are ordered by lane (interactive first), then by how many runs
+their owner already has running (fair share), then by age. Two workers can
+race for runs of the same owner; the claim takes a per-owner transaction
+advisory lock and re-checks the quotas under it, so they hold exactly.
+The bulk cap is checked without a lock and may be exceeded by one run per
+racing worker.
+
+While a worker executes a run, ``heartbeat`` refreshes ``heartbeat_at`` and
+relays cancellation requests to the runner. ``recover_stale_runs`` puts
+runs whose worker stopped heart-beating back in the queue; the next
+execution resumes after the run's last checkpoint.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import statistics
+import uuid
+import zlib
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Collection, Dict, List, Optional
+
+from sqlalchemy import case, func, or_, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import aliased
+
+from app.config import settings
+from app.models.project import Project
+from app.models.run import Run
+from app.services.project_stats import record_run_status
+
+logger = logging.getLogger(__name__)
+
+LANES = ("interactive", "bulk")
+
+
+@dataclass(frozen=True)
+class Quotas:
+    per_user: int
+    per_project: int
+    # Cluster-wide running bulk runs; 0 means no cap
+    bulk: int = 0
+
+    @classmethod
+    def from_settings(cls) -> Quotas:
+        return cls(
+            per_user=settings.run_max_per_user,
+            per_project=settings.run_max_per_project,
+            bulk=settings.run_max_bulk,
+        )
+
+
+def _running_for_project(project_id: Any):
+    other = aliased(Run)
+    return (
+        select(func.count())
+        .select_from(other)
+        .where(other.project_id == project_id, other.status == "running")
+        .scalar_subquery()
+    )
+
+
+def _running_for_owner(owner_id: Any):
+    other, other_project = aliased(Run), aliased(Project)
+    return (
+        select(func.count())
+        .select_from(other)
+        .join(other_project, other_project.id == other.project_id)
+        .where(other_project.owner_id == owner_id, other.status == "running")
+        .scalar_subquery()
+    )
+
+
+def _running_bulk():
+    other = aliased(Run)
+    return (
+        select(func.count())
+        .select_from(other)
+        .where(other.lane == "bulk", other.status == "running")
+        .scalar_subquery()
+    )
+
+
+def _owner_lock_key(owner_id: uuid.UUID) -> int:
+    # pg_advisory_xact_lock takes a signed 64-bit key
+    return zlib.crc32(owner_id.bytes) - 2**31
+
+
+async def _within_quotas(
+    db: AsyncSession, project_id: uuid.UUID, owner_id: uuid.UUID, quotas: Quotas
+) -> bool:
+    row = (
+        await db.execute(
+            select(_running_for_project(project_id), _running_for_owner(owner_id))
+        )
+    ).one()
+    return row[0] < quotas.per_project and row[1] < quotas.per_user
+
+
+async def claim_next_run(
+    db: AsyncSession,
+    worker_id: str,
+    quotas: Optional[Quotas] = None,
+    *,
+    skip: Collection[uuid.UUID] = (),
+) -> Optional[Run]:
+    """Claim the next run this worker may start and mark it running; commits.
+
+    Returns None when nothing is claimable under the quotas.
+    """
+    quotas = quotas or Quotas.from_settings()
+    postgres = db.bind.dialect.name == "postgresql"
+    skip = set(skip)
+    while True:
+        owner_running = _running_for_owner(Project.owner_id)
+        query = (
+            select(Run, Project.owner_id)
+            .join(Project, Project.id == Run.project_id)
+            .where(
+                Run.status == "pending",
+                _running_for_project(Run.project_id) < quotas.per_project,
+                owner_running < quotas.per_user,
+            )
+            .order_by(
+                case((Run.lane == "interactive", 0), else_=1),
+                owner_running,
+                Run.created_at,
+                Run.id,
+            )
+            .limit(1)
+            .with_for_update(of=Run, skip_locked=True)
+        )
+        if quotas.bulk:
+            query = query.where(or_(Run.lane != "bulk", _running_bulk() < quotas.bulk))
+        if skip:
+            query = query.where(Run.id.not_in(skip))
+        row = (await db.execute(query)).first()
+        if row is None:
+            await db.rollback()
+            return None
+        run, owner_id = row
+
+        if postgres:
+            # Serialise claims per owner, then re-check with everything committed so far.
+            await db.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": _owner_lock_key(owner_id)}
+            )
+            if not await _within_quotas(db, run.project_id, owner_id, quotas):
+                await db.rollback()
+                skip.add(run.id)
+                continue
+
+        now = datetime.utcnow()
+        run.status = "running"
+        run.worker_id = worker_id
+        run.started_at = run.started_at or now
+        run.heartbeat_at = now
+        await db.commit()
+        return run
+
+
+@asynccontextmanager
+async def heartbeat(
+    session_factory: async_sessionmaker,
+    run_id: uuid.UUID,
+    cancel: asyncio.Event,
+    interval: Optional[float] = None,
+) -> AsyncIterator[None]:
+    """Refresh the run's heartbeat in the background; set ``cancel`` when requested."""
+    interval = settings.run_heartbeat_interval if interval is None else interval
+
+    stop = asyncio.Event()
+
+    async def beat() -> None:
+        while True:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                async with session_factory() as db:
+                    requested = await db.scalar(
+                        update(Run)
+                        .where(Run.id == run_id)
+                        .values(heartbeat_at=datetime.utcnow())
+                        .returning(Run.cancel_requested_at)
+                    )
+                    await db.commit()
+            except Exception:
+                # A missed beat is harmless unless it lasts a whole timeout.
+                logger.exception("Heartbeat for run %s failed", run_id)
+                continue
+            if requested is not None:
+                cancel.set()
+
+    task = asyncio.create_task(beat())
+    try:
+        yield
+    finally:
+        # Stop between beats rather than cancelling the task, which could
+        # interrupt an in-flight UPDATE and leave its connection unusable.
+        stop.set()
+        await task
+
+
+async def recover_stale_runs(
+    db: AsyncSession, timeout: Optional[timedelta] = None
+) -> List[uuid.UUID]:
+    """Requeue running runs whose worker stopped heart-beating; commits.
+
+    Runs with a pending cancellation are marked cancelled instead.
+    """
+    if timeout is None:
+        timeout = timedelta(seconds=settings.run_heartbeat_timeout)
+    cutoff = datetime.utcnow() - timeout
+    result = await db.execute(
+        select(Run)
+        .where(Run.status == "running", func.coalesce(Run.heartbeat_at, Run.started_at) < cutoff)
+        .with_for_update(skip_locked=True)
+    )
+    recovered = []
+    for run in result.scalars().all():
+        if run.cancel_requested_at is not None:
+            run.status = "cancelled"
+            run.completed_at = datetime.utcnow()
+        else:
+            logger.warning("Requeueing run %s; worker %s is gone", run.id, run.worker_id)
+            run.status = "pending"
+            run.worker_id = None
+        await record_run_status(db, run)
+        recovered.append(run.id)
+    await db.commit()
+    return recovered
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    if len(values) == 1:
+        return round(values[0], 3)
+    return round(statistics.quantiles(values, n=100, method="inclusive")[int(fraction * 100) - 1], 3)
+
+
+async def queue_metrics(db: AsyncSession, window: timedelta = timedelta(hours=1)) -> Dict[str, Any]:
+    """Per-lane queue depth, running count and wait times over ``window``."""
+    now = datetime.utcnow()
+    counts = await db.execute(
+        select(Run.lane, Run.status, func.count(), func.min(Run.created_at))
+        .where(Run.status.in_(("pending", "running")))
+        .group_by(Run.lane, Run.status)
+    )
+    lanes: Dict[str, Dict[str, Any]] = {
+        lane: {"lane": lane, "depth": 0, "running": 0, "oldest_wait_seconds": None}
+        for lane in LANES
+    }
+    for lane, status, count, oldest in counts.all():
+        entry = lanes.setdefault(
+            lane, {"lane": lane, "depth": 0, "running": 0, "oldest_wait_seconds": None}
+        )
+        if status == "pending":
+            entry["depth"] = count
+            entry["oldest_wait_seconds"] = round((now - _naive(oldest)).total_seconds(), 3)
+        else:
+            entry["running"] = count
+
+    claimed = await db.execute(
+        select(Run.lane, Run.created_at, Run.started_at).where(Run.started_at >= now - window)
+    )
+    waits: Dict[str, List[float]] = {lane: [] for lane in lanes}
+    for lane, created_at, started_at in claimed.all():
+        waits.setdefault(lane, []).append(
+            max((_naive(started_at) - _naive(created_at)).total_seconds(), 0.0)
+        )
+    for lane, entry in lanes.items():
+        entry["wait_p50_seconds"] = _percentile(waits.get(lane, []), 0.50)
+        entry["wait_p95_seconds"] = _percentile(waits.get(lane, []), 0.95)
+        entry["claimed"] = len(waits.get(lane, []))
+    return {"window_seconds": window.total_seconds(), "lanes": list(lanes.values())}
+
+
+def _naive(value: datetime) -> datetime:
+    # Timestamps are written as naive UTC; Postgres returns them timezone-aware.
+    return value.replace(tzinfo=None) if value.tzinfo is not None else value
@@ -0,0 +1,347 @@
+"""
+Taxonomy labeling (PROJECT_PLAN.md §8, step 6): a cluster tree over the
+run's embedding matrix, named bottom-up by the reasoning model.
+
+* Leaves are spherical k-means clusters of the paper embeddings, seeded
+  with k-means++ from a fixed seed so a run's tree is reproducible. There
+  are about ``leaf_size`` papers per leaf and at most ``max_clusters`` leaves.
+* Each level above clusters the centroids of the level below (weighted by
+  size) into groups of about ``fanout``, until one level fits under the root.
+* A leaf is labeled from its ``representatives`` papers nearest the
+  centroid; a parent from its children's labels alone. That is one model
+  call per node with a prompt of bounded size, so calls and tokens grow
+  with the number of clusters, never with the number of papers.
+
+The tree is stored as the run's ``taxonomy`` table artifact, one row per
+node in breadth-first order (``load_taxonomy`` reads it back).
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import uuid
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.paper import Paper
+from app.pipeline.profiling import record_llm_usage
+from app.services.artifacts import get_artifact, load_array, read_table, save_table
+from app.services.llm import ReasoningModel, get_reasoner
+from app.storage import Storage
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Rows per block when scoring points against centroids
+CHUNK_ROWS = 16384
+# k-means++ seeding looks at a random sample of at most this many points
+SEED_SAMPLE = 20000
+MAX_ITERATIONS = 25
+# Abstract words per representative paper in a leaf prompt
+ABSTRACT_WORDS = 60
+LABEL_TOKENS = 16
+
+LEAF_PROMPT = (
+    "You organise a literature review. The papers below were clustered together. "
+    "Reply with a short noun phrase (2-6 words) naming their common research topic."
+)
+PARENT_PROMPT = (
+    "You organise a literature review. The sub-topics below (paper counts in brackets) "
+    "belong to one broader theme. Reply with a short noun phrase (2-6 words) naming it."
+)
+
+
+@dataclass
+class TaxonomyOptions:
+    leaf_size: int
+    max_clusters: int
+    fanout: int
+    representatives: int
+    seed: int
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "TaxonomyOptions":
+        """Options from a run's ``config_snapshot``, defaulting to settings."""
+        return cls(
+            leaf_size=max(1, int(config.get("taxonomy_leaf_size", settings.taxonomy_leaf_size))),
+            max_clusters=max(
+                1, int(config.get("taxonomy_max_clusters", settings.taxonomy_max_clusters))
+            ),
+            fanout=max(2, int(config.get("taxonomy_fanout", settings.taxonomy_fanout))),
+            representatives=max(
+                1, int(config.get("taxonomy_representatives", settings.taxonomy_representatives))
+            ),
+            seed=int(config.get("taxonomy_seed", settings.taxonomy_seed)),
+        )
+
+
+@dataclass
+class TaxonomyNode:
+    id: int
+    parent: Optional[int]
+    depth: int
+    size: int
+    label: str = ""
+    children: List[int] = field(default_factory=list)
+    # Leaves only: every paper in the cluster, and the few nearest its centroid
+    paper_ids: List[str] = field(default_factory=list)
+    representatives: List[str] = field(default_factory=list)
+
+
+@dataclass
+class TaxonomySummary:
+    papers: int
+    clusters: int
+    nodes: int
+    depth: int
+
+
+def _seed_centroids(
+    points: "np.ndarray", k: int, weights: "np.ndarray", rng: "np.random.Generator"
+) -> "np.ndarray":
+    """k-means++ over a sample of ``points``, with cosine distance."""
+    import numpy as np
+
+    n = points.shape[0]
+    sample = np.sort(rng.choice(n, size=SEED_SAMPLE, replace=False)) if n > SEED_SAMPLE else None
+    candidates = np.asarray(points[sample] if sample is not None else points, dtype=np.float32)
+    w = (weights[sample] if sample is not None else weights).astype(np.float64)
+
+    first = rng.choice(len(candidates), p=w / w.sum())
+    centers = [candidates[first]]
+    distance = np.maximum(1.0 - candidates @ candidates[first], 0.0).astype(np.float64)
+    # Greedy k-means++: of a few sampled candidates, keep the one that lowers the
+    # total distance most, so an unlucky draw rarely puts two seeds in one cluster
+    trials = 2 + int(math.log(k))
+    for _ in range(1, k):
+        p = distance * w
+        total = p.sum()
+        if total <= 0:
+            # Fewer distinct points than clusters
+            break
+        tried = rng.choice(len(candidates), size=trials, p=p / total)
+        options = np.minimum(
+            distance, np.maximum(1.0 - candidates[tried] @ candidates.T, 0.0)
+        )
+        best = int(np.argmin(options @ w))
+        centers.append(candidates[tried[best]])
+        distance = options[best]
+    return np.stack(centers)
+
+
+def kmeans(
+    points: "np.ndarray",
+    k: int,
+    *,
+    weights: Optional["np.ndarray"] = None,
+    seed: int = 0,
+    iterations: int = MAX_ITERATIONS,
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Spherical k-means over the L2-normalised rows of ``points``.
+
+    Returns ``(centroids, labels)``; clusters that end up empty are dropped,
+    so there may be fewer than ``k`` centroids. ``points`` may be a memmap:
+    it is read in ``CHUNK_ROWS`` blocks, once per iteration.
+    """
+    import numpy as np
+
+    n = points.shape[0]
+    w = np.ones(n, dtype=np.float32) if weights is None else np.asarray(weights, np.float32)
+    rng = np.random.default_rng(seed)
+    centroids = _seed_centroids(points, max(1, min(k, n)), w, rng)
+    labels = np.full(n, -1, dtype=np.int64)
+
+    for _ in range(iterations):
+        sums = np.zeros_like(centroids)
+        changed = False
+        for start in range(0, n, CHUNK_ROWS):
+            block = np.asarray(points[start : start + CHUNK_ROWS], dtype=np.float32)
+            assigned = np.argmax(block @ centroids.T, axis=1)
+            changed |= not np.array_equal(assigned, labels[start : start + CHUNK_ROWS])
+            labels[start : start + CHUNK_ROWS] = assigned
+            onehot = np.zeros((len(centroids), len(block)), dtype=np.float32)
+            onehot[assigned, np.arange(len(block))] = w[start : start + CHUNK_ROWS]
+            sums += onehot @ block
+        if not changed:
+            break
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # An emptied cluster keeps its previous centroid
+        centroids = np.where(norms > 0, sums / np.where(norms > 0, norms, 1), centroids)
+
+    used = np.unique(labels)
+    remap = np.full(len(centroids), -1, dtype=np.int64)
+    remap[used] = np.arange(len(used))
+    return centroids[used], remap[labels]
+
+
+def build_tree(
+    matrix: "np.ndarray", paper_ids: Sequence[str], options: TaxonomyOptions
+) -> List[TaxonomyNode]:
+    """Unlabeled taxonomy nodes in breadth-first order; node 0 is the root."""
+    import numpy as np
+
+    n = len(paper_ids)
+    if n == 0:
+        return [TaxonomyNode(id=0, parent=None, depth=0, size=0)]
+
+    k = min(options.max_clusters, max(1, round(n / options.leaf_size)))
+    centroids, labels = kmeans(matrix, k, seed=options.seed)
+    sizes = np.bincount(labels, minlength=len(centroids))
+    members: List[np.ndarray] = [np.flatnonzero(labels == c) for c in range(len(centroids))]
+
+    # levels[0] holds leaves (members are matrix rows); each later level's
+    # members index into the level before it
+    levels: List[List[np.ndarray]] = [members]
+    level_sizes = [sizes]
+    while len(centroids) > options.fanout:
+        centroids, labels = kmeans(
+            centroids,
+            math.ceil(len(centroids) / options.fanout),
+            weights=sizes,
+            seed=options.seed,
+        )
+        groups = [np.flatnonzero(labels == c) for c in range(len(centroids))]
+        sizes = np.array([sizes[g].sum() for g in groups])
+        levels.append(groups)
+        level_sizes.append(sizes)
+
+    nodes = [TaxonomyNode(id=0, parent=None, depth=0, size=n)]
+    # (node, level, index within level) of the nodes at the current depth
+    frontier: List[Tuple[TaxonomyNode, int, np.ndarray]] = [
+        (nodes[0], len(levels), np.arange(len(levels[-1])))
+    ]
+    while frontier:
+        next_frontier = []
+        for parent, level, children in frontier:
+            level -= 1
+            child_sizes = level_sizes[level][children]
+            # Largest first; stable, so ties keep cluster order
+            for index in children[np.argsort(-child_sizes, kind="stable")]:
+                node = TaxonomyNode(
+                    id=len(nodes),
+                    parent=parent.id,
+                    depth=parent.depth + 1,
+                    size=int(level_sizes[level][index]),
+                )
+                nodes.append(node)
+                parent.children.append(node.id)
+                if level == 0:
+                    _fill_leaf(node, matrix, paper_ids, levels[0][index], options)
+                else:
+                    next_frontier.append((node, level, levels[level][index]))
+        frontier = next_frontier
+    return nodes
+
+
+def _fill_leaf(
+    node: TaxonomyNode,
+    matrix: "np.ndarray",
+    paper_ids: Sequence[str],
+    rows: "np.ndarray",
+    options: TaxonomyOptions,
+) -> None:
+    import numpy as np
+
+    vectors = np.asarray(matrix[rows], dtype=np.float32)
+    centroid = vectors.sum(axis=0)
+    scores = vectors @ centroid
+    nearest = rows[np.argsort(-scores, kind="stable")[: options.representatives]]
+    node.paper_ids = [paper_ids[r] for r in rows]
+    node.representatives = [paper_ids[r] for r in nearest]
+
+
+def _representative_text(title: str, abstract: Optional[str]) -> str:
+    if not abstract:
+        return title
+    words = abstract.split()
+    snippet = " ".join(words[:ABSTRACT_WORDS]) + (" ..." if len(words) > ABSTRACT_WORDS else "")
+    return f"{title}: {snippet}"
+
+
+async def label_tree(
+    nodes: List[TaxonomyNode],
+    texts: Dict[str, str],
+    reasoner: ReasoningModel,
+    concurrency: int,
+) -> None:
+    """Label ``nodes`` deepest level first; the nodes of a level run concurrently."""
+    by_id = {node.id: node for node in nodes}
+    gate = asyncio.Semaphore(max(1, concurrency))
+
+    async def label(node: TaxonomyNode) -> None:
+        if len(node.children) == 1:
+            node.label = by_id[node.children[0]].label
+            return
+        if node.children:
+            system = PARENT_PROMPT
+            prompt = "\n".join(
+                f"- {by_id[c].label} [{by_id[c].size}]" for c in node.children
+            )
+        elif node.representatives:
+            system = LEAF_PROMPT
+            prompt = "\n".join(
+                f"{i}. {texts.get(pid, '')}" for i, pid in enumerate(node.representatives, 1)
+            )
+        else:
+            return
+        async with gate:
+            completion = await reasoner.complete(system, prompt, max_tokens=LABEL_TOKENS)
+        record_llm_usage(
+            prompt_tokens=completion.prompt_tokens,
+            completion_tokens=completion.completion_tokens,
+        )
+        node.label = completion.text.strip().strip("\"'.")[:200]
+
+    for depth in range(max(node.depth for node in nodes), -1, -1):
+        await asyncio.gather(*(label(node) for node in nodes if node.depth == depth))
+
+
+async def build_taxonomy(
+    db: AsyncSession,
+    run_id: uuid.UUID,
+    options: TaxonomyOptions,
+    *,
+    storage: Optional[Storage] = None,
+    reasoner: Optional[ReasoningModel] = None,
+) -> TaxonomySummary:
+    """Cluster and label the run's ``embeddings`` artifact; save the tree."""
+    embeddings = await get_artifact(db, run_id, "embeddings")
+    index = await get_artifact(db, run_id, "embedding_index")
+    if embeddings is None or index is None:
+        raise RuntimeError("taxonomy needs the run's embeddings artifacts")
+    matrix = await load_array(embeddings, storage)
+    paper_ids = [row["paper_id"] for row in await read_table(index, storage)]
+
+    # NumPy releases the GIL in the heavy parts; keep the event loop free
+    nodes = await asyncio.to_thread(build_tree, matrix, paper_ids, options)
+
+    wanted = [uuid.UUID(pid) for node in nodes for pid in node.representatives]
+    result = await db.execute(
+        select(Paper.id, Paper.title, Paper.abstract).where(Paper.id.in_(wanted))
+    )
+    texts = {str(pid): _representative_text(title, abstract) for pid, title, abstract in result}
+    await label_tree(nodes, texts, reasoner or get_reasoner(), settings.llm_concurrency)
+
+    await save_table(
+        db, run_id, "taxonomy", (vars(node) for node in nodes), storage
+    )
+    return TaxonomySummary(
+        papers=len(paper_ids),
+        clusters=sum(1 for node in nodes if node.parent is not None and not node.children),
+        nodes=len(nodes),
+        depth=max(node.depth for node in nodes),
+    )
+
+
+async def load_taxonomy(
+    db: AsyncSession, run_id: uuid.UUID, storage: Optional[Storage] = None
+) -> Optional[List[TaxonomyNode]]:
+    """The run's taxonomy nodes, or None if the run has not built one."""
+    artifact = await get_artifact(db, run_id, "taxonomy")
+    if artifact is None:
+        return None
+    return [TaxonomyNode(**row) for row in await read_table(artifact, storage)]
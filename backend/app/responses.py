@@ -0,0 +1,101 @@
+"""
+Fast JSON path for large list responses.
+
+Endpoints that return many rows can skip ORM hydration and Pydantic
+validation entirely: they select plain columns, shape the rows into dicts
+with ``schema_row`` and return ``FastJSONResponse``. FastAPI passes a returned
+``Response`` straight through, so the route's ``response_model`` is still
+used for the OpenAPI schema but never run. This is only for trusted DB output
+whose shape already matches the schema. ``schema_columns`` derives the
+selected columns from the schema's fields, so the two cannot drift apart.
+
+Encoding uses orjson when installed (the ``fast`` extra) and falls back to
+the stdlib ``json`` module with the same output format.
+"""
+from __future__ import annotations
+
+import json
+import uuid
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Any, Collection, Dict, List, Mapping, Optional, Tuple, Type
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is not None and value.utcoffset() == timezone.utc.utcoffset(None):
+            return value.replace(tzinfo=None).isoformat() + "Z"
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize ``content`` the way Pydantic would (UTC as ``Z``, UUIDs as strings)."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def _scalar_fields(schema: Type[BaseModel], prefix: str) -> Tuple[Tuple[str, str], ...]:
+    """(field name, column label) for every non-nested field of ``schema``."""
+    return tuple(
+        (name, prefix + name)
+        for name, info in schema.model_fields.items()
+        if not (isinstance(info.annotation, type) and issubclass(info.annotation, BaseModel))
+    )
+
+
+def schema_columns(
+    model: Type[Any],
+    schema: Type[BaseModel],
+    prefix: str = "",
+    fields: Optional[Collection[str]] = None,
+) -> List[Any]:
+    """ORM columns for the scalar fields of ``schema`` (all, or only ``fields``).
+
+    Each is labelled ``prefix + name``; unselected columns are never loaded.
+    """
+    return [
+        getattr(model, name).label(label)
+        for name, label in _scalar_fields(schema, prefix)
+        if fields is None or name in fields
+    ]
+
+
+def schema_row(
+    row: Mapping[str, Any],
+    schema: Type[BaseModel],
+    prefix: str = "",
+    fields: Optional[Collection[str]] = None,
+) -> Dict[str, Any]:
+    return {
+        name: row[label]
+        for name, label in _scalar_fields(schema, prefix)
+        if fields is None or name in fields
+    }
+
+
+def scalar_field_names(schema: Type[BaseModel]) -> List[str]:
+    return [name for name, _ in _scalar_fields(schema, "")]
@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import hashlib
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import TTLCache
+from app.config import settings
+from app.database import get_db, get_read_db
+from app.models.document import PaperDocument
+from app.models.paper import ProjectPaper
+from app.models.upload import PdfUpload
+from app.pipeline.pdf import PdfParsePool, get_parse_pool, parse_documents
+from app.routers.projects import get_current_user_id
+from app.routers.runs import get_owned_project
+from app.schemas.document import (
+    PaperDocumentDetail,
+    PaperDocumentRead,
+    PdfUploadCreate,
+    PdfUploadRead,
+)
+from app.storage import Storage, content_key, get_storage
+
+router = APIRouter()
+
+# Running SHA-256 per in-progress upload, with the offset it has hashed up to.
+# Lost on restart, when a chunk lands on another worker, or after an hour
+# without a chunk (abandoned uploads must not pin digests forever);
+# completion then re-hashes the stored bytes instead.
+DIGEST_IDLE_SECONDS = 3600.0
+DIGEST_ENTRIES = 1000
+_upload_digests: TTLCache[Tuple[int, "hashlib._Hash"]] = TTLCache(
+    DIGEST_IDLE_SECONDS, DIGEST_ENTRIES
+)
+
+
+async def get_project_paper(
+    project_id: uuid.UUID,
+    paper_id: uuid.UUID,
+    user_id: uuid.UUID,
+    db: AsyncSession,
+) -> ProjectPaper:
+    await get_owned_project(project_id, user_id, db)
+    result = await db.execute(
+        select(ProjectPaper).where(
+            ProjectPaper.project_id == project_id, ProjectPaper.paper_id == paper_id
+        )
+    )
+    pp = result.scalar_one_or_none()
+    if pp is None:
+        raise HTTPException(status_code=404, detail="Paper not in project")
+    return pp
+
+
+async def get_upload(
+    project_id: uuid.UUID,
+    upload_id: uuid.UUID,
+    user_id: uuid.UUID,
+    db: AsyncSession,
+    for_update: bool = False,
+) -> PdfUpload:
+    await get_owned_project(project_id, user_id, db)
+    query = select(PdfUpload).where(PdfUpload.id == upload_id, PdfUpload.project_id == project_id)
+    if for_update:
+        # One writer per upload; concurrent chunks for it wait here.
+        query = query.with_for_update()
+    upload = (await db.execute(query)).scalar_one_or_none()
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload
+
+
+async def _hashed(
+    stream: AsyncIterator[bytes],
+    digest: Optional["hashlib._Hash"],
+    limit: int,
+    too_large: str,
+) -> AsyncIterator[bytes]:
+    """Pass request chunks through, hashing them; 413 with ``too_large`` past ``limit``."""
+    received = 0
+    async for chunk in stream:
+        if not chunk:
+            continue
+        received += len(chunk)
+        if received > limit:
+            raise HTTPException(status_code=413, detail=too_large)
+        if digest is not None:
+            digest.update(chunk)
+        yield chunk
+
+
+async def _store_document(
+    db: AsyncSession,
+    storage: Storage,
+    upload_key: str,
+    state: Dict[str, Any],
+    paper_id: uuid.UUID,
+    content_hash: str,
+    size: int,
+    pool: PdfParsePool,
+    parse: bool,
+) -> PaperDocument:
+    """Link sealed upload bytes to ``paper_id``, reusing any document with the same hash.
+
+    A 409 for bytes already attached to another paper leaves the upload
+    untouched; the caller decides what happens to it.
+    """
+    result = await db.execute(
+        select(PaperDocument).where(PaperDocument.content_hash == content_hash)
+    )
+    document = result.scalar_one_or_none()
+    if document is not None:
+        if document.paper_id != paper_id:
+            raise HTTPException(status_code=409, detail="PDF already attached to another paper")
+        # Same bytes uploaded before: never store or parse them twice.
+        await storage.discard_upload(upload_key, state)
+        return document
+
+    key = content_key("pdfs", content_hash, ".pdf")
+    await storage.promote_upload(upload_key, key)
+    document = PaperDocument(
+        paper_id=paper_id,
+        content_hash=content_hash,
+        storage_key=key,
+        size_bytes=size,
+        status="pending",
+    )
+    db.add(document)
+    await db.flush()
+    if parse:
+        # Awaits a worker process; the event loop stays free meanwhile.
+        await parse_documents(db, [document], pool)
+    await db.refresh(document)
+    return document
+
+
+@router.post(
+    "/{project_id}/papers/{paper_id}/pdf",
+    response_model=PaperDocumentRead,
+    status_code=201,
+)
+async def upload_pdf(
+    project_id: uuid.UUID,
+    paper_id: uuid.UUID,
+    request: Request,
+    parse: bool = True,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+    pool: PdfParsePool = Depends(get_parse_pool),
+) -> PaperDocument:
+    """Single-request upload: the raw PDF body is streamed straight to storage."""
+    await get_project_paper(project_id, paper_id, user_id, db)
+
+    storage = get_storage()
+    upload_key = uuid.uuid4().hex
+    state = await storage.begin_upload(upload_key)
+    digest = hashlib.sha256()
+    try:
+        size = await storage.append(
+            upload_key,
+            state,
+            0,
+            _hashed(request.stream(), digest, settings.max_upload_bytes, "PDF too large"),
+        )
+        if not size:
+            raise HTTPException(status_code=400, detail="Empty upload")
+        await storage.seal_upload(upload_key, state)
+    except BaseException:
+        await storage.discard_upload(upload_key, state)
+        raise
+    try:
+        return await _store_document(
+            db, storage, upload_key, state, paper_id, digest.hexdigest(), size, pool, parse
+        )
+    except HTTPException:
+        await storage.discard_upload(upload_key, state)
+        raise
+
+
+@router.post("/{project_id}/uploads", response_model=PdfUploadRead, status_code=201)
+async def create_upload(
+    project_id: uuid.UUID,
+    body: PdfUploadCreate,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> PdfUpload:
+    """Start a resumable upload; send bytes with PATCH and Upload-Offset."""
+    await get_project_paper(project_id, body.paper_id, user_id, db)
+    if body.size > settings.max_upload_bytes:
+        raise HTTPException(status_code=413, detail="PDF too large")
+
+    now = datetime.utcnow()
+    upload = PdfUpload(
+        id=uuid.uuid4(),
+        project_id=project_id,
+        paper_id=body.paper_id,
+        filename=body.filename,
+        size=body.size,
+        offset=0,
+        status="uploading",
+        created_at=now,
+        updated_at=now,
+    )
+    upload.backend_state = await get_storage().begin_upload(str(upload.id))
+    _upload_digests.set(upload.id, (0, hashlib.sha256()))
+    db.add(upload)
+    await db.flush()
+    return upload
+
+
+@router.get("/{project_id}/uploads/{upload_id}", response_model=PdfUploadRead)
+async def get_upload_status(
+    project_id: uuid.UUID,
+    upload_id: uuid.UUID,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> PdfUpload:
+    """Current offset, i.e. where a client should resume."""
+    return await get_upload(project_id, upload_id, user_id, db)
+
+
+@router.patch("/{project_id}/uploads/{upload_id}", response_model=PdfUploadRead)
+async def append_upload(
+    project_id: uuid.UUID,
+    upload_id: uuid.UUID,
+    request: Request,
+    upload_offset: int = Header(),
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> PdfUpload:
+    upload = await get_upload(project_id, upload_id, user_id, db, for_update=True)
+    if upload.status != "uploading":
+        raise HTTPException(status_code=409, detail=f"Upload is {upload.status}")
+    if upload_offset != upload.offset:
+        raise HTTPException(
+            status_code=409, detail=f"Upload-Offset mismatch: expected {upload.offset}"
+        )
+
+    entry = _upload_digests.get(upload.id)
+    _upload_digests.discard(upload.id)
+    digest = entry[1] if entry is not None and entry[0] == upload.offset else None
+    storage = get_storage()
+    state = dict(upload.backend_state)
+    written = await storage.append(
+        str(upload.id),
+        state,
+        upload.offset,
+        _hashed(
+            request.stream(),
+            digest,
+            upload.size - upload.offset,
+            "Upload exceeds declared size",
+        ),
+    )
+    is_final = upload.offset + written == upload.size
+    if written and not is_final and written < storage.min_chunk_bytes:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Chunks before the last must be at least {storage.min_chunk_bytes} bytes",
+        )
+
+    upload.offset += written
+    upload.backend_state = state
+    upload.updated_at = datetime.utcnow()
+    if digest is not None:
+        _upload_digests.set(upload.id, (upload.offset, digest))
+    await db.flush()
+    return upload
+
+
+@router.post(
+    "/{project_id}/uploads/{upload_id}/complete",
+    response_model=PaperDocumentRead,
+    status_code=201,
+)
+async def complete_upload(
+    project_id: uuid.UUID,
+    upload_id: uuid.UUID,
+    parse: bool = True,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+    pool: PdfParsePool = Depends(get_parse_pool),
+) -> PaperDocument:
+    upload = await get_upload(project_id, upload_id, user_id, db, for_update=True)
+    if upload.status != "uploading":
+        raise HTTPException(status_code=409, detail=f"Upload is {upload.status}")
+    if upload.offset != upload.size:
+        raise HTTPException(
+            status_code=409, detail=f"Upload incomplete: {upload.offset} of {upload.size} bytes"
+        )
+
+    storage = get_storage()
+    upload_key = str(upload.id)
+    await storage.seal_upload(upload_key, upload.backend_state)
+    entry = _upload_digests.get(upload.id)
+    _upload_digests.discard(upload.id)
+    if entry is not None and entry[0] == upload.size:
+        content_hash = entry[1].hexdigest()
+    else:
+        digest = hashlib.sha256()
+        async for chunk in storage.read_upload(upload_key):
+            digest.update(chunk)
+        content_hash = digest.hexdigest()
+
+    try:
+        document = await _store_document(
+            db,
+            storage,
+            upload_key,
+            upload.backend_state,
+            upload.paper_id,
+            content_hash,
+            upload.size,
+            pool,
+            parse,
+        )
+    except HTTPException:
+        # The sealed bytes are dropped, so the upload must not stay "uploading"
+        # for a retry to complete again: record that before the 409 rolls back.
+        await storage.discard_upload(upload_key, upload.backend_state)
+        upload.status = "failed"
+        upload.updated_at = datetime.utcnow()
+        await db.commit()
+        raise
+    upload.status = "completed"
+    upload.document_id = document.id
+    upload.updated_at = datetime.utcnow()
+    await db.flush()
+    return document
+
+
+@router.delete("/{project_id}/uploads/{upload_id}", status_code=204)
+async def abort_upload(
+    project_id: uuid.UUID,
+    upload_id: uuid.UUID,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> None:
+    upload = await get_upload(project_id, upload_id, user_id, db, for_update=True)
+    if upload.status == "uploading":
+        await get_storage().discard_upload(str(upload.id), upload.backend_state)
+        _upload_digests.discard(upload.id)
+        upload.status = "aborted"
+        upload.updated_at = datetime.utcnow()
+
+
+@router.get(
+    "/{project_id}/papers/{paper_id}/document",
+    response_model=PaperDocumentDetail,
+)
+async def get_document(
+    project_id: uuid.UUID,
+    paper_id: uuid.UUID,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> PaperDocument:
+    await get_project_paper(project_id, paper_id, user_id, db)
+    result = await db.execute(
+        select(PaperDocument)
+        .where(PaperDocument.paper_id == paper_id)
+        .order_by(PaperDocument.created_at.desc())
+        .limit(1)
+    )
+    document = result.scalar_one_or_none()
+    if document is None:
+        raise HTTPException(status_code=404, detail="No document uploaded for this paper")
+    return document
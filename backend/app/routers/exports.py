@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import uuid
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import FileResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db, get_read_db
+from app.models.export import ExportJob
+from app.pipeline.exports import ExportError, request_export
+from app.routers.projects import get_current_user_id
+from app.routers.reports import get_project_run
+from app.routers.runs import get_owned_project
+from app.schemas.export import ExportCreate, ExportJobRead
+from app.services.paper_queries import PaperFilter
+from app.storage import file_response
+
+router = APIRouter()
+
+
+def job_read(job: ExportJob) -> ExportJobRead:
+    url = None
+    if job.status == "completed":
+        url = f"/projects/{job.project_id}/exports/{job.id}/download"
+    return ExportJobRead(
+        id=job.id,
+        run_id=job.run_id,
+        format=job.format,
+        filters=job.filters,
+        layout_version=job.layout_version,
+        status=job.status,
+        error=job.error,
+        media_type=job.media_type,
+        filename=job.filename,
+        size_bytes=job.size_bytes,
+        download_url=url,
+        created_at=job.created_at,
+        completed_at=job.completed_at,
+    )
+
+
+async def get_project_export(
+    project_id: uuid.UUID, job_id: uuid.UUID, user_id: uuid.UUID, db: AsyncSession
+) -> ExportJob:
+    await get_owned_project(project_id, user_id, db)
+    job = await db.scalar(
+        select(ExportJob).where(ExportJob.id == job_id, ExportJob.project_id == project_id)
+    )
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export not found")
+    return job
+
+
+@router.post("/{project_id}/exports", response_model=ExportJobRead, status_code=202)
+async def create_export(
+    project_id: uuid.UUID,
+    body: ExportCreate,
+    response: Response,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> ExportJobRead:
+    """Queue an export of the run's report for the current filters and layout.
+
+    An export of the same inputs is returned instead of queueing another;
+    when it already finished the response is 200 with its download URL.
+    """
+    await get_project_run(project_id, body.run_id, user_id, db)
+    try:
+        job, _ = await request_export(
+            db, project_id, body.run_id, body.format, PaperFilter(**body.filters.model_dump())
+        )
+    except ExportError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    await db.commit()
+    if job.status == "completed":
+        response.status_code = 200
+    return job_read(job)
+
+
+@router.get("/{project_id}/exports", response_model=List[ExportJobRead])
+async def list_exports(
+    project_id: uuid.UUID,
+    limit: int = 50,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> List[ExportJobRead]:
+    await get_owned_project(project_id, user_id, db)
+    result = await db.scalars(
+        select(ExportJob)
+        .where(ExportJob.project_id == project_id)
+        .order_by(ExportJob.created_at.desc(), ExportJob.id)
+        .limit(limit)
+    )
+    return [job_read(job) for job in result]
+
+
+@router.get("/{project_id}/exports/{job_id}", response_model=ExportJobRead)
+async def get_export(
+    project_id: uuid.UUID,
+    job_id: uuid.UUID,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> ExportJobRead:
+    """The job's status; poll until it is completed or failed."""
+    return job_read(await get_project_export(project_id, job_id, user_id, db))
+
+
+@router.get("/{project_id}/exports/{job_id}/download")
+async def download_export(
+    project_id: uuid.UUID,
+    job_id: uuid.UUID,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> FileResponse:
+    job = await get_project_export(project_id, job_id, user_id, db)
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Export is {job.status}")
+    return await file_response(job.storage_key, job.content_hash, job.media_type, job.filename)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import math
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_read_db
+from app.models.graph import GraphEdge, GraphLayout, GraphNode
+from app.models.paper import Paper
+from app.responses import FastJSONResponse, schema_columns, schema_row
+from app.routers.projects import get_current_user_id
+from app.routers.runs import get_owned_project
+from app.schemas.graph import GraphEdgeRead, GraphLayoutRead, GraphRead, GraphView
+from app.services.graph_view import Viewport, graph_view
+
+router = APIRouter()
+
+
+async def get_project_layout(
+    project_id: uuid.UUID, user_id: uuid.UUID, db: AsyncSession
+) -> GraphLayout:
+    await get_owned_project(project_id, user_id, db)
+    layout = await db.get(GraphLayout, project_id)
+    if layout is None:
+        raise HTTPException(status_code=404, detail="Graph not built yet")
+    return layout
+
+
+@router.get("/{project_id}/graph", response_model=GraphRead)
+async def get_graph(
+    project_id: uuid.UUID,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> FastJSONResponse:
+    """The whole paper graph with its persisted layout coordinates."""
+    layout = await get_project_layout(project_id, user_id, db)
+    nodes = await db.execute(
+        select(GraphNode.paper_id, Paper.title, GraphNode.x, GraphNode.y, GraphNode.cluster)
+        .join(Paper, Paper.id == GraphNode.paper_id)
+        .where(GraphNode.project_id == project_id)
+        .order_by(GraphNode.paper_id)
+    )
+    edges = await db.execute(
+        select(*schema_columns(GraphEdge, GraphEdgeRead))
+        .where(GraphEdge.project_id == project_id)
+        .order_by(GraphEdge.source_id, GraphEdge.target_id)
+    )
+    return FastJSONResponse(
+        {
+            "layout": GraphLayoutRead.model_validate(layout).model_dump(mode="json"),
+            "nodes": [dict(row) for row in nodes.mappings()],
+            "edges": [schema_row(row, GraphEdgeRead) for row in edges.mappings()],
+        }
+    )
+
+
+@router.get("/{project_id}/graph/view", response_model=GraphView)
+async def get_graph_view(
+    project_id: uuid.UUID,
+    x0: float,
+    y0: float,
+    x1: float,
+    y1: float,
+    zoom: float = Query(gt=0),
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> FastJSONResponse:
+    """What is visible in the box ``[x0, x1] x [y0, y1]`` at ``zoom`` pixels per unit.
+
+    Papers with their top edges when zoomed in far enough, otherwise one
+    super-node per taxonomy leaf; see ``app.services.graph_view``.
+    """
+    # Query parsing accepts inf and nan, which have no grid cell
+    if not all(math.isfinite(v) for v in (x0, y0, x1, y1, zoom)):
+        raise HTTPException(status_code=400, detail="Viewport bounds and zoom must be finite")
+    if x1 < x0 or y1 < y0:
+        raise HTTPException(status_code=400, detail="Viewport corners are out of order")
+    layout = await get_project_layout(project_id, user_id, db)
+    view = await graph_view(db, layout, Viewport(x0, y0, x1, y1, zoom))
+    return FastJSONResponse(view)
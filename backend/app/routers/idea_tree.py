@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import uuid
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db, get_read_db
+from app.models.idea_tree import IdeaNodePaper, IdeaTree
+from app.models.paper import Paper
+from app.models.run import Run
+from app.pipeline.taxonomy import load_taxonomy
+from app.routers.projects import get_current_user_id
+from app.routers.runs import get_owned_project
+from app.schemas.idea_tree import (
+    IdeaNodeRead,
+    IdeaTreeCreate,
+    IdeaTreeLevel,
+    IdeaTreePatch,
+    IdeaTreePatchResult,
+    IdeaTreeRead,
+)
+from app.schemas.paper import PaperSummary
+from app.services.idea_tree import (
+    EditConflict,
+    InvalidEdit,
+    NodeNotFound,
+    apply_ops,
+    get_node,
+    get_tree,
+    node_level,
+    seed_from_taxonomy,
+    set_locked,
+)
+
+router = APIRouter()
+
+
+async def get_project_tree(
+    project_id: uuid.UUID, user_id: uuid.UUID, db: AsyncSession
+) -> IdeaTree:
+    await get_owned_project(project_id, user_id, db)
+    tree = await get_tree(db, project_id)
+    if tree is None:
+        raise HTTPException(status_code=404, detail="Idea tree not found")
+    return tree
+
+
+@router.post("/{project_id}/idea-tree", response_model=IdeaTreeRead, status_code=201)
+async def create_idea_tree(
+    project_id: uuid.UUID,
+    body: IdeaTreeCreate,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> IdeaTree:
+    """Seed the tree from a run's taxonomy, replacing the current tree unless locked."""
+    await get_owned_project(project_id, user_id, db)
+    run = await db.scalar(select(Run).where(Run.id == body.run_id, Run.project_id == project_id))
+    nodes = await load_taxonomy(db, run.id) if run is not None else None
+    if nodes is None:
+        raise HTTPException(status_code=404, detail="Run taxonomy not found")
+    try:
+        tree = await seed_from_taxonomy(db, project_id, run.id, nodes)
+    except EditConflict as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    await db.commit()
+    return tree
+
+
+@router.get("/{project_id}/idea-tree", response_model=IdeaTreeLevel)
+async def get_idea_tree_level(
+    project_id: uuid.UUID,
+    parent_id: Optional[uuid.UUID] = None,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> IdeaTreeLevel:
+    """One level of the tree: the children of ``parent_id``, or the roots."""
+    tree = await get_project_tree(project_id, user_id, db)
+    if parent_id is not None:
+        try:
+            await get_node(db, tree.id, parent_id)
+        except NodeNotFound as exc:
+            raise HTTPException(status_code=404, detail=str(exc))
+    nodes = await node_level(db, tree, parent_id)
+    return IdeaTreeLevel(
+        tree=IdeaTreeRead.model_validate(tree),
+        parent_id=parent_id,
+        nodes=[IdeaNodeRead(**node) for node in nodes],
+    )
+
+
+@router.patch("/{project_id}/idea-tree", response_model=IdeaTreePatchResult)
+async def patch_idea_tree(
+    project_id: uuid.UUID,
+    body: IdeaTreePatch,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> IdeaTreePatchResult:
+    """Apply a batch of edits made against ``version``; all or nothing."""
+    tree = await get_project_tree(project_id, user_id, db)
+    try:
+        created = await apply_ops(db, tree, body.version, body.ops)
+    except EditConflict as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except NodeNotFound as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except InvalidEdit as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    await db.commit()
+    await db.refresh(tree)
+    return IdeaTreePatchResult(tree=IdeaTreeRead.model_validate(tree), created=created)
+
+
+@router.get(
+    "/{project_id}/idea-tree/nodes/{node_id}/papers", response_model=List[PaperSummary]
+)
+async def list_node_papers(
+    project_id: uuid.UUID,
+    node_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 50,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> List[Paper]:
+    """Papers placed directly on the node, by title."""
+    tree = await get_project_tree(project_id, user_id, db)
+    try:
+        await get_node(db, tree.id, node_id)
+    except NodeNotFound as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    result = await db.execute(
+        select(Paper)
+        .join(IdeaNodePaper, IdeaNodePaper.paper_id == Paper.id)
+        .where(IdeaNodePaper.node_id == node_id)
+        .order_by(Paper.title, Paper.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+@router.put("/{project_id}/idea-tree/lock", response_model=IdeaTreeRead)
+async def lock_idea_tree(
+    project_id: uuid.UUID,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> IdeaTree:
+    """Freeze the taxonomy: edits and re-seeding are refused until unlocked."""
+    tree = await get_project_tree(project_id, user_id, db)
+    await set_locked(db, tree, True)
+    await db.commit()
+    return tree
+
+
+@router.delete("/{project_id}/idea-tree/lock", response_model=IdeaTreeRead)
+async def unlock_idea_tree(
+    project_id: uuid.UUID,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> IdeaTree:
+    tree = await get_project_tree(project_id, user_id, db)
+    await set_locked(db, tree, False)
+    await db.commit()
+    return tree
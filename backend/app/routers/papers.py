@@ -2,39 +2,123 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional, Set
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.models.dedup import PaperLSHBucket
 from app.models.paper import Paper, ProjectPaper
+from app.responses import FastJSONResponse, scalar_field_names, schema_columns, schema_row
 from app.routers.projects import get_current_user_id
 from app.routers.runs import get_owned_project
-from app.schemas.paper import PaperCreate, ProjectPaperCreate, ProjectPaperRead
+from app.pipeline.citations import CitationSource, expand_citations, get_citation_source
+from app.schemas.paper import (
+    CitationExpansionCreate,
+    CitationExpansionRead,
+    DedupReport,
+    DuplicateGroup,
+    PaperBatch,
+    PaperBatchGet,
+    PaperCreate,
+    PaperFacets,
+    PaperRead,
+    PaperSummary,
+    ProjectPaperCreate,
+    ProjectPaperListItem,
+    ProjectPaperRead,
+    ProjectPaperSearchHit,
+)
+from app.services.dedup import Fingerprint, cluster_duplicates, index_rows
+from app.services.embeddings import store_paper_embeddings
+from app.services.paper_queries import SORT_OPTIONS, PaperFilter, order_by, paper_facets
+from app.services.papers import find_or_create_paper
+from app.services.project_stats import record_papers_added, refresh_project_stats
+from app.services.search import hybrid_search
 
 router = APIRouter()
 
 
-@router.get("/{project_id}/papers", response_model=List[ProjectPaperRead])
+def parse_paper_fields(fields: Optional[str]) -> Optional[Set[str]]:
+    """``fields=title,year`` -> {"id", "title", "year"}; None means every list field."""
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    allowed = scalar_field_names(PaperSummary)
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))} (allowed: {', '.join(allowed)})",
+        )
+    return requested | {"id"}
+
+
+def paper_filter(
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    author: Optional[str] = Query(default=None, description="Exact author name"),
+    score_min: Optional[float] = None,
+    score_max: Optional[float] = None,
+    inclusion_reason: Optional[str] = Query(default=None, description="Prefix match"),
+) -> PaperFilter:
+    return PaperFilter(
+        year_min=year_min,
+        year_max=year_max,
+        author=author,
+        score_min=score_min,
+        score_max=score_max,
+        inclusion_reason=inclusion_reason,
+    )
+
+
+@router.get("/{project_id}/papers", response_model=List[ProjectPaperListItem])
 async def list_papers(
     project_id: uuid.UUID,
     skip: int = 0,
     limit: int = 50,
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated paper fields to return, e.g. title,authors,year",
+    ),
+    sort: str = Query(default="added_at", description="Sort key; prefix with - to descend"),
+    flt: PaperFilter = Depends(paper_filter),
     user_id: uuid.UUID = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db),
-) -> List[ProjectPaper]:
+    db: AsyncSession = Depends(get_read_db),
+) -> FastJSONResponse:
+    """Papers without abstracts; ``get_paper`` returns the full record."""
     await get_owned_project(project_id, user_id, db)
+    paper_fields = parse_paper_fields(fields)
+    if sort not in SORT_OPTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown sort: {sort} (allowed: {', '.join(SORT_OPTIONS)})",
+        )
+    # Plain columns in one joined query: no ORM objects, no response validation,
+    # and only the requested paper columns leave the database.
     result = await db.execute(
-        select(ProjectPaper)
-        .where(ProjectPaper.project_id == project_id)
-        .options(selectinload(ProjectPaper.paper))
+        select(
+            *schema_columns(ProjectPaper, ProjectPaperListItem),
+            *schema_columns(Paper, PaperSummary, prefix="paper.", fields=paper_fields),
+        )
+        .join(Paper, Paper.id == ProjectPaper.paper_id)
+        .where(ProjectPaper.project_id == project_id, *flt.conditions(db.bind.dialect.name))
+        .order_by(*order_by(sort))
         .offset(skip)
         .limit(limit)
     )
-    return list(result.scalars().all())
+    return FastJSONResponse(
+        [
+            {
+                **schema_row(row, ProjectPaperListItem),
+                "paper": schema_row(row, PaperSummary, prefix="paper.", fields=paper_fields),
+            }
+            for row in result.mappings()
+        ]
+    )
 
 
 @router.post("/{project_id}/papers", response_model=ProjectPaperRead, status_code=201)
@@ -44,28 +128,11 @@ async def add_paper(
     user_id: uuid.UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ) -> ProjectPaper:
-    await get_owned_project(project_id, user_id, db)
+    await get_owned_project(project_id, user_id, db, lock=True)
 
-    # Find or create paper by DOI or arxiv_id
-    paper: Optional[Paper] = None
-    if body.doi:
-        result = await db.execute(select(Paper).where(Paper.doi == body.doi))
-        paper = result.scalar_one_or_none()
-    if paper is None and body.arxiv_id:
-        result = await db.execute(select(Paper).where(Paper.arxiv_id == body.arxiv_id))
-        paper = result.scalar_one_or_none()
-    if paper is None:
-        paper = Paper(
-            doi=body.doi,
-            arxiv_id=body.arxiv_id,
-            title=body.title,
-            authors=body.authors,
-            year=body.year,
-            abstract=body.abstract,
-            created_at=datetime.utcnow(),
-        )
-        db.add(paper)
-        await db.flush()
+    paper, created = await find_or_create_paper(db, body)
+    if created:
+        await store_paper_embeddings(db, [paper])
 
     # Check if already linked to this project
     result = await db.execute(
@@ -84,6 +151,7 @@ async def add_paper(
     db.add(pp)
     await db.flush()
     await db.refresh(pp)
+    await record_papers_added(db, project_id, [paper.year])
 
     # Eagerly load paper for response
     result = await db.execute(
@@ -105,11 +173,12 @@ async def link_paper(
     user_id: uuid.UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ) -> ProjectPaper:
-    await get_owned_project(project_id, user_id, db)
+    await get_owned_project(project_id, user_id, db, lock=True)
 
     # Verify paper exists
     result = await db.execute(select(Paper).where(Paper.id == body.paper_id))
-    if result.scalar_one_or_none() is None:
+    paper = result.scalar_one_or_none()
+    if paper is None:
         raise HTTPException(status_code=404, detail="Paper not found")
 
     # Check if already linked
@@ -130,6 +199,7 @@ async def link_paper(
     )
     db.add(pp)
     await db.flush()
+    await record_papers_added(db, project_id, [paper.year])
 
     result = await db.execute(
         select(ProjectPaper)
@@ -139,12 +209,198 @@ async def link_paper(
     return result.scalar_one()
 
 
+@router.post("/{project_id}/papers/dedup", response_model=DedupReport)
+async def dedup_papers(
+    project_id: uuid.UUID,
+    merge: bool = False,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> DedupReport:
+    """Find near-duplicate papers in a project; with ``merge=true`` keep only the oldest."""
+    await get_owned_project(project_id, user_id, db)
+    result = await db.execute(
+        select(
+            Paper.id,
+            Paper.title,
+            Paper.authors,
+            Paper.year,
+            Paper.doi,
+            Paper.arxiv_id,
+            exists().where(PaperLSHBucket.paper_id == Paper.id),
+        )
+        .join(ProjectPaper, ProjectPaper.paper_id == Paper.id)
+        .where(ProjectPaper.project_id == project_id)
+        .order_by(Paper.created_at, Paper.id)
+    )
+    items = []
+    for paper_id, title, authors, year, doi, arxiv_id, indexed in result.all():
+        fingerprint = Fingerprint.of(title, authors, year, doi, arxiv_id)
+        items.append((paper_id, fingerprint))
+        if not indexed:
+            # Papers added before the LSH index existed.
+            db.add_all(index_rows(paper_id, fingerprint))
+    clusters = cluster_duplicates(items)
+
+    merged = 0
+    if merge and clusters:
+        involved = [c.canonical_id for c in clusters]
+        involved += [d for c in clusters for d in c.duplicate_ids]
+        result = await db.execute(
+            select(ProjectPaper).where(
+                ProjectPaper.project_id == project_id, ProjectPaper.paper_id.in_(involved)
+            )
+        )
+        links = {pp.paper_id: pp for pp in result.scalars().all()}
+        for cluster in clusters:
+            keep = links[cluster.canonical_id]
+            for duplicate_id in cluster.duplicate_ids:
+                dup = links[duplicate_id]
+                if dup.score is not None and (keep.score is None or dup.score > keep.score):
+                    keep.score = dup.score
+                keep.inclusion_reason = keep.inclusion_reason or dup.inclusion_reason
+                await db.delete(dup)
+                merged += 1
+    await db.flush()
+    if merged:
+        await refresh_project_stats(db, project_id)
+
+    return DedupReport(
+        groups=[
+            DuplicateGroup(
+                canonical_paper_id=c.canonical_id,
+                duplicate_paper_ids=c.duplicate_ids,
+                similarity=c.similarity,
+            )
+            for c in clusters
+        ],
+        merged=merged,
+    )
+
+
+@router.post("/{project_id}/papers/expand", response_model=CitationExpansionRead)
+async def expand_papers(
+    project_id: uuid.UUID,
+    body: CitationExpansionCreate,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+    source: CitationSource = Depends(get_citation_source),
+) -> CitationExpansionRead:
+    """Expand the project's papers along the citation graph."""
+    await get_owned_project(project_id, user_id, db)
+    result = await expand_citations(
+        db,
+        project_id,
+        source,
+        depth=body.depth,
+        budget=body.budget,
+        min_score=body.min_score,
+        max_fetches=body.max_fetches,
+    )
+    return CitationExpansionRead(**vars(result))
+
+
+@router.post("/{project_id}/papers/batch-get", response_model=PaperBatch)
+async def batch_get_papers(
+    project_id: uuid.UUID,
+    body: PaperBatchGet,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> FastJSONResponse:
+    """Full records of many papers in one ``IN (...)`` query, for graph and tree views.
+
+    A POST only because the id list would not fit in a URL; it writes nothing.
+    """
+    await get_owned_project(project_id, user_id, db)
+    wanted = list(dict.fromkeys(body.paper_ids))
+    result = await db.execute(
+        select(
+            *schema_columns(ProjectPaper, ProjectPaperRead),
+            *schema_columns(Paper, PaperRead, prefix="paper."),
+        )
+        .join(Paper, Paper.id == ProjectPaper.paper_id)
+        .where(ProjectPaper.project_id == project_id, ProjectPaper.paper_id.in_(wanted))
+    )
+    found = {
+        row["paper_id"]: {
+            **schema_row(row, ProjectPaperRead),
+            "paper": schema_row(row, PaperRead, prefix="paper."),
+        }
+        for row in result.mappings()
+    }
+    return FastJSONResponse(
+        {
+            "papers": [found[pid] for pid in wanted if pid in found],
+            "missing": [pid for pid in wanted if pid not in found],
+        }
+    )
+
+
+@router.get("/{project_id}/papers/facets", response_model=PaperFacets)
+async def get_paper_facets(
+    project_id: uuid.UUID,
+    flt: PaperFilter = Depends(paper_filter),
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> PaperFacets:
+    """Year, author and score-bucket counts over the papers matching the filter."""
+    await get_owned_project(project_id, user_id, db)
+    return PaperFacets(**await paper_facets(db, project_id, flt))
+
+
+@router.get("/{project_id}/papers/search", response_model=List[ProjectPaperSearchHit])
+async def search_papers(
+    project_id: uuid.UUID,
+    q: str = Query(min_length=1),
+    mode: Literal["hybrid", "lexical", "semantic"] = "hybrid",
+    lexical_weight: float = Query(default=1.0, ge=0),
+    semantic_weight: float = Query(default=1.0, ge=0),
+    limit: int = Query(default=20, ge=1, le=100),
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> List[ProjectPaperSearchHit]:
+    await get_owned_project(project_id, user_id, db)
+    if mode == "lexical":
+        semantic_weight = 0.0
+    elif mode == "semantic":
+        lexical_weight = 0.0
+    hits = await hybrid_search(
+        db,
+        project_id,
+        q,
+        lexical_weight=lexical_weight,
+        semantic_weight=semantic_weight,
+        limit=limit,
+    )
+    if not hits:
+        return []
+
+    result = await db.execute(
+        select(ProjectPaper)
+        .where(
+            ProjectPaper.project_id == project_id,
+            ProjectPaper.paper_id.in_([hit.paper_id for hit in hits]),
+        )
+        .options(selectinload(ProjectPaper.paper))
+    )
+    by_paper = {pp.paper_id: pp for pp in result.scalars().all()}
+    return [
+        ProjectPaperSearchHit(
+            **ProjectPaperRead.model_validate(by_paper[hit.paper_id]).model_dump(),
+            search_score=hit.score,
+            lexical_rank=hit.lexical_rank,
+            semantic_rank=hit.semantic_rank,
+        )
+        for hit in hits
+        if hit.paper_id in by_paper
+    ]
+
+
 @router.get("/{project_id}/papers/{paper_id}", response_model=ProjectPaperRead)
 async def get_paper(
     project_id: uuid.UUID,
     paper_id: uuid.UUID,
     user_id: uuid.UUID = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> ProjectPaper:
     await get_owned_project(project_id, user_id, db)
     result = await db.execute(
@@ -2,47 +2,84 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import List
 
-from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.auth import AuthUser, forget_project, get_current_user, require_project_owner
+from app.database import get_db, get_read_db
 from app.models.project import Project
-from app.models.user import User
-from app.schemas.project import ProjectCreate, ProjectRead, ProjectUpdate
+from app.models.stats import ProjectStats
+from app.responses import FastJSONResponse, schema_columns, schema_row
+from app.schemas.project import (
+    ProjectCreate,
+    ProjectListItem,
+    ProjectRead,
+    ProjectStatsRead,
+    ProjectUpdate,
+)
+from app.services.project_stats import create_project_stats
 
 router = APIRouter()
 
-# Stub auth: caller passes X-User-Id header. Real auth is Phase 2.
-async def get_current_user_id(x_user_id: Optional[str] = Header(default=None)) -> uuid.UUID:
-    if not x_user_id:
-        raise HTTPException(status_code=401, detail="X-User-Id header required")
-    try:
-        return uuid.UUID(x_user_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid X-User-Id")
+# Listed for a project without a project_stats row, e.g. in a database built
+# with create_all that was never backfilled
+EMPTY_STATS = {name: None for name in ProjectStatsRead.model_fields} | {
+    "paper_count": 0,
+    "run_count": 0,
+}
 
 
-async def ensure_user_exists(user_id: uuid.UUID, db: AsyncSession) -> None:
-    """Create a stub user record if it doesn't exist yet."""
-    result = await db.execute(select(User).where(User.id == user_id))
-    if result.scalar_one_or_none() is None:
-        db.add(User(id=user_id, email=f"{user_id}@stub.local", created_at=datetime.utcnow()))
+async def get_current_user_id(user: AuthUser = Depends(get_current_user)) -> uuid.UUID:
+    return user.id
 
 
-@router.get("", response_model=List[ProjectRead])
+async def get_owned_project_row(
+    project_id: uuid.UUID, user_id: uuid.UUID, db: AsyncSession
+) -> Project:
+    """The project, or 404 unless the user owns it."""
+    await require_project_owner(db, project_id, user_id)
+    project = await db.get(Project, project_id)
+    if project is None:
+        # The cached owner outlived a delete made by another process
+        await forget_project(project_id)
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project
+
+
+@router.get("", response_model=List[ProjectListItem])
 async def list_projects(
     skip: int = 0,
     limit: int = 50,
     user_id: uuid.UUID = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db),
-) -> List[Project]:
+    db: AsyncSession = Depends(get_read_db),
+) -> FastJSONResponse:
+    # Stats are read from the materialized project_stats row, never aggregated here.
     result = await db.execute(
-        select(Project).where(Project.owner_id == user_id).offset(skip).limit(limit)
+        select(
+            *schema_columns(Project, ProjectListItem),
+            *schema_columns(ProjectStats, ProjectStatsRead, prefix="stats."),
+        )
+        .outerjoin(ProjectStats, ProjectStats.project_id == Project.id)
+        .where(Project.owner_id == user_id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return FastJSONResponse(
+        [
+            {
+                **schema_row(row, ProjectListItem),
+                "stats": (
+                    EMPTY_STATS
+                    if row["stats.paper_count"] is None
+                    else schema_row(row, ProjectStatsRead, prefix="stats.")
+                ),
+            }
+            for row in result.mappings()
+        ]
     )
-    return list(result.scalars().all())
 
 
 @router.post("", response_model=ProjectRead, status_code=201)
@@ -51,7 +88,6 @@ async def create_project(
     user_id: uuid.UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ) -> Project:
-    await ensure_user_exists(user_id, db)
     now = datetime.utcnow()
     project = Project(
         owner_id=user_id,
@@ -62,6 +98,8 @@ async def create_project(
     )
     db.add(project)
     await db.flush()
+    create_project_stats(db, project.id)
+    await db.flush()
     await db.refresh(project)
     return project
 
@@ -70,15 +108,9 @@ async def create_project(
 async def get_project(
     project_id: uuid.UUID,
     user_id: uuid.UUID = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> Project:
-    result = await db.execute(
-        select(Project).where(Project.id == project_id, Project.owner_id == user_id)
-    )
-    project = result.scalar_one_or_none()
-    if project is None:
-        raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    return await get_owned_project_row(project_id, user_id, db)
 
 
 @router.patch("/{project_id}", response_model=ProjectRead)
@@ -88,12 +120,7 @@ async def update_project(
     user_id: uuid.UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ) -> Project:
-    result = await db.execute(
-        select(Project).where(Project.id == project_id, Project.owner_id == user_id)
-    )
-    project = result.scalar_one_or_none()
-    if project is None:
-        raise HTTPException(status_code=404, detail="Project not found")
+    project = await get_owned_project_row(project_id, user_id, db)
     if body.name is not None:
         project.name = body.name
     if body.description is not None:
@@ -110,10 +137,9 @@ async def delete_project(
     user_id: uuid.UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ) -> None:
-    result = await db.execute(
-        select(Project).where(Project.id == project_id, Project.owner_id == user_id)
-    )
-    project = result.scalar_one_or_none()
-    if project is None:
-        raise HTTPException(status_code=404, detail="Project not found")
+    project = await get_owned_project_row(project_id, user_id, db)
     await db.delete(project)
+    await db.flush()
+    # Before the commit, so the shared entry is gone by the time the delete is
+    # visible; see app.auth for the per-process window.
+    await forget_project(project_id)
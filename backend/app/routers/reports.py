@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import database
+from app.config import settings
+from app.database import get_read_db
+from app.models.report import Report, ReportPart, ReportSection
+from app.models.run import Run
+from app.routers.projects import get_current_user_id
+from app.routers.runs import get_owned_project
+from app.schemas.report import ReportPartRead, ReportRead
+from app.services.reports import report_events
+
+router = APIRouter()
+
+
+async def get_project_run(
+    project_id: uuid.UUID, run_id: uuid.UUID, user_id: uuid.UUID, db: AsyncSession
+) -> Run:
+    await get_owned_project(project_id, user_id, db)
+    run = await db.scalar(select(Run).where(Run.id == run_id, Run.project_id == project_id))
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return run
+
+
+@router.get("/{project_id}/runs/{run_id}/report", response_model=ReportRead)
+async def get_report(
+    project_id: uuid.UUID,
+    run_id: uuid.UUID,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> ReportRead:
+    """The report as written so far, part by part, in reading order."""
+    await get_project_run(project_id, run_id, user_id, db)
+    report = await db.get(Report, run_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not started")
+    result = await db.execute(
+        select(ReportPart, ReportSection.content)
+        .outerjoin(
+            ReportSection,
+            and_(
+                ReportSection.project_id == project_id,
+                ReportSection.key == ReportPart.section_key,
+            ),
+        )
+        .where(ReportPart.run_id == run_id)
+        .order_by(ReportPart.position)
+    )
+    parts = [
+        ReportPartRead(
+            position=part.position,
+            depth=part.depth,
+            node_id=part.node_id,
+            label=part.label,
+            content=content,
+            cached=part.cached,
+            completed_at=part.completed_at,
+        )
+        for part, content in result.all()
+    ]
+    return ReportRead(
+        run_id=report.run_id,
+        status=report.status,
+        total=report.total,
+        done=report.done,
+        content=report.content,
+        created_at=report.created_at,
+        completed_at=report.completed_at,
+        parts=parts,
+    )
+
+
+@router.get("/{project_id}/runs/{run_id}/report/stream")
+async def stream_report(
+    project_id: uuid.UUID,
+    run_id: uuid.UUID,
+    request: Request,
+    last_event_id: Optional[int] = Header(default=None),
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> StreamingResponse:
+    """Server-Sent Events: each report section as soon as it is written.
+
+    Open it when the run is created; sections arrive while the report stage
+    works, then a ``done`` event. ``Last-Event-ID`` resumes after a section.
+    """
+    await get_project_run(project_id, run_id, user_id, db)
+    events = report_events(
+        database.sessions.for_read(request),
+        project_id,
+        run_id,
+        after=last_event_id or 0,
+        interval=settings.report_stream_interval,
+    )
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,17 +1,32 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.database import get_db
-from app.models.project import Project
+from app.auth import require_project_owner
+from app.database import get_db, get_read_db
+from app.models.artifact import RunArtifact
+from app.models.profile import RunStageProfile
 from app.models.run import Run
+from app.responses import FastJSONResponse, schema_columns, schema_row
 from app.routers.projects import get_current_user_id
-from app.schemas.run import RunCreate, RunRead
+from app.schemas.run import (
+    CacheStats,
+    RunCreate,
+    RunDetail,
+    RunProfileRead,
+    RunRead,
+    StageProfileRead,
+)
+from app.services.project_stats import record_run_created, record_run_status
+from app.storage import file_response
 
 router = APIRouter()
 
@@ -20,14 +35,13 @@ async def get_owned_project(
     project_id: uuid.UUID,
     user_id: uuid.UUID,
     db: AsyncSession,
-) -> Project:
-    result = await db.execute(
-        select(Project).where(Project.id == project_id, Project.owner_id == user_id)
-    )
-    project = result.scalar_one_or_none()
-    if project is None:
-        raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    lock: bool = False,
+) -> None:
+    """404 unless the user owns the project; usually answered from the owner cache.
+
+    Pass ``lock`` before inserting rows that reference the project.
+    """
+    await require_project_owner(db, project_id, user_id, lock=lock)
 
 
 @router.get("/{project_id}/runs", response_model=List[RunRead])
@@ -36,13 +50,16 @@ async def list_runs(
     skip: int = 0,
     limit: int = 50,
     user_id: uuid.UUID = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db),
-) -> List[Run]:
+    db: AsyncSession = Depends(get_read_db),
+) -> FastJSONResponse:
     await get_owned_project(project_id, user_id, db)
     result = await db.execute(
-        select(Run).where(Run.project_id == project_id).offset(skip).limit(limit)
+        select(*schema_columns(Run, RunRead))
+        .where(Run.project_id == project_id)
+        .offset(skip)
+        .limit(limit)
     )
-    return list(result.scalars().all())
+    return FastJSONResponse([schema_row(row, RunRead) for row in result.mappings()])
 
 
 @router.post("/{project_id}/runs", response_model=RunRead, status_code=201)
@@ -52,26 +69,151 @@ async def create_run(
     user_id: uuid.UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ) -> Run:
-    await get_owned_project(project_id, user_id, db)
-    run = Run(project_id=project_id, config_snapshot=body.config_snapshot)
+    await get_owned_project(project_id, user_id, db, lock=True)
+    run = Run(project_id=project_id, config_snapshot=body.config_snapshot, lane=body.lane)
     db.add(run)
     await db.flush()
     await db.refresh(run)
+    await record_run_created(db, run)
     return run
 
 
-@router.get("/{project_id}/runs/{run_id}", response_model=RunRead)
+@router.get("/{project_id}/runs/{run_id}", response_model=RunDetail)
 async def get_run(
+    project_id: uuid.UUID,
+    run_id: uuid.UUID,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> Run:
+    await get_owned_project(project_id, user_id, db)
+    result = await db.execute(
+        select(Run)
+        .where(Run.id == run_id, Run.project_id == project_id)
+        .options(selectinload(Run.artifacts))
+    )
+    run = result.scalar_one_or_none()
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return run
+
+
+@router.get("/{project_id}/runs/{run_id}/artifacts/{name}")
+async def download_artifact(
+    project_id: uuid.UUID,
+    run_id: uuid.UUID,
+    name: str,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> FileResponse:
+    """The artifact's stored bytes (``.npy`` or compressed NDJSON)."""
+    await get_owned_project(project_id, user_id, db)
+    result = await db.execute(
+        select(RunArtifact)
+        .join(Run, Run.id == RunArtifact.run_id)
+        .where(
+            RunArtifact.run_id == run_id,
+            RunArtifact.name == name,
+            Run.project_id == project_id,
+        )
+    )
+    artifact = result.scalar_one_or_none()
+    if artifact is None:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    return await file_response(
+        artifact.storage_key,
+        artifact.content_hash,
+        "application/octet-stream",
+        f"{artifact.name}.{artifact.format}",
+    )
+
+
+@router.post("/{project_id}/runs/{run_id}/cancel", response_model=RunRead, status_code=202)
+async def cancel_run(
     project_id: uuid.UUID,
     run_id: uuid.UUID,
     user_id: uuid.UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ) -> Run:
+    """Cancel a queued run now, or ask the worker executing it to stop."""
     await get_owned_project(project_id, user_id, db)
+    # Row lock: a worker claiming this run concurrently either sees the
+    # cancellation or has finished claiming it before we look at the status.
     result = await db.execute(
-        select(Run).where(Run.id == run_id, Run.project_id == project_id)
+        select(Run).where(Run.id == run_id, Run.project_id == project_id).with_for_update()
     )
     run = result.scalar_one_or_none()
     if run is None:
         raise HTTPException(status_code=404, detail="Run not found")
+    if run.status not in ("pending", "running"):
+        raise HTTPException(status_code=409, detail=f"Run is already {run.status}")
+    now = datetime.utcnow()
+    run.cancel_requested_at = run.cancel_requested_at or now
+    if run.status == "pending":
+        run.status = "cancelled"
+        run.completed_at = now
+        await record_run_status(db, run)
+    await db.flush()
+    await db.refresh(run)
     return run
+
+
+@router.get("/{project_id}/runs/{run_id}/profile", response_model=RunProfileRead)
+async def get_run_profile(
+    project_id: uuid.UUID,
+    run_id: uuid.UUID,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> RunProfileRead:
+    """Per-stage performance record of a run; stages appear as they finish."""
+    await get_owned_project(project_id, user_id, db)
+    status = await db.scalar(
+        select(Run.status).where(Run.id == run_id, Run.project_id == project_id)
+    )
+    if status is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    result = await db.execute(
+        select(RunStageProfile)
+        .where(RunStageProfile.run_id == run_id)
+        .order_by(RunStageProfile.position)
+    )
+    stages = [
+        StageProfileRead(
+            stage=row.stage,
+            started_at=row.started_at,
+            wall_seconds=row.wall_seconds,
+            cpu_seconds=row.cpu_seconds,
+            peak_rss_bytes=row.peak_rss_bytes,
+            db_seconds=row.db_seconds,
+            db_statements=row.db_statements,
+            llm_calls=row.llm_calls,
+            llm_prompt_tokens=row.llm_prompt_tokens,
+            llm_completion_tokens=row.llm_completion_tokens,
+            cache={
+                name: CacheStats(
+                    hits=counts["hits"],
+                    misses=counts["misses"],
+                    hit_rate=(
+                        counts["hits"] / (counts["hits"] + counts["misses"])
+                        if counts["hits"] + counts["misses"]
+                        else None
+                    ),
+                )
+                for name, counts in row.cache.items()
+            },
+            samples=row.samples,
+            error=row.error,
+        )
+        for row in result.scalars().all()
+    ]
+    return RunProfileRead(
+        run_id=run_id,
+        status=status,
+        wall_seconds=sum(s.wall_seconds for s in stages),
+        cpu_seconds=sum(s.cpu_seconds for s in stages),
+        db_seconds=sum(s.db_seconds for s in stages),
+        peak_rss_bytes=max((s.peak_rss_bytes for s in stages), default=0),
+        llm_calls=sum(s.llm_calls for s in stages),
+        llm_prompt_tokens=sum(s.llm_prompt_tokens for s in stages),
+        llm_completion_tokens=sum(s.llm_completion_tokens for s in stages),
+        stages=stages,
+    )
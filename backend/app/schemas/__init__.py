@@ -1,15 +1,124 @@
-from app.schemas.paper import PaperCreate, PaperRead, ProjectPaperCreate, ProjectPaperRead
-from app.schemas.project import ProjectCreate, ProjectRead, ProjectUpdate
-from app.schemas.run import RunCreate, RunRead
+from app.schemas.document import (
+    DocumentSection,
+    PaperDocumentDetail,
+    PaperDocumentRead,
+    PdfUploadCreate,
+    PdfUploadRead,
+)
+from app.schemas.graph import (
+    GraphCluster,
+    GraphClusterEdge,
+    GraphEdgeRead,
+    GraphLayoutRead,
+    GraphNodeRead,
+    GraphRead,
+    GraphView,
+)
+from app.schemas.idea_tree import (
+    IdeaNodeRead,
+    IdeaTreeCreate,
+    IdeaTreeLevel,
+    IdeaTreePatch,
+    IdeaTreePatchResult,
+    IdeaTreeRead,
+    MergeNodes,
+    MoveNode,
+    MovePapers,
+    RenameNode,
+    SplitNode,
+)
+from app.schemas.paper import (
+    CitationExpansionCreate,
+    CitationExpansionRead,
+    DedupReport,
+    DuplicateGroup,
+    AuthorCount,
+    PaperCreate,
+    PaperFacets,
+    PaperRead,
+    PaperSummary,
+    ProjectPaperCreate,
+    ProjectPaperListItem,
+    ProjectPaperRead,
+    ProjectPaperSearchHit,
+    ScoreBucketCount,
+    SparsePaperSummary,
+    YearCount,
+)
+from app.schemas.project import (
+    ProjectCreate,
+    ProjectListItem,
+    ProjectRead,
+    ProjectStatsRead,
+    ProjectUpdate,
+)
+from app.schemas.report import ReportPartRead, ReportRead
+from app.schemas.run import (
+    ArtifactManifest,
+    CacheStats,
+    LaneMetrics,
+    QueueMetrics,
+    RunCreate,
+    RunDetail,
+    RunProfileRead,
+    RunRead,
+    StageProfileRead,
+)
 
 __all__ = [
     "ProjectCreate",
     "ProjectRead",
+    "ProjectListItem",
+    "ProjectStatsRead",
     "ProjectUpdate",
     "RunCreate",
     "RunRead",
+    "RunDetail",
+    "ArtifactManifest",
+    "CacheStats",
+    "StageProfileRead",
+    "RunProfileRead",
+    "LaneMetrics",
+    "QueueMetrics",
     "PaperCreate",
+    "CitationExpansionCreate",
+    "CitationExpansionRead",
+    "DedupReport",
+    "DuplicateGroup",
     "PaperRead",
+    "PaperSummary",
     "ProjectPaperCreate",
+    "ProjectPaperListItem",
     "ProjectPaperRead",
+    "ProjectPaperSearchHit",
+    "SparsePaperSummary",
+    "PaperFacets",
+    "YearCount",
+    "AuthorCount",
+    "ScoreBucketCount",
+    "DocumentSection",
+    "PaperDocumentRead",
+    "PaperDocumentDetail",
+    "PdfUploadCreate",
+    "PdfUploadRead",
+    "IdeaTreeCreate",
+    "IdeaTreeRead",
+    "IdeaNodeRead",
+    "IdeaTreeLevel",
+    "IdeaTreePatch",
+    "IdeaTreePatchResult",
+    "RenameNode",
+    "MoveNode",
+    "MovePapers",
+    "MergeNodes",
+    "SplitNode",
+    "GraphCluster",
+    "GraphLayoutRead",
+    "GraphNodeRead",
+    "GraphEdgeRead",
+    "GraphRead",
+    "GraphClusterEdge",
+    "GraphView",
+    "ReportRead",
+    "ReportPartRead",
 ]
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class DocumentSection(BaseModel):
+    title: str
+    text: str
+
+
+class PaperDocumentRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    paper_id: uuid.UUID
+    content_hash: str
+    size_bytes: int
+    status: str
+    page_count: Optional[int]
+    error: Optional[str]
+    created_at: datetime
+    parsed_at: Optional[datetime]
+
+
+class PaperDocumentDetail(PaperDocumentRead):
+    text: Optional[str]
+    sections: List[DocumentSection]
+    references: List[str]
+
+
+class PdfUploadCreate(BaseModel):
+    paper_id: uuid.UUID
+    filename: str = Field(min_length=1, max_length=255)
+    size: int = Field(gt=0)
+
+
+class PdfUploadRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    project_id: uuid.UUID
+    paper_id: uuid.UUID
+    filename: str
+    size: int
+    offset: int
+    status: str
+    document_id: Optional[uuid.UUID]
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class ExportFilters(BaseModel):
+    """The Explore filters of ``GET /projects/{id}/papers`` the export applies."""
+
+    year_min: Optional[int] = None
+    year_max: Optional[int] = None
+    author: Optional[str] = None
+    score_min: Optional[float] = None
+    score_max: Optional[float] = None
+    inclusion_reason: Optional[str] = None
+
+
+class ExportCreate(BaseModel):
+    run_id: uuid.UUID
+    format: Literal["markdown", "latex", "pdf", "slides"]
+    filters: ExportFilters = ExportFilters()
+
+
+class ExportJobRead(BaseModel):
+    id: uuid.UUID
+    run_id: uuid.UUID
+    format: str
+    filters: Dict[str, Any]
+    layout_version: int
+    # "queued" | "running" | "completed" | "failed"
+    status: str
+    error: Optional[str]
+    media_type: Optional[str]
+    filename: Optional[str]
+    size_bytes: Optional[int]
+    # Set once completed
+    download_url: Optional[str]
+    created_at: datetime
+    completed_at: Optional[datetime]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class GraphCluster(BaseModel):
+    # Taxonomy leaf id, label and size, at the mean position of its papers
+    id: int
+    label: str
+    size: int
+    x: float
+    y: float
+
+
+class GraphLayoutRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    version: int
+    run_id: Optional[uuid.UUID]
+    seed: int
+    node_count: int
+    edge_count: int
+    clusters: List[GraphCluster]
+    updated_at: datetime
+
+
+class GraphNodeRead(BaseModel):
+    paper_id: uuid.UUID
+    title: str
+    x: float
+    y: float
+    cluster: Optional[int]
+
+
+class GraphEdgeRead(BaseModel):
+    source_id: uuid.UUID
+    target_id: uuid.UUID
+    weight: float
+    # "similar" | "cites"
+    kind: str
+
+
+class GraphRead(BaseModel):
+    layout: GraphLayoutRead
+    nodes: List[GraphNodeRead]
+    edges: List[GraphEdgeRead]
+
+
+class GraphClusterEdge(BaseModel):
+    source: int
+    target: int
+    # Number of paper edges between the two leaves
+    weight: int
+
+
+class GraphView(BaseModel):
+    """The part of the graph inside a viewport, at the detail its zoom allows."""
+
+    version: int
+    # "nodes": papers and their top edges; "clusters": one super-node per leaf
+    mode: Literal["nodes", "clusters"]
+    # Papers inside the viewport, drawn individually or not
+    visible: int
+    nodes: List[GraphNodeRead]
+    edges: List[GraphEdgeRead]
+    clusters: List[GraphCluster]
+    cluster_edges: List[GraphClusterEdge]
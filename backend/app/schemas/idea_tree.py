@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import List, Literal, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, Field
+from typing_extensions import Annotated
+
+
+class IdeaTreeCreate(BaseModel):
+    # Run whose taxonomy seeds the tree; replaces an unlocked existing tree
+    run_id: uuid.UUID
+
+
+class IdeaTreeRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    project_id: uuid.UUID
+    source_run_id: Optional[uuid.UUID]
+    version: int
+    locked_at: Optional[datetime]
+    updated_at: datetime
+
+
+class IdeaNodeRead(BaseModel):
+    id: uuid.UUID
+    parent_id: Optional[uuid.UUID]
+    depth: int
+    position: int
+    label: str
+    # Papers on this node itself / in its whole subtree
+    paper_count: int
+    subtree_paper_count: int
+    child_count: int
+
+
+class IdeaTreeLevel(BaseModel):
+    """One level of the tree: the children of ``parent_id`` (the roots if None)."""
+
+    tree: IdeaTreeRead
+    parent_id: Optional[uuid.UUID]
+    nodes: List[IdeaNodeRead]
+
+
+class RenameNode(BaseModel):
+    op: Literal["rename"]
+    node_id: uuid.UUID
+    label: str = Field(min_length=1, max_length=200)
+
+
+class MoveNode(BaseModel):
+    op: Literal["move"]
+    node_id: uuid.UUID
+    parent_id: uuid.UUID
+    # Index among the new siblings; default appends
+    position: Optional[int] = Field(default=None, ge=0)
+
+
+class MovePapers(BaseModel):
+    op: Literal["move_papers"]
+    paper_ids: List[uuid.UUID] = Field(min_length=1, max_length=1000)
+    node_id: uuid.UUID
+
+
+class MergeNodes(BaseModel):
+    """Fold ``source_id`` into ``target_id``: its papers and children move over."""
+
+    op: Literal["merge"]
+    source_id: uuid.UUID
+    target_id: uuid.UUID
+
+
+class SplitNode(BaseModel):
+    """Move ``paper_ids`` of ``node_id`` into a new sibling labeled ``label``."""
+
+    op: Literal["split"]
+    node_id: uuid.UUID
+    label: str = Field(min_length=1, max_length=200)
+    paper_ids: List[uuid.UUID] = Field(min_length=1, max_length=1000)
+
+
+IdeaTreeOp = Annotated[
+    Union[RenameNode, MoveNode, MovePapers, MergeNodes, SplitNode], Field(discriminator="op")
+]
+
+
+class IdeaTreePatch(BaseModel):
+    # The version the edits were made against; 409 if the tree has moved on
+    version: int
+    ops: List[IdeaTreeOp] = Field(min_length=1, max_length=100)
+
+
+class IdeaTreePatchResult(BaseModel):
+    tree: IdeaTreeRead
+    # Nodes created by split ops, in op order
+    created: List[uuid.UUID]
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class PaperCreate(BaseModel):
@@ -29,6 +29,35 @@ class PaperRead(BaseModel):
     created_at: datetime
 
 
+class PaperSummary(BaseModel):
+    """Paper without its abstract, for list views; ``get_paper`` has the full record."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    doi: Optional[str]
+    arxiv_id: Optional[str]
+    title: str
+    authors: List[str]
+    year: Optional[int]
+    created_at: datetime
+
+
+class SparsePaperSummary(BaseModel):
+    """``PaperSummary`` as ``list_papers`` returns it: ``id`` plus the requested
+    fields. Fields left out by ``fields=`` are absent, not null."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    doi: Optional[str] = None
+    arxiv_id: Optional[str] = None
+    title: Optional[str] = None
+    authors: Optional[List[str]] = None
+    year: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+
 class ProjectPaperCreate(BaseModel):
     paper_id: uuid.UUID
     inclusion_reason: Optional[str] = None
@@ -45,3 +74,88 @@ class ProjectPaperRead(BaseModel):
     score: Optional[float]
     added_at: datetime
     paper: PaperRead
+
+
+class PaperBatchGet(BaseModel):
+    # Paper ids (ProjectPaperRead.paper_id); duplicates are returned once
+    paper_ids: List[uuid.UUID] = Field(min_length=1, max_length=500)
+
+
+class PaperBatch(BaseModel):
+    # In the order requested
+    papers: List[ProjectPaperRead]
+    # Requested ids that are not in the project
+    missing: List[uuid.UUID]
+
+
+class ProjectPaperListItem(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    project_id: uuid.UUID
+    paper_id: uuid.UUID
+    inclusion_reason: Optional[str]
+    score: Optional[float]
+    added_at: datetime
+    # Every PaperSummary field, or only the requested ones (plus id) with ``fields=``
+    paper: SparsePaperSummary
+
+
+class ProjectPaperSearchHit(ProjectPaperRead):
+    search_score: float
+    lexical_rank: Optional[int]
+    semantic_rank: Optional[int]
+
+
+class DuplicateGroup(BaseModel):
+    canonical_paper_id: uuid.UUID
+    duplicate_paper_ids: List[uuid.UUID]
+    similarity: float
+
+
+class DedupReport(BaseModel):
+    groups: List[DuplicateGroup]
+    merged: int
+
+
+class CitationExpansionCreate(BaseModel):
+    depth: int = Field(default=1, ge=1, le=3)
+    # Maximum number of papers to add to the project
+    budget: int = Field(default=50, ge=1, le=500)
+    min_score: float = Field(default=0.0, ge=0.0, le=1.0)
+    # Cap on citation API requests; defaults to seeds + 4 * budget
+    max_fetches: Optional[int] = Field(default=None, ge=1, le=10000)
+
+
+class CitationExpansionRead(BaseModel):
+    seeds: int
+    fetched: int
+    failed: int
+    discovered: int
+    added: int
+    edges: int
+
+
+class YearCount(BaseModel):
+    year: Optional[int]
+    count: int
+
+
+class AuthorCount(BaseModel):
+    author: str
+    count: int
+
+
+class ScoreBucketCount(BaseModel):
+    # [min, max) score range; both None for papers without a score
+    min: Optional[float]
+    max: Optional[float]
+    count: int
+
+
+class PaperFacets(BaseModel):
+    total: int
+    years: List[YearCount]
+    # Most frequent authors only
+    authors: List[AuthorCount]
+    score_buckets: List[ScoreBucketCount]
@@ -26,3 +26,19 @@ class ProjectRead(BaseModel):
     description: Optional[str]
     created_at: datetime
     updated_at: datetime
+
+
+class ProjectStatsRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    paper_count: int
+    run_count: int
+    latest_run_id: Optional[uuid.UUID]
+    latest_run_status: Optional[str]
+    latest_run_at: Optional[datetime]
+    year_min: Optional[int]
+    year_max: Optional[int]
+
+
+class ProjectListItem(ProjectRead):
+    stats: ProjectStatsRead
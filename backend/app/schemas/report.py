@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ReportPartRead(BaseModel):
+    position: int
+    depth: int
+    # None for the introduction
+    node_id: Optional[uuid.UUID]
+    label: str
+    # None while the section is being written
+    content: Optional[str]
+    # Taken from the section cache rather than written by this run
+    cached: bool
+    completed_at: Optional[datetime]
+
+
+class ReportRead(BaseModel):
+    run_id: uuid.UUID
+    # "writing" | "completed" | "failed"
+    status: str
+    total: int
+    done: int
+    # The assembled Markdown once completed
+    content: Optional[str]
+    created_at: datetime
+    completed_at: Optional[datetime]
+    parts: List[ReportPartRead]
@@ -2,13 +2,18 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict
 
 
+RunLane = Literal["interactive", "bulk"]
+
+
 class RunCreate(BaseModel):
     config_snapshot: Dict[str, Any] = {}
+    # "interactive" for small re-runs a user is waiting on; claimed ahead of "bulk"
+    lane: RunLane = "bulk"
 
 
 class RunRead(BaseModel):
@@ -17,6 +22,81 @@ class RunRead(BaseModel):
     id: uuid.UUID
     project_id: uuid.UUID
     status: str
+    lane: str
     config_snapshot: Dict[str, Any]
     created_at: datetime
+    started_at: Optional[datetime]
     completed_at: Optional[datetime]
+    # Set while a cancellation is pending on a running run
+    cancel_requested_at: Optional[datetime]
+
+
+class ArtifactManifest(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    name: str
+    kind: str
+    format: str
+    content_hash: str
+    size_bytes: int
+    rows: Optional[int]
+    shape: Optional[List[int]]
+    dtype: Optional[str]
+    created_at: datetime
+
+
+class RunDetail(RunRead):
+    # Manifests only; fetch the bytes from .../artifacts/{name}
+    artifacts: List[ArtifactManifest]
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: Optional[float]
+
+
+class StageProfileRead(BaseModel):
+    stage: str
+    started_at: datetime
+    wall_seconds: float
+    cpu_seconds: float
+    peak_rss_bytes: int
+    db_seconds: float
+    db_statements: int
+    llm_calls: int
+    llm_prompt_tokens: int
+    llm_completion_tokens: int
+    cache: Dict[str, CacheStats]
+    samples: Optional[Dict[str, Any]]
+    error: Optional[str]
+
+
+class RunProfileRead(BaseModel):
+    run_id: uuid.UUID
+    status: str
+    wall_seconds: float
+    cpu_seconds: float
+    db_seconds: float
+    peak_rss_bytes: int
+    llm_calls: int
+    llm_prompt_tokens: int
+    llm_completion_tokens: int
+    stages: List[StageProfileRead]
+
+
+class LaneMetrics(BaseModel):
+    lane: str
+    # Pending runs waiting to be claimed
+    depth: int
+    running: int
+    oldest_wait_seconds: Optional[float]
+    # Queue wait (created -> claimed) of runs claimed within the window
+    wait_p50_seconds: Optional[float]
+    wait_p95_seconds: Optional[float]
+    claimed: int
+
+
+class QueueMetrics(BaseModel):
+    window_seconds: float
+    lanes: List[LaneMetrics]
@@ -0,0 +1,214 @@
+"""
+Run artifacts: large run outputs kept out of the database.
+
+Each artifact is a blob in ``app.storage`` plus a small ``RunArtifact``
+manifest row; ``get_run`` returns only the manifests. Blobs are
+content-addressed (``artifacts/<sha256>``), so identical outputs of
+different runs are stored once.
+
+* Arrays (embeddings) are float32 ``.npy`` files, opened memory-mapped by
+  ``load_array`` so a large matrix is paged in on demand rather than read.
+* Tables are newline-delimited JSON compressed with zstd when the
+  ``zstandard`` package is installed, otherwise gzip. Both encoders are
+  deterministic, so the hash depends on the rows alone.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+)
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.artifact import RunArtifact
+from app.responses import dumps
+from app.storage import READ_CHUNK, Storage, content_key, get_storage
+
+if TYPE_CHECKING:
+    import numpy as np
+
+ZSTD_LEVEL = 10
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while chunk := fh.read(READ_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _table_writer() -> Tuple[str, Callable[[BinaryIO], BinaryIO]]:
+    try:
+        import zstandard
+    except ImportError:
+        # No name or mtime in the header, so equal rows give equal bytes
+        return "ndjson.gz", lambda fh: gzip.GzipFile(
+            filename="", fileobj=fh, mode="wb", mtime=0
+        )
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return "ndjson.zst", lambda fh: compressor.stream_writer(fh, closefd=False)
+
+
+def _table_reader(fmt: str, fh: BinaryIO) -> BinaryIO:
+    if fmt == "ndjson.zst":
+        import zstandard
+
+        return zstandard.ZstdDecompressor().stream_reader(fh)
+    return gzip.GzipFile(fileobj=fh, mode="rb")
+
+
+async def _store(
+    db: AsyncSession,
+    storage: Storage,
+    run_id: uuid.UUID,
+    name: str,
+    path: Path,
+    **manifest: Any,
+) -> RunArtifact:
+    digest = _sha256(path)
+    suffix = "." + manifest["format"]
+    size = path.stat().st_size
+    key = content_key("artifacts", digest, suffix)
+    await storage.put_file(key, path)
+
+    result = await db.execute(
+        select(RunArtifact).where(RunArtifact.run_id == run_id, RunArtifact.name == name)
+    )
+    artifact = result.scalar_one_or_none()
+    if artifact is None:
+        artifact = RunArtifact(run_id=run_id, name=name)
+        db.add(artifact)
+    artifact.content_hash = digest
+    artifact.storage_key = key
+    artifact.size_bytes = size
+    artifact.created_at = datetime.utcnow()
+    for field, value in manifest.items():
+        setattr(artifact, field, value)
+    await db.flush()
+    return artifact
+
+
+def _scratch_file() -> Path:
+    fd, name = tempfile.mkstemp(prefix="artifact-")
+    os.close(fd)
+    return Path(name)
+
+
+async def save_array(
+    db: AsyncSession,
+    run_id: uuid.UUID,
+    name: str,
+    array: "np.ndarray",
+    storage: Optional[Storage] = None,
+) -> RunArtifact:
+    """Store ``array`` as a float32 ``.npy`` artifact of the run."""
+    import numpy as np
+
+    matrix = np.ascontiguousarray(array, dtype=np.float32)
+    path = _scratch_file()
+    try:
+        with open(path, "wb") as fh:
+            np.save(fh, matrix, allow_pickle=False)
+        return await _store(
+            db,
+            storage or get_storage(),
+            run_id,
+            name,
+            path,
+            kind="array",
+            format="npy",
+            rows=int(matrix.shape[0]) if matrix.ndim else None,
+            shape=list(matrix.shape),
+            dtype=str(matrix.dtype),
+        )
+    finally:
+        path.unlink(missing_ok=True)
+
+
+async def save_table(
+    db: AsyncSession,
+    run_id: uuid.UUID,
+    name: str,
+    rows: Iterable[Dict[str, Any]],
+    storage: Optional[Storage] = None,
+) -> RunArtifact:
+    """Store ``rows`` as a compressed NDJSON artifact of the run, streaming."""
+    fmt, writer = _table_writer()
+    path = _scratch_file()
+    count = 0
+    try:
+        with open(path, "wb") as fh:
+            out = writer(fh)
+            for row in rows:
+                out.write(dumps(row) + b"\n")
+                count += 1
+            out.close()
+        return await _store(
+            db,
+            storage or get_storage(),
+            run_id,
+            name,
+            path,
+            kind="table",
+            format=fmt,
+            rows=count,
+            shape=None,
+            dtype=None,
+        )
+    finally:
+        path.unlink(missing_ok=True)
+
+
+async def load_array(
+    artifact: RunArtifact, storage: Optional[Storage] = None, mmap: bool = True
+) -> "np.ndarray":
+    """The artifact's array; memory-mapped read-only unless ``mmap`` is False."""
+    import numpy as np
+
+    path = await (storage or get_storage()).local_path(artifact.storage_key)
+    return np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+
+
+async def read_table(
+    artifact: RunArtifact, storage: Optional[Storage] = None
+) -> Iterator[Dict[str, Any]]:
+    """Iterate the rows of a table artifact, decompressing as it goes."""
+    path = await (storage or get_storage()).local_path(artifact.storage_key)
+
+    def rows() -> Iterator[Dict[str, Any]]:
+        with open(path, "rb") as fh, _table_reader(artifact.format, fh) as stream:
+            buffer = b""
+            while chunk := stream.read(READ_CHUNK):
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    yield json.loads(line)
+            if buffer.strip():
+                yield json.loads(buffer)
+
+    return rows()
+
+
+async def get_artifact(db: AsyncSession, run_id: uuid.UUID, name: str) -> Optional[RunArtifact]:
+    result = await db.execute(
+        select(RunArtifact).where(RunArtifact.run_id == run_id, RunArtifact.name == name)
+    )
+    return result.scalar_one_or_none()
@@ -0,0 +1,270 @@
+"""
+Fuzzy near-duplicate detection for papers without matching DOI/arXiv IDs.
+
+Titles are normalised and shingled into character 4-grams, summarised as
+MinHash signatures and split into LSH bands. Every band hash is stored in
+``paper_lsh_buckets``, so finding candidates for a new paper is an indexed
+lookup on ``(band, bucket)`` instead of a scan over all papers. Candidates
+are then verified on exact shingle Jaccard, author overlap and year.
+
+A title match alone is only a candidate: ``find_duplicate`` merges a new
+paper into an existing one automatically only when they also share an
+author or an identifier (``corroborated``). Papers lacking that evidence,
+e.g. entries without authors, are left for the project's batch dedup
+report, which lists every ``match_score`` pair.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import unicodedata
+import uuid
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.dedup import PaperLSHBucket
+from app.models.paper import Paper
+
+if TYPE_CHECKING:
+    import numpy as np
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE = 4
+_PRIME = (1 << 31) - 1
+
+# Verification thresholds
+TITLE_JACCARD = 0.8
+MAX_YEAR_GAP = 1
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+_ET_AL_RE = re.compile(r"\bet\.?\s+al\.?$")
+
+
+def normalize_title(title: str) -> str:
+    text = unicodedata.normalize("NFKD", title)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = _PUNCT_RE.sub(" ", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def author_keys(authors: Iterable[str]) -> FrozenSet[str]:
+    """Normalised family names: "Vaswani, Ashish" and "Ashish Vaswani" agree."""
+    keys = set()
+    for author in authors:
+        name = _ET_AL_RE.sub("", author.strip().lower()).strip()
+        if "," in name:
+            family = name.split(",", 1)[0]
+        else:
+            parts = name.split()
+            family = parts[-1] if parts else ""
+        family = normalize_title(family)
+        if family:
+            keys.add(family)
+    return frozenset(keys)
+
+
+def shingles(normalized: str) -> FrozenSet[str]:
+    if len(normalized) <= SHINGLE:
+        return frozenset([normalized]) if normalized else frozenset()
+    return frozenset(normalized[i : i + SHINGLE] for i in range(len(normalized) - SHINGLE + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+@lru_cache(maxsize=1)
+def _permutations() -> Tuple["np.ndarray", "np.ndarray"]:
+    import numpy as np
+
+    rng = np.random.default_rng(0x5EED)
+    a = rng.integers(1, _PRIME, size=NUM_PERM, dtype=np.uint64)
+    b = rng.integers(0, _PRIME, size=NUM_PERM, dtype=np.uint64)
+    return a, b
+
+
+def minhash(shingle_set: FrozenSet[str]) -> "np.ndarray":
+    import numpy as np
+
+    a, b = _permutations()
+    if not shingle_set:
+        return np.full(NUM_PERM, _PRIME, dtype=np.uint64)
+    base = np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little") % _PRIME
+            for s in shingle_set
+        ),
+        dtype=np.uint64,
+        count=len(shingle_set),
+    )
+    # (a * x + b) mod p for every (permutation, shingle); a, x < 2**31 so no overflow.
+    return ((np.outer(a, base) + b[:, None]) % _PRIME).min(axis=1)
+
+
+def band_keys(signature: "np.ndarray") -> List[Tuple[int, str]]:
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS : (band + 1) * ROWS].tobytes()
+        keys.append((band, hashlib.blake2b(rows, digest_size=8).hexdigest()))
+    return keys
+
+
+@dataclass
+class Fingerprint:
+    title_shingles: FrozenSet[str]
+    authors: FrozenSet[str]
+    year: Optional[int]
+    doi: Optional[str] = None
+    arxiv_id: Optional[str] = None
+    _bands: Optional[List[Tuple[int, str]]] = field(default=None, repr=False)
+
+    @classmethod
+    def of(
+        cls,
+        title: str,
+        authors: Sequence[str],
+        year: Optional[int],
+        doi: Optional[str] = None,
+        arxiv_id: Optional[str] = None,
+    ) -> "Fingerprint":
+        return cls(shingles(normalize_title(title)), author_keys(authors), year, doi, arxiv_id)
+
+    @property
+    def bands(self) -> List[Tuple[int, str]]:
+        if self._bands is None:
+            self._bands = band_keys(minhash(self.title_shingles))
+        return self._bands
+
+
+def fingerprint_of(paper: Paper) -> Fingerprint:
+    return Fingerprint.of(paper.title, paper.authors, paper.year, paper.doi, paper.arxiv_id)
+
+
+def match_score(a: Fingerprint, b: Fingerprint) -> float:
+    """Title Jaccard if ``a`` and ``b`` look like the same work, else 0."""
+    # Two different persistent identifiers always mean two different works.
+    if a.doi and b.doi and a.doi.lower() != b.doi.lower():
+        return 0.0
+    if a.arxiv_id and b.arxiv_id and a.arxiv_id != b.arxiv_id:
+        return 0.0
+    if a.year is not None and b.year is not None and abs(a.year - b.year) > MAX_YEAR_GAP:
+        return 0.0
+    if a.authors and b.authors and not (a.authors & b.authors):
+        return 0.0
+    score = jaccard(a.title_shingles, b.title_shingles)
+    return score if score >= TITLE_JACCARD else 0.0
+
+
+def corroborated(a: Fingerprint, b: Fingerprint) -> bool:
+    """Whether ``a`` and ``b`` share an author or an identifier, not just a title."""
+    if a.authors & b.authors:
+        return True
+    if a.doi and b.doi and a.doi.lower() == b.doi.lower():
+        return True
+    return bool(a.arxiv_id and a.arxiv_id == b.arxiv_id)
+
+
+def index_rows(paper_id: uuid.UUID, fingerprint: Fingerprint) -> List[PaperLSHBucket]:
+    return [
+        PaperLSHBucket(band=band, bucket=key, paper_id=paper_id)
+        for band, key in fingerprint.bands
+    ]
+
+
+async def find_duplicate(db: AsyncSession, fingerprint: Fingerprint) -> Optional[Paper]:
+    """Best existing paper safe to merge ``fingerprint`` into, via the LSH bucket index.
+
+    Only corroborated matches count: papers are shared across projects, so a
+    merge on title and year alone could join two tenants' different works.
+    """
+    result = await db.execute(
+        select(PaperLSHBucket.paper_id)
+        .where(tuple_(PaperLSHBucket.band, PaperLSHBucket.bucket).in_(fingerprint.bands))
+        .distinct()
+    )
+    candidate_ids = list(result.scalars().all())
+    if not candidate_ids:
+        return None
+    result = await db.execute(
+        select(Paper).where(Paper.id.in_(candidate_ids)).order_by(Paper.created_at)
+    )
+    best: Optional[Paper] = None
+    best_score = 0.0
+    for paper in result.scalars().all():
+        candidate = fingerprint_of(paper)
+        if not corroborated(fingerprint, candidate):
+            continue
+        score = match_score(fingerprint, candidate)
+        if score > best_score:
+            best, best_score = paper, score
+    return best
+
+
+@dataclass
+class DuplicateCluster:
+    canonical_id: uuid.UUID
+    duplicate_ids: List[uuid.UUID]
+    similarity: float
+
+
+def cluster_duplicates(
+    items: Sequence[Tuple[uuid.UUID, Fingerprint]],
+) -> List[DuplicateCluster]:
+    """Group near-duplicates among ``items`` (ordered oldest first).
+
+    Candidate pairs come only from shared LSH buckets, so the work is roughly
+    linear in the number of papers rather than quadratic.
+    """
+    buckets: Dict[Tuple[int, str], List[int]] = {}
+    for index, (_, fingerprint) in enumerate(items):
+        for key in fingerprint.bands:
+            buckets.setdefault(key, []).append(index)
+
+    parent = list(range(len(items)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    checked: Set[Tuple[int, int]] = set()
+    min_score: Dict[int, float] = {}
+    for members in buckets.values():
+        for pos, i in enumerate(members):
+            for j in members[pos + 1 :]:
+                if (i, j) in checked:
+                    continue
+                checked.add((i, j))
+                score = match_score(items[i][1], items[j][1])
+                if score:
+                    root_i, root_j = find(i), find(j)
+                    if root_i != root_j:
+                        # Keep the oldest paper as the root / canonical record.
+                        low, high = sorted((root_i, root_j))
+                        parent[high] = low
+                        min_score[low] = min(
+                            score, min_score.get(low, 1.0), min_score.pop(high, 1.0)
+                        )
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(items)):
+        groups.setdefault(find(i), []).append(i)
+    return [
+        DuplicateCluster(
+            canonical_id=items[root][0],
+            duplicate_ids=[items[i][0] for i in members if i != root],
+            similarity=round(min_score.get(root, 1.0), 4),
+        )
+        for root, members in sorted(groups.items())
+        if len(members) > 1
+    ]
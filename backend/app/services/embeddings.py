@@ -0,0 +1,128 @@
+"""
+Paper embeddings: vector encoding for storage and the default local embedder.
+
+Real embedding models arrive with the Phase 2 Provider Router. Until then
+``HashingEmbedder`` produces deterministic feature-hashed vectors so semantic
+search works offline and in tests.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.embedding import PaperEmbedding
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from app.models.paper import Paper
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+class Embedder(Protocol):
+    model: str
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        """Return a (len(texts), dim) float32 matrix of L2-normalised rows."""
+        ...
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+@lru_cache(maxsize=65536)
+def _bucket(feature: str, dim: int) -> Tuple[int, float]:
+    digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+    # Low bits pick the bucket, the top bit picks the sign.
+    return digest % dim, (1.0 if digest >> 63 else -1.0)
+
+
+def _features(text: str) -> Iterable[str]:
+    for token in tokenize(text):
+        yield token
+        # Character trigrams let inflections ("transformer"/"transformers") overlap.
+        if len(token) > 4:
+            padded = f"#{token}#"
+            for i in range(len(padded) - 2):
+                yield padded[i : i + 3]
+
+
+class HashingEmbedder:
+    """Signed feature hashing over words and character trigrams."""
+
+    def __init__(self, dim: int = 256) -> None:
+        self.dim = dim
+        self.model = f"hashing-{dim}"
+
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        import numpy as np
+
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in _features(text):
+                bucket, sign = _bucket(feature, self.dim)
+                out[row, bucket] += sign
+        return normalize_rows(out)
+
+
+@lru_cache(maxsize=1)
+def get_embedder() -> Embedder:
+    return HashingEmbedder(settings.embedding_dim)
+
+
+def normalize_rows(matrix: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def paper_text(title: str, abstract: Optional[str]) -> str:
+    return f"{title}. {abstract}" if abstract else title
+
+
+def encode_vector(vector: "np.ndarray") -> bytes:
+    import numpy as np
+
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+
+def decode_matrix(blobs: Sequence[bytes], dim: int) -> "np.ndarray":
+    import numpy as np
+
+    if not blobs:
+        return np.zeros((0, dim), dtype=np.float32)
+    return np.frombuffer(b"".join(blobs), dtype="<f4").reshape(len(blobs), dim)
+
+
+async def store_paper_embeddings(
+    db: AsyncSession,
+    papers: Sequence["Paper"],
+    embedder: Optional[Embedder] = None,
+) -> None:
+    """Embed ``papers`` in one batch and stage the vectors on the session."""
+    if not papers:
+        return
+    embedder = embedder or get_embedder()
+    matrix = embedder.embed([paper_text(p.title, p.abstract) for p in papers])
+    now = datetime.utcnow()
+    for paper, vector in zip(papers, matrix):
+        db.add(
+            PaperEmbedding(
+                paper_id=paper.id,
+                model=embedder.model,
+                dim=embedder.dim,
+                vector=encode_vector(vector),
+                created_at=now,
+            )
+        )
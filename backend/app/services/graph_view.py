@@ -0,0 +1,190 @@
+"""
+Viewport queries over the persisted paper graph, at a level of detail
+chosen by zoom.
+
+``graph_nodes`` carries a uniform grid index: each node stores the integer
+cell ``(floor(x / cell_size), floor(y / cell_size))`` and
+``(project_id, cell_x, cell_y)`` is indexed. A viewport becomes a cell range
+plus an exact coordinate test, so a query reads only the cells it overlaps
+on any database. The graph stage picks ``cell_size`` so that a cell holds
+about ``NODES_PER_CELL`` papers on average.
+
+``zoom`` is screen pixels per layout unit; neighbouring papers sit about one
+unit apart. Below ``graph_detail_zoom``, or when more than
+``graph_max_nodes`` papers are visible, the view is aggregated: one
+super-node per taxonomy leaf, sized and placed by its visible papers, with
+the precomputed edge counts between leaves. Otherwise it lists the visible
+papers with, for each, its ``graph_edges_per_node`` strongest edges to
+other visible papers.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.config import settings
+from app.models.graph import GraphEdge, GraphLayout, GraphNode
+from app.models.paper import Paper
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Average papers per grid cell
+NODES_PER_CELL = 32
+# Grid cells are INTEGER columns; a huge (finite) box is clamped to their range
+_CELL_LIMIT = 2**31 - 1
+
+
+@dataclass
+class Viewport:
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+    # Screen pixels per layout unit
+    zoom: float
+
+
+def grid_cell_size(pos: "np.ndarray") -> float:
+    """Cell side for ``pos`` giving about NODES_PER_CELL points per cell."""
+    import numpy as np
+
+    if len(pos) == 0:
+        return 1.0
+    extent = np.maximum(pos.max(axis=0) - pos.min(axis=0), 1.0)
+    return float(math.sqrt(extent[0] * extent[1] * NODES_PER_CELL / len(pos)))
+
+
+def grid_cells(pos: "np.ndarray", cell_size: float) -> "np.ndarray":
+    import numpy as np
+
+    return np.floor(pos / cell_size).astype(np.int64)
+
+
+def in_viewport(node: Any, layout: GraphLayout, view: Viewport) -> ColumnElement[bool]:
+    """Grid-cell range (served by the index) and exact bounds, for ``node``."""
+    cell = layout.cell_size
+
+    def index(v: float) -> int:
+        return max(-_CELL_LIMIT, min(_CELL_LIMIT, math.floor(v / cell)))
+
+    return and_(
+        node.project_id == layout.project_id,
+        node.cell_x.between(index(view.x0), index(view.x1)),
+        node.cell_y.between(index(view.y0), index(view.y1)),
+        node.x.between(view.x0, view.x1),
+        node.y.between(view.y0, view.y1),
+    )
+
+
+async def visible_clusters(
+    db: AsyncSession, layout: GraphLayout, view: Viewport
+) -> List[Tuple[Optional[int], int, float, float]]:
+    """(cluster, visible papers, mean x, mean y) per cluster in the viewport."""
+    result = await db.execute(
+        select(GraphNode.cluster, func.count(), func.avg(GraphNode.x), func.avg(GraphNode.y))
+        .where(in_viewport(GraphNode, layout, view))
+        .group_by(GraphNode.cluster)
+        .order_by(GraphNode.cluster)
+    )
+    return [(cluster, count, float(x), float(y)) for cluster, count, x, y in result]
+
+
+def top_edges(edges: Sequence[Dict[str, Any]], per_node: int) -> List[Dict[str, Any]]:
+    """Edges among the ``per_node`` strongest of either endpoint, strongest first."""
+    ranked: Dict[Any, int] = {}
+    kept = []
+    for edge in sorted(
+        edges, key=lambda e: (-e["weight"], str(e["source_id"]), str(e["target_id"]))
+    ):
+        keep = False
+        for end in (edge["source_id"], edge["target_id"]):
+            ranked[end] = ranked.get(end, 0) + 1
+            keep = keep or ranked[end] <= per_node
+        if keep:
+            kept.append(edge)
+    return kept
+
+
+async def graph_view(db: AsyncSession, layout: GraphLayout, view: Viewport) -> Dict[str, Any]:
+    """The visible part of the graph, as papers or as cluster super-nodes."""
+    clusters = await visible_clusters(db, layout, view)
+    visible = sum(count for _, count, _, _ in clusters)
+    detail = view.zoom >= settings.graph_detail_zoom and visible <= settings.graph_max_nodes
+    response: Dict[str, Any] = {
+        "version": layout.version,
+        "mode": "nodes" if detail else "clusters",
+        "visible": visible,
+        "nodes": [],
+        "edges": [],
+        "clusters": [],
+        "cluster_edges": [],
+    }
+    if not detail:
+        labels = {c["id"]: c["label"] for c in layout.clusters}
+        shown = {cluster for cluster, _, _, _ in clusters if cluster is not None}
+        # Every placed paper belongs to a taxonomy leaf; stray rows are not drawn
+        response["clusters"] = [
+            {"id": cluster, "label": labels.get(cluster, ""), "size": count, "x": x, "y": y}
+            for cluster, count, x, y in clusters
+            if cluster is not None
+        ]
+        response["cluster_edges"] = [
+            edge
+            for edge in layout.cluster_edges
+            if edge["source"] in shown and edge["target"] in shown
+        ]
+        return response
+
+    nodes = await db.execute(
+        select(GraphNode.paper_id, Paper.title, GraphNode.x, GraphNode.y, GraphNode.cluster)
+        .join(Paper, Paper.id == GraphNode.paper_id)
+        .where(in_viewport(GraphNode, layout, view))
+        .order_by(GraphNode.paper_id)
+    )
+    response["nodes"] = [dict(row) for row in nodes.mappings()]
+    source, target = aliased(GraphNode), aliased(GraphNode)
+    edges = await db.execute(
+        select(GraphEdge.source_id, GraphEdge.target_id, GraphEdge.weight, GraphEdge.kind)
+        .join(
+            source,
+            and_(source.project_id == GraphEdge.project_id, source.paper_id == GraphEdge.source_id),
+        )
+        .join(
+            target,
+            and_(target.project_id == GraphEdge.project_id, target.paper_id == GraphEdge.target_id),
+        )
+        .where(
+            GraphEdge.project_id == layout.project_id,
+            in_viewport(source, layout, view),
+            in_viewport(target, layout, view),
+        )
+    )
+    response["edges"] = top_edges(
+        [dict(row) for row in edges.mappings()], settings.graph_edges_per_node
+    )
+    return response
+
+
+def cluster_edge_counts(
+    cluster_of: "np.ndarray", src: "np.ndarray", dst: "np.ndarray"
+) -> List[Dict[str, int]]:
+    """Edges between distinct clusters, counted per unordered cluster pair."""
+    import numpy as np
+
+    a, b = cluster_of[src], cluster_of[dst]
+    between = (a != b) & (a >= 0) & (b >= 0)
+    pairs = np.stack([np.minimum(a, b), np.maximum(a, b)], axis=1)[between]
+    if not len(pairs):
+        return []
+    unique, counts = np.unique(pairs, axis=0, return_counts=True)
+    return [
+        {"source": int(s), "target": int(t), "weight": int(c)}
+        for (s, t), c in zip(unique.tolist(), counts.tolist())
+    ]
@@ -0,0 +1,404 @@
+"""
+Idea tree (PROJECT_PLAN.md §2, Step 5): a project's editable taxonomy.
+
+Nodes carry a materialized ``path``, the hex ids of the root down to the
+node each followed by "/". A subtree is therefore the ``path`` range
+``[prefix, prefix + "~")``, one index range scan on ``(tree_id, path)``.
+Moving a subtree is a single UPDATE that rewrites the path prefix. Paths
+are compared bytewise (``COLLATE "C"`` on Postgres, SQLite's default), and
+every path character sorts below "~".
+
+Papers hang off nodes through ``idea_node_papers``. Each node counts only
+its own papers; subtree totals are summed over the path range when a level
+is read.
+
+Edits arrive as small batches of operations made against a tree
+``version``. The batch first bumps the version with a compare-and-set
+UPDATE, so of two batches made against the same version only one applies
+and the other gets an ``EditConflict``. A batch applies whole or not at all.
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import String, and_, delete, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.idea_tree import IdeaNode, IdeaNodePaper, IdeaTree
+from app.models.paper import ProjectPaper
+from app.pipeline.taxonomy import TaxonomyNode
+from app.schemas.idea_tree import (
+    IdeaTreeOp,
+    MergeNodes,
+    MoveNode,
+    MovePapers,
+    RenameNode,
+    SplitNode,
+)
+
+# Sorts after every character that can appear in a path
+PATH_END = "~"
+INSERT_BATCH = 5000
+
+
+class EditConflict(Exception):
+    """The tree is locked or has moved past the version the edit was made against."""
+
+
+class InvalidEdit(Exception):
+    pass
+
+
+class NodeNotFound(Exception):
+    pass
+
+
+def _segment(node_id: uuid.UUID) -> str:
+    return node_id.hex + "/"
+
+
+def in_subtree(path: Any, prefix: Any) -> ColumnElement[bool]:
+    """``path`` lies in the subtree whose root has path ``prefix`` (root included)."""
+    return and_(path >= prefix, path < prefix + PATH_END)
+
+
+async def get_tree(db: AsyncSession, project_id: uuid.UUID) -> Optional[IdeaTree]:
+    result = await db.execute(select(IdeaTree).where(IdeaTree.project_id == project_id))
+    return result.scalar_one_or_none()
+
+
+async def seed_from_taxonomy(
+    db: AsyncSession,
+    project_id: uuid.UUID,
+    run_id: uuid.UUID,
+    nodes: Sequence[TaxonomyNode],
+) -> IdeaTree:
+    """(Re)build the project's tree from a run's taxonomy nodes."""
+    tree = await get_tree(db, project_id)
+    if tree is None:
+        tree = IdeaTree(project_id=project_id, version=0)
+        db.add(tree)
+        await db.flush()
+    elif tree.locked_at is not None:
+        raise EditConflict("Idea tree is locked")
+    else:
+        await db.execute(delete(IdeaNodePaper).where(IdeaNodePaper.tree_id == tree.id))
+        await db.execute(delete(IdeaNode).where(IdeaNode.tree_id == tree.id))
+    tree.source_run_id = run_id
+    tree.version += 1
+    tree.updated_at = datetime.utcnow()
+
+    # Papers removed from the project since the run are left out
+    result = await db.execute(
+        select(ProjectPaper.paper_id).where(ProjectPaper.project_id == project_id)
+    )
+    in_project = {str(pid) for pid in result.scalars()}
+
+    now = datetime.utcnow()
+    ids = {node.id: uuid.uuid4() for node in nodes}
+    paths: Dict[int, str] = {}
+    positions = {child: i for node in nodes for i, child in enumerate(node.children)}
+    node_rows: List[Dict[str, Any]] = []
+    paper_rows: List[Dict[str, Any]] = []
+    # Taxonomy nodes are breadth-first, so parents are inserted first
+    for node in nodes:
+        parent_path = paths[node.parent] if node.parent is not None else ""
+        paths[node.id] = parent_path + _segment(ids[node.id])
+        papers = [pid for pid in node.paper_ids if pid in in_project]
+        node_rows.append(
+            {
+                "id": ids[node.id],
+                "tree_id": tree.id,
+                "parent_id": ids[node.parent] if node.parent is not None else None,
+                "path": paths[node.id],
+                "depth": node.depth,
+                "position": positions.get(node.id, 0),
+                "label": node.label,
+                "paper_count": len(papers),
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        paper_rows.extend(
+            {
+                "id": uuid.uuid4(),
+                "tree_id": tree.id,
+                "node_id": ids[node.id],
+                "paper_id": uuid.UUID(pid),
+            }
+            for pid in papers
+        )
+    if node_rows:
+        await db.execute(insert(IdeaNode), node_rows)
+    for start in range(0, len(paper_rows), INSERT_BATCH):
+        await db.execute(insert(IdeaNodePaper), paper_rows[start : start + INSERT_BATCH])
+    await db.flush()
+    return tree
+
+
+async def node_level(
+    db: AsyncSession, tree: IdeaTree, parent_id: Optional[uuid.UUID]
+) -> List[Dict[str, Any]]:
+    """The children of ``parent_id`` (the roots if None), with counts, in order."""
+    child = aliased(IdeaNode)
+    below = aliased(IdeaNode)
+    child_count = (
+        select(func.count()).where(child.parent_id == IdeaNode.id).scalar_subquery()
+    )
+    subtree_papers = (
+        select(func.coalesce(func.sum(below.paper_count), 0))
+        .where(below.tree_id == IdeaNode.tree_id, in_subtree(below.path, IdeaNode.path))
+        .scalar_subquery()
+    )
+    parent = IdeaNode.parent_id.is_(None) if parent_id is None else IdeaNode.parent_id == parent_id
+    result = await db.execute(
+        select(
+            IdeaNode.id,
+            IdeaNode.parent_id,
+            IdeaNode.depth,
+            IdeaNode.position,
+            IdeaNode.label,
+            IdeaNode.paper_count,
+            subtree_papers.label("subtree_paper_count"),
+            child_count.label("child_count"),
+        )
+        .where(IdeaNode.tree_id == tree.id, parent)
+        .order_by(IdeaNode.position, IdeaNode.id)
+    )
+    return [dict(row._mapping) for row in result]
+
+
+async def get_node(db: AsyncSession, tree_id: uuid.UUID, node_id: uuid.UUID) -> IdeaNode:
+    # populate_existing: earlier bulk UPDATEs in the batch may have moved the node
+    result = await db.execute(
+        select(IdeaNode)
+        .where(IdeaNode.id == node_id, IdeaNode.tree_id == tree_id)
+        .execution_options(populate_existing=True)
+    )
+    node = result.scalar_one_or_none()
+    if node is None:
+        raise NodeNotFound(f"Node {node_id} not found")
+    return node
+
+
+async def _bump_version(db: AsyncSession, tree: IdeaTree, expected: int) -> None:
+    version = await db.scalar(
+        update(IdeaTree)
+        .where(
+            IdeaTree.id == tree.id,
+            IdeaTree.version == expected,
+            IdeaTree.locked_at.is_(None),
+        )
+        .values(version=IdeaTree.version + 1, updated_at=datetime.utcnow())
+        .returning(IdeaTree.version)
+    )
+    await db.refresh(tree)
+    if version is None:
+        if tree.locked_at is not None:
+            raise EditConflict("Idea tree is locked")
+        raise EditConflict(f"Idea tree is at version {tree.version}, not {expected}")
+
+
+async def _next_position(db: AsyncSession, parent_id: uuid.UUID) -> int:
+    last = await db.scalar(select(func.max(IdeaNode.position)).where(IdeaNode.parent_id == parent_id))
+    return 0 if last is None else last + 1
+
+
+async def _open_slot(db: AsyncSession, parent_id: uuid.UUID, position: int) -> None:
+    await db.execute(
+        update(IdeaNode)
+        .where(IdeaNode.parent_id == parent_id, IdeaNode.position >= position)
+        .values(position=IdeaNode.position + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _add_papers(db: AsyncSession, node_id: uuid.UUID, delta: int) -> None:
+    await db.execute(
+        update(IdeaNode)
+        .where(IdeaNode.id == node_id)
+        .values(paper_count=IdeaNode.paper_count + delta)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _rebase(
+    db: AsyncSession, tree_id: uuid.UUID, old_prefix: str, new_prefix: str, depth_delta: int
+) -> None:
+    """Rewrite the ``old_prefix`` of every path in that subtree to ``new_prefix``."""
+    await db.execute(
+        update(IdeaNode)
+        .where(IdeaNode.tree_id == tree_id, in_subtree(IdeaNode.path, old_prefix))
+        .values(
+            path=literal(new_prefix, String)
+            + func.substr(IdeaNode.path, len(old_prefix) + 1, type_=String),
+            depth=IdeaNode.depth + depth_delta,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _rename(db: AsyncSession, tree: IdeaTree, op: RenameNode) -> None:
+    node = await get_node(db, tree.id, op.node_id)
+    node.label = op.label
+
+
+async def _move(db: AsyncSession, tree: IdeaTree, op: MoveNode) -> None:
+    node = await get_node(db, tree.id, op.node_id)
+    parent = await get_node(db, tree.id, op.parent_id)
+    if parent.path.startswith(node.path):
+        raise InvalidEdit("Cannot move a node into its own subtree")
+    if op.position is None:
+        position = await _next_position(db, parent.id)
+    else:
+        position = op.position
+        await _open_slot(db, parent.id, position)
+    await _rebase(
+        db, tree.id, node.path, parent.path + _segment(node.id), parent.depth + 1 - node.depth
+    )
+    await db.execute(
+        update(IdeaNode)
+        .where(IdeaNode.id == node.id)
+        .values(parent_id=parent.id, position=position)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _move_papers(db: AsyncSession, tree: IdeaTree, op: MovePapers) -> None:
+    target = await get_node(db, tree.id, op.node_id)
+    paper_ids = set(op.paper_ids)
+    in_project = set(
+        (
+            await db.execute(
+                select(ProjectPaper.paper_id).where(
+                    ProjectPaper.project_id == tree.project_id,
+                    ProjectPaper.paper_id.in_(paper_ids),
+                )
+            )
+        ).scalars()
+    )
+    if in_project != paper_ids:
+        raise NodeNotFound("Paper not found in project")
+
+    result = await db.execute(
+        select(IdeaNodePaper.node_id, IdeaNodePaper.paper_id).where(
+            IdeaNodePaper.tree_id == tree.id, IdeaNodePaper.paper_id.in_(paper_ids)
+        )
+    )
+    placed: Dict[uuid.UUID, int] = {}
+    unplaced = set(paper_ids)
+    for node_id, paper_id in result:
+        placed[node_id] = placed.get(node_id, 0) + 1
+        unplaced.discard(paper_id)
+    await db.execute(
+        update(IdeaNodePaper)
+        .where(IdeaNodePaper.tree_id == tree.id, IdeaNodePaper.paper_id.in_(paper_ids))
+        .values(node_id=target.id)
+        .execution_options(synchronize_session=False)
+    )
+    # Papers added to the project after the tree was built get their first place
+    if unplaced:
+        await db.execute(
+            insert(IdeaNodePaper),
+            [
+                {"id": uuid.uuid4(), "tree_id": tree.id, "node_id": target.id, "paper_id": pid}
+                for pid in unplaced
+            ],
+        )
+    for node_id, count in placed.items():
+        await _add_papers(db, node_id, -count)
+    await _add_papers(db, target.id, len(paper_ids))
+
+
+async def _merge(db: AsyncSession, tree: IdeaTree, op: MergeNodes) -> None:
+    source = await get_node(db, tree.id, op.source_id)
+    target = await get_node(db, tree.id, op.target_id)
+    if target.path.startswith(source.path):
+        raise InvalidEdit("Cannot merge a node into itself or its descendant")
+    offset = await _next_position(db, target.id)
+    # The source's descendants keep their shape under the target
+    await _rebase(db, tree.id, source.path, target.path, target.depth - source.depth)
+    await db.execute(
+        update(IdeaNode)
+        .where(IdeaNode.parent_id == source.id)
+        .values(parent_id=target.id, position=IdeaNode.position + offset)
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        update(IdeaNodePaper)
+        .where(IdeaNodePaper.node_id == source.id)
+        .values(node_id=target.id)
+        .execution_options(synchronize_session=False)
+    )
+    await _add_papers(db, target.id, source.paper_count)
+    await db.execute(delete(IdeaNode).where(IdeaNode.id == source.id))
+    db.expunge(source)
+
+
+async def _split(db: AsyncSession, tree: IdeaTree, op: SplitNode) -> uuid.UUID:
+    node = await get_node(db, tree.id, op.node_id)
+    if node.parent_id is None:
+        raise InvalidEdit("Cannot split a root node")
+    paper_ids = set(op.paper_ids)
+    await _open_slot(db, node.parent_id, node.position + 1)
+    sibling_id = uuid.uuid4()
+    db.add(
+        IdeaNode(
+            id=sibling_id,
+            tree_id=tree.id,
+            parent_id=node.parent_id,
+            path=node.path[: -len(_segment(node.id))] + _segment(sibling_id),
+            depth=node.depth,
+            position=node.position + 1,
+            label=op.label,
+            paper_count=len(paper_ids),
+        )
+    )
+    await db.flush()
+    moved = await db.execute(
+        update(IdeaNodePaper)
+        .where(IdeaNodePaper.node_id == node.id, IdeaNodePaper.paper_id.in_(paper_ids))
+        .values(node_id=sibling_id)
+        .execution_options(synchronize_session=False)
+    )
+    if moved.rowcount != len(paper_ids):
+        raise InvalidEdit("Every paper to split off must be on the node being split")
+    await _add_papers(db, node.id, -len(paper_ids))
+    return sibling_id
+
+
+async def apply_ops(
+    db: AsyncSession, tree: IdeaTree, version: int, ops: Sequence[IdeaTreeOp]
+) -> List[uuid.UUID]:
+    """Apply ``ops`` in order against ``version``; returns the ids split ops created.
+
+    Raises ``EditConflict``, ``InvalidEdit`` or ``NodeNotFound``; the caller
+    rolls back, so a failing batch leaves no trace.
+    """
+    await _bump_version(db, tree, version)
+    created: List[uuid.UUID] = []
+    for op in ops:
+        if isinstance(op, RenameNode):
+            await _rename(db, tree, op)
+        elif isinstance(op, MoveNode):
+            await _move(db, tree, op)
+        elif isinstance(op, MovePapers):
+            await _move_papers(db, tree, op)
+        elif isinstance(op, MergeNodes):
+            await _merge(db, tree, op)
+        else:
+            created.append(await _split(db, tree, op))
+    await db.flush()
+    return created
+
+
+async def set_locked(db: AsyncSession, tree: IdeaTree, locked: bool) -> IdeaTree:
+    tree.locked_at = datetime.utcnow() if locked else None
+    tree.version += 1
+    tree.updated_at = datetime.utcnow()
+    await db.flush()
+    return tree
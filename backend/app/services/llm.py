@@ -0,0 +1,100 @@
+"""
+Reasoning-model client (Tier 1 in PROJECT_PLAN.md §4).
+
+Real providers arrive with the Phase 2 Provider Router. Until then
+``ExtractiveReasoner`` answers offline and deterministically by echoing the
+most frequent content words of the prompt, which is enough to give taxonomy
+nodes readable labels in development and tests. Asked for more than a label
+(``max_tokens`` above ``LABEL_LIMIT``), it returns the prompt's best-scoring
+lines instead, which gives report sections some body text.
+
+Callers report usage with ``record_llm_usage`` so it shows up in the run's
+stage profile; the token counts come back on each ``Completion``.
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Protocol
+
+from app.services.embeddings import tokenize
+
+_STOPWORDS = frozenset(
+    """
+    a an and are as at based be by for from in into is it its of on or over that the
+    their this to towards under using via with without we our new study approach
+    method methods paper papers analysis results
+    """.split()
+)
+# Longest answer given as top words; longer requests get extracted lines
+LABEL_LIMIT = 64
+_LIST_MARKER = re.compile(r"^\s*(?:[-*]|\d+\.)\s*")
+
+
+@dataclass
+class Completion:
+    text: str
+    prompt_tokens: int
+    completion_tokens: int
+
+
+class ReasoningModel(Protocol):
+    model: str
+
+    async def complete(self, system: str, prompt: str, max_tokens: int = 64) -> Completion:
+        """Answer ``prompt`` under the ``system`` instructions."""
+        ...
+
+
+class ExtractiveReasoner:
+    """Offline stand-in: the prompt's top content words, title-cased."""
+
+    model = "extractive"
+
+    def __init__(self, words: int = 3) -> None:
+        self.words = words
+
+    async def complete(self, system: str, prompt: str, max_tokens: int = 64) -> Completion:
+        tokens = tokenize(prompt)
+        counts = Counter(
+            t for t in tokens if len(t) > 2 and not t.isdigit() and t not in _STOPWORDS
+        )
+        if max_tokens > LABEL_LIMIT:
+            text, used = self._extract(prompt, counts, max_tokens)
+        else:
+            # Ties go to the word seen first, so the answer depends on the prompt alone
+            first_seen = {t: i for i, t in reversed(list(enumerate(tokens)))}
+            top = sorted(counts, key=lambda t: (-counts[t], first_seen[t]))[: self.words]
+            text = " ".join(word.capitalize() for word in top) or "Miscellaneous"
+            used = len(top)
+        return Completion(
+            text=text,
+            prompt_tokens=len(tokenize(system)) + len(tokens),
+            completion_tokens=used,
+        )
+
+    @staticmethod
+    def _extract(prompt: str, counts: Counter, max_tokens: int) -> "tuple[str, int]":
+        """Highest-scoring prompt lines, in prompt order, within ``max_tokens``."""
+        lines = [_LIST_MARKER.sub("", line).strip() for line in prompt.splitlines()]
+        lines = [line for line in lines if line]
+        scores = [
+            sum(counts[t] for t in set(tokenize(line))) / (1 + len(tokenize(line)))
+            for line in lines
+        ]
+        chosen, used = [], 0
+        for index in sorted(range(len(lines)), key=lambda i: (-scores[i], i)):
+            length = len(tokenize(lines[index]))
+            if used + length > max_tokens:
+                continue
+            chosen.append(index)
+            used += length
+        text = " ".join(lines[i].rstrip(".") + "." for i in sorted(chosen))
+        return text or "No material.", used
+
+
+@lru_cache(maxsize=1)
+def get_reasoner() -> ReasoningModel:
+    return ExtractiveReasoner()
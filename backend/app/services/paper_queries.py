@@ -0,0 +1,173 @@
+"""
+Filtering, sorting and faceting of a project's papers (the Explore step).
+
+``PaperFilter`` turns query parameters into WHERE clauses over the
+``project_papers``/``papers`` join; ``list_papers`` and ``paper_facets``
+share it, so facet counts always describe the filtered set.
+
+Facets come back from one statement: the filtered rows are a CTE and the
+year, author, score-bucket and total counts are UNION ALL branches over it.
+Authors are unnested with ``jsonb_array_elements_text`` on Postgres and
+``json_each`` on SQLite. On Postgres the author filter is a JSONB ``@>``
+containment test, served by the ``ix_papers_authors`` GIN index.
+"""
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import (
+    Integer,
+    String,
+    case,
+    cast,
+    exists,
+    func,
+    literal,
+    select,
+    true,
+    type_coerce,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.paper import Paper, ProjectPaper
+
+# Score facet: SCORE_BUCKETS equal-width buckets over [0, 1].
+SCORE_BUCKETS = 10
+# Author facet lists the most frequent authors only.
+TOP_AUTHORS = 50
+
+SORT_KEYS = {
+    "added_at": ProjectPaper.added_at,
+    "year": Paper.year,
+    "score": ProjectPaper.score,
+    "title": Paper.title,
+}
+SORT_OPTIONS = sorted([*SORT_KEYS, *(f"-{key}" for key in SORT_KEYS)])
+
+
+@dataclass
+class PaperFilter:
+    year_min: Optional[int] = None
+    year_max: Optional[int] = None
+    author: Optional[str] = None
+    score_min: Optional[float] = None
+    score_max: Optional[float] = None
+    # Prefix match, e.g. "citation expansion"
+    inclusion_reason: Optional[str] = None
+
+    def conditions(self, dialect: str) -> List[ColumnElement[bool]]:
+        clauses: List[ColumnElement[bool]] = []
+        if self.year_min is not None:
+            clauses.append(Paper.year >= self.year_min)
+        if self.year_max is not None:
+            clauses.append(Paper.year <= self.year_max)
+        if self.score_min is not None:
+            clauses.append(ProjectPaper.score >= self.score_min)
+        if self.score_max is not None:
+            clauses.append(ProjectPaper.score <= self.score_max)
+        if self.inclusion_reason:
+            clauses.append(
+                ProjectPaper.inclusion_reason.startswith(self.inclusion_reason, autoescape=True)
+            )
+        if self.author:
+            clauses.append(_has_author(self.author, dialect))
+        return clauses
+
+
+def _has_author(author: str, dialect: str) -> ColumnElement[bool]:
+    if dialect == "postgresql":
+        return type_coerce(Paper.authors, JSONB).contains([author])
+    each = func.json_each(Paper.authors).table_valued("value")
+    return exists(select(literal(1)).select_from(each).where(each.c.value == author))
+
+
+def _author_values(dialect: str, authors: Any):
+    if dialect == "postgresql":
+        return func.jsonb_array_elements_text(authors).table_valued("value")
+    return func.json_each(authors).table_valued("value")
+
+
+def order_by(sort: str) -> List[Any]:
+    """ORDER BY for ``sort`` ("year", "-score", ...); NULLs last, id breaks ties."""
+    key = SORT_KEYS[sort.lstrip("-")]
+    column = key.desc() if sort.startswith("-") else key.asc()
+    return [column.nulls_last(), ProjectPaper.id]
+
+
+def filtered(project_id: uuid.UUID, flt: PaperFilter, dialect: str):
+    """``project_papers JOIN papers`` restricted to the project and filter."""
+    return (
+        select(ProjectPaper.id)
+        .join(Paper, Paper.id == ProjectPaper.paper_id)
+        .where(ProjectPaper.project_id == project_id, *flt.conditions(dialect))
+    )
+
+
+async def paper_facets(
+    db: AsyncSession, project_id: uuid.UUID, flt: PaperFilter
+) -> Dict[str, Any]:
+    dialect = db.bind.dialect.name
+    # Bucket index is computed in the CTE so the GROUP BY is over a plain column
+    bucket = case(
+        (ProjectPaper.score.is_(None), None),
+        (ProjectPaper.score >= 1, SCORE_BUCKETS - 1),
+        (ProjectPaper.score < 0, 0),
+        else_=cast(ProjectPaper.score * SCORE_BUCKETS, Integer),
+    )
+    base = (
+        filtered(project_id, flt, dialect)
+        .with_only_columns(Paper.year, Paper.authors, bucket.label("bucket"))
+        .cte("filtered")
+    )
+
+    authors = _author_values(dialect, base.c.authors)
+    author_counts = (
+        select(
+            literal("author").label("facet"),
+            authors.c.value.label("value"),
+            func.count().label("n"),
+        )
+        .select_from(base.join(authors, true()))
+        .group_by(authors.c.value)
+        .order_by(func.count().desc(), authors.c.value)
+        .limit(TOP_AUTHORS)
+        .subquery()
+    )
+    query = union_all(
+        select(literal("total"), literal(None, String), func.count()).select_from(base),
+        select(literal("year"), cast(base.c.year, String), func.count()).group_by(base.c.year),
+        select(literal("score"), cast(base.c.bucket, String), func.count()).group_by(
+            base.c.bucket
+        ),
+        select(author_counts.c.facet, author_counts.c.value, author_counts.c.n),
+    )
+
+    total = 0
+    years: List[Dict[str, Any]] = []
+    authors_out: List[Dict[str, Any]] = []
+    buckets: List[Dict[str, Any]] = []
+    for facet, value, count in (await db.execute(query)).all():
+        if facet == "total":
+            total = count
+        elif facet == "year":
+            years.append({"year": int(value) if value is not None else None, "count": count})
+        elif facet == "author":
+            authors_out.append({"author": value, "count": count})
+        else:
+            index = int(value) if value is not None else None
+            buckets.append(
+                {
+                    "min": index / SCORE_BUCKETS if index is not None else None,
+                    "max": (index + 1) / SCORE_BUCKETS if index is not None else None,
+                    "count": count,
+                }
+            )
+    years.sort(key=lambda y: (y["year"] is None, y["year"] or 0))
+    authors_out.sort(key=lambda a: (-a["count"], a["author"]))
+    buckets.sort(key=lambda b: (b["min"] is None, b["min"] or 0))
+    return {"total": total, "years": years, "authors": authors_out, "score_buckets": buckets}
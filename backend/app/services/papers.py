@@ -0,0 +1,53 @@
+"""Canonical paper lookup shared by the papers API and pipeline stages."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.paper import Paper
+from app.schemas.paper import PaperCreate
+from app.services.dedup import Fingerprint, find_duplicate, index_rows
+
+
+async def find_or_create_paper(db: AsyncSession, body: PaperCreate) -> Tuple[Paper, bool]:
+    """Return the canonical paper for ``body`` and whether it was created.
+
+    Newly created papers are indexed for dedup but not embedded; callers batch
+    ``store_paper_embeddings`` over the papers they created.
+    """
+    # Find or create paper by DOI or arxiv_id
+    paper: Optional[Paper] = None
+    if body.doi:
+        result = await db.execute(select(Paper).where(Paper.doi == body.doi))
+        paper = result.scalar_one_or_none()
+    if paper is None and body.arxiv_id:
+        result = await db.execute(select(Paper).where(Paper.arxiv_id == body.arxiv_id))
+        paper = result.scalar_one_or_none()
+    if paper is not None:
+        return paper, False
+
+    # No identifier match: look for a near-duplicate (preprint vs. proceedings,
+    # PDF upload without IDs) before creating a new canonical paper. The match
+    # may belong to another project, so the caller's identifiers are not
+    # written onto it.
+    fingerprint = Fingerprint.of(body.title, body.authors, body.year, body.doi, body.arxiv_id)
+    paper = await find_duplicate(db, fingerprint)
+    if paper is not None:
+        return paper, False
+
+    paper = Paper(
+        doi=body.doi,
+        arxiv_id=body.arxiv_id,
+        title=body.title,
+        authors=body.authors,
+        year=body.year,
+        abstract=body.abstract,
+        created_at=datetime.utcnow(),
+    )
+    db.add(paper)
+    await db.flush()
+    db.add_all(index_rows(paper.id, fingerprint))
+    return paper, True
@@ -0,0 +1,118 @@
+"""
+Incremental maintenance of ``project_stats``.
+
+Every write that changes a project's paper set or runs also issues one
+``UPDATE project_stats SET paper_count = paper_count + 1, ...`` in the same
+transaction, so the counters commit or roll back with the change itself and
+concurrent writers serialise on the stats row rather than racing on a
+read-modify-write. Year bounds only ever widen incrementally; removals
+(dedup merges) call ``refresh_project_stats``, which recomputes the row from
+the source tables.
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.paper import Paper, ProjectPaper
+from app.models.run import Run
+from app.models.stats import ProjectStats
+
+
+def create_project_stats(db: AsyncSession, project_id: uuid.UUID) -> None:
+    db.add(ProjectStats(project_id=project_id, updated_at=datetime.utcnow()))
+
+
+def _widen(column, bound: Optional[int], lower: bool):
+    if bound is None:
+        return column
+    beyond = column > bound if lower else column < bound
+    return case((column.is_(None) | beyond, bound), else_=column)
+
+
+async def record_papers_added(
+    db: AsyncSession, project_id: uuid.UUID, years: Iterable[Optional[int]]
+) -> None:
+    """Count newly linked papers (one entry per paper) and widen the year span."""
+    years = list(years)
+    if not years:
+        return
+    known = [year for year in years if year is not None]
+    await db.execute(
+        update(ProjectStats)
+        .where(ProjectStats.project_id == project_id)
+        .values(
+            paper_count=ProjectStats.paper_count + len(years),
+            year_min=_widen(ProjectStats.year_min, min(known, default=None), lower=True),
+            year_max=_widen(ProjectStats.year_max, max(known, default=None), lower=False),
+            updated_at=datetime.utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def record_run_created(db: AsyncSession, run: Run) -> None:
+    await db.execute(
+        update(ProjectStats)
+        .where(ProjectStats.project_id == run.project_id)
+        .values(
+            run_count=ProjectStats.run_count + 1,
+            latest_run_id=run.id,
+            latest_run_status=run.status,
+            latest_run_at=run.created_at,
+            updated_at=datetime.utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def record_run_status(db: AsyncSession, run: Run) -> None:
+    """Mirror a status change; only the project's latest run is tracked."""
+    await db.execute(
+        update(ProjectStats)
+        .where(ProjectStats.project_id == run.project_id, ProjectStats.latest_run_id == run.id)
+        .values(latest_run_status=run.status, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def refresh_project_stats(db: AsyncSession, project_id: uuid.UUID) -> None:
+    """Recompute the row from ``project_papers`` and ``runs``."""
+    papers = (
+        await db.execute(
+            select(func.count(), func.min(Paper.year), func.max(Paper.year))
+            .select_from(ProjectPaper)
+            .join(Paper, Paper.id == ProjectPaper.paper_id)
+            .where(ProjectPaper.project_id == project_id)
+        )
+    ).one()
+    run_count = await db.scalar(
+        select(func.count()).select_from(Run).where(Run.project_id == project_id)
+    )
+    latest = (
+        await db.execute(
+            select(Run.id, Run.status, Run.created_at)
+            .where(Run.project_id == project_id)
+            .order_by(Run.created_at.desc(), Run.id.desc())
+            .limit(1)
+        )
+    ).first()
+    await db.execute(
+        update(ProjectStats)
+        .where(ProjectStats.project_id == project_id)
+        .values(
+            paper_count=papers[0],
+            year_min=papers[1],
+            year_max=papers[2],
+            run_count=run_count,
+            latest_run_id=latest[0] if latest else None,
+            latest_run_status=latest[1] if latest else None,
+            latest_run_at=latest[2] if latest else None,
+            updated_at=datetime.utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    )
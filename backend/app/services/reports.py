@@ -0,0 +1,114 @@
+"""
+Reading reports while the report stage writes them.
+
+``report_events`` is a Server-Sent Events stream over a run's report. It
+polls the database every ``interval`` seconds, so it works wherever the
+stage runs (another worker process, another host). Each finished part is
+one ``section`` event whose ``id`` is the part's completion ``sequence``.
+A reconnecting ``EventSource`` sends that back as ``Last-Event-ID`` and the
+stream resumes after it. A final ``done`` event carries the report status
+(``completed``, ``failed``, or ``cancelled`` when the run was cancelled
+while writing it), or the run's status if the run ended without finishing
+the report.
+
+The stream outlives the request handler, so it takes a session factory
+rather than the request's session and opens a short read-only session per
+poll; no connection is held while it sleeps.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.report import Report, ReportPart, ReportSection
+from app.models.run import Run
+
+# Runs in these states will not write any more of their report
+FINISHED_RUN_STATUSES = ("completed", "failed", "cancelled")
+# Comment line sent when nothing happened for this long, to keep proxies from timing out
+KEEPALIVE_SECONDS = 15.0
+
+
+def sse(event: str, data: Dict[str, Any], event_id: Any = None) -> str:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def finished_parts(
+    db: AsyncSession, project_id: uuid.UUID, run_id: uuid.UUID, after: int = 0
+) -> List[Dict[str, Any]]:
+    """Finished parts with their text, in completion order, after ``sequence``."""
+    result = await db.execute(
+        select(
+            ReportPart.sequence,
+            ReportPart.position,
+            ReportPart.depth,
+            ReportPart.node_id,
+            ReportPart.label,
+            ReportPart.cached,
+            ReportSection.content,
+        )
+        .join(
+            ReportSection,
+            and_(
+                ReportSection.project_id == project_id,
+                ReportSection.key == ReportPart.section_key,
+            ),
+        )
+        .where(ReportPart.run_id == run_id, ReportPart.sequence > after)
+        .order_by(ReportPart.sequence)
+    )
+    return [dict(row) for row in result.mappings()]
+
+
+async def report_events(
+    sessions: async_sessionmaker,
+    project_id: uuid.UUID,
+    run_id: uuid.UUID,
+    *,
+    after: int = 0,
+    interval: float = 1.0,
+) -> AsyncIterator[str]:
+    """SSE lines for the run's report sections as they finish, then ``done``.
+
+    ``done`` carries ``status``: the report's completed/failed/cancelled, or
+    failed/cancelled/missing from the run when no report status was stored.
+    """
+    idle_since = time.monotonic()
+    while True:
+        # A new session (and transaction) per poll sees newly committed sections
+        async with sessions() as db:
+            # Status first: once it reads "completed", every part is already visible
+            report = (
+                await db.execute(
+                    select(Report.status, Report.total).where(Report.run_id == run_id)
+                )
+            ).first()
+            run_status = await db.scalar(select(Run.status).where(Run.id == run_id))
+            parts = await finished_parts(db, project_id, run_id, after)
+
+        for part in parts:
+            after = part["sequence"]
+            total = report.total if report is not None else None
+            yield sse("section", {**part, "total": total}, event_id=after)
+        if parts:
+            idle_since = time.monotonic()
+
+        if report is not None and report.status != "writing":
+            yield sse("done", {"status": report.status, "total": report.total})
+            return
+        if run_status is None or run_status in FINISHED_RUN_STATUSES:
+            # A run that ended without finishing a report either failed or has none
+            status = run_status if run_status in ("failed", "cancelled") else "missing"
+            yield sse("done", {"status": status, "total": None})
+            return
+        if time.monotonic() - idle_since >= KEEPALIVE_SECONDS:
+            idle_since = time.monotonic()
+            yield ": keepalive\n\n"
+        await asyncio.sleep(interval)
@@ -0,0 +1,186 @@
+"""
+Hybrid paper search: lexical matching over title/abstract plus vector
+similarity over stored embeddings, merged with reciprocal rank fusion (RRF).
+
+RRF only looks at ranks, so the two branches never need comparable scores:
+a paper's fused score is ``sum(weight / (k + rank))`` over the rankings it
+appears in.
+"""
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import func, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.embedding import PaperEmbedding
+from app.models.paper import Paper, ProjectPaper
+from app.services.embeddings import Embedder, decode_matrix, get_embedder, tokenize
+
+RRF_K = 60
+
+T = TypeVar("T")
+
+
+@dataclass
+class SearchHit:
+    paper_id: uuid.UUID
+    score: float
+    lexical_rank: Optional[int] = None
+    semantic_rank: Optional[int] = None
+
+
+def reciprocal_rank_fusion(
+    rankings: Mapping[str, Sequence[uuid.UUID]],
+    weights: Mapping[str, float],
+    k: int = RRF_K,
+) -> List[Tuple[uuid.UUID, float]]:
+    """Fuse ranked id lists into one list of (id, score), best first."""
+    scores: Dict[uuid.UUID, float] = {}
+    for source, ranked in rankings.items():
+        weight = weights.get(source, 1.0)
+        if weight <= 0:
+            continue
+        for rank, paper_id in enumerate(ranked, start=1):
+            scores[paper_id] = scores.get(paper_id, 0.0) + weight / (k + rank)
+    # Ties broken by id so results are deterministic.
+    return sorted(scores.items(), key=lambda item: (-item[1], str(item[0])))
+
+
+# Must match the expression of ix_papers_fts in migration 002 for the GIN
+# index to be used.
+def _pg_document():
+    english = literal_column("'english'::regconfig")
+    return func.setweight(func.to_tsvector(english, Paper.title), literal_column("'A'")).op("||")(
+        func.setweight(
+            func.to_tsvector(english, func.coalesce(Paper.abstract, literal_column("''"))),
+            literal_column("'B'"),
+        )
+    )
+
+
+async def lexical_search(
+    db: AsyncSession, project_id: uuid.UUID, query: str, limit: int
+) -> List[uuid.UUID]:
+    terms = tokenize(query)
+    if not terms:
+        return []
+    scoped = select(Paper.id).join(ProjectPaper, ProjectPaper.paper_id == Paper.id).where(
+        ProjectPaper.project_id == project_id
+    )
+
+    if db.bind.dialect.name == "postgresql":
+        document = _pg_document()
+        tsquery = func.websearch_to_tsquery(literal_column("'english'::regconfig"), query)
+        result = await db.execute(
+            scoped.where(document.op("@@")(tsquery))
+            .order_by(func.ts_rank_cd(document, tsquery).desc(), Paper.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    # Portable fallback (SQLite): LIKE prefilter, term-frequency ranking in Python.
+    clauses = []
+    for term in set(terms):
+        pattern = f"%{term}%"
+        clauses += [Paper.title.ilike(pattern), Paper.abstract.ilike(pattern)]
+    result = await db.execute(
+        scoped.add_columns(Paper.title, Paper.abstract).where(or_(*clauses))
+    )
+    scored = []
+    for paper_id, title, abstract in result.all():
+        title_counts = Counter(tokenize(title))
+        abstract_counts = Counter(tokenize(abstract or ""))
+        score = sum(2 * title_counts[t] + abstract_counts[t] for t in terms)
+        if score:
+            scored.append((score, str(paper_id), paper_id))
+    scored.sort(key=lambda row: (-row[0], row[1]))
+    return [paper_id for _, _, paper_id in scored[:limit]]
+
+
+async def semantic_search(
+    db: AsyncSession,
+    project_id: uuid.UUID,
+    query: str,
+    limit: int,
+    embedder: Embedder,
+) -> List[uuid.UUID]:
+    import numpy as np
+
+    result = await db.execute(
+        select(PaperEmbedding.paper_id, PaperEmbedding.vector)
+        .join(ProjectPaper, ProjectPaper.paper_id == PaperEmbedding.paper_id)
+        .where(ProjectPaper.project_id == project_id, PaperEmbedding.model == embedder.model)
+    )
+    rows = result.all()
+    if not rows:
+        return []
+    ids = [row[0] for row in rows]
+    matrix = decode_matrix([row[1] for row in rows], embedder.dim)
+    query_vector = embedder.embed([query])[0]
+    if not query_vector.any():
+        return []
+    scores = matrix @ query_vector
+    top = min(limit, len(ids))
+    best = np.argpartition(-scores, top - 1)[:top]
+    best = best[np.argsort(-scores[best], kind="stable")]
+    return [ids[i] for i in best if scores[i] > 0]
+
+
+async def hybrid_search(
+    db: AsyncSession,
+    project_id: uuid.UUID,
+    query: str,
+    *,
+    lexical_weight: float = 1.0,
+    semantic_weight: float = 1.0,
+    limit: int = 20,
+    embedder: Optional[Embedder] = None,
+) -> List[SearchHit]:
+    """Run both branches concurrently and fuse them. A zero weight skips a branch."""
+    embedder = embedder or get_embedder()
+    # Each branch over-fetches so fusion can promote items ranked lower in one list.
+    depth = max(limit * 3, 50)
+
+    branches: Dict[str, Callable[[AsyncSession], Awaitable[List[uuid.UUID]]]] = {}
+    if lexical_weight > 0:
+        branches["lexical"] = lambda s: lexical_search(s, project_id, query, depth)
+    if semantic_weight > 0:
+        branches["semantic"] = lambda s: semantic_search(s, project_id, query, depth, embedder)
+
+    if db.bind.dialect.name == "sqlite":
+        # SQLite serialises access to one connection anyway; run back to back.
+        ranked = [await branch(db) for branch in branches.values()]
+    else:
+        factory = async_sessionmaker(bind=db.bind, expire_on_commit=False)
+        ranked = await asyncio.gather(*(_in_session(factory, b) for b in branches.values()))
+    rankings = dict(zip(branches.keys(), ranked))
+
+    fused = reciprocal_rank_fusion(
+        rankings, {"lexical": lexical_weight, "semantic": semantic_weight}
+    )
+    positions = {
+        source: {paper_id: rank for rank, paper_id in enumerate(ids, start=1)}
+        for source, ids in rankings.items()
+    }
+    return [
+        SearchHit(
+            paper_id=paper_id,
+            score=score,
+            lexical_rank=positions.get("lexical", {}).get(paper_id),
+            semantic_rank=positions.get("semantic", {}).get(paper_id),
+        )
+        for paper_id, score in fused[:limit]
+    ]
+
+
+async def _in_session(
+    factory: async_sessionmaker[AsyncSession],
+    branch: Callable[[AsyncSession], Awaitable[T]],
+) -> T:
+    async with factory() as session:
+        return await branch(session)
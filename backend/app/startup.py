@@ -0,0 +1,80 @@
+"""
+API process start-up: database preparation and phase timing.
+
+``STARTUP_MODE=dev`` (the default) creates missing tables with
+``create_all``, which suits SQLite and local hacking. ``STARTUP_MODE=production``
+never issues DDL: it reads ``alembic_version`` once and refuses to start if
+the database is not at ``SCHEMA_REVISION``, so each autoscaled worker pays
+one cheap query instead of a full metadata introspection.
+
+Heavy optional stacks (NumPy, pypdf, multiprocessing, httpx, boto3) are
+imported inside the functions that use them, never at module level, so they
+load on first use rather than at boot.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Alembic head this code expects; bump together with every new migration.
+SCHEMA_REVISION = "018"
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+class StartupTimer:
+    """Millisecond durations of named start-up phases, in order."""
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = {}
+
+    def record(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = round(seconds * 1000, 1)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    @property
+    def total_ms(self) -> float:
+        return round(sum(self.phases.values()), 1)
+
+
+async def check_schema_version(engine: AsyncEngine) -> str:
+    async with engine.connect() as conn:
+        try:
+            version = await conn.scalar(text("SELECT version_num FROM alembic_version"))
+        except DBAPIError as exc:
+            raise SchemaVersionError(
+                "Database has no alembic_version table; run `alembic upgrade head`"
+            ) from exc
+    if version != SCHEMA_REVISION:
+        raise SchemaVersionError(
+            f"Database schema is at revision {version}, this build expects "
+            f"{SCHEMA_REVISION}; run `alembic upgrade head`"
+        )
+    return version
+
+
+async def prepare_database(engine: AsyncEngine, mode: str) -> None:
+    if mode == "production":
+        await check_schema_version(engine)
+        return
+    from app.database import Base
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
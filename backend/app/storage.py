@@ -0,0 +1,301 @@
+"""
+Blob storage for uploaded PDFs and run artifacts.
+
+Objects are content-addressed: the key is derived from the SHA-256 of the
+bytes, so identical uploads share one object. Bytes always arrive through an
+*upload*: chunks are appended at increasing offsets, the upload is sealed,
+and the sealed bytes are promoted under their content key once the hash is
+known. Nothing is ever held in memory beyond a single request chunk.
+
+Run artifacts (``app.services.artifacts``) are written whole from a local
+file with ``put_file`` under the same content-addressed scheme, and are
+served, like rendered exports, by ``file_response``.
+
+Two backends share this interface: ``LocalStorage`` (a directory, also the
+test stand-in) and ``S3Storage`` (any S3-compatible store such as MinIO,
+via the optional ``boto3`` dependency).
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import tempfile
+from collections.abc import AsyncIterator
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Protocol
+
+from fastapi.responses import FileResponse
+
+from app.config import settings
+
+READ_CHUNK = 1024 * 1024
+
+
+class StorageError(Exception):
+    pass
+
+
+def content_key(prefix: str, digest: str, suffix: str = "") -> str:
+    return f"{prefix}/{digest[:2]}/{digest[2:4]}/{digest}{suffix}"
+
+
+class Storage(Protocol):
+    # Smallest accepted non-final chunk (S3 multipart parts must be >= 5 MiB).
+    min_chunk_bytes: int
+
+    async def begin_upload(self, upload_id: str) -> Dict[str, Any]:
+        """Start an upload and return backend state to persist with it."""
+        ...
+
+    async def append(
+        self, upload_id: str, state: Dict[str, Any], offset: int, chunks: AsyncIterator[bytes]
+    ) -> int:
+        """Write ``chunks`` at ``offset``; returns bytes written. May update ``state``."""
+        ...
+
+    async def seal_upload(self, upload_id: str, state: Dict[str, Any]) -> None: ...
+
+    def read_upload(self, upload_id: str) -> AsyncIterator[bytes]:
+        """Stream back the bytes of a sealed upload."""
+        ...
+
+    async def promote_upload(self, upload_id: str, key: str) -> None:
+        """Move a sealed upload to ``key``; discards it if ``key`` already exists."""
+        ...
+
+    async def discard_upload(self, upload_id: str, state: Dict[str, Any]) -> None: ...
+
+    async def local_path(self, key: str) -> Path:
+        """A local file with the object's bytes, e.g. for memory-mapped parsing."""
+        ...
+
+    async def put_file(self, key: str, path: Path) -> None:
+        """Store the file at ``path`` under ``key`` (consuming it); no-op if ``key`` exists."""
+        ...
+
+
+class LocalStorage:
+    """Filesystem backend rooted at ``settings.storage_dir``."""
+
+    min_chunk_bytes = 0
+
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+
+    def path(self, key: str) -> Path:
+        return self.root / key
+
+    def _upload_path(self, upload_id: str) -> Path:
+        return self.root / ".uploads" / upload_id
+
+    async def begin_upload(self, upload_id: str) -> Dict[str, Any]:
+        path = self._upload_path(upload_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+        return {}
+
+    async def append(
+        self, upload_id: str, state: Dict[str, Any], offset: int, chunks: AsyncIterator[bytes]
+    ) -> int:
+        written = 0
+        with open(self._upload_path(upload_id), "r+b") as fh:
+            # Drop any partial tail left by an interrupted request.
+            fh.truncate(offset)
+            fh.seek(offset)
+            try:
+                async for chunk in chunks:
+                    await asyncio.to_thread(fh.write, chunk)
+                    written += len(chunk)
+            except BaseException:
+                fh.truncate(offset)
+                raise
+        return written
+
+    async def seal_upload(self, upload_id: str, state: Dict[str, Any]) -> None:
+        return None
+
+    async def read_upload(self, upload_id: str) -> AsyncIterator[bytes]:
+        with open(self._upload_path(upload_id), "rb") as fh:
+            while chunk := await asyncio.to_thread(fh.read, READ_CHUNK):
+                yield chunk
+
+    async def promote_upload(self, upload_id: str, key: str) -> None:
+        source, target = self._upload_path(upload_id), self.path(key)
+        if target.exists():
+            source.unlink(missing_ok=True)
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, target)
+
+    async def discard_upload(self, upload_id: str, state: Dict[str, Any]) -> None:
+        self._upload_path(upload_id).unlink(missing_ok=True)
+
+    async def local_path(self, key: str) -> Path:
+        return self.path(key)
+
+    async def put_file(self, key: str, path: Path) -> None:
+        target = self.path(key)
+        if target.exists():
+            path.unlink(missing_ok=True)
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Stage next to the target so the final rename is atomic.
+        partial = target.with_name(target.name + ".part")
+        await asyncio.to_thread(shutil.move, str(path), str(partial))
+        os.replace(partial, target)
+
+
+class S3Storage:
+    """S3-compatible backend using multipart uploads; one part per appended chunk."""
+
+    min_chunk_bytes = 5 * 1024 * 1024
+
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        cache_dir: str = "./data/cache",
+    ) -> None:
+        import boto3
+
+        self.bucket = bucket
+        self.client = boto3.client("s3", endpoint_url=endpoint_url or None, region_name=region)
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def _upload_key(upload_id: str) -> str:
+        return f"uploads/{upload_id}"
+
+    async def begin_upload(self, upload_id: str) -> Dict[str, Any]:
+        response = await asyncio.to_thread(
+            self.client.create_multipart_upload, Bucket=self.bucket, Key=self._upload_key(upload_id)
+        )
+        return {"multipart_id": response["UploadId"], "parts": []}
+
+    async def append(
+        self, upload_id: str, state: Dict[str, Any], offset: int, chunks: AsyncIterator[bytes]
+    ) -> int:
+        # A part is only accepted whole: spool it to disk, then upload it.
+        parts = [p for p in state["parts"] if p["offset"] < offset]
+        with tempfile.TemporaryFile() as spool:
+            written = 0
+            async for chunk in chunks:
+                await asyncio.to_thread(spool.write, chunk)
+                written += len(chunk)
+            if not written:
+                return 0
+            spool.seek(0)
+            number = len(parts) + 1
+            response = await asyncio.to_thread(
+                self.client.upload_part,
+                Bucket=self.bucket,
+                Key=self._upload_key(upload_id),
+                UploadId=state["multipart_id"],
+                PartNumber=number,
+                Body=spool,
+            )
+        parts.append({"number": number, "etag": response["ETag"], "offset": offset})
+        state["parts"] = parts
+        return written
+
+    async def seal_upload(self, upload_id: str, state: Dict[str, Any]) -> None:
+        await asyncio.to_thread(
+            self.client.complete_multipart_upload,
+            Bucket=self.bucket,
+            Key=self._upload_key(upload_id),
+            UploadId=state["multipart_id"],
+            MultipartUpload={
+                "Parts": [{"PartNumber": p["number"], "ETag": p["etag"]} for p in state["parts"]]
+            },
+        )
+
+    async def read_upload(self, upload_id: str) -> AsyncIterator[bytes]:
+        response = await asyncio.to_thread(
+            self.client.get_object, Bucket=self.bucket, Key=self._upload_key(upload_id)
+        )
+        body = response["Body"]
+        while chunk := await asyncio.to_thread(body.read, READ_CHUNK):
+            yield chunk
+
+    async def _exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            await asyncio.to_thread(self.client.head_object, Bucket=self.bucket, Key=key)
+            return True
+        except ClientError:
+            return False
+
+    async def promote_upload(self, upload_id: str, key: str) -> None:
+        source = self._upload_key(upload_id)
+        if not await self._exists(key):
+            await asyncio.to_thread(
+                self.client.copy,
+                {"Bucket": self.bucket, "Key": source},
+                self.bucket,
+                key,
+            )
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=source)
+
+    async def discard_upload(self, upload_id: str, state: Dict[str, Any]) -> None:
+        from botocore.exceptions import ClientError
+
+        try:
+            await asyncio.to_thread(
+                self.client.abort_multipart_upload,
+                Bucket=self.bucket,
+                Key=self._upload_key(upload_id),
+                UploadId=state["multipart_id"],
+            )
+        except ClientError:
+            # Already sealed: remove the assembled object instead.
+            await asyncio.to_thread(
+                self.client.delete_object, Bucket=self.bucket, Key=self._upload_key(upload_id)
+            )
+
+    async def local_path(self, key: str) -> Path:
+        path = self.cache_dir / key
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            partial = path.with_suffix(path.suffix + ".part")
+            await asyncio.to_thread(self.client.download_file, self.bucket, key, str(partial))
+            os.replace(partial, path)
+        return path
+
+    async def put_file(self, key: str, path: Path) -> None:
+        try:
+            if not await self._exists(key):
+                await asyncio.to_thread(self.client.upload_file, str(path), self.bucket, key)
+        finally:
+            path.unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> Storage:
+    if settings.storage_backend == "s3":
+        if not settings.s3_bucket:
+            raise StorageError("STORAGE_BACKEND=s3 requires S3_BUCKET")
+        return S3Storage(
+            settings.s3_bucket,
+            endpoint_url=settings.s3_endpoint_url,
+            region=settings.s3_region,
+            cache_dir=settings.storage_cache_dir,
+        )
+    return LocalStorage(settings.storage_dir)
+
+
+async def file_response(
+    key: str, content_hash: str, media_type: str, filename: str
+) -> FileResponse:
+    """Download response for a stored object, tagged with its content hash."""
+    return FileResponse(
+        await get_storage().local_path(key),
+        media_type=media_type,
+        filename=filename,
+        # Content-addressed: the bytes behind this hash never change.
+        headers={"ETag": f'"{content_hash}"'},
+    )
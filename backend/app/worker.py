@@ -0,0 +1,181 @@
+"""
+Run and export worker processes.
+
+    python -m app.worker --processes 4 --export-processes 1
+
+Starts ``--processes`` (default ``RUN_WORKERS``) worker processes. Each one
+has its own event loop and database pool and repeatedly claims a pending run
+with ``claim_next_run`` and executes it; when the queue is empty it sleeps
+``RUN_POLL_INTERVAL`` seconds. Workers on several nodes can share one
+database, since claims are arbitrated by Postgres row locks. While a run
+executes its heartbeat is refreshed, and every worker periodically sweeps
+for runs whose worker died and requeues them. SIGTERM/SIGINT let each
+process finish its current run and exit.
+
+``--export-processes`` (default ``EXPORT_WORKERS``) more processes render
+export jobs (``app.pipeline.exports``) the same way, polling every
+``EXPORT_POLL_INTERVAL`` seconds and keeping the job's heartbeat fresh so
+no other worker reclaims a slow render.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.pipeline.exports import claim_next_export, execute_export, export_heartbeat
+from app.pipeline.runner import execute_run
+from app.pipeline.scheduler import Quotas, claim_next_run, heartbeat, recover_stale_runs
+
+logger = logging.getLogger(__name__)
+
+
+class RunWorker:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        worker_id: Optional[str] = None,
+        quotas: Optional[Quotas] = None,
+        poll_interval: Optional[float] = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.quotas = quotas or Quotas.from_settings()
+        self.poll_interval = (
+            settings.run_poll_interval if poll_interval is None else poll_interval
+        )
+        self._last_sweep = 0.0
+
+    async def run_once(self) -> bool:
+        """Claim and execute one run; False when nothing was claimable."""
+        async with self.session_factory() as db:
+            run = await claim_next_run(db, self.worker_id, self.quotas)
+            if run is None:
+                return False
+            logger.info("Worker %s claimed run %s (%s)", self.worker_id, run.id, run.lane)
+            cancel = asyncio.Event()
+            try:
+                async with heartbeat(self.session_factory, run.id, cancel):
+                    await execute_run(db, run, cancel=cancel)
+            except Exception:
+                # execute_run has already marked the run failed.
+                logger.exception("Run %s failed", run.id)
+            return True
+
+    async def sweep(self) -> None:
+        """Requeue dead workers' runs, at most once per heartbeat timeout."""
+        if time.monotonic() - self._last_sweep < settings.run_heartbeat_timeout:
+            return
+        self._last_sweep = time.monotonic()
+        async with self.session_factory() as db:
+            await recover_stale_runs(db)
+
+    async def serve(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            await self.sweep()
+            if await self.run_once():
+                continue
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+class ExportWorker:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        worker_id: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_interval = (
+            settings.export_poll_interval if poll_interval is None else poll_interval
+        )
+
+    async def run_once(self) -> bool:
+        """Claim and render one export job; False when the queue was empty."""
+        async with self.session_factory() as db:
+            job = await claim_next_export(db, self.worker_id)
+            if job is None:
+                return False
+            logger.info("Worker %s claimed export %s (%s)", self.worker_id, job.id, job.format)
+            async with export_heartbeat(self.session_factory, job.id, self.worker_id):
+                await execute_export(db, job)
+            return True
+
+    async def serve(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            if await self.run_once():
+                continue
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+WORKERS = {"run": RunWorker, "export": ExportWorker}
+
+
+async def _serve(kind: str) -> None:
+    engine = create_async_engine(settings.database_url)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    try:
+        worker = WORKERS[kind](async_sessionmaker(bind=engine, expire_on_commit=False))
+        await worker.serve(stop)
+    finally:
+        await engine.dispose()
+
+
+def _process_main(kind: str = "run") -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(process)d %(message)s")
+    asyncio.run(_serve(kind))
+
+
+def main() -> None:
+    import multiprocessing
+
+    parser = argparse.ArgumentParser(description="LRWeb run and export workers")
+    parser.add_argument("--processes", type=int, default=settings.run_workers)
+    parser.add_argument("--export-processes", type=int, default=settings.export_workers)
+    args = parser.parse_args()
+
+    kinds = ["run"] * max(args.processes, 0) + ["export"] * max(args.export_processes, 0)
+    if not kinds:
+        parser.error("no worker processes requested")
+    if len(kinds) == 1:
+        _process_main(kinds[0])
+        return
+    ctx = multiprocessing.get_context("spawn")
+    processes = [
+        ctx.Process(target=_process_main, args=(kind,), name=f"{kind}-worker-{i}")
+        for i, kind in enumerate(kinds)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(signum, _frame) -> None:
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signum)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
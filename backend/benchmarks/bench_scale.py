@@ -0,0 +1,266 @@
+"""
+Large-project scale test: the full pipeline against per-stage budgets.
+
+Seeds a synthetic library (``benchmarks.synthetic``) of each requested size,
+runs every pipeline stage on it through ``execute_run`` with offline model
+providers, and checks each stage's wall time and memory growth against
+``BUDGETS`` for the size tier. The embedder returns seeded random vectors and
+the reasoner answers like ``ExtractiveReasoner`` after an optional simulated
+latency, so the numbers measure this codebase rather than a model vendor.
+
+Memory growth is the stage's peak RSS (from its ``RunStageProfile``) minus
+the process RSS just before the run started, so it includes whatever earlier
+stages still hold. Any stage over budget makes the command exit non-zero.
+
+    cd backend
+    python -m benchmarks.bench_scale --papers 1000 10000
+    python -m benchmarks.bench_scale --papers 100000 --embedded 0.99 --output scale.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401
+from app.config import settings
+from app.database import Base
+from app.models.profile import RunStageProfile
+from app.models.run import Run
+from app.pipeline.profiling import current_rss
+from app.pipeline.runner import execute_run
+from app.services.embeddings import normalize_rows
+from app.services.llm import Completion, ExtractiveReasoner
+from app.storage import get_storage
+from benchmarks.synthetic import seed_project
+
+MiB = 1024 * 1024
+# Papers in the tier -> stage -> (wall seconds, MiB of RSS growth). A library
+# is held to the smallest tier at least its size. Set at 2-5x what SQLite on
+# a development machine measures; the 100k tier keeps the whole run inside
+# the plan's 30 minutes, most of it in the graph's neighbour search.
+BUDGETS: Dict[int, Dict[str, Tuple[float, float]]] = {
+    1_000: {
+        "retrieval": (1.0, 16),
+        "pdf_parsing": (1.0, 32),
+        "embeddings": (2.0, 64),
+        "taxonomy": (5.0, 64),
+        "graph": (5.0, 96),
+        "report": (5.0, 96),
+    },
+    10_000: {
+        "retrieval": (1.0, 16),
+        "pdf_parsing": (2.0, 64),
+        "embeddings": (5.0, 128),
+        "taxonomy": (10.0, 160),
+        "graph": (30.0, 192),
+        "report": (10.0, 192),
+    },
+    100_000: {
+        "retrieval": (5.0, 64),
+        "pdf_parsing": (10.0, 192),
+        "embeddings": (30.0, 1024),
+        "taxonomy": (60.0, 1024),
+        "graph": (600.0, 1536),
+        "report": (30.0, 1024),
+    },
+}
+
+
+class SyntheticEmbedder:
+    """One seeded random unit vector per distinct text; no model involved."""
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+        self.model = f"synthetic-{dim}"
+        self.calls = 0
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        self.calls += 1
+        rows = [
+            np.random.default_rng(zlib.crc32(text.encode())).standard_normal(self.dim)
+            for text in texts
+        ]
+        return normalize_rows(np.array(rows, dtype=np.float32).reshape(len(texts), self.dim))
+
+
+class SyntheticReasoner:
+    """``ExtractiveReasoner`` answers after ``latency`` seconds per call."""
+
+    model = "synthetic-reasoner"
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.inner = ExtractiveReasoner()
+        self.calls = 0
+
+    async def complete(self, system: str, prompt: str, max_tokens: int = 64) -> Completion:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return await self.inner.complete(system, prompt, max_tokens)
+
+
+def budget_for(papers: int) -> Optional[Dict[str, Tuple[float, float]]]:
+    for tier in sorted(BUDGETS):
+        if papers <= tier:
+            return BUDGETS[tier]
+    return None
+
+
+async def measure(
+    papers: int,
+    *,
+    database_url: str,
+    embedded: float = 1.0,
+    llm_latency: float = 0.0,
+    seed: int = 7,
+    budgets: Optional[Dict[str, Tuple[float, float]]] = None,
+) -> Dict[str, Any]:
+    """Seed ``papers`` papers, run the pipeline once and report each stage."""
+    if database_url.startswith("sqlite"):
+        engine = create_async_engine(database_url, poolclass=StaticPool)
+    else:
+        engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    embedder = SyntheticEmbedder(settings.embedding_dim)
+    reasoner = SyntheticReasoner(llm_latency)
+    budgets = budget_for(papers) if budgets is None else budgets
+
+    try:
+        start = time.perf_counter()
+        async with factory() as session:
+            project_id = await seed_project(
+                session,
+                papers,
+                model=embedder.model,
+                dim=embedder.dim,
+                embedded=embedded,
+                seed=seed,
+            )
+        seed_seconds = time.perf_counter() - start
+
+        async with factory() as session:
+            run = Run(project_id=project_id, config_snapshot={})
+            session.add(run)
+            await session.commit()
+            baseline = current_rss()
+            start = time.perf_counter()
+            await execute_run(session, run, embedder=embedder, reasoner=reasoner)
+            total = time.perf_counter() - start
+            result = await session.execute(
+                select(RunStageProfile)
+                .where(RunStageProfile.run_id == run.id)
+                .order_by(RunStageProfile.position)
+            )
+            profiles = list(result.scalars().all())
+            status = run.status
+    finally:
+        await engine.dispose()
+
+    stages: Dict[str, Dict[str, Any]] = {}
+    for profile in profiles:
+        growth = max(0, profile.peak_rss_bytes - baseline) / MiB
+        limit = (budgets or {}).get(profile.stage)
+        stages[profile.stage] = {
+            "wall_seconds": round(profile.wall_seconds, 3),
+            "cpu_seconds": round(profile.cpu_seconds, 3),
+            "rss_growth_mb": round(growth, 1),
+            "db_statements": profile.db_statements,
+            "llm_calls": profile.llm_calls,
+            "budget": None if limit is None else {"wall_seconds": limit[0], "rss_mb": limit[1]},
+            "ok": limit is None or (profile.wall_seconds <= limit[0] and growth <= limit[1]),
+        }
+    return {
+        "papers": papers,
+        "status": status,
+        "seed_seconds": round(seed_seconds, 2),
+        "run_seconds": round(total, 2),
+        "embedder_calls": embedder.calls,
+        "reasoner_calls": reasoner.calls,
+        "stages": stages,
+    }
+
+
+def overruns(report: Dict[str, Any]) -> List[str]:
+    """``"<stage>"`` for every stage over budget, or ``"run"`` if it did not complete."""
+    found = [] if report["status"] == "completed" else ["run"]
+    return found + [name for name, stage in report["stages"].items() if not stage["ok"]]
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    # Run artifacts go to a scratch directory, not the configured storage
+    settings.storage_dir = tempfile.mkdtemp(prefix="lrweb-scale-")
+    get_storage.cache_clear()
+    database_url = args.database_url
+    reports = []
+    for papers in args.papers:
+        if database_url is None:
+            path = os.path.join(settings.storage_dir, f"scale-{papers}.db")
+            url = f"sqlite+aiosqlite:///{path}"
+        else:
+            url = database_url
+        report = await measure(
+            papers,
+            database_url=url,
+            embedded=args.embedded,
+            llm_latency=args.llm_latency,
+            seed=args.seed,
+        )
+        print(
+            f"{papers:>7} papers: {report['run_seconds']}s, over budget: "
+            f"{', '.join(overruns(report)) or 'none'}",
+            file=sys.stderr,
+        )
+        reports.append(report)
+    return reports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--papers", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument(
+        "--embedded",
+        type=float,
+        default=0.9,
+        help="Fraction of papers already embedded; the pipeline embeds the rest",
+    )
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.0, help="Simulated seconds per reasoner call"
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--database-url", help="Defaults to a temporary SQLite file per size")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    args = parser.parse_args()
+
+    reports = asyncio.run(run(args))
+    text = json.dumps(
+        {"python": platform.python_version(), "budgets": BUDGETS, "runs": reports}, indent=2
+    )
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    print(text)
+    failed = [f"{r['papers']}:{name}" for r in reports for name in overruns(r)]
+    if failed:
+        print(f"Over budget: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
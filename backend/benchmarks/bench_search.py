@@ -0,0 +1,215 @@
+"""
+Recall and latency benchmark for lexical, semantic and hybrid paper search.
+
+Builds a synthetic corpus in which every topic has two interchangeable
+vocabularies (so paraphrased queries defeat lexical search) and a handful of
+rare model names (which a dense embedding blurs together). A fake "semantic"
+embedder maps synonyms onto shared concept vectors, standing in for a real
+embedding model.
+
+    cd backend
+    python -m benchmarks.bench_search --papers 5000 --topics 200
+    python -m benchmarks.bench_search --database-url postgresql+asyncpg://...
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401
+from app.database import Base
+from app.models.embedding import PaperEmbedding
+from app.models.paper import Paper, ProjectPaper
+from app.models.project import Project
+from app.models.user import User
+from app.services.embeddings import encode_vector, normalize_rows, tokenize
+from app.services.search import hybrid_search
+
+DIM = 128
+K = 20
+MODES = {"lexical": (1.0, 0.0), "semantic": (0.0, 1.0), "hybrid": (1.0, 1.0)}
+
+
+class ConceptEmbedder:
+    """Sums one concept vector per known token; synonyms share a concept."""
+
+    model = "bench-concepts"
+    dim = DIM
+
+    def __init__(self, concept_of: Dict[str, int], n_concepts: int, seed: int) -> None:
+        rng = np.random.default_rng(seed)
+        self.concept_of = concept_of
+        self.vectors = normalize_rows(rng.standard_normal((n_concepts, DIM)).astype(np.float32))
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        out = np.zeros((len(texts), DIM), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in tokenize(text):
+                concept = self.concept_of.get(token)
+                if concept is not None:
+                    out[row] += self.vectors[concept]
+        return normalize_rows(out)
+
+
+def build_corpus(n_papers: int, n_topics: int, seed: int):
+    rng = random.Random(seed)
+    concept_of: Dict[str, int] = {}
+    topics = []
+    for t in range(n_topics):
+        # Three concepts per topic, each with an "a" and a "b" surface form.
+        words_a, words_b = [], []
+        for c in range(3):
+            concept = t * 3 + c
+            a, b = f"t{t}c{c}alpha", f"t{t}c{c}beta"
+            concept_of[a] = concept_of[b] = concept
+            words_a.append(a)
+            words_b.append(b)
+        topics.append((words_a, words_b))
+
+    papers: List[Tuple[uuid.UUID, int, str, str]] = []
+    names: Dict[str, Set[uuid.UUID]] = {}
+    for i in range(n_papers):
+        topic = i % n_topics
+        words_a, _ = topics[topic]
+        paper_id = uuid.uuid4()
+        title = " ".join(rng.sample(words_a, 2))
+        abstract = " ".join(rng.choices(words_a, k=6))
+        if rng.random() < 0.05:
+            name = f"model{topic}x{rng.randrange(3)}"
+            concept_of.setdefault(name, topic * 3)
+            abstract += f" using {name}"
+            names.setdefault(name, set()).add(paper_id)
+        papers.append((paper_id, topic, title, abstract))
+
+    embedder = ConceptEmbedder(concept_of, n_topics * 3, seed)
+    members: Dict[int, Set[uuid.UUID]] = {}
+    for paper_id, topic, _, _ in papers:
+        members.setdefault(topic, set()).add(paper_id)
+
+    queries: List[Tuple[str, str, Set[uuid.UUID]]] = []
+    for topic, (_, words_b) in enumerate(topics):
+        # Paraphrase: only "b" forms, which never appear in the corpus text.
+        queries.append(("paraphrase", " ".join(words_b[:2]), members[topic]))
+    for name, ids in names.items():
+        queries.append(("exact_name", name, ids))
+    return papers, embedder, queries
+
+
+async def seed(session: AsyncSession, papers, embedder: ConceptEmbedder) -> uuid.UUID:
+    now = datetime.utcnow()
+    user_id, project_id = uuid.uuid4(), uuid.uuid4()
+    await session.execute(insert(User).values(id=user_id, email="bench@local", created_at=now))
+    await session.execute(
+        insert(Project).values(
+            id=project_id, owner_id=user_id, name="bench", created_at=now, updated_at=now
+        )
+    )
+    matrix = embedder.embed([f"{title}. {abstract}" for _, _, title, abstract in papers])
+    await session.execute(
+        insert(Paper),
+        [
+            {"id": pid, "title": title, "abstract": abstract, "authors": [], "created_at": now}
+            for pid, _, title, abstract in papers
+        ],
+    )
+    await session.execute(
+        insert(ProjectPaper),
+        [
+            {"id": uuid.uuid4(), "project_id": project_id, "paper_id": pid, "added_at": now}
+            for pid, _, _, _ in papers
+        ],
+    )
+    await session.execute(
+        insert(PaperEmbedding),
+        [
+            {
+                "paper_id": pid,
+                "model": embedder.model,
+                "dim": DIM,
+                "vector": encode_vector(vector),
+                "created_at": now,
+            }
+            for (pid, _, _, _), vector in zip(papers, matrix)
+        ],
+    )
+    await session.commit()
+    return project_id
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Dict[str, Dict[str, float]]]:
+    if args.database_url.startswith("sqlite"):
+        engine = create_async_engine(args.database_url, poolclass=StaticPool)
+    else:
+        engine = create_async_engine(args.database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    papers, embedder, queries = build_corpus(args.papers, args.topics, args.seed)
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with factory() as session:
+        project_id = await seed(session, papers, embedder)
+
+    report: Dict[str, Dict[str, Dict[str, float]]] = {}
+    async with factory() as session:
+        for mode, (lexical_weight, semantic_weight) in MODES.items():
+            recalls: Dict[str, List[float]] = {}
+            latencies: List[float] = []
+            for kind, text, relevant in queries:
+                start = time.perf_counter()
+                hits = await hybrid_search(
+                    session,
+                    project_id,
+                    text,
+                    lexical_weight=lexical_weight,
+                    semantic_weight=semantic_weight,
+                    limit=K,
+                    embedder=embedder,
+                )
+                latencies.append((time.perf_counter() - start) * 1000)
+                found = {hit.paper_id for hit in hits}
+                denominator = min(len(relevant), K)
+                recalls.setdefault(kind, []).append(len(found & relevant) / denominator)
+            latencies.sort()
+            report[mode] = {
+                "recall_at_k": {kind: round(statistics.mean(v), 4) for kind, v in recalls.items()},
+                "latency_ms": {
+                    "p50": round(latencies[len(latencies) // 2], 2),
+                    "p95": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+                    "mean": round(statistics.mean(latencies), 2),
+                },
+            }
+    await engine.dispose()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--papers", type=int, default=2000)
+    parser.add_argument("--topics", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    text = json.dumps({"k": K, "papers": args.papers, "modes": report}, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+CPU cost of building a ``list_papers`` response, per 1,000 rows.
+
+Compares the path FastAPI takes for ORM results (load ``ProjectPaper`` with
+``selectinload(paper)``, validate through ``List[ProjectPaperRead]`` with
+``from_attributes``, dump to JSON) against the fast path in
+``app.responses`` (select plain columns, shape dicts, encode directly), both
+for the default abstract-free list and for ``fields=title,authors,year``.
+Query and encode CPU, and response size, are reported separately.
+
+    cd backend
+    python -m benchmarks.bench_serialization --rows 1000 --repeat 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401
+from app.database import Base
+from app.models.paper import Paper, ProjectPaper
+from app.models.project import Project
+from app.models.user import User
+from app.responses import dumps, orjson, schema_columns, schema_row
+from app.schemas.paper import PaperSummary, ProjectPaperListItem, ProjectPaperRead
+
+WORDS = "graph neural retrieval attention sparse transformer citation topic embedding".split()
+
+
+async def seed(session: AsyncSession, rows: int, seed: int) -> uuid.UUID:
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    user_id, project_id = uuid.uuid4(), uuid.uuid4()
+    await session.execute(insert(User).values(id=user_id, email="bench@local", created_at=now))
+    await session.execute(
+        insert(Project).values(
+            id=project_id, owner_id=user_id, name="bench", created_at=now, updated_at=now
+        )
+    )
+    paper_ids = [uuid.uuid4() for _ in range(rows)]
+    await session.execute(
+        insert(Paper),
+        [
+            {
+                "id": pid,
+                "doi": f"10.5555/bench.{i}",
+                "title": " ".join(rng.choices(WORDS, k=8)),
+                "authors": [f"Author {rng.randrange(500)}" for _ in range(4)],
+                "year": rng.randint(1995, 2025),
+                # ~1 KB, a typical abstract
+                "abstract": " ".join(rng.choices(WORDS, k=130)),
+                "created_at": now,
+            }
+            for i, pid in enumerate(paper_ids)
+        ],
+    )
+    await session.execute(
+        insert(ProjectPaper),
+        [
+            {
+                "id": uuid.uuid4(),
+                "project_id": project_id,
+                "paper_id": pid,
+                "inclusion_reason": "seed",
+                "score": rng.random(),
+                "added_at": now,
+            }
+            for pid in paper_ids
+        ],
+    )
+    await session.commit()
+    return project_id
+
+
+async def validated(session: AsyncSession, project_id: uuid.UUID, rows: int) -> Tuple[Any, float]:
+    result = await session.execute(
+        select(ProjectPaper)
+        .where(ProjectPaper.project_id == project_id)
+        .options(selectinload(ProjectPaper.paper))
+        .limit(rows)
+    )
+    objects = list(result.scalars().all())
+    start = time.process_time()
+    adapter = TypeAdapter(List[ProjectPaperRead])
+    body = adapter.dump_json(adapter.validate_python(objects, from_attributes=True))
+    return body, time.process_time() - start
+
+
+def fast_path(fields: Optional[Set[str]] = None) -> "Path":
+    async def fast(
+        session: AsyncSession, project_id: uuid.UUID, rows: int
+    ) -> Tuple[Any, float]:
+        result = await session.execute(
+            select(
+                *schema_columns(ProjectPaper, ProjectPaperListItem),
+                *schema_columns(Paper, PaperSummary, prefix="paper.", fields=fields),
+            )
+            .join(Paper, Paper.id == ProjectPaper.paper_id)
+            .where(ProjectPaper.project_id == project_id)
+            .limit(rows)
+        )
+        mappings = list(result.mappings())
+        start = time.process_time()
+        body = dumps(
+            [
+                {
+                    **schema_row(row, ProjectPaperListItem),
+                    "paper": schema_row(row, PaperSummary, prefix="paper.", fields=fields),
+                }
+                for row in mappings
+            ]
+        )
+        return body, time.process_time() - start
+
+    return fast
+
+
+Path = Callable[[AsyncSession, uuid.UUID, int], Awaitable[Tuple[Any, float]]]
+
+
+async def measure(factory, path: Path, project_id: uuid.UUID, args) -> Dict[str, float]:
+    totals: List[float] = []
+    encodes: List[float] = []
+    size = 0
+    for _ in range(args.repeat):
+        # A fresh session per iteration, like one per HTTP request.
+        async with factory() as session:
+            start = time.process_time()
+            body, encode = await path(session, project_id, args.rows)
+            totals.append(time.process_time() - start)
+            encodes.append(encode)
+            size = len(body)
+    scale = 1000 / args.rows * 1000  # seconds per args.rows -> ms per 1,000 rows
+    total, encode = statistics.median(totals) * scale, statistics.median(encodes) * scale
+    return {
+        "cpu_ms_per_1k_rows": round(total, 2),
+        "query_cpu_ms_per_1k_rows": round(total - encode, 2),
+        "encode_cpu_ms_per_1k_rows": round(encode, 2),
+        "kb_per_1k_rows": round(size / args.rows, 1),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    engine = create_async_engine(args.database_url, poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with factory() as session:
+        project_id = await seed(session, args.rows, args.seed)
+
+    report = {
+        name: await measure(factory, path, project_id, args)
+        for name, path in (
+            ("orm_validated", validated),
+            ("fast_path", fast_path()),
+            ("fast_path_sparse", fast_path({"id", "title", "authors", "year"})),
+        )
+    }
+    await engine.dispose()
+    base, new = report["orm_validated"], report["fast_path"]
+    return {
+        "rows": args.rows,
+        "encoder": "orjson" if orjson is not None else "json",
+        "paths": report,
+        "cpu_saved_ms_per_1k_rows": round(
+            base["cpu_ms_per_1k_rows"] - new["cpu_ms_per_1k_rows"], 2
+        ),
+        "speedup": round(base["cpu_ms_per_1k_rows"] / new["cpu_ms_per_1k_rows"], 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
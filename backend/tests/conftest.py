@@ -18,8 +18,12 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 
-from app.database import Base, get_db
+from app.auth import clear_caches
+from app.config import settings
+from app import database
+from app.database import Base, SessionRouter, get_db, get_read_db
 from app.main import app
+from app.storage import get_storage
 
 # ---------------------------------------------------------------------------
 # Override SQLAlchemy models to use SQLite-compatible column types in tests
@@ -56,7 +60,7 @@ async def db_session(db_engine) -> AsyncGenerator[AsyncSession, None]:
 
 
 @pytest_asyncio.fixture(scope="function")
-async def client(db_engine) -> AsyncGenerator[AsyncClient, None]:
+async def client(db_engine, monkeypatch) -> AsyncGenerator[AsyncClient, None]:
     session_factory = async_sessionmaker(
         bind=db_engine, class_=AsyncSession, expire_on_commit=False
     )
@@ -71,6 +75,11 @@ async def client(db_engine) -> AsyncGenerator[AsyncClient, None]:
                 raise
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    # For code that opens its own sessions (streaming responses)
+    monkeypatch.setattr(database, "sessions", SessionRouter(session_factory))
+    # Users and owners cached by earlier tests belong to other databases
+    clear_caches()
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
@@ -88,3 +97,13 @@ def user_id() -> str:
 @pytest.fixture
 def auth_headers(user_id: str) -> Dict[str, str]:
     return {"X-User-Id": user_id}
+
+
+@pytest.fixture
+def storage_dir(tmp_path, monkeypatch) -> str:
+    """Point blob storage at a per-test temporary directory."""
+    root = str(tmp_path / "storage")
+    monkeypatch.setattr(settings, "storage_dir", root)
+    get_storage.cache_clear()
+    yield root
+    get_storage.cache_clear()
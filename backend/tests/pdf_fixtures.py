@@ -0,0 +1,54 @@
+"""Tiny hand-built PDFs for parser tests (no PDF writer dependency)."""
+from __future__ import annotations
+
+from typing import List
+
+
+def _escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages: List[List[str]]) -> bytes:
+    """Build a PDF with one Helvetica text line per entry of each page."""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "",  # page tree, filled in below
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for lines in pages:
+        content = "BT /F1 11 Tf 14 TL 72 720 Td "
+        content += " ".join(f"({_escape(line)}) '" for line in lines) + " ET"
+        page_id, content_id = len(objects) + 1, len(objects) + 2
+        kids.append(f"{page_id} 0 R")
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    ).encode()
+    return out
+
+
+SAMPLE_PAGES = [
+    ["A Study of Things", "Abstract", "We study things.", "1 Introduction", "Things matter."],
+    [
+        "2 Method",
+        "We measure things.",
+        "References",
+        "[1] A. Smith. Paper one. 2019.",
+        "[2] B. Jones. Paper two. 2020.",
+    ],
+]
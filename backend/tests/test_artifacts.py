@@ -0,0 +1,95 @@
+import gzip
+import uuid
+
+import numpy as np
+import pytest
+
+from app.models.run import Run
+from app.pipeline.runner import execute_run
+from app.services.artifacts import get_artifact, load_array, read_table, save_array, save_table
+
+
+async def make_run(client, headers, titles=("Graph neural networks", "Sparse attention")):
+    resp = await client.post("/projects", json={"name": "Artifacts"}, headers=headers)
+    pid = resp.json()["id"]
+    for title in titles:
+        await client.post(f"/projects/{pid}/papers", json={"title": title}, headers=headers)
+    resp = await client.post(f"/projects/{pid}/runs", json={}, headers=headers)
+    return pid, resp.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_array_round_trip_is_memory_mapped(client, auth_headers, db_session, storage_dir):
+    _, run_id = await make_run(client, auth_headers)
+    matrix = np.arange(12, dtype=np.float64).reshape(4, 3)
+
+    artifact = await save_array(db_session, uuid.UUID(run_id), "embeddings", matrix)
+    assert (artifact.kind, artifact.format, artifact.dtype) == ("array", "npy", "float32")
+    assert artifact.shape == [4, 3] and artifact.rows == 4
+
+    loaded = await load_array(artifact)
+    assert isinstance(loaded, np.memmap)
+    assert not loaded.flags.writeable
+    np.testing.assert_array_equal(loaded, matrix.astype(np.float32))
+
+
+@pytest.mark.asyncio
+async def test_table_round_trip_and_content_addressing(
+    client, auth_headers, db_session, storage_dir
+):
+    _, first = await make_run(client, auth_headers)
+    _, second = await make_run(client, auth_headers)
+    rows = [{"row": i, "paper_id": str(uuid.uuid4())} for i in range(1000)]
+
+    a = await save_table(db_session, uuid.UUID(first), "index", iter(rows))
+    b = await save_table(db_session, uuid.UUID(second), "index", rows)
+    assert a.rows == 1000
+    assert a.format in ("ndjson.zst", "ndjson.gz")
+    # Same rows in two runs: one blob, two manifests
+    assert a.storage_key == b.storage_key and a.id != b.id
+    assert list(await read_table(b)) == rows
+
+    # Saving under the same name replaces the run's manifest
+    c = await save_table(db_session, uuid.UUID(first), "index", rows[:10])
+    assert c.id == a.id and c.rows == 10
+    assert (await get_artifact(db_session, uuid.UUID(first), "index")).rows == 10
+
+
+@pytest.mark.asyncio
+async def test_run_lists_manifests_and_serves_bytes(
+    client, auth_headers, db_session, storage_dir
+):
+    pid, run_id = await make_run(client, auth_headers)
+    run = await db_session.get(Run, uuid.UUID(run_id))
+    await execute_run(db_session, run)
+
+    resp = await client.get(f"/projects/{pid}/runs/{run_id}", headers=auth_headers)
+    assert resp.status_code == 200
+    artifacts = {a["name"]: a for a in resp.json()["artifacts"]}
+    assert set(artifacts) == {"embeddings", "embedding_index", "taxonomy"}
+    embeddings = artifacts["embeddings"]
+    assert embeddings["shape"][0] == 2 and embeddings["dtype"] == "float32"
+    assert "storage_key" not in embeddings
+
+    resp = await client.get(
+        f"/projects/{pid}/runs/{run_id}/artifacts/embedding_index", headers=auth_headers
+    )
+    assert resp.status_code == 200
+    assert resp.headers["etag"] == f'"{artifacts["embedding_index"]["content_hash"]}"'
+    if artifacts["embedding_index"]["format"] == "ndjson.gz":
+        assert gzip.decompress(resp.content).count(b"\n") == 2
+
+
+@pytest.mark.asyncio
+async def test_artifact_download_not_found(client, auth_headers, db_session, storage_dir):
+    pid, run_id = await make_run(client, auth_headers)
+    await save_table(db_session, uuid.UUID(run_id), "index", [{"row": 0}])
+    await db_session.commit()
+
+    url = f"/projects/{pid}/runs/{run_id}/artifacts"
+    resp = await client.get(f"{url}/missing", headers=auth_headers)
+    assert resp.status_code == 404
+    resp = await client.get(f"{url}/index", headers={"X-User-Id": str(uuid.uuid4())})
+    assert resp.status_code == 404
+    resp = await client.get(f"{url}/index", headers=auth_headers)
+    assert resp.status_code == 200
@@ -0,0 +1,113 @@
+import uuid
+
+import pytest
+from sqlalchemy import delete, event, func, select
+
+from app import auth
+from app.auth import TTLCache, resolve_user
+from app.models.project import Project
+from app.models.user import User
+
+
+class StatementLog:
+    def __init__(self, engine):
+        self.engine = engine.sync_engine
+        self.statements = []
+
+    def capture(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement.lower())
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self.capture)
+        return self.statements
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self.capture)
+
+
+def test_ttl_cache_expires_and_stays_bounded(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(auth.time, "monotonic", lambda: now[0])
+    cache = TTLCache(ttl=30, max_entries=10)
+    cache.set("a", 1)
+    now[0] += 29
+    assert cache.get("a") == 1
+    now[0] += 2
+    assert cache.get("a") is None
+
+    for i in range(25):
+        cache.set(i, i)
+    assert len(cache._entries) <= 10
+    assert cache.get(24) == 24 and cache.get(0) is None
+
+
+@pytest.mark.asyncio
+async def test_known_user_and_owner_cost_no_queries(client, auth_headers, db_engine, db_session):
+    resp = await client.post("/projects", json={"name": "Scoped"}, headers=auth_headers)
+    pid = resp.json()["id"]
+    # Created once, on first sight
+    assert await db_session.scalar(select(func.count()).select_from(User)) == 1
+
+    await client.get(f"/projects/{pid}/runs", headers=auth_headers)
+    with StatementLog(db_engine) as statements:
+        resp = await client.get(f"/projects/{pid}/runs", headers=auth_headers)
+        assert resp.status_code == 200
+        resp = await client.post("/projects", json={"name": "Second"}, headers=auth_headers)
+        assert resp.status_code == 201
+    assert not any("from users" in s or "into users" in s for s in statements)
+    # The runs listing is the only statement of its request
+    assert statements[0].startswith("select") and "from runs" in statements[0]
+    assert "from projects" not in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_ownership_is_still_enforced(client, auth_headers, db_engine):
+    resp = await client.post("/projects", json={"name": "Mine"}, headers=auth_headers)
+    pid = resp.json()["id"]
+    stranger = {"X-User-Id": str(uuid.uuid4())}
+
+    # Cold and warm owner cache alike
+    for _ in range(2):
+        assert (await client.get(f"/projects/{pid}/runs", headers=stranger)).status_code == 404
+    assert (await client.get(f"/projects/{pid}/runs", headers=auth_headers)).status_code == 200
+
+    assert (await client.delete(f"/projects/{pid}", headers=auth_headers)).status_code == 204
+    # Deleting evicts the cached owner
+    assert (await client.get(f"/projects/{pid}/runs", headers=auth_headers)).status_code == 404
+    missing = f"/projects/{uuid.uuid4()}/runs"
+    assert (await client.get(missing, headers=auth_headers)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_owner_cached_past_a_delete_elsewhere(client, auth_headers, db_session):
+    resp = await client.post("/projects", json={"name": "Doomed"}, headers=auth_headers)
+    pid = resp.json()["id"]
+    assert (await client.get(f"/projects/{pid}", headers=auth_headers)).status_code == 200
+    # Another process deletes it; this one still has the owner cached
+    await db_session.execute(delete(Project).where(Project.id == uuid.UUID(pid)))
+    await db_session.commit()
+
+    # Reads find nothing under it
+    assert (await client.get(f"/projects/{pid}/runs", headers=auth_headers)).json() == []
+    # Writes confirm the row first, and drop the stale entry
+    resp = await client.post(f"/projects/{pid}/runs", json={}, headers=auth_headers)
+    assert resp.status_code == 404
+    assert auth._owners.get(uuid.UUID(pid)) is None
+
+    # Other routes likewise, starting from a stale entry each time
+    auth._owners.set(uuid.UUID(pid), uuid.UUID(auth_headers["X-User-Id"]))
+    resp = await client.post(f"/projects/{pid}/papers", json={"title": "Late"}, headers=auth_headers)
+    assert resp.status_code == 404
+    auth._owners.set(uuid.UUID(pid), uuid.UUID(auth_headers["X-User-Id"]))
+    assert (await client.get(f"/projects/{pid}", headers=auth_headers)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_resolving_a_user_twice_inserts_once(db_session):
+    user_id = uuid.uuid4()
+    first = await resolve_user(db_session, user_id)
+    auth.clear_caches()
+    # Another process that has not cached the user yet
+    second = await resolve_user(db_session, user_id)
+    assert first == second
+    assert await db_session.scalar(select(func.count()).select_from(User)) == 1
@@ -0,0 +1,167 @@
+"""Citation expansion against a local fixture citation server (ASGI, no network)."""
+import uuid
+from collections import Counter
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI, Response
+from sqlalchemy import func, select
+
+from app.main import app
+from app.models.citation import Citation
+from app.pipeline.citations import HttpCitationSource, get_citation_source
+
+
+def node(pid, title, refs=(), cited_by=(), doi=None, arxiv=None, year=2020):
+    return {
+        "paperId": pid,
+        "title": title,
+        "authors": [{"name": f"Author {pid}"}],
+        "year": year,
+        "abstract": f"Abstract of {title}.",
+        "externalIds": {k: v for k, v in (("DOI", doi), ("ArXiv", arxiv)) if v},
+        "references": [{"paperId": r} for r in refs],
+        "citations": [{"paperId": c} for c in cited_by],
+    }
+
+
+# S1 and S2 are the seeds. A is linked to both, B/C/D to one, E is two hops out.
+GRAPH = {
+    "S1": node("S1", "Seed One", refs=["A", "B"], cited_by=["C"], doi="10.1/seed1"),
+    "S2": node("S2", "Seed Two", refs=["A", "D"], arxiv="2001.00001"),
+    "A": node("A", "Shared Foundation", refs=["E"], cited_by=["S1", "S2"]),
+    "B": node("B", "Only Cited By One", cited_by=["S1"]),
+    "C": node("C", "Citing Follow-up", refs=["S1"]),
+    "D": node("D", "Other Reference", cited_by=["S2"]),
+    "E": node("E", "Distant Ancestor", cited_by=["A"]),
+}
+ALIASES = {"DOI:10.1/seed1": "S1", "ARXIV:2001.00001": "S2"}
+
+
+def citation_server(calls: Counter) -> FastAPI:
+    server = FastAPI()
+
+    @server.get("/paper/{key:path}")
+    async def paper(key: str, response: Response):
+        calls[key] += 1
+        if key == "B" and calls[key] == 1:
+            # Transient rate limit on first request
+            response.status_code = 429
+            response.headers["Retry-After"] = "0"
+            return {}
+        paper_id = ALIASES.get(key, key)
+        if paper_id not in GRAPH:
+            response.status_code = 404
+            return {}
+        return GRAPH[paper_id]
+
+    return server
+
+
+@pytest.fixture
+def calls() -> Counter:
+    return Counter()
+
+
+@pytest_asyncio.fixture
+async def citation_source(client, calls):
+    transport = httpx.ASGITransport(app=citation_server(calls))
+    async with httpx.AsyncClient(transport=transport, base_url="http://citations") as http:
+        source = HttpCitationSource(http, concurrency=2, requests_per_second=0)
+        app.dependency_overrides[get_citation_source] = lambda: source
+        yield source
+
+
+async def seed_project(client, headers):
+    resp = await client.post("/projects", json={"name": "Citations"}, headers=headers)
+    pid = resp.json()["id"]
+    for body in (
+        {"title": "Seed One", "doi": "10.1/seed1"},
+        {"title": "Seed Two", "arxiv_id": "2001.00001"},
+    ):
+        resp = await client.post(f"/projects/{pid}/papers", json=body, headers=headers)
+        assert resp.status_code == 201
+    return pid
+
+
+@pytest.mark.asyncio
+async def test_expand_depth_one(client, auth_headers, citation_source, calls, db_session):
+    pid = await seed_project(client, auth_headers)
+
+    resp = await client.post(f"/projects/{pid}/papers/expand", json={}, headers=auth_headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["seeds"] == 2
+    assert data["discovered"] == 4
+    assert data["added"] == 4
+    assert data["failed"] == 0
+
+    # Distant paper never fetched; every other node fetched exactly once (B retried once).
+    assert "E" not in calls
+    assert {k: v for k, v in calls.items() if k != "B"} == {
+        "DOI:10.1/seed1": 1,
+        "ARXIV:2001.00001": 1,
+        "A": 1,
+        "C": 1,
+        "D": 1,
+    }
+    assert calls["B"] == 2
+
+    papers = (await client.get(f"/projects/{pid}/papers", headers=auth_headers)).json()
+    by_title = {pp["paper"]["title"]: pp for pp in papers}
+    assert by_title["Shared Foundation"]["score"] == 1.0
+    assert "2 seed paper(s)" in by_title["Shared Foundation"]["inclusion_reason"]
+    assert by_title["Only Cited By One"]["score"] < 1.0
+    assert by_title["Seed One"]["inclusion_reason"] is None
+
+    edges = await db_session.scalar(select(func.count()).select_from(Citation))
+    assert edges == data["edges"] == 5
+
+
+@pytest.mark.asyncio
+async def test_expand_depth_two_with_budget(client, auth_headers, citation_source, calls):
+    pid = await seed_project(client, auth_headers)
+
+    resp = await client.post(
+        f"/projects/{pid}/papers/expand", json={"depth": 2, "budget": 2}, headers=auth_headers
+    )
+    data = resp.json()
+    assert data["discovered"] == 5
+    assert data["added"] == 2
+    assert calls["E"] == 1
+    assert all(count == 1 for key, count in calls.items() if key != "B")
+
+    # Papers already in the project don't count against the budget of a re-run.
+    resp = await client.post(
+        f"/projects/{pid}/papers/expand", json={"depth": 2, "budget": 2}, headers=auth_headers
+    )
+    assert resp.json()["added"] == 2
+    papers = (await client.get(f"/projects/{pid}/papers", headers=auth_headers)).json()
+    assert len(papers) == 6
+
+
+@pytest.mark.asyncio
+async def test_expand_min_score(client, auth_headers, citation_source):
+    pid = await seed_project(client, auth_headers)
+    resp = await client.post(
+        f"/projects/{pid}/papers/expand", json={"min_score": 0.9}, headers=auth_headers
+    )
+    assert resp.json()["added"] == 1
+
+
+@pytest.mark.asyncio
+async def test_expand_requires_ownership(client, auth_headers, citation_source):
+    pid = await seed_project(client, auth_headers)
+    other = {"X-User-Id": str(uuid.uuid4())}
+    resp = await client.post(f"/projects/{pid}/papers/expand", json={}, headers=other)
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_expand_validates_depth(client, auth_headers, citation_source):
+    pid = await seed_project(client, auth_headers)
+    resp = await client.post(
+        f"/projects/{pid}/papers/expand", json={"depth": 9}, headers=auth_headers
+    )
+    assert resp.status_code == 422
@@ -0,0 +1,170 @@
+import uuid
+
+import pytest
+from sqlalchemy import delete
+
+from app.models.dedup import PaperLSHBucket
+from app.services.dedup import (
+    Fingerprint,
+    author_keys,
+    cluster_duplicates,
+    match_score,
+    normalize_title,
+)
+
+
+async def make_project(client, headers, name="Dedup Project"):
+    resp = await client.post("/projects", json={"name": name}, headers=headers)
+    assert resp.status_code == 201
+    return resp.json()
+
+
+PREPRINT = {
+    "title": "Attention Is All You Need",
+    "authors": ["Ashish Vaswani", "Noam Shazeer"],
+    "year": 2017,
+}
+PROCEEDINGS = {
+    "title": "Attention is all you need.",
+    "authors": ["Vaswani, A.", "Shazeer, N."],
+    "year": 2017,
+    "doi": "10.5555/3295222.3295349",
+}
+
+
+def test_normalization():
+    assert normalize_title("  Attention  is ALL you need!  ") == "attention is all you need"
+    assert normalize_title("Schrödinger’s Cat") == "schrodinger s cat"
+    assert author_keys(["Vaswani, Ashish", "Ashish Vaswani", "Shazeer et al."]) == {
+        "vaswani",
+        "shazeer",
+    }
+
+
+def test_match_score_guards():
+    a = Fingerprint.of(PREPRINT["title"], PREPRINT["authors"], 2017)
+    assert match_score(a, Fingerprint.of(PROCEEDINGS["title"], PROCEEDINGS["authors"], 2018)) > 0
+    # Year too far apart, disjoint authors, or conflicting DOIs are never duplicates.
+    assert match_score(a, Fingerprint.of(PREPRINT["title"], PREPRINT["authors"], 2021)) == 0
+    assert match_score(a, Fingerprint.of(PREPRINT["title"], ["Someone Else"], 2017)) == 0
+    assert (
+        match_score(
+            Fingerprint.of(PREPRINT["title"], [], None, doi="10.1/a"),
+            Fingerprint.of(PREPRINT["title"], [], None, doi="10.1/b"),
+        )
+        == 0
+    )
+
+
+def test_cluster_duplicates_keeps_oldest():
+    ids = [uuid.uuid4() for _ in range(4)]
+    items = [
+        (ids[0], Fingerprint.of("Deep Residual Learning for Image Recognition", ["He"], 2016)),
+        (ids[1], Fingerprint.of("Attention Is All You Need", ["Vaswani"], 2017)),
+        (ids[2], Fingerprint.of("Deep residual learning for image recognition.", ["He"], 2015)),
+        (ids[3], Fingerprint.of("Deep Residual Learning for Image-Recognition", ["K. He"], 2016)),
+    ]
+    clusters = cluster_duplicates(items)
+    assert len(clusters) == 1
+    assert clusters[0].canonical_id == ids[0]
+    assert set(clusters[0].duplicate_ids) == {ids[2], ids[3]}
+
+
+@pytest.mark.asyncio
+async def test_add_paper_merges_near_duplicate(client, auth_headers):
+    p1 = await make_project(client, auth_headers, "P1")
+    p2 = await make_project(client, auth_headers, "P2")
+
+    r1 = await client.post(f"/projects/{p1['id']}/papers", json=PREPRINT, headers=auth_headers)
+    r2 = await client.post(f"/projects/{p2['id']}/papers", json=PROCEEDINGS, headers=auth_headers)
+    assert r1.status_code == 201
+    assert r2.status_code == 201
+    assert r1.json()["paper_id"] == r2.json()["paper_id"]
+    # A fuzzy match never rewrites the shared record's identifiers
+    assert r2.json()["paper"]["doi"] is None
+
+    resp = await client.post(f"/projects/{p1['id']}/papers", json=PROCEEDINGS, headers=auth_headers)
+    assert resp.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_distinct_titles_not_merged(client, auth_headers):
+    project = await make_project(client, auth_headers)
+    pid = project["id"]
+    other = {**PREPRINT, "title": "Attention Is Not All You Need"}
+
+    r1 = await client.post(f"/projects/{pid}/papers", json=PREPRINT, headers=auth_headers)
+    r2 = await client.post(f"/projects/{pid}/papers", json=other, headers=auth_headers)
+    assert r2.status_code == 201
+    assert r1.json()["paper_id"] != r2.json()["paper_id"]
+
+
+@pytest.mark.asyncio
+async def test_title_alone_is_not_merged_across_tenants(client, auth_headers):
+    other = {"X-User-Id": str(uuid.uuid4())}
+    mine = (await make_project(client, auth_headers, "Mine"))["id"]
+    theirs = (await make_project(client, other, "Theirs"))["id"]
+    survey = {"title": "A Survey of Deep Learning Methods", "year": 2020}
+
+    r1 = await client.post(f"/projects/{mine}/papers", json=survey, headers=auth_headers)
+    r2 = await client.post(
+        f"/projects/{theirs}/papers",
+        json={**survey, "year": 2021, "authors": ["Zed Q"], "doi": "10.1/xyz"},
+        headers=other,
+    )
+    assert r2.status_code == 201
+    assert r1.json()["paper_id"] != r2.json()["paper_id"]
+    resp = await client.get(f"/projects/{mine}/papers/{r1.json()['paper_id']}", headers=auth_headers)
+    assert resp.json()["paper"]["doi"] is None
+
+    # A shared author corroborates the match; the author-less entry is then
+    # reported to the project as a dedup candidate instead of being merged
+    r3 = await client.post(
+        f"/projects/{mine}/papers", json={**survey, "authors": ["Zed Q"]}, headers=auth_headers
+    )
+    assert r3.json()["paper_id"] == r2.json()["paper_id"]
+    resp = await client.post(f"/projects/{mine}/papers/dedup", headers=auth_headers)
+    [group] = resp.json()["groups"]
+    assert group["canonical_paper_id"] == r1.json()["paper_id"]
+    assert group["duplicate_paper_ids"] == [r2.json()["paper_id"]]
+
+
+@pytest.mark.asyncio
+async def test_batch_dedup_and_merge(client, auth_headers, db_session):
+    project = await make_project(client, auth_headers)
+    pid = project["id"]
+
+    first = await client.post(f"/projects/{pid}/papers", json=PREPRINT, headers=auth_headers)
+    # Simulate a paper imported before the LSH index existed.
+    await db_session.execute(delete(PaperLSHBucket))
+    await db_session.commit()
+    second = await client.post(f"/projects/{pid}/papers", json=PROCEEDINGS, headers=auth_headers)
+    await client.post(
+        f"/projects/{pid}/papers",
+        json={"title": "Deep Residual Learning", "authors": ["He"], "year": 2016},
+        headers=auth_headers,
+    )
+    assert first.json()["paper_id"] != second.json()["paper_id"]
+
+    resp = await client.post(f"/projects/{pid}/papers/dedup", headers=auth_headers)
+    assert resp.status_code == 200
+    report = resp.json()
+    assert report["merged"] == 0
+    assert len(report["groups"]) == 1
+    assert report["groups"][0]["canonical_paper_id"] == first.json()["paper_id"]
+    assert report["groups"][0]["duplicate_paper_ids"] == [second.json()["paper_id"]]
+
+    resp = await client.post(f"/projects/{pid}/papers/dedup?merge=true", headers=auth_headers)
+    assert resp.json()["merged"] == 1
+    listing = await client.get(f"/projects/{pid}/papers", headers=auth_headers)
+    assert len(listing.json()) == 2
+    projects = await client.get("/projects", headers=auth_headers)
+    assert projects.json()[0]["stats"]["paper_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_dedup_requires_ownership(client, auth_headers):
+    project = await make_project(client, auth_headers)
+    other = {"X-User-Id": str(uuid.uuid4())}
+    resp = await client.post(f"/projects/{project['id']}/papers/dedup", headers=other)
+    assert resp.status_code == 404
@@ -0,0 +1,121 @@
+import uuid
+
+import pytest
+import pytest_asyncio
+
+from app.main import app
+from app.pipeline.pdf import ParseError, PdfParsePool, get_parse_pool
+from app.pipeline.pdf_extract import extract_references, split_sections
+from tests.pdf_fixtures import SAMPLE_PAGES, make_pdf
+
+
+@pytest_asyncio.fixture
+async def parse_pool(client):
+    pool = PdfParsePool(max_workers=2, timeout=60)
+    app.dependency_overrides[get_parse_pool] = lambda: pool
+    yield pool
+    pool.shutdown()
+
+
+async def make_paper(client, headers):
+    resp = await client.post("/projects", json={"name": "Full text"}, headers=headers)
+    pid = resp.json()["id"]
+    resp = await client.post(
+        f"/projects/{pid}/papers", json={"title": "A Study of Things"}, headers=headers
+    )
+    return pid, resp.json()["paper_id"]
+
+
+def upload(client, pid, paper_id, data, headers, **params):
+    return client.post(
+        f"/projects/{pid}/papers/{paper_id}/pdf",
+        content=data,
+        params=params,
+        headers={**headers, "Content-Type": "application/pdf"},
+    )
+
+
+def test_split_sections_and_references():
+    text = "\n".join(line for page in SAMPLE_PAGES for line in page)
+    sections = split_sections(text)
+    assert [s["title"] for s in sections] == [
+        "Front matter",
+        "Abstract",
+        "1 Introduction",
+        "2 Method",
+        "References",
+    ]
+    assert extract_references(sections) == [
+        "A. Smith. Paper one. 2019.",
+        "B. Jones. Paper two. 2020.",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_upload_and_parse(client, auth_headers, storage_dir, parse_pool):
+    pid, paper_id = await make_paper(client, auth_headers)
+
+    resp = await upload(client, pid, paper_id, make_pdf(SAMPLE_PAGES), auth_headers)
+    assert resp.status_code == 201
+    doc = resp.json()
+    assert doc["status"] == "parsed"
+    assert doc["page_count"] == 2
+    assert len(doc["content_hash"]) == 64
+
+    resp = await client.get(f"/projects/{pid}/papers/{paper_id}/document", headers=auth_headers)
+    assert resp.status_code == 200
+    detail = resp.json()
+    assert "Things matter." in detail["text"]
+    assert "1 Introduction" in [s["title"] for s in detail["sections"]]
+    assert len(detail["references"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_same_bytes_parsed_once(client, auth_headers, storage_dir, parse_pool):
+    pid, paper_id = await make_paper(client, auth_headers)
+    data = make_pdf(SAMPLE_PAGES)
+
+    first = (await upload(client, pid, paper_id, data, auth_headers)).json()
+    second = (await upload(client, pid, paper_id, data, auth_headers)).json()
+    assert second["id"] == first["id"]
+    assert second["parsed_at"] == first["parsed_at"]
+
+
+@pytest.mark.asyncio
+async def test_unparseable_pdf_marked_failed(client, auth_headers, storage_dir, parse_pool):
+    pid, paper_id = await make_paper(client, auth_headers)
+
+    resp = await upload(client, pid, paper_id, b"not a pdf at all", auth_headers)
+    assert resp.status_code == 201
+    assert resp.json()["status"] == "failed"
+    assert resp.json()["error"]
+
+
+@pytest.mark.asyncio
+async def test_upload_without_parse(client, auth_headers, storage_dir, parse_pool):
+    pid, paper_id = await make_paper(client, auth_headers)
+    resp = await upload(client, pid, paper_id, make_pdf(SAMPLE_PAGES), auth_headers, parse=False)
+    assert resp.json()["status"] == "pending"
+
+
+@pytest.mark.asyncio
+async def test_upload_requires_paper_in_project(client, auth_headers, storage_dir, parse_pool):
+    pid, _ = await make_paper(client, auth_headers)
+    resp = await upload(client, pid, uuid.uuid4(), make_pdf(SAMPLE_PAGES), auth_headers)
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_pool_recovers_after_timeout(tmp_path):
+    path = tmp_path / "paper.pdf"
+    path.write_bytes(make_pdf(SAMPLE_PAGES))
+    # Far below worker start-up time, so the first parse must time out.
+    pool = PdfParsePool(max_workers=1, timeout=0.001)
+    try:
+        with pytest.raises(ParseError, match="Timed out"):
+            await pool.parse(str(path))
+        pool.timeout = 60
+        result = await pool.parse(str(path))
+        assert result["page_count"] == 2
+    finally:
+        pool.shutdown()
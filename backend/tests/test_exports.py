@@ -0,0 +1,243 @@
+import asyncio
+import io
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from pypdf import PdfReader
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.export import ExportJob
+from app.models.run import Run
+from app.pipeline.export_render import latex_escape, render
+from app.pipeline.exports import claim_next_export, export_heartbeat
+from app.pipeline.runner import execute_run
+from app.worker import ExportWorker
+
+PAYLOAD = {
+    "title": "Folding & lensing",
+    "filters": {"year_min": 2020},
+    "layout_version": 3,
+    "sections": [
+        {"depth": 0, "label": "Introduction", "node_id": None, "content": "Two themes."},
+        {"depth": 0, "label": "Proteins", "node_id": "a", "content": "Chains fold [1]."},
+        {"depth": 1, "label": "Galaxies_2", "node_id": "b", "content": "Mass bends 100% light."},
+    ],
+    "clusters": [{"id": 0, "label": "Proteins"}, {"id": 1, "label": "Galaxies"}],
+    "nodes": [[0.0, 0.0, 0], [1.0, 2.0, 1], [1.5, 2.5, 1]],
+    "papers": [
+        {"title": "Protein folding", "authors": ["Ada"], "year": 2021, "doi": "10.1/x"},
+        {"title": "Galaxy lensing", "authors": [], "year": 2022, "arxiv_id": "2201.1"},
+    ],
+}
+
+PAPERS = [
+    ("Protein folding of protein chains", 2019),
+    ("Protein structure of protein complexes", 2020),
+    ("Protein design for protein binders", 2021),
+    ("Galaxy lensing in galaxy clusters", 2019),
+    ("Galaxy rotation in galaxy discs", 2020),
+    ("Galaxy formation in galaxy halos", 2021),
+]
+
+
+def test_renderers_cover_report_map_and_references():
+    markdown = render("markdown", PAYLOAD).data.decode()
+    assert markdown.startswith("# Folding & lensing\n")
+    assert "### Galaxies_2\n" in markdown
+    assert "| Galaxies | 2 |" in markdown
+    assert "2 papers matching year min 2020." in markdown
+    assert "1. Ada (2021). Protein folding. doi:10.1/x" in markdown
+
+    latex = render("latex", PAYLOAD).data.decode()
+    assert latex_escape("50% of a_b & {c}") == r"50\% of a\_b \& \{c\}"
+    assert r"\subsection{Galaxies\_2}" in latex
+    assert r"\begin{thebibliography}" in latex and latex.rstrip().endswith(r"\end{document}")
+
+    pdf = render("pdf", PAYLOAD)
+    assert pdf.data.startswith(b"%PDF-") and pdf.media_type == "application/pdf"
+    text = "".join(page.extract_text() for page in PdfReader(io.BytesIO(pdf.data)).pages)
+    assert "Mass bends 100% light." in text and "Galaxy lensing" in text
+
+    slides = render("slides", PAYLOAD).data.decode()
+    # Title, introduction, the top-level theme, map and cluster list
+    assert slides.count("<section") == 5 and "<svg" in slides
+    assert "Folding &amp; lensing" in slides
+
+    # Deterministic, so equal inputs share a content hash
+    assert render("pdf", PAYLOAD).data == pdf.data
+
+
+async def completed_run(client, headers, db_session):
+    resp = await client.post("/projects", json={"name": "Review"}, headers=headers)
+    pid = resp.json()["id"]
+    for title, year in PAPERS:
+        await client.post(
+            f"/projects/{pid}/papers", json={"title": title, "year": year}, headers=headers
+        )
+    resp = await client.post(
+        f"/projects/{pid}/runs",
+        json={"config_snapshot": {"taxonomy_leaf_size": 3}},
+        headers=headers,
+    )
+    run = await db_session.get(Run, uuid.UUID(resp.json()["id"]))
+    await execute_run(db_session, run)
+    assert run.status == "completed"
+    return pid, str(run.id)
+
+
+@pytest.mark.asyncio
+async def test_export_renders_off_request_and_repeats_hit_the_cache(
+    client, auth_headers, db_session, db_engine, storage_dir
+):
+    pid, run_id = await completed_run(client, auth_headers, db_session)
+    body = {"run_id": run_id, "format": "pdf", "filters": {"year_min": 2020}}
+
+    resp = await client.post(f"/projects/{pid}/exports", json=body, headers=auth_headers)
+    assert resp.status_code == 202
+    job = resp.json()
+    assert (job["status"], job["download_url"]) == ("queued", None)
+    assert job["filters"] == {"year_min": 2020}
+    download = f"/projects/{pid}/exports/{job['id']}/download"
+    assert (await client.get(download, headers=auth_headers)).status_code == 409
+
+    worker = ExportWorker(
+        async_sessionmaker(bind=db_engine, class_=AsyncSession, expire_on_commit=False),
+        worker_id="test-export",
+    )
+    assert await worker.run_once() is True
+    assert await worker.run_once() is False
+
+    resp = await client.get(f"/projects/{pid}/exports/{job['id']}", headers=auth_headers)
+    done = resp.json()
+    assert done["status"] == "completed"
+    assert done["download_url"] == download
+    resp = await client.get(download, headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/pdf"
+    assert resp.headers["etag"].strip('"') and resp.content.startswith(b"%PDF-")
+    text = "".join(p.extract_text() for p in PdfReader(io.BytesIO(resp.content)).pages)
+    references = text.split("References", 1)[1]
+    # Only papers from 2020 on are listed
+    assert "4 papers matching year min 2020." in references
+    assert "Protein structure of protein complexes" in references
+    assert "Protein folding of protein chains" not in references
+
+    # The same inputs are served from the finished job without queueing
+    resp = await client.post(f"/projects/{pid}/exports", json=body, headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.json()["id"] == job["id"]
+
+    others = [
+        {**body, "format": "markdown"},
+        {**body, "filters": {"year_min": 2021}},
+        {**body, "filters": {}},
+    ]
+    ids = set()
+    for other in others:
+        resp = await client.post(f"/projects/{pid}/exports", json=other, headers=auth_headers)
+        assert resp.status_code == 202
+        ids.add(resp.json()["id"])
+    assert len(ids) == 3 and job["id"] not in ids
+
+    listed = await client.get(f"/projects/{pid}/exports", headers=auth_headers)
+    assert len(listed.json()) == 4
+
+    stranger = {"X-User-Id": str(uuid.uuid4())}
+    assert (await client.get(download, headers=stranger)).status_code == 404
+    resp = await client.post(f"/projects/{pid}/exports", json=body, headers=stranger)
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_export_needs_a_finished_report(client, auth_headers):
+    resp = await client.post("/projects", json={"name": "Empty"}, headers=auth_headers)
+    pid = resp.json()["id"]
+    resp = await client.post(f"/projects/{pid}/runs", json={}, headers=auth_headers)
+    body = {"run_id": resp.json()["id"], "format": "markdown"}
+    resp = await client.post(f"/projects/{pid}/exports", json=body, headers=auth_headers)
+    assert resp.status_code == 409
+
+    body = {"run_id": str(uuid.uuid4()), "format": "markdown"}
+    resp = await client.post(f"/projects/{pid}/exports", json=body, headers=auth_headers)
+    assert resp.status_code == 404
+    resp = await client.post(
+        f"/projects/{pid}/exports", json={**body, "format": "docx"}, headers=auth_headers
+    )
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_stalled_export_is_reclaimed_and_failures_requeue(
+    client, auth_headers, db_session, storage_dir
+):
+    pid, run_id = await completed_run(client, auth_headers, db_session)
+    body = {"run_id": run_id, "format": "markdown"}
+    resp = await client.post(f"/projects/{pid}/exports", json=body, headers=auth_headers)
+    job_id = uuid.UUID(resp.json()["id"])
+
+    assert (await claim_next_export(db_session, "first")).id == job_id
+    # Another worker leaves it alone until its heartbeat has gone silent
+    assert await claim_next_export(db_session, "second") is None
+    await db_session.execute(
+        update(ExportJob)
+        .where(ExportJob.id == job_id)
+        .values(heartbeat_at=datetime.utcnow() - timedelta(hours=1))
+    )
+    await db_session.commit()
+    job = await claim_next_export(db_session, "second")
+    assert (job.id, job.worker_id) == (job_id, "second")
+
+    await db_session.execute(
+        update(ExportJob).where(ExportJob.id == job_id).values(status="failed", error="boom")
+    )
+    await db_session.commit()
+    # A failed export is not a cache hit; asking again queues a fresh job
+    resp = await client.post(f"/projects/{pid}/exports", json=body, headers=auth_headers)
+    assert resp.status_code == 202
+    assert resp.json()["id"] != str(job_id)
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_keeps_a_slow_render_claimed(
+    client, auth_headers, db_engine, db_session, storage_dir
+):
+    pid, run_id = await completed_run(client, auth_headers, db_session)
+    body = {"run_id": run_id, "format": "markdown"}
+    resp = await client.post(f"/projects/{pid}/exports", json=body, headers=auth_headers)
+    job_id = uuid.UUID(resp.json()["id"])
+    factory = async_sessionmaker(bind=db_engine, class_=AsyncSession, expire_on_commit=False)
+
+    job = await claim_next_export(db_session, "first")
+    # Rendering has already outlasted the timeout, but the worker is alive
+    await db_session.execute(
+        update(ExportJob)
+        .where(ExportJob.id == job_id)
+        .values(
+            started_at=datetime.utcnow() - timedelta(hours=1),
+            heartbeat_at=datetime.utcnow() - timedelta(hours=1),
+        )
+    )
+    await db_session.commit()
+    async with export_heartbeat(factory, job.id, "first", interval=0.01):
+        await asyncio.sleep(0.05)
+    assert await claim_next_export(db_session, "second") is None
+
+    # A worker that lost its claim no longer refreshes the job
+    await db_session.execute(
+        update(ExportJob)
+        .where(ExportJob.id == job_id)
+        .values(heartbeat_at=datetime.utcnow() - timedelta(hours=1))
+    )
+    await db_session.commit()
+    assert (await claim_next_export(db_session, "second")).worker_id == "second"
+    await db_session.execute(
+        update(ExportJob)
+        .where(ExportJob.id == job_id)
+        .values(heartbeat_at=datetime.utcnow() - timedelta(hours=1))
+    )
+    await db_session.commit()
+    async with export_heartbeat(factory, job.id, "first", interval=0.01):
+        await asyncio.sleep(0.05)
+    assert (await claim_next_export(db_session, "third")).worker_id == "third"
@@ -0,0 +1,241 @@
+import uuid
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.citation import Citation
+from app.models.graph import GraphLayout, GraphNode
+from app.models.run import Run
+from app.pipeline.graph import GraphOptions, layout_full, place_new, similarity_edges
+from app.pipeline.runner import execute_run
+from app.services.graph_view import top_edges
+
+
+def blobs(topics, per_topic, dim=32, seed=1):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(topics, dim))
+    noise = 0.1 * rng.normal(size=(topics * per_topic, dim))
+    points = np.repeat(centers, per_topic, axis=0) + noise
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+    groups = [np.arange(t * per_topic, (t + 1) * per_topic) for t in range(topics)]
+    return points.astype(np.float32), groups
+
+
+OPTIONS = GraphOptions(neighbors=4, min_similarity=0.2, iterations=30, seed=7)
+
+
+def test_similarity_edges_stay_within_groups_once_per_pair():
+    points, groups = blobs(topics=3, per_topic=20)
+    src, dst, weight = similarity_edges(points, groups, neighbors=4, min_similarity=0.2)
+
+    assert len(src) >= 20 * 3 * 4 / 2
+    assert np.all(src < dst)
+    assert len(set(zip(src.tolist(), dst.tolist()))) == len(src)
+    assert np.all(src // 20 == dst // 20)
+    assert np.all(weight >= 0.2)
+
+
+def test_full_layout_is_deterministic_and_separates_clusters():
+    points, groups = blobs(topics=3, per_topic=40)
+    edges = similarity_edges(points, groups, 4, 0.2)
+    first = layout_full(points, groups, *edges, OPTIONS)
+    second = layout_full(points, groups, *edges, OPTIONS)
+
+    np.testing.assert_array_equal(first, second)
+    assert np.isfinite(first).all()
+    centers = np.array([first[g].mean(axis=0) for g in groups])
+    spread = max(np.linalg.norm(first[g] - first[g].mean(axis=0), axis=1).max() for g in groups)
+    gaps = [np.linalg.norm(centers[a] - centers[b]) for a in range(3) for b in range(a + 1, 3)]
+    assert min(gaps) > spread
+
+
+def test_incremental_placement_keeps_existing_positions():
+    points, groups = blobs(topics=2, per_topic=30)
+    edges = similarity_edges(points, groups, 4, 0.2)
+    full = layout_full(points, groups, *edges, OPTIONS)
+
+    placed = np.ones(len(points), dtype=bool)
+    new = [5, 40]
+    placed[new] = False
+    pos = np.where(placed[:, None], full, 0.0)
+    updated = place_new(pos, placed, groups, *edges, OPTIONS)
+
+    np.testing.assert_array_equal(updated[placed], full[placed])
+    centers = [full[g].mean(axis=0) for g in groups]
+    for row, own, other in ((5, centers[0], centers[1]), (40, centers[1], centers[0])):
+        assert np.linalg.norm(updated[row] - own) < np.linalg.norm(updated[row] - other)
+
+
+TITLES = [
+    "Protein folding of protein chains",
+    "Protein structure of protein complexes",
+    "Protein design for protein binders",
+    "Galaxy lensing in galaxy clusters",
+    "Galaxy rotation in galaxy discs",
+    "Galaxy formation in galaxy halos",
+]
+
+
+async def run_pipeline(client, headers, db_session, pid, config=None):
+    resp = await client.post(
+        f"/projects/{pid}/runs",
+        json={"config_snapshot": {"taxonomy_leaf_size": 3, **(config or {})}},
+        headers=headers,
+    )
+    run = await db_session.get(Run, uuid.UUID(resp.json()["id"]))
+    await execute_run(db_session, run)
+    assert run.status == "completed"
+    resp = await client.get(f"/projects/{pid}/graph", headers=headers)
+    assert resp.status_code == 200
+    return resp.json()
+
+
+async def graph_project(client, headers, db_session):
+    """Two three-paper topics and one citation across them."""
+    resp = await client.post("/projects", json={"name": "Graph"}, headers=headers)
+    pid = resp.json()["id"]
+    assert (await client.get(f"/projects/{pid}/graph", headers=headers)).status_code == 404
+    ids = []
+    for title in TITLES:
+        resp = await client.post(f"/projects/{pid}/papers", json={"title": title}, headers=headers)
+        ids.append(uuid.UUID(resp.json()["paper_id"]))
+    db_session.add(Citation(citing_paper_id=ids[0], cited_paper_id=ids[5]))
+    await db_session.commit()
+    return pid, ids
+
+
+@pytest.mark.asyncio
+async def test_graph_stage_persists_and_extends_layout(
+    client, auth_headers, db_session, storage_dir
+):
+    pid, ids = await graph_project(client, auth_headers, db_session)
+
+    graph = await run_pipeline(client, auth_headers, db_session, pid)
+    layout = graph["layout"]
+    assert layout["version"] == 1 and layout["node_count"] == 6
+    assert sorted(c["size"] for c in layout["clusters"]) == [3, 3]
+    positions = {n["paper_id"]: (n["x"], n["y"]) for n in graph["nodes"]}
+    assert len(positions) == 6
+    kinds = {
+        frozenset((e["source_id"], e["target_id"])): e["kind"] for e in graph["edges"]
+    }
+    # The citation across topics becomes an edge of its own kind
+    assert kinds[frozenset((str(ids[0]), str(ids[5])))] == "cites"
+    assert "similar" in kinds.values()
+
+    # Nothing changed: same coordinates, same version
+    again = await run_pipeline(client, auth_headers, db_session, pid)
+    assert again["layout"]["version"] == 1
+    assert {n["paper_id"]: (n["x"], n["y"]) for n in again["nodes"]} == positions
+
+    # A new paper is placed; nobody else moves
+    resp = await client.post(
+        f"/projects/{pid}/papers",
+        json={"title": "Protein docking of protein pairs"},
+        headers=auth_headers,
+    )
+    new_id = resp.json()["paper_id"]
+    grown = await run_pipeline(client, auth_headers, db_session, pid)
+    assert grown["layout"]["version"] == 2
+    moved = {n["paper_id"]: (n["x"], n["y"]) for n in grown["nodes"]}
+    assert {pid_: moved[pid_] for pid_ in positions} == positions
+    assert new_id in moved
+
+    relaid = await run_pipeline(
+        client, auth_headers, db_session, pid, {"graph_relayout": True}
+    )
+    assert relaid["layout"]["version"] == 3
+
+    resp = await client.get(f"/projects/{pid}/graph", headers={"X-User-Id": str(uuid.uuid4())})
+    assert resp.status_code == 404
+
+
+def test_top_edges_keeps_each_nodes_strongest():
+    edges = [
+        {"source_id": s, "target_id": t, "weight": w}
+        for s, t, w in [("a", "b", 0.9), ("a", "c", 0.8), ("a", "d", 0.7), ("b", "c", 0.6)]
+    ]
+    # b-c is nobody's strongest edge; a-d is d's only one
+    assert [(e["source_id"], e["target_id"]) for e in top_edges(edges, per_node=1)] == [
+        ("a", "b"),
+        ("a", "c"),
+        ("a", "d"),
+    ]
+    assert len(top_edges(edges, per_node=2)) == 4
+
+
+async def view(client, pid, headers, box, zoom):
+    x0, y0, x1, y1 = box
+    resp = await client.get(
+        f"/projects/{pid}/graph/view",
+        params={"x0": x0, "y0": y0, "x1": x1, "y1": y1, "zoom": zoom},
+        headers=headers,
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+@pytest.mark.asyncio
+async def test_viewport_levels_of_detail(
+    client, auth_headers, db_session, storage_dir, monkeypatch
+):
+    pid, ids = await graph_project(client, auth_headers, db_session)
+    graph = await run_pipeline(client, auth_headers, db_session, pid)
+    xs = [n["x"] for n in graph["nodes"]]
+    ys = [n["y"] for n in graph["nodes"]]
+    everything = (min(xs) - 1, min(ys) - 1, max(xs) + 1, max(ys) + 1)
+
+    # Grid cells agree with the stored cell size
+    layout = await db_session.get(GraphLayout, uuid.UUID(pid))
+    for node in (await db_session.execute(select(GraphNode))).scalars():
+        assert node.cell_x == int(np.floor(node.x / layout.cell_size))
+        assert node.cell_y == int(np.floor(node.y / layout.cell_size))
+
+    zoomed_in = settings.graph_detail_zoom
+    detail = await view(client, pid, auth_headers, everything, zoomed_in)
+    assert detail["mode"] == "nodes" and detail["visible"] == 6
+    assert detail["version"] == graph["layout"]["version"]
+    assert sorted(n["paper_id"] for n in detail["nodes"]) == sorted(map(str, ids))
+    assert 0 < len(detail["edges"]) <= len(graph["edges"])
+    assert detail["clusters"] == []
+
+    overview = await view(client, pid, auth_headers, everything, zoomed_in / 10)
+    assert overview["mode"] == "clusters" and overview["nodes"] == []
+    assert sorted(c["size"] for c in overview["clusters"]) == [3, 3]
+    # The single citation is the only edge between the two topics
+    [between] = overview["cluster_edges"]
+    assert between["weight"] == 1
+
+    # Too many papers in view also aggregates, whatever the zoom
+    monkeypatch.setattr(settings, "graph_max_nodes", 5)
+    assert (await view(client, pid, auth_headers, everything, zoomed_in))["mode"] == "clusters"
+    monkeypatch.undo()
+
+    # A box around one paper sees only the papers inside it
+    first = graph["nodes"][0]
+    box = (first["x"] - 0.01, first["y"] - 0.01, first["x"] + 0.01, first["y"] + 0.01)
+    near = await view(client, pid, auth_headers, box, zoomed_in)
+    assert [n["paper_id"] for n in near["nodes"]] == [first["paper_id"]]
+    assert near["edges"] == []
+
+    far = (everything[2] + 10, everything[3] + 10, everything[2] + 20, everything[3] + 20)
+    empty = await view(client, pid, auth_headers, far, zoomed_in / 10)
+    assert empty["visible"] == 0 and empty["clusters"] == []
+
+    resp = await client.get(
+        f"/projects/{pid}/graph/view",
+        params={"x0": 1, "y0": 0, "x1": 0, "y1": 1, "zoom": 1},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 400
+    for bad in ({"x0": "-inf"}, {"y1": "nan"}, {"zoom": "inf"}):
+        params = {"x0": 0, "y0": 0, "x1": 1, "y1": 1, "zoom": 1, **bad}
+        resp = await client.get(
+            f"/projects/{pid}/graph/view", params=params, headers=auth_headers
+        )
+        assert resp.status_code == 400
+    # Huge but finite bounds clamp to the grid and see everything
+    huge = await view(client, pid, auth_headers, (-1e300, -1e300, 1e300, 1e300), zoomed_in / 10)
+    assert huge["visible"] == 6
@@ -0,0 +1,254 @@
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.models.idea_tree import IdeaNode
+from app.models.run import Run
+from app.pipeline.runner import execute_run
+
+TITLES = [
+    "Protein folding of protein chains",
+    "Protein structure of protein complexes",
+    "Protein design for protein binders",
+    "Galaxy lensing in galaxy clusters",
+    "Galaxy rotation in galaxy discs",
+    "Galaxy formation in galaxy halos",
+]
+
+
+async def seeded_tree(client, headers, db_session):
+    """A project whose first run seeded a root with two three-paper leaves."""
+    resp = await client.post("/projects", json={"name": "Ideas"}, headers=headers)
+    pid = resp.json()["id"]
+    for title in TITLES:
+        await client.post(f"/projects/{pid}/papers", json={"title": title}, headers=headers)
+    resp = await client.post(
+        f"/projects/{pid}/runs",
+        json={"config_snapshot": {"taxonomy_leaf_size": 3}},
+        headers=headers,
+    )
+    run = await db_session.get(Run, uuid.UUID(resp.json()["id"]))
+    await execute_run(db_session, run)
+
+    root = (await client.get(f"/projects/{pid}/idea-tree", headers=headers)).json()
+    level = await client.get(
+        f"/projects/{pid}/idea-tree",
+        params={"parent_id": root["nodes"][0]["id"]},
+        headers=headers,
+    )
+    return pid, str(run.id), root, level.json()
+
+
+async def patch(client, pid, headers, version, *ops):
+    return await client.patch(
+        f"/projects/{pid}/idea-tree", json={"version": version, "ops": list(ops)}, headers=headers
+    )
+
+
+async def node_paper_ids(client, pid, node_id, headers):
+    resp = await client.get(f"/projects/{pid}/idea-tree/nodes/{node_id}/papers", headers=headers)
+    assert resp.status_code == 200
+    return [p["id"] for p in resp.json()]
+
+
+@pytest.mark.asyncio
+async def test_run_seeds_tree_read_one_level_at_a_time(
+    client, auth_headers, db_session, storage_dir
+):
+    pid, run_id, root, level = await seeded_tree(client, auth_headers, db_session)
+
+    assert root["tree"]["source_run_id"] == run_id
+    assert root["parent_id"] is None
+    [top] = root["nodes"]
+    assert (top["child_count"], top["paper_count"], top["subtree_paper_count"]) == (2, 0, 6)
+
+    leaves = level["nodes"]
+    assert [n["position"] for n in leaves] == [0, 1]
+    assert all(n["child_count"] == 0 and n["subtree_paper_count"] == 3 for n in leaves)
+    assert all(n["depth"] == 1 and n["parent_id"] == top["id"] for n in leaves)
+    assert len(await node_paper_ids(client, pid, leaves[0]["id"], auth_headers)) == 3
+
+    resp = await client.get(
+        f"/projects/{pid}/idea-tree", params={"parent_id": str(uuid.uuid4())}, headers=auth_headers
+    )
+    assert resp.status_code == 404
+    resp = await client.get(
+        f"/projects/{pid}/idea-tree", headers={"X-User-Id": str(uuid.uuid4())}
+    )
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_stale_version_conflicts(client, auth_headers, db_session, storage_dir):
+    pid, _, root, level = await seeded_tree(client, auth_headers, db_session)
+    version = root["tree"]["version"]
+    leaf = level["nodes"][0]["id"]
+
+    resp = await patch(
+        client, pid, auth_headers, version, {"op": "rename", "node_id": leaf, "label": "Proteins"}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["tree"]["version"] == version + 1
+
+    # A second editor still holding the old version
+    resp = await patch(
+        client, pid, auth_headers, version, {"op": "rename", "node_id": leaf, "label": "Other"}
+    )
+    assert resp.status_code == 409
+    level = await client.get(
+        f"/projects/{pid}/idea-tree", params={"parent_id": root["nodes"][0]["id"]},
+        headers=auth_headers,
+    )
+    assert level.json()["nodes"][0]["label"] == "Proteins"
+
+
+@pytest.mark.asyncio
+async def test_split_and_move_subtree(client, auth_headers, db_session, storage_dir):
+    pid, _, root, level = await seeded_tree(client, auth_headers, db_session)
+    version = root["tree"]["version"]
+    first, second = (n["id"] for n in level["nodes"])
+    papers = await node_paper_ids(client, pid, first, auth_headers)
+
+    resp = await patch(
+        client,
+        pid,
+        auth_headers,
+        version,
+        {"op": "split", "node_id": first, "label": "Offshoot", "paper_ids": papers[:2]},
+        {"op": "move", "node_id": second, "parent_id": first},
+    )
+    assert resp.status_code == 200
+    [offshoot] = resp.json()["created"]
+    version = resp.json()["tree"]["version"]
+
+    # Moving the offshoot under `second` (now under `first`) nests it two deep
+    resp = await patch(
+        client, pid, auth_headers, version,
+        {"op": "move", "node_id": offshoot, "parent_id": second},
+    )
+    assert resp.status_code == 200
+    nodes = {
+        str(n.id): n for n in (await db_session.execute(
+            select(IdeaNode).execution_options(populate_existing=True)
+        )).scalars()
+    }
+    assert nodes[offshoot].depth == 3
+    assert nodes[offshoot].path.startswith(nodes[second].path)
+    assert nodes[second].path.startswith(nodes[first].path)
+
+    level = await client.get(
+        f"/projects/{pid}/idea-tree", params={"parent_id": root["nodes"][0]["id"]},
+        headers=auth_headers,
+    )
+    [only] = level.json()["nodes"]
+    assert (only["id"], only["paper_count"], only["subtree_paper_count"]) == (first, 1, 6)
+    assert await node_paper_ids(client, pid, offshoot, auth_headers) == sorted(
+        papers[:2], key=papers.index
+    )
+
+    # A node cannot move below its own descendant
+    resp = await patch(
+        client, pid, auth_headers, version + 1,
+        {"op": "move", "node_id": first, "parent_id": offshoot},
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_merge_and_move_papers(client, auth_headers, db_session, storage_dir):
+    pid, _, root, level = await seeded_tree(client, auth_headers, db_session)
+    version = root["tree"]["version"]
+    first, second = (n["id"] for n in level["nodes"])
+    moved = (await node_paper_ids(client, pid, first, auth_headers))[0]
+
+    resp = await patch(
+        client, pid, auth_headers, version,
+        {"op": "move_papers", "paper_ids": [moved], "node_id": second},
+    )
+    assert resp.status_code == 200
+    assert moved in await node_paper_ids(client, pid, second, auth_headers)
+
+    resp = await patch(
+        client, pid, auth_headers, version + 1,
+        {"op": "merge", "source_id": second, "target_id": first},
+    )
+    assert resp.status_code == 200
+    level = await client.get(
+        f"/projects/{pid}/idea-tree", params={"parent_id": root["nodes"][0]["id"]},
+        headers=auth_headers,
+    )
+    [merged] = level.json()["nodes"]
+    assert (merged["id"], merged["paper_count"]) == (first, 6)
+
+    resp = await patch(
+        client, pid, auth_headers, version + 2,
+        {"op": "move_papers", "paper_ids": [str(uuid.uuid4())], "node_id": first},
+    )
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_changes_nothing(client, auth_headers, db_session, storage_dir):
+    pid, _, root, level = await seeded_tree(client, auth_headers, db_session)
+    version = root["tree"]["version"]
+    top = root["nodes"][0]["id"]
+    leaf = level["nodes"][0]["id"]
+
+    resp = await patch(
+        client, pid, auth_headers, version,
+        {"op": "rename", "node_id": leaf, "label": "Renamed"},
+        {"op": "split", "node_id": top, "label": "Nope", "paper_ids": [str(uuid.uuid4())]},
+    )
+    assert resp.status_code == 400
+    root = (await client.get(f"/projects/{pid}/idea-tree", headers=auth_headers)).json()
+    assert root["tree"]["version"] == version
+    level = await client.get(
+        f"/projects/{pid}/idea-tree", params={"parent_id": top}, headers=auth_headers
+    )
+    assert "Renamed" not in [n["label"] for n in level.json()["nodes"]]
+
+
+@pytest.mark.asyncio
+async def test_locked_tree_refuses_edits_and_reseeding(
+    client, auth_headers, db_session, storage_dir
+):
+    pid, run_id, root, level = await seeded_tree(client, auth_headers, db_session)
+    leaf = level["nodes"][0]["id"]
+
+    resp = await client.put(f"/projects/{pid}/idea-tree/lock", headers=auth_headers)
+    assert resp.status_code == 200 and resp.json()["locked_at"] is not None
+    version = resp.json()["version"]
+
+    resp = await patch(
+        client, pid, auth_headers, version, {"op": "rename", "node_id": leaf, "label": "X"}
+    )
+    assert resp.status_code == 409
+    resp = await client.post(
+        f"/projects/{pid}/idea-tree", json={"run_id": run_id}, headers=auth_headers
+    )
+    assert resp.status_code == 409
+
+    resp = await client.delete(f"/projects/{pid}/idea-tree/lock", headers=auth_headers)
+    version = resp.json()["version"]
+    resp = await patch(
+        client, pid, auth_headers, version, {"op": "rename", "node_id": leaf, "label": "X"}
+    )
+    assert resp.status_code == 200
+
+    # Re-seeding from the run discards the edits
+    resp = await client.post(
+        f"/projects/{pid}/idea-tree", json={"run_id": run_id}, headers=auth_headers
+    )
+    assert resp.status_code == 201
+    root = (await client.get(f"/projects/{pid}/idea-tree", headers=auth_headers)).json()
+    level = await client.get(
+        f"/projects/{pid}/idea-tree", params={"parent_id": root["nodes"][0]["id"]},
+        headers=auth_headers,
+    )
+    assert "X" not in [n["label"] for n in level.json()["nodes"]]
+
+    resp = await client.post(
+        f"/projects/{pid}/idea-tree", json={"run_id": str(uuid.uuid4())}, headers=auth_headers
+    )
+    assert resp.status_code == 404
@@ -0,0 +1,145 @@
+import uuid
+
+import pytest
+
+
+async def make_project(client, headers, name="Filter Project"):
+    resp = await client.post("/projects", json={"name": name}, headers=headers)
+    assert resp.status_code == 201
+    return resp.json()
+
+
+PAPERS = [
+    # title, authors, year, inclusion_reason, score
+    ("Graph attention networks", ["Velickovic", "Bengio"], 2018, "seed", 0.95),
+    ("Sequence to sequence learning", ["Sutskever", "Vinyals"], 2014, "seed", 0.4),
+    ("Neural machine translation by jointly learning", ["Bahdanau", "Bengio"], 2015,
+     "citation expansion depth 1", 0.72),
+    ("Deep residual learning for image recognition", ["He", "Zhang"], 2016,
+     "citation expansion depth 2", None),
+    ("Dropout: preventing overfitting", ["Srivastava", "Hinton"], None, "manual", 0.05),
+]
+
+
+async def seeded_project(client, headers):
+    """Papers are created in a scratch project, then linked with reason and score."""
+    scratch = await make_project(client, headers, "Scratch")
+    project = await make_project(client, headers)
+    for i, (title, authors, year, reason, score) in enumerate(PAPERS):
+        resp = await client.post(
+            f"/projects/{scratch['id']}/papers",
+            json={"title": title, "authors": authors, "year": year, "doi": f"10.1/f.{i}"},
+            headers=headers,
+        )
+        assert resp.status_code == 201
+        resp = await client.post(
+            f"/projects/{project['id']}/papers/link",
+            json={"paper_id": resp.json()["paper_id"], "inclusion_reason": reason, "score": score},
+            headers=headers,
+        )
+        assert resp.status_code == 201
+    return project["id"]
+
+
+async def titles(client, headers, pid, **params):
+    resp = await client.get(f"/projects/{pid}/papers", params=params, headers=headers)
+    assert resp.status_code == 200, resp.text
+    return [pp["paper"]["title"] for pp in resp.json()]
+
+
+@pytest.mark.asyncio
+async def test_filters(client, auth_headers):
+    pid = await seeded_project(client, auth_headers)
+
+    assert await titles(client, auth_headers, pid, year_min=2015, year_max=2016, sort="year") == [
+        "Neural machine translation by jointly learning",
+        "Deep residual learning for image recognition",
+    ]
+    assert set(await titles(client, auth_headers, pid, author="Bengio")) == {
+        "Graph attention networks",
+        "Neural machine translation by jointly learning",
+    }
+    # Exact author match, not substring
+    assert await titles(client, auth_headers, pid, author="Beng") == []
+    assert set(await titles(client, auth_headers, pid, score_min=0.5)) == {
+        "Graph attention networks",
+        "Neural machine translation by jointly learning",
+    }
+    assert set(await titles(client, auth_headers, pid, inclusion_reason="citation")) == {
+        "Neural machine translation by jointly learning",
+        "Deep residual learning for image recognition",
+    }
+    # LIKE wildcards in the prefix are literal
+    assert await titles(client, auth_headers, pid, inclusion_reason="%") == []
+    assert await titles(
+        client, auth_headers, pid, author="Bengio", score_max=0.8
+    ) == ["Neural machine translation by jointly learning"]
+
+
+@pytest.mark.asyncio
+async def test_sort(client, auth_headers):
+    pid = await seeded_project(client, auth_headers)
+
+    by_score = await titles(client, auth_headers, pid, sort="-score")
+    assert by_score[:4] == [
+        "Graph attention networks",
+        "Neural machine translation by jointly learning",
+        "Sequence to sequence learning",
+        "Dropout: preventing overfitting",
+    ]
+    # NULLs sort last in both directions
+    assert by_score[-1] == "Deep residual learning for image recognition"
+    assert (await titles(client, auth_headers, pid, sort="year"))[-1] == (
+        "Dropout: preventing overfitting"
+    )
+    assert await titles(client, auth_headers, pid, sort="title", limit=2) == [
+        "Deep residual learning for image recognition",
+        "Dropout: preventing overfitting",
+    ]
+
+    resp = await client.get(f"/projects/{pid}/papers?sort=abstract", headers=auth_headers)
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_facets(client, auth_headers):
+    pid = await seeded_project(client, auth_headers)
+
+    resp = await client.get(f"/projects/{pid}/papers/facets", headers=auth_headers)
+    assert resp.status_code == 200
+    facets = resp.json()
+    assert facets["total"] == 5
+    assert facets["years"] == [
+        {"year": 2014, "count": 1},
+        {"year": 2015, "count": 1},
+        {"year": 2016, "count": 1},
+        {"year": 2018, "count": 1},
+        {"year": None, "count": 1},
+    ]
+    assert facets["authors"][0] == {"author": "Bengio", "count": 2}
+    assert len(facets["authors"]) == 9
+    assert facets["score_buckets"] == [
+        {"min": 0.0, "max": 0.1, "count": 1},
+        {"min": 0.4, "max": 0.5, "count": 1},
+        {"min": 0.7, "max": 0.8, "count": 1},
+        {"min": 0.9, "max": 1.0, "count": 1},
+        {"min": None, "max": None, "count": 1},
+    ]
+
+    # Facets describe the filtered set
+    resp = await client.get(
+        f"/projects/{pid}/papers/facets", params={"author": "Bengio"}, headers=auth_headers
+    )
+    facets = resp.json()
+    assert facets["total"] == 2
+    assert [y["year"] for y in facets["years"]] == [2015, 2018]
+    assert {a["author"] for a in facets["authors"]} == {"Bengio", "Velickovic", "Bahdanau"}
+
+
+@pytest.mark.asyncio
+async def test_facets_other_user_404(client, auth_headers):
+    project = await make_project(client, auth_headers)
+    resp = await client.get(
+        f"/projects/{project['id']}/papers/facets", headers={"X-User-Id": str(uuid.uuid4())}
+    )
+    assert resp.status_code == 404
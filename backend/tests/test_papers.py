@@ -57,6 +57,46 @@ async def test_list_papers(client, auth_headers):
     assert "Paper Two" in titles
 
 
+@pytest.mark.asyncio
+async def test_list_papers_omits_abstract(client, auth_headers):
+    project = await make_project(client, auth_headers)
+    pid = project["id"]
+    add = await client.post(f"/projects/{pid}/papers", json=PAPER_PAYLOAD, headers=auth_headers)
+    paper_id = add.json()["paper_id"]
+
+    resp = await client.get(f"/projects/{pid}/papers", headers=auth_headers)
+    assert "abstract" not in resp.json()[0]["paper"]
+
+    resp = await client.get(f"/projects/{pid}/papers/{paper_id}", headers=auth_headers)
+    assert resp.json()["paper"]["abstract"] == PAPER_PAYLOAD["abstract"]
+
+
+@pytest.mark.asyncio
+async def test_list_papers_sparse_fields(client, auth_headers):
+    project = await make_project(client, auth_headers)
+    pid = project["id"]
+    await client.post(f"/projects/{pid}/papers", json=PAPER_PAYLOAD, headers=auth_headers)
+
+    resp = await client.get(
+        f"/projects/{pid}/papers", params={"fields": "title, year"}, headers=auth_headers
+    )
+    assert resp.status_code == 200
+    item = resp.json()[0]
+    assert item["paper"] == {"id": item["paper_id"], "title": PAPER_PAYLOAD["title"], "year": 2017}
+    assert item["inclusion_reason"] is None
+
+    for bad in ("abstract", "title,bogus"):
+        resp = await client.get(
+            f"/projects/{pid}/papers", params={"fields": bad}, headers=auth_headers
+        )
+        assert resp.status_code == 400
+
+    # The documented shape allows what fields= leaves out
+    schemas = (await client.get("/openapi.json")).json()["components"]["schemas"]
+    paper_ref = schemas["ProjectPaperListItem"]["properties"]["paper"]["$ref"]
+    assert schemas[paper_ref.rsplit("/", 1)[1]]["required"] == ["id"]
+
+
 @pytest.mark.asyncio
 async def test_add_duplicate_paper_to_same_project(client, auth_headers):
     project = await make_project(client, auth_headers)
@@ -113,3 +153,47 @@ async def test_papers_scoped_to_project(client, auth_headers):
 
     resp = await client.get(f"/projects/{p2['id']}/papers", headers=auth_headers)
     assert resp.json() == []
+
+
+@pytest.mark.asyncio
+async def test_batch_get_papers(client, auth_headers):
+    p1 = await make_project(client, auth_headers, "P1")
+    p2 = await make_project(client, auth_headers, "P2")
+    ids = []
+    for i in range(3):
+        add = await client.post(
+            f"/projects/{p1['id']}/papers",
+            json={"title": f"Paper {i}", "abstract": f"Abstract {i}"},
+            headers=auth_headers,
+        )
+        ids.append(add.json()["paper_id"])
+    other = await client.post(
+        f"/projects/{p2['id']}/papers", json={"title": "Elsewhere"}, headers=auth_headers
+    )
+    elsewhere = other.json()["paper_id"]
+
+    resp = await client.post(
+        f"/projects/{p1['id']}/papers/batch-get",
+        json={"paper_ids": [ids[2], ids[0], elsewhere, ids[2]]},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    # Requested order, duplicates once, full records; other projects' papers are missing
+    assert [p["paper_id"] for p in data["papers"]] == [ids[2], ids[0]]
+    assert data["papers"][0]["paper"]["abstract"] == "Abstract 2"
+    assert data["missing"] == [elsewhere]
+
+    too_many = [str(uuid.uuid4()) for _ in range(501)]
+    resp = await client.post(
+        f"/projects/{p1['id']}/papers/batch-get",
+        json={"paper_ids": too_many},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 422
+    resp = await client.post(
+        f"/projects/{p1['id']}/papers/batch-get",
+        json={"paper_ids": ids},
+        headers={"X-User-Id": str(uuid.uuid4())},
+    )
+    assert resp.status_code == 404
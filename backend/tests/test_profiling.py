@@ -0,0 +1,119 @@
+import time
+import uuid
+
+import pytest
+from sqlalchemy import delete
+
+from app.models.embedding import PaperEmbedding
+from app.models.run import Run
+from app.pipeline.profiling import record_cache
+from app.pipeline.runner import execute_run
+
+
+async def make_run(client, headers, titles=("Graph neural networks", "Sparse attention")):
+    resp = await client.post("/projects", json={"name": "Profiled"}, headers=headers)
+    pid = resp.json()["id"]
+    for title in titles:
+        await client.post(f"/projects/{pid}/papers", json={"title": title}, headers=headers)
+    resp = await client.post(f"/projects/{pid}/runs", json={}, headers=headers)
+    return pid, resp.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_run_profile_per_stage(client, auth_headers, db_session, storage_dir):
+    pid, run_id = await make_run(client, auth_headers)
+    # One paper lost its embedding, so the stage has one hit and one miss.
+    embedded = (await db_session.execute(PaperEmbedding.__table__.select())).first()
+    await db_session.execute(
+        delete(PaperEmbedding).where(PaperEmbedding.paper_id == embedded.paper_id)
+    )
+    run = await db_session.get(Run, uuid.UUID(run_id))
+    await execute_run(db_session, run)
+
+    resp = await client.get(f"/projects/{pid}/runs/{run_id}/profile", headers=auth_headers)
+    assert resp.status_code == 200
+    profile = resp.json()
+    assert profile["status"] == "completed"
+    assert [s["stage"] for s in profile["stages"]] == [
+        "retrieval",
+        "pdf_parsing",
+        "embeddings",
+        "taxonomy",
+        "graph",
+        "report",
+    ]
+
+    stage = profile["stages"][2]
+    assert stage["wall_seconds"] > 0
+    assert stage["peak_rss_bytes"] > 0
+    assert stage["db_statements"] >= 3
+    assert stage["cache"]["embeddings"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+    # The local embedder is not a model call; the cache miss records its work
+    assert stage["llm_calls"] == 0 and stage["llm_prompt_tokens"] == 0
+    assert stage["samples"] is None
+    # The single leaf label of a two-paper taxonomy
+    assert profile["stages"][3]["llm_calls"] == 1
+    # That leaf's section and the introduction
+    assert profile["stages"][5]["llm_calls"] == 2
+    assert profile["llm_calls"] == 3
+    assert profile["wall_seconds"] >= stage["wall_seconds"]
+
+
+def busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_sampling_profiler_for_one_stage(client, auth_headers, db_session):
+    pid, run_id = await make_run(client, auth_headers)
+
+    async def hot(ctx):
+        busy_loop(0.2)
+
+    async def cold(ctx):
+        record_cache("thing", hits=3)
+
+    run = await db_session.get(Run, uuid.UUID(run_id))
+    await execute_run(db_session, run, stages=[("hot", hot), ("cold", cold)], sample_stage="hot")
+
+    resp = await client.get(f"/projects/{pid}/runs/{run_id}/profile", headers=auth_headers)
+    hot_stage, cold_stage = resp.json()["stages"]
+    assert hot_stage["cpu_seconds"] > 0.1
+    samples = hot_stage["samples"]
+    assert samples["total"] > 0
+    assert "test_profiling.py:busy_loop" in samples["stacks"][0]["stack"]
+    assert cold_stage["samples"] is None
+    assert cold_stage["cache"]["thing"]["hit_rate"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_failed_stage_recorded(client, auth_headers, db_session):
+    pid, run_id = await make_run(client, auth_headers)
+
+    async def broken(ctx):
+        raise RuntimeError("boom")
+
+    run = await db_session.get(Run, uuid.UUID(run_id))
+    with pytest.raises(RuntimeError):
+        await execute_run(db_session, run, stages=[("broken", broken), ("never", broken)])
+
+    resp = await client.get(f"/projects/{pid}/runs/{run_id}/profile", headers=auth_headers)
+    profile = resp.json()
+    assert profile["status"] == "failed"
+    assert len(profile["stages"]) == 1
+    assert profile["stages"][0]["error"] == "RuntimeError: boom"
+
+
+@pytest.mark.asyncio
+async def test_profile_ownership(client, auth_headers):
+    pid, run_id = await make_run(client, auth_headers, titles=())
+    resp = await client.get(f"/projects/{pid}/runs/{run_id}/profile", headers=auth_headers)
+    assert resp.json()["stages"] == []
+
+    other = {"X-User-Id": str(uuid.uuid4())}
+    resp = await client.get(f"/projects/{pid}/runs/{run_id}/profile", headers=other)
+    assert resp.status_code == 404
+    resp = await client.get(f"/projects/{pid}/runs/{uuid.uuid4()}/profile", headers=auth_headers)
+    assert resp.status_code == 404
@@ -0,0 +1,129 @@
+import uuid
+
+import pytest
+from sqlalchemy import delete, event
+
+from app.models.run import Run
+from app.models.stats import ProjectStats
+from app.pipeline.runner import execute_run
+from app.services.project_stats import refresh_project_stats
+
+
+async def make_project(client, headers, name="Stats Project"):
+    resp = await client.post("/projects", json={"name": name}, headers=headers)
+    assert resp.status_code == 201
+    return resp.json()
+
+
+async def stats_of(client, headers, pid):
+    resp = await client.get("/projects", headers=headers)
+    assert resp.status_code == 200
+    return next(p["stats"] for p in resp.json() if p["id"] == pid)
+
+
+@pytest.mark.asyncio
+async def test_new_project_has_empty_stats(client, auth_headers):
+    project = await make_project(client, auth_headers)
+    assert await stats_of(client, auth_headers, project["id"]) == {
+        "paper_count": 0,
+        "run_count": 0,
+        "latest_run_id": None,
+        "latest_run_status": None,
+        "latest_run_at": None,
+        "year_min": None,
+        "year_max": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_stats_follow_papers_and_runs(client, auth_headers, db_session):
+    pid = (await make_project(client, auth_headers))["id"]
+    other = (await make_project(client, auth_headers, "Other"))["id"]
+
+    kernels = {"title": "Graph kernels", "year": 2011, "authors": ["Vishwanathan"]}
+    for body in [{"title": "Sparse attention", "year": 2019}, kernels, {"title": "Undated"}]:
+        resp = await client.post(f"/projects/{pid}/papers", json=body, headers=auth_headers)
+        assert resp.status_code == 201
+    resp = await client.post(
+        f"/projects/{other}/papers", json={"title": "Old survey", "year": 1998}, headers=auth_headers
+    )
+    resp = await client.post(
+        f"/projects/{pid}/papers/link", json={"paper_id": resp.json()["paper_id"]}, headers=auth_headers
+    )
+    assert resp.status_code == 201
+    # A rejected duplicate is rolled back together with its counter update
+    resp = await client.post(f"/projects/{pid}/papers", json=kernels, headers=auth_headers)
+    assert resp.status_code == 409
+
+    stats = await stats_of(client, auth_headers, pid)
+    assert (stats["paper_count"], stats["year_min"], stats["year_max"]) == (4, 1998, 2019)
+    assert stats["run_count"] == 0
+
+    await client.post(f"/projects/{pid}/runs", json={}, headers=auth_headers)
+    resp = await client.post(f"/projects/{pid}/runs", json={}, headers=auth_headers)
+    run_id = resp.json()["id"]
+    stats = await stats_of(client, auth_headers, pid)
+    assert stats["run_count"] == 2
+    assert (stats["latest_run_id"], stats["latest_run_status"]) == (run_id, "pending")
+
+    run = await db_session.get(Run, uuid.UUID(run_id))
+    await execute_run(db_session, run, stages=[])
+    assert (await stats_of(client, auth_headers, pid))["latest_run_status"] == "completed"
+    assert (await stats_of(client, auth_headers, other))["paper_count"] == 1
+
+    # Incremental maintenance agrees with a full recompute
+    before = await stats_of(client, auth_headers, pid)
+    await refresh_project_stats(db_session, uuid.UUID(pid))
+    await db_session.commit()
+    assert await stats_of(client, auth_headers, pid) == before
+
+
+@pytest.mark.asyncio
+async def test_project_without_stats_row_is_still_listed(client, auth_headers, db_session):
+    pid = (await make_project(client, auth_headers))["id"]
+    await db_session.execute(delete(ProjectStats).where(ProjectStats.project_id == uuid.UUID(pid)))
+    await db_session.commit()
+
+    resp = await client.get("/projects", headers=auth_headers)
+    assert [p["id"] for p in resp.json()] == [pid]
+    assert resp.json()[0]["stats"]["paper_count"] == 0
+    assert resp.json()[0]["stats"]["latest_run_id"] is None
+
+
+@pytest.mark.asyncio
+async def test_refresh_repairs_drift(client, auth_headers, db_session):
+    pid = (await make_project(client, auth_headers))["id"]
+    for year in (2001, 2020):
+        await client.post(
+            f"/projects/{pid}/papers", json={"title": f"Survey {year}", "year": year},
+            headers=auth_headers,
+        )
+    row = await db_session.get(ProjectStats, uuid.UUID(pid))
+    # Simulate drift; refresh rewrites the row from the source tables.
+    row.paper_count = 99
+    await db_session.commit()
+
+    await refresh_project_stats(db_session, uuid.UUID(pid))
+    await db_session.commit()
+    stats = await stats_of(client, auth_headers, pid)
+    assert (stats["paper_count"], stats["year_min"], stats["year_max"]) == (2, 2001, 2020)
+
+
+@pytest.mark.asyncio
+async def test_list_projects_does_not_aggregate(client, auth_headers, db_engine):
+    pid = (await make_project(client, auth_headers))["id"]
+    await client.post(f"/projects/{pid}/papers", json={"title": "A paper"}, headers=auth_headers)
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lower())
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        resp = await client.get("/projects", headers=auth_headers)
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", capture)
+    assert resp.json()[0]["stats"]["paper_count"] == 1
+    assert len(statements) == 1
+    assert "count(" not in statements[0] and "group by" not in statements[0]
@@ -0,0 +1,129 @@
+import shutil
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import database
+from app.auth import clear_caches
+from app.database import PRIMARY_COOKIE, Base, SessionRouter
+from app.main import app
+
+
+@pytest_asyncio.fixture
+async def replicated(tmp_path, monkeypatch):
+    """A primary and a replica as two SQLite files; ``replicate()`` copies one to the other."""
+    paths = {name: tmp_path / f"{name}.db" for name in ("primary", "replica")}
+    engines = {
+        name: create_async_engine(f"sqlite+aiosqlite:///{path}") for name, path in paths.items()
+    }
+    for engine in engines.values():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    factories = {
+        name: async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        for name, engine in engines.items()
+    }
+    monkeypatch.setattr(
+        database,
+        "sessions",
+        SessionRouter(factories["primary"], [factories["replica"]], sticky_seconds=5),
+    )
+    app.dependency_overrides.clear()
+    clear_caches()
+
+    async def replicate():
+        await engines["replica"].dispose()
+        shutil.copyfile(paths["primary"], paths["replica"])
+
+    yield replicate
+    for engine in engines.values():
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_the_replica_unless_the_client_just_wrote(replicated, auth_headers):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/projects", json={"name": "Fresh"}, headers=auth_headers)
+        assert resp.status_code == 201
+        assert PRIMARY_COOKIE in resp.cookies
+        pid = resp.json()["id"]
+
+        # Read-your-writes: the cookie keeps this client on the primary
+        resp = await client.get(f"/projects/{pid}", headers=auth_headers)
+        assert resp.status_code == 200
+        assert PRIMARY_COOKIE not in resp.cookies
+
+        # Without it, reads hit the replica, which has not seen the project yet
+        client.cookies.clear()
+        assert (await client.get("/projects", headers=auth_headers)).json() == []
+        resp = await client.get(f"/projects/{pid}", headers=auth_headers)
+        assert resp.status_code == 404
+        resp = await client.get(
+            f"/projects/{pid}", headers={**auth_headers, "X-Read-Primary": "1"}
+        )
+        assert resp.status_code == 200
+
+        await replicated()
+        resp = await client.get("/projects", headers=auth_headers)
+        assert [p["id"] for p in resp.json()] == [pid]
+
+
+@pytest.mark.asyncio
+async def test_writes_always_use_the_primary(replicated, auth_headers):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/projects", json={"name": "Fresh"}, headers=auth_headers)
+        pid = resp.json()["id"]
+        await replicated()
+        client.cookies.clear()
+
+        resp = await client.patch(
+            f"/projects/{pid}", json={"name": "Renamed"}, headers=auth_headers
+        )
+        assert resp.status_code == 200
+        client.cookies.clear()
+        # The replica still has the old name; the primary has the new one
+        resp = await client.get(f"/projects/{pid}", headers=auth_headers)
+        assert resp.json()["name"] == "Fresh"
+        resp = await client.get(
+            f"/projects/{pid}", headers={**auth_headers, "X-Read-Primary": "1"}
+        )
+        assert resp.json()["name"] == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_replica_reads_open_no_primary_session(replicated, auth_headers, monkeypatch):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.post("/projects", json={"name": "Fresh"}, headers=auth_headers)
+        await replicated()
+        client.cookies.clear()
+
+        opened = []
+        primary = database.sessions.primary
+
+        def counting():
+            opened.append(1)
+            return primary()
+
+        monkeypatch.setattr(database.sessions, "primary", counting)
+        assert len((await client.get("/projects", headers=auth_headers)).json()) == 1
+        assert opened == []
+        # Only an unknown caller costs a primary session, for auth alone
+        clear_caches()
+        assert len((await client.get("/projects", headers=auth_headers)).json()) == 1
+        assert opened == [1]
+
+
+def test_replicas_are_used_round_robin():
+    primary, first, second = object(), object(), object()
+    router = SessionRouter(primary, [first, second])
+
+    class Request:
+        cookies = {}
+        headers = {}
+
+    assert [router.for_read(Request()) for _ in range(3)] == [first, second, first]
+    Request.cookies = {PRIMARY_COOKIE: "1"}
+    assert router.for_read(Request()) is primary
+    assert SessionRouter(primary).for_read(Request()) is primary
@@ -0,0 +1,226 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from app.models.run import Run
+from app.pipeline import RunCancelled
+from app.pipeline.report import ReportOptions, write_report
+from app.pipeline.runner import execute_run
+from app.services.llm import Completion, ExtractiveReasoner
+
+TITLES = [
+    "Protein folding of protein chains",
+    "Protein structure of protein complexes",
+    "Protein design for protein binders",
+    "Galaxy lensing in galaxy clusters",
+    "Galaxy rotation in galaxy discs",
+    "Galaxy formation in galaxy halos",
+]
+
+
+async def run_once(client, headers, db_session, pid):
+    resp = await client.post(
+        f"/projects/{pid}/runs",
+        json={"config_snapshot": {"taxonomy_leaf_size": 3}},
+        headers=headers,
+    )
+    run = await db_session.get(Run, uuid.UUID(resp.json()["id"]))
+    await execute_run(db_session, run)
+    assert run.status == "completed"
+    resp = await client.get(f"/projects/{pid}/runs/{run.id}/report", headers=headers)
+    assert resp.status_code == 200
+    return str(run.id), resp.json()
+
+
+async def review_project(client, headers):
+    resp = await client.post("/projects", json={"name": "Review"}, headers=headers)
+    pid = resp.json()["id"]
+    for title in TITLES:
+        await client.post(f"/projects/{pid}/papers", json={"title": title}, headers=headers)
+    return pid
+
+
+def parse_sse(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        if "event" in fields:
+            events.append((fields["event"], fields.get("id"), json.loads(fields["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_report_stage_writes_sections_bottom_up(
+    client, auth_headers, db_session, storage_dir
+):
+    pid = await review_project(client, auth_headers)
+    run_id, report = await run_once(client, auth_headers, db_session, pid)
+
+    assert report["status"] == "completed"
+    # Introduction, the root theme and its two topics
+    assert report["total"] == report["done"] == 4
+    intro, root, *leaves = report["parts"]
+    assert intro["label"] == "Introduction" and intro["node_id"] is None
+    assert (root["depth"], [leaf["depth"] for leaf in leaves]) == (0, [1, 1])
+    assert all(p["content"] and not p["cached"] for p in report["parts"])
+    assert report["content"].startswith("# Review\n")
+    assert f"### {leaves[0]['label']}\n" in report["content"]
+
+    resp = await client.get(f"/projects/{pid}/runs/{run_id}/report/stream", headers=auth_headers)
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(resp.text)
+    sections = [data for event, _, data in events if event == "section"]
+    # Leaves first, then the theme reduced from them, then the introduction
+    assert [s["depth"] for s in sections[:2]] == [1, 1]
+    assert [s["position"] for s in sections[2:]] == [1, 0]
+    assert [event_id for _, event_id, _ in events[:4]] == ["1", "2", "3", "4"]
+    assert events[-1] == ("done", None, {"status": "completed", "total": 4})
+
+    # Reconnecting with Last-Event-ID picks up after that section
+    resp = await client.get(
+        f"/projects/{pid}/runs/{run_id}/report/stream",
+        headers={**auth_headers, "Last-Event-ID": "3"},
+    )
+    assert [e[1] for e in parse_sse(resp.text)] == ["4", None]
+
+    resp = await client.get(
+        f"/projects/{pid}/runs/{run_id}/report", headers={"X-User-Id": str(uuid.uuid4())}
+    )
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_editing_a_node_rewrites_only_its_sections(
+    client, auth_headers, db_session, storage_dir
+):
+    pid = await review_project(client, auth_headers)
+    await run_once(client, auth_headers, db_session, pid)
+
+    _, again = await run_once(client, auth_headers, db_session, pid)
+    assert all(p["cached"] for p in again["parts"])
+
+    tree = (await client.get(f"/projects/{pid}/idea-tree", headers=auth_headers)).json()
+    level = await client.get(
+        f"/projects/{pid}/idea-tree",
+        params={"parent_id": tree["nodes"][0]["id"]},
+        headers=auth_headers,
+    )
+    edited, untouched = (n["id"] for n in level.json()["nodes"])
+    resp = await client.patch(
+        f"/projects/{pid}/idea-tree",
+        json={
+            "version": tree["tree"]["version"],
+            "ops": [{"op": "rename", "node_id": edited, "label": "Protein science"}],
+        },
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+
+    _, edited_report = await run_once(client, auth_headers, db_session, pid)
+    cached = {p["node_id"]: p["cached"] for p in edited_report["parts"]}
+    # The renamed node and everything summarising it are rewritten; its sibling is not
+    assert cached[untouched] is True
+    assert cached[edited] is False
+    assert [p["cached"] for p in edited_report["parts"][:2]] == [False, False]
+    assert "Protein science" in edited_report["content"]
+
+
+class SlowReasoner(ExtractiveReasoner):
+    """Extractive answers after a pause, recording how many calls overlap."""
+
+    model = "slow-extractive"
+
+    def __init__(self, fail_on: str = "") -> None:
+        super().__init__()
+        self.fail_on = fail_on
+        self.in_flight = 0
+        self.peak = 0
+
+    async def complete(self, system: str, prompt: str, max_tokens: int = 64) -> Completion:
+        if self.fail_on and system.startswith(self.fail_on):
+            raise RuntimeError("model unavailable")
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return await super().complete(system, prompt, max_tokens)
+
+
+@pytest.mark.asyncio
+async def test_sections_of_a_level_are_written_concurrently(
+    client, auth_headers, db_session, storage_dir
+):
+    pid = await review_project(client, auth_headers)
+    run_id, _ = await run_once(client, auth_headers, db_session, pid)
+
+    reasoner = SlowReasoner()
+    options = ReportOptions(section_tokens=200, papers_per_section=10, concurrency=4)
+    summary = await write_report(
+        db_session, uuid.UUID(pid), uuid.UUID(run_id), options, reasoner=reasoner
+    )
+    assert (summary.written, summary.cached) == (4, 0)
+    assert reasoner.peak == 2
+
+    reasoner = SlowReasoner()
+    # Another model misses the cache filled above
+    reasoner.model = "slow-extractive-2"
+    options.concurrency = 1
+    await write_report(db_session, uuid.UUID(pid), uuid.UUID(run_id), options, reasoner=reasoner)
+    assert reasoner.peak == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_report_keeps_finished_sections(
+    client, auth_headers, db_session, storage_dir
+):
+    pid = await review_project(client, auth_headers)
+    run_id, _ = await run_once(client, auth_headers, db_session, pid)
+
+    options = ReportOptions(section_tokens=200, papers_per_section=10, concurrency=2)
+    with pytest.raises(RuntimeError):
+        await write_report(
+            db_session,
+            uuid.UUID(pid),
+            uuid.UUID(run_id),
+            options,
+            reasoner=SlowReasoner(fail_on="You are writing the introduction"),
+        )
+
+    resp = await client.get(f"/projects/{pid}/runs/{run_id}/report", headers=auth_headers)
+    report = resp.json()
+    assert (report["status"], report["done"], report["content"]) == ("failed", 3, None)
+    assert report["parts"][0]["content"] is None
+
+    resp = await client.get(f"/projects/{pid}/runs/{run_id}/report/stream", headers=auth_headers)
+    events = parse_sse(resp.text)
+    assert [e[0] for e in events] == ["section"] * 3 + ["done"]
+    assert events[-1][2]["status"] == "failed"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_report_is_not_reported_as_failed(
+    client, auth_headers, db_session, storage_dir
+):
+    pid = await review_project(client, auth_headers)
+    run_id, _ = await run_once(client, auth_headers, db_session, pid)
+
+    def cancelled():
+        raise RunCancelled(run_id)
+
+    options = ReportOptions(section_tokens=200, papers_per_section=10, concurrency=2)
+    with pytest.raises(RunCancelled):
+        await write_report(
+            db_session,
+            uuid.UUID(pid),
+            uuid.UUID(run_id),
+            options,
+            reasoner=ExtractiveReasoner(),
+            check_cancelled=cancelled,
+        )
+
+    resp = await client.get(f"/projects/{pid}/runs/{run_id}/report", headers=auth_headers)
+    assert resp.json()["status"] == "cancelled"
+    resp = await client.get(f"/projects/{pid}/runs/{run_id}/report/stream", headers=auth_headers)
+    assert parse_sse(resp.text)[-1][2]["status"] == "cancelled"
@@ -0,0 +1,54 @@
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app import responses
+from app.models.paper import ProjectPaper
+from app.schemas.paper import ProjectPaperListItem
+
+
+@pytest.mark.asyncio
+async def test_fast_list_matches_validated_output(client, auth_headers, db_session):
+    resp = await client.post("/projects", json={"name": "Fast"}, headers=auth_headers)
+    pid = resp.json()["id"]
+    for i, (title, abstract) in enumerate([("Alpha", "Text with ünïcode"), ("Beta", None)]):
+        body = {"title": title, "authors": ["A. Author"], "year": 2020 + i, "abstract": abstract}
+        await client.post(f"/projects/{pid}/papers", json=body, headers=auth_headers)
+
+    resp = await client.get(f"/projects/{pid}/papers", headers=auth_headers)
+    assert resp.headers["content-type"] == "application/json"
+
+    result = await db_session.execute(
+        select(ProjectPaper)
+        .where(ProjectPaper.project_id == uuid.UUID(pid))
+        .options(selectinload(ProjectPaper.paper))
+    )
+    adapter = TypeAdapter(List[ProjectPaperListItem])
+    expected = adapter.dump_python(
+        adapter.validate_python(result.scalars().all(), from_attributes=True), mode="json"
+    )
+    assert sorted(resp.json(), key=lambda r: r["id"]) == sorted(expected, key=lambda r: r["id"])
+
+
+def test_stdlib_fallback_matches_orjson(monkeypatch):
+    content = [
+        {
+            "id": uuid.UUID(int=1),
+            "at": datetime(2026, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc),
+            "naive": datetime(2026, 1, 2, 3, 4, 5),
+            "score": 0.25,
+            "authors": ["Ödön"],
+            "missing": None,
+        }
+    ]
+    fast = responses.dumps(content)
+    monkeypatch.setattr(responses, "orjson", None)
+    slow = responses.dumps(content)
+    assert json.loads(fast) == json.loads(slow)
+    assert json.loads(slow)[0]["at"] == "2026-01-02T03:04:05.000678Z"
@@ -0,0 +1,171 @@
+import asyncio
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.checkpoint import RunCheckpoint
+from app.models.run import Run
+from app.pipeline.runner import execute_run
+from app.pipeline.scheduler import Quotas, claim_next_run, heartbeat, recover_stale_runs
+
+
+async def make_run(client, headers):
+    resp = await client.post("/projects", json={"name": "Recoverable"}, headers=headers)
+    pid = resp.json()["id"]
+    resp = await client.post(f"/projects/{pid}/runs", json={}, headers=headers)
+    return pid, resp.json()["id"]
+
+
+@dataclass
+class Found:
+    papers: int
+
+
+@pytest.mark.asyncio
+async def test_cancel_pending_run(client, auth_headers):
+    pid, run_id = await make_run(client, auth_headers)
+
+    resp = await client.post(f"/projects/{pid}/runs/{run_id}/cancel", headers=auth_headers)
+    assert resp.status_code == 202
+    assert resp.json()["status"] == "cancelled"
+    assert resp.json()["cancel_requested_at"] is not None
+
+    resp = await client.post(f"/projects/{pid}/runs/{run_id}/cancel", headers=auth_headers)
+    assert resp.status_code == 409
+    other = {"X-User-Id": str(uuid.uuid4())}
+    resp = await client.post(f"/projects/{pid}/runs/{run_id}/cancel", headers=other)
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_cancel_between_stages(client, auth_headers, db_session):
+    pid, run_id = await make_run(client, auth_headers)
+    ran = []
+
+    async def first(ctx):
+        ran.append("first")
+        resp = await client.post(f"/projects/{pid}/runs/{run_id}/cancel", headers=auth_headers)
+        assert resp.json()["status"] == "running"
+
+    async def second(ctx):
+        ran.append("second")
+
+    run = await db_session.get(Run, uuid.UUID(run_id))
+    await execute_run(db_session, run, stages=[("first", first), ("second", second)])
+    assert ran == ["first"]
+    assert run.status == "cancelled"
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_relays_cancel(client, auth_headers, db_engine, db_session):
+    pid, run_id = await make_run(client, auth_headers)
+    run = await claim_next_run(db_session, "w1", Quotas(per_user=1, per_project=1))
+    claimed_beat = run.heartbeat_at
+    factory = async_sessionmaker(bind=db_engine, class_=AsyncSession, expire_on_commit=False)
+
+    cancel = asyncio.Event()
+    async with heartbeat(factory, run.id, cancel, interval=0.01):
+        await asyncio.sleep(0.05)
+    assert not cancel.is_set()
+
+    await client.post(f"/projects/{pid}/runs/{run_id}/cancel", headers=auth_headers)
+    async with heartbeat(factory, run.id, cancel, interval=0.01):
+        await asyncio.wait_for(cancel.wait(), timeout=2)
+    await db_session.refresh(run)
+    assert run.heartbeat_at > claimed_beat
+
+
+@pytest.mark.asyncio
+async def test_cancel_mid_stage(client, auth_headers, db_session):
+    pid, run_id = await make_run(client, auth_headers)
+    run = await db_session.get(Run, uuid.UUID(run_id))
+    cancel = asyncio.Event()
+    iterations = []
+
+    async def slow(ctx):
+        for i in range(500):
+            ctx.check_cancelled()
+            iterations.append(i)
+            if i == 5:
+                # What the heartbeat does once it sees the cancellation request
+                cancel.set()
+            await asyncio.sleep(0)
+
+    await execute_run(db_session, run, stages=[("slow", slow)], cancel=cancel)
+    assert run.status == "cancelled"
+    assert len(iterations) == 6
+
+    resp = await client.get(f"/projects/{pid}/runs/{run_id}/profile", headers=auth_headers)
+    assert resp.json()["stages"][0]["error"].startswith("RunCancelled")
+
+
+@pytest.mark.asyncio
+async def test_crashed_run_resumes_from_checkpoint(client, auth_headers, db_session):
+    pid, run_id = await make_run(client, auth_headers)
+    calls = {"retrieval": 0, "analysis": 0}
+    crash = True
+
+    async def retrieval(ctx):
+        calls["retrieval"] += 1
+        return Found(papers=42)
+
+    async def analysis(ctx):
+        calls["analysis"] += 1
+        if crash:
+            # The worker process dies mid-stage: nothing after this runs.
+            raise asyncio.CancelledError()
+        return ctx.outputs["retrieval"]["papers"] * 2
+
+    stages = [("retrieval", retrieval), ("analysis", analysis)]
+    quotas = Quotas(per_user=1, per_project=1)
+    run = await claim_next_run(db_session, "dead-worker", quotas)
+    with pytest.raises(asyncio.CancelledError):
+        await execute_run(db_session, run, stages=stages)
+    await db_session.rollback()
+    assert (await db_session.get(Run, uuid.UUID(run_id))).status == "running"
+
+    # Heartbeat still fresh: left alone.
+    assert await recover_stale_runs(db_session, timedelta(minutes=1)) == []
+    await db_session.execute(
+        update(Run)
+        .where(Run.id == uuid.UUID(run_id))
+        .values(heartbeat_at=datetime.utcnow() - timedelta(minutes=5))
+    )
+    await db_session.commit()
+    assert await recover_stale_runs(db_session, timedelta(minutes=1)) == [uuid.UUID(run_id)]
+
+    crash = False
+    run = await claim_next_run(db_session, "new-worker", quotas)
+    assert str(run.id) == run_id
+    await execute_run(db_session, run, stages=stages)
+    assert run.status == "completed"
+    assert calls == {"retrieval": 1, "analysis": 2}
+
+    result = await db_session.execute(
+        select(RunCheckpoint.stage, RunCheckpoint.output)
+        .where(RunCheckpoint.run_id == run.id)
+        .order_by(RunCheckpoint.position)
+    )
+    assert result.all() == [("retrieval", {"papers": 42}), ("analysis", 84)]
+
+
+@pytest.mark.asyncio
+async def test_stale_run_with_cancel_request_is_cancelled(client, auth_headers, db_session):
+    pid, run_id = await make_run(client, auth_headers)
+    await claim_next_run(db_session, "dead-worker", Quotas(per_user=1, per_project=1))
+    resp = await client.post(f"/projects/{pid}/runs/{run_id}/cancel", headers=auth_headers)
+    assert resp.json()["status"] == "running"
+    await db_session.execute(
+        update(Run)
+        .where(Run.id == uuid.UUID(run_id))
+        .values(heartbeat_at=datetime.utcnow() - timedelta(minutes=5))
+    )
+    await db_session.commit()
+
+    await recover_stale_runs(db_session, timedelta(minutes=1))
+    resp = await client.get(f"/projects/{pid}/runs/{run_id}", headers=auth_headers)
+    assert resp.json()["status"] == "cancelled"
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from app.pipeline.runner import STAGES
+from benchmarks.bench_scale import measure, overruns
+from benchmarks.synthetic import generate_papers
+
+
+def test_generated_library_is_reproducible_and_realistic():
+    batches = list(generate_papers(250, dim=32, seed=3, batch=100))
+    assert [len(b) for b in batches] == [100, 100, 50]
+    papers = [p for batch in batches for p in batch]
+    again = [p for batch in generate_papers(250, dim=32, seed=3, batch=100) for p in batch]
+    assert [p["id"] for p in papers] == [p["id"] for p in again]
+
+    assert all(120 <= len(p["abstract"].split()) <= 200 for p in papers)
+    assert all(1 <= len(p["authors"]) <= 6 for p in papers)
+    years = [p["year"] for p in papers]
+    assert min(years) >= 2000 and sum(y >= 2020 for y in years) > len(years) / 2
+    dois = [p["doi"] for p in papers if p["doi"]]
+    assert len(set(dois)) == len(dois) and all(p["doi"] or p["arxiv_id"] for p in papers)
+
+    vectors = np.stack([p["vector"] for p in papers])
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+    # Papers of one area sit closer together than papers of different areas
+    area = np.array([p["area"] for p in papers])
+    same = area[:, None] == area[None, :]
+    sims = vectors @ vectors.T
+    assert sims[same].mean() > sims[~same].mean() + 0.3
+
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_at_scale_with_offline_providers(tmp_path, storage_dir):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'scale.db'}"
+    report = await measure(300, database_url=url, embedded=0.5)
+    assert report["status"] == "completed"
+    assert list(report["stages"]) == [name for name, _ in STAGES]
+    # Half the library arrives unembedded; the injected providers do the work
+    assert report["embedder_calls"] == 1 and report["reasoner_calls"] > 0
+    assert report["stages"]["report"]["llm_calls"] > 0
+    assert overruns(report) == []
+
+    tight = {name: (0.0, 0.0) for name, _ in STAGES}
+    report = await measure(300, database_url=url, budgets=tight)
+    assert set(overruns(report)) >= {"taxonomy", "graph", "report"}
@@ -0,0 +1,138 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.models.run import Run
+from app.pipeline.scheduler import Quotas, claim_next_run
+from app.worker import RunWorker
+
+QUOTAS = Quotas(per_user=2, per_project=1)
+
+
+async def make_project(client, headers, name="Queued"):
+    resp = await client.post("/projects", json={"name": name}, headers=headers)
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+async def enqueue(client, headers, pid, lane="bulk"):
+    resp = await client.post(f"/projects/{pid}/runs", json={"lane": lane}, headers=headers)
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+async def claimed_ids(db, quotas=QUOTAS):
+    ids = []
+    while (run := await claim_next_run(db, "test-worker", quotas)) is not None:
+        ids.append(str(run.id))
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_interactive_lane_first(client, auth_headers, db_session):
+    bulk = await enqueue(client, auth_headers, await make_project(client, auth_headers))
+    interactive = await enqueue(
+        client, auth_headers, await make_project(client, auth_headers), lane="interactive"
+    )
+    assert await claimed_ids(db_session) == [interactive, bulk]
+
+    run = await db_session.get(Run, uuid.UUID(interactive))
+    assert (run.status, run.worker_id) == ("running", "test-worker")
+    assert run.started_at is not None
+
+
+@pytest.mark.asyncio
+async def test_project_and_user_quotas(client, auth_headers, db_session):
+    a = await make_project(client, auth_headers, "A")
+    b = await make_project(client, auth_headers, "B")
+    c = await make_project(client, auth_headers, "C")
+    a1, a2 = await enqueue(client, auth_headers, a), await enqueue(client, auth_headers, a)
+    b1 = await enqueue(client, auth_headers, b)
+    await enqueue(client, auth_headers, c)
+
+    # One run per project, two per user: a2 waits on a1, C waits on the user quota.
+    assert await claimed_ids(db_session) == [a1, b1]
+
+    await db_session.execute(update(Run).where(Run.id == uuid.UUID(a1)).values(status="completed"))
+    await db_session.commit()
+    assert await claimed_ids(db_session) == [a2]
+
+
+@pytest.mark.asyncio
+async def test_fair_share_across_users(client, db_session):
+    heavy, light = {"X-User-Id": str(uuid.uuid4())}, {"X-User-Id": str(uuid.uuid4())}
+    heavy_projects = [await make_project(client, heavy, f"H{i}") for i in range(3)]
+    first = await enqueue(client, heavy, heavy_projects[0])
+    assert await claimed_ids(db_session, Quotas(per_user=1, per_project=1)) == [first]
+
+    # The heavy user queued first, but the light user has nothing running.
+    h2 = await enqueue(client, heavy, heavy_projects[1])
+    l1 = await enqueue(client, light, await make_project(client, light))
+    await db_session.execute(
+        update(Run).where(Run.id == uuid.UUID(h2)).values(
+            created_at=datetime.utcnow() - timedelta(minutes=5)
+        )
+    )
+    await db_session.commit()
+    assert await claimed_ids(db_session, Quotas(per_user=5, per_project=1)) == [l1, h2]
+
+
+@pytest.mark.asyncio
+async def test_bulk_cap_keeps_slots_for_interactive(client, db_session):
+    users = [{"X-User-Id": str(uuid.uuid4())} for _ in range(3)]
+    bulk = [await enqueue(client, h, await make_project(client, h)) for h in users[:2]]
+    interactive = await enqueue(
+        client, users[2], await make_project(client, users[2]), lane="interactive"
+    )
+    quotas = Quotas(per_user=1, per_project=1, bulk=1)
+    assert await claimed_ids(db_session, quotas) == [interactive, bulk[0]]
+
+
+@pytest.mark.asyncio
+async def test_worker_executes_claimed_run(client, auth_headers, db_engine, storage_dir):
+    pid = await make_project(client, auth_headers)
+    await client.post(f"/projects/{pid}/papers", json={"title": "Queued paper"}, headers=auth_headers)
+    run_id = await enqueue(client, auth_headers, pid)
+
+    factory = async_sessionmaker(bind=db_engine, class_=AsyncSession, expire_on_commit=False)
+    worker = RunWorker(factory, worker_id="w1", quotas=QUOTAS, poll_interval=0)
+    assert await worker.run_once() is True
+    assert await worker.run_once() is False
+
+    resp = await client.get(f"/projects/{pid}/runs/{run_id}", headers=auth_headers)
+    run = resp.json()
+    assert run["status"] == "completed"
+    assert run["started_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_queue_metrics(client, auth_headers, db_session, monkeypatch):
+    pid = await make_project(client, auth_headers)
+    await enqueue(client, auth_headers, pid)
+    await enqueue(client, auth_headers, pid)
+    await enqueue(client, auth_headers, await make_project(client, auth_headers), "interactive")
+    await claimed_ids(db_session)
+
+    # Internal only: off without a configured token, then only with it
+    assert (await client.get("/health/queue")).status_code == 404
+    monkeypatch.setattr(settings, "metrics_token", "s3cret")
+    assert (await client.get("/health/queue", headers=auth_headers)).status_code == 403
+    resp = await client.get("/health/queue", headers={"X-Metrics-Token": "s3cret"})
+    assert resp.status_code == 200
+    lanes = {lane["lane"]: lane for lane in resp.json()["lanes"]}
+    assert (lanes["interactive"]["depth"], lanes["interactive"]["running"]) == (0, 1)
+    assert (lanes["bulk"]["depth"], lanes["bulk"]["running"]) == (1, 1)
+    assert lanes["bulk"]["oldest_wait_seconds"] >= 0
+    assert lanes["bulk"]["claimed"] == 1
+    assert lanes["interactive"]["wait_p50_seconds"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_unknown_lane_rejected(client, auth_headers):
+    pid = await make_project(client, auth_headers)
+    resp = await client.post(f"/projects/{pid}/runs", json={"lane": "urgent"}, headers=auth_headers)
+    assert resp.status_code == 422
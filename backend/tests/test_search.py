@@ -0,0 +1,127 @@
+import uuid
+
+import pytest
+
+from app.services.search import reciprocal_rank_fusion
+
+
+async def make_project(client, headers, name="Search Project"):
+    resp = await client.post("/projects", json={"name": name}, headers=headers)
+    assert resp.status_code == 201
+    return resp.json()
+
+
+PAPERS = [
+    {
+        "title": "Attention Is All You Need",
+        "abstract": "We propose the Transformer, a network based solely on attention mechanisms.",
+        "arxiv_id": "1706.03762",
+    },
+    {
+        "title": "BERT: Pre-training of Deep Bidirectional Transformers",
+        "abstract": "Language representation model pre-trained with masked language modelling.",
+        "arxiv_id": "1810.04805",
+    },
+    {
+        "title": "Deep Residual Learning for Image Recognition",
+        "abstract": "Residual networks ease the training of very deep convolutional networks.",
+        "arxiv_id": "1512.03385",
+    },
+]
+
+
+async def seed(client, headers, pid):
+    for payload in PAPERS:
+        resp = await client.post(f"/projects/{pid}/papers", json=payload, headers=headers)
+        assert resp.status_code == 201
+
+
+def test_rrf_rewards_agreement():
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    fused = reciprocal_rank_fusion(
+        {"lexical": [a, b], "semantic": [b, c]}, {"lexical": 1.0, "semantic": 1.0}
+    )
+    assert fused[0][0] == b
+    assert {pid for pid, _ in fused} == {a, b, c}
+
+
+def test_rrf_weights_and_zero_weight():
+    a, b = uuid.uuid4(), uuid.uuid4()
+    fused = reciprocal_rank_fusion(
+        {"lexical": [a], "semantic": [b]}, {"lexical": 0.1, "semantic": 2.0}
+    )
+    assert [pid for pid, _ in fused] == [b, a]
+
+    fused = reciprocal_rank_fusion(
+        {"lexical": [a], "semantic": [b]}, {"lexical": 0.0, "semantic": 1.0}
+    )
+    assert [pid for pid, _ in fused] == [b]
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search(client, auth_headers):
+    project = await make_project(client, auth_headers)
+    pid = project["id"]
+    await seed(client, auth_headers, pid)
+
+    resp = await client.get(
+        f"/projects/{pid}/papers/search",
+        params={"q": "transformer attention"},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+    hits = resp.json()
+    assert hits[0]["paper"]["title"] == "Attention Is All You Need"
+    assert hits[0]["lexical_rank"] == 1
+    assert hits[0]["semantic_rank"] is not None
+    scores = [hit["search_score"] for hit in hits]
+    assert scores == sorted(scores, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_search_modes(client, auth_headers):
+    project = await make_project(client, auth_headers)
+    pid = project["id"]
+    await seed(client, auth_headers, pid)
+
+    resp = await client.get(
+        f"/projects/{pid}/papers/search",
+        params={"q": "residual", "mode": "lexical"},
+        headers=auth_headers,
+    )
+    hits = resp.json()
+    assert [hit["paper"]["arxiv_id"] for hit in hits] == ["1512.03385"]
+    assert hits[0]["semantic_rank"] is None
+
+    # Inflected form has no exact token match but shares trigrams.
+    resp = await client.get(
+        f"/projects/{pid}/papers/search",
+        params={"q": "transformers", "mode": "semantic"},
+        headers=auth_headers,
+    )
+    hits = resp.json()
+    assert hits and all(hit["lexical_rank"] is None for hit in hits)
+    assert hits[0]["paper"]["arxiv_id"] in {"1706.03762", "1810.04805"}
+
+
+@pytest.mark.asyncio
+async def test_search_scoped_to_project(client, auth_headers):
+    p1 = await make_project(client, auth_headers, "P1")
+    p2 = await make_project(client, auth_headers, "P2")
+    await seed(client, auth_headers, p1["id"])
+
+    resp = await client.get(
+        f"/projects/{p2['id']}/papers/search", params={"q": "attention"}, headers=auth_headers
+    )
+    assert resp.status_code == 200
+    assert resp.json() == []
+
+
+@pytest.mark.asyncio
+async def test_search_requires_ownership(client, auth_headers):
+    project = await make_project(client, auth_headers)
+    other = {"X-User-Id": str(uuid.uuid4())}
+    resp = await client.get(
+        f"/projects/{project['id']}/papers/search", params={"q": "x"}, headers=other
+    )
+    assert resp.status_code == 404
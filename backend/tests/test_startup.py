@@ -0,0 +1,75 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.startup import SCHEMA_REVISION, SchemaVersionError, check_schema_version, prepare_database
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+def test_schema_revision_matches_alembic_head():
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(BACKEND / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND / "alembic"))
+    assert ScriptDirectory.from_config(config).get_current_head() == SCHEMA_REVISION
+
+
+def test_heavy_modules_not_imported_at_boot():
+    heavy = ["numpy", "pypdf", "httpx", "boto3", "multiprocessing", "alembic"]
+    code = f"import sys, app.main; print([m for m in {heavy!r} if m in sys.modules])"
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND, capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "[]"
+
+
+@pytest.mark.asyncio
+async def test_production_mode_checks_revision():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        with pytest.raises(SchemaVersionError, match="no alembic_version"):
+            await prepare_database(engine, "production")
+
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32))"))
+            await conn.execute(text("INSERT INTO alembic_version VALUES ('001')"))
+        with pytest.raises(SchemaVersionError, match="revision 001"):
+            await prepare_database(engine, "production")
+
+        async with engine.begin() as conn:
+            await conn.execute(text(f"UPDATE alembic_version SET version_num = '{SCHEMA_REVISION}'"))
+        assert await check_schema_version(engine) == SCHEMA_REVISION
+        # Production mode never creates tables.
+        async with engine.connect() as conn:
+            tables = await conn.run_sync(lambda c: inspect(c).get_table_names())
+        assert tables == ["alembic_version"]
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_dev_mode_creates_tables():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        await prepare_database(engine, "dev")
+        async with engine.connect() as conn:
+            tables = await conn.run_sync(lambda c: inspect(c).get_table_names())
+        assert "papers" in tables and "runs" in tables
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_startup_timings_endpoint(client):
+    resp = await client.get("/health/startup")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["mode"] == "dev"
+    assert {"imports", "app"} <= set(data["phases_ms"])
+    assert data["total_ms"] >= data["phases_ms"]["imports"]
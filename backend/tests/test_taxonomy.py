@@ -0,0 +1,149 @@
+import uuid
+
+import numpy as np
+import pytest
+
+from app.models.run import Run
+from app.pipeline.runner import execute_run
+from app.pipeline.taxonomy import (
+    TaxonomyOptions,
+    build_tree,
+    kmeans,
+    label_tree,
+    load_taxonomy,
+)
+from app.services.llm import Completion, ExtractiveReasoner
+
+
+def blobs(topics, per_topic, dim=32, seed=1):
+    """Unit vectors scattered tightly around ``topics`` random directions."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(topics, dim))
+    noise = 0.05 * rng.normal(size=(topics * per_topic, dim))
+    points = np.repeat(centers, per_topic, axis=0) + noise
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+    return points.astype(np.float32), np.repeat(np.arange(topics), per_topic)
+
+
+def options(**overrides):
+    values = dict(leaf_size=25, max_clusters=64, fanout=6, representatives=5, seed=0)
+    values.update(overrides)
+    return TaxonomyOptions(**values)
+
+
+class CountingReasoner:
+    model = "counting"
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_chars = 0
+
+    async def complete(self, system, prompt, max_tokens=64):
+        self.calls += 1
+        self.prompt_chars += len(prompt)
+        return Completion(text=f"Topic {self.calls}", prompt_tokens=1, completion_tokens=2)
+
+
+def test_kmeans_recovers_separated_clusters_deterministically():
+    points, truth = blobs(topics=8, per_topic=50)
+    centroids, labels = kmeans(points, 8, seed=3)
+    assert len(centroids) == 8
+    # Every true topic maps onto exactly one cluster
+    for topic in range(8):
+        assert len(set(labels[truth == topic])) == 1
+    again, labels_again = kmeans(points, 8, seed=3)
+    np.testing.assert_array_equal(labels, labels_again)
+    np.testing.assert_allclose(centroids, again)
+
+
+def test_tree_partitions_papers_and_sums_sizes():
+    points, _ = blobs(topics=24, per_topic=25)
+    ids = [str(i) for i in range(len(points))]
+    nodes = build_tree(points, ids, options())
+
+    root = nodes[0]
+    assert root.parent is None and root.size == len(ids)
+    assert 1 < len(root.children) <= 6
+    leaves = [n for n in nodes if not n.children]
+    assert len(leaves) == 24
+    assert sorted(pid for leaf in leaves for pid in leaf.paper_ids) == sorted(ids)
+    by_id = {n.id: n for n in nodes}
+    for node in nodes:
+        if node.children:
+            assert node.size == sum(by_id[c].size for c in node.children)
+            assert all(by_id[c].depth == node.depth + 1 for c in node.children)
+            assert not node.paper_ids
+    # Representatives come from the leaf and are capped
+    assert all(set(l.representatives) <= set(l.paper_ids) for l in leaves)
+    assert all(len(l.representatives) == 5 for l in leaves)
+
+
+@pytest.mark.asyncio
+async def test_model_calls_scale_with_clusters_not_papers():
+    usage = []
+    for per_topic in (25, 250):
+        points, _ = blobs(topics=8, per_topic=per_topic)
+        ids = [str(i) for i in range(len(points))]
+        nodes = build_tree(points, ids, options(max_clusters=8, fanout=4))
+        reasoner = CountingReasoner()
+        await label_tree(nodes, {pid: "A paper title" for pid in ids}, reasoner, 4)
+        assert all(n.label for n in nodes)
+        usage.append((reasoner.calls, reasoner.prompt_chars))
+    # Ten times the papers: the same number of calls, and prompts that only
+    # differ in the paper counts shown to parent nodes
+    assert usage[0][0] == usage[1][0] <= 2 * 8
+    assert usage[1][1] < 1.1 * usage[0][1]
+
+
+@pytest.mark.asyncio
+async def test_extractive_reasoner_is_deterministic():
+    reasoner = ExtractiveReasoner()
+    prompt = "1. Graph neural networks\n2. Graph attention networks for molecules"
+    first = await reasoner.complete("system", prompt)
+    assert first.text == "Graph Networks Neural"
+    assert (await reasoner.complete("system", prompt)).text == first.text
+
+
+TOPICS = {
+    "protein": [
+        "Protein folding with deep learning",
+        "Protein structure prediction",
+        "Protein design by diffusion",
+    ],
+    "galaxy": [
+        "Galaxy cluster lensing survey",
+        "Galaxy rotation curves",
+        "Galaxy formation simulations",
+    ],
+}
+
+
+@pytest.mark.asyncio
+async def test_run_persists_labeled_taxonomy(client, auth_headers, db_session, storage_dir):
+    resp = await client.post("/projects", json={"name": "Taxonomy"}, headers=auth_headers)
+    pid = resp.json()["id"]
+    for titles in TOPICS.values():
+        for title in titles:
+            await client.post(
+                f"/projects/{pid}/papers", json={"title": title}, headers=auth_headers
+            )
+    resp = await client.post(
+        f"/projects/{pid}/runs",
+        json={"config_snapshot": {"taxonomy_leaf_size": 3}},
+        headers=auth_headers,
+    )
+    run_id = uuid.UUID(resp.json()["id"])
+    run = await db_session.get(Run, run_id)
+    await execute_run(db_session, run)
+    assert run.status == "completed"
+
+    nodes = await load_taxonomy(db_session, run_id)
+    leaves = [n for n in nodes if not n.children]
+    assert len(leaves) == 2 and nodes[0].children == [leaves[0].id, leaves[1].id]
+    labels = sorted(leaf.label.split()[0].lower() for leaf in leaves)
+    assert labels == ["galaxy", "protein"]
+
+    resp = await client.get(f"/projects/{pid}/runs/{run_id}/profile", headers=auth_headers)
+    [taxonomy] = [s for s in resp.json()["stages"] if s["stage"] == "taxonomy"]
+    # Two leaves and the root
+    assert taxonomy["llm_calls"] == 3
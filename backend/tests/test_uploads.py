@@ -0,0 +1,196 @@
+import uuid
+from pathlib import Path
+
+import pytest
+
+from app import auth
+from app.config import settings
+from app.routers import documents
+from tests.pdf_fixtures import SAMPLE_PAGES, make_pdf
+from tests.test_documents import make_paper, parse_pool  # noqa: F401
+from tests.test_documents import upload as upload_pdf
+
+
+async def begin(client, pid, paper_id, data, headers):
+    resp = await client.post(
+        f"/projects/{pid}/uploads",
+        json={"paper_id": paper_id, "filename": "paper.pdf", "size": len(data)},
+        headers=headers,
+    )
+    assert resp.status_code == 201
+    return resp.json()
+
+
+def send(client, pid, upload_id, chunk, offset, headers):
+    return client.patch(
+        f"/projects/{pid}/uploads/{upload_id}",
+        content=chunk,
+        headers={
+            **headers,
+            "Upload-Offset": str(offset),
+            "Content-Type": "application/offset+octet-stream",
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_chunked_upload_with_resume(client, auth_headers, storage_dir, parse_pool):
+    pid, paper_id = await make_paper(client, auth_headers)
+    data = make_pdf(SAMPLE_PAGES)
+    upload = await begin(client, pid, paper_id, data, auth_headers)
+    assert upload["offset"] == 0 and upload["status"] == "uploading"
+
+    half = len(data) // 2
+    resp = await send(client, pid, upload["id"], data[:half], 0, auth_headers)
+    assert resp.json()["offset"] == half
+
+    # A client that lost track of progress asks where to resume.
+    resp = await client.get(f"/projects/{pid}/uploads/{upload['id']}", headers=auth_headers)
+    assert resp.json()["offset"] == half
+
+    resp = await send(client, pid, upload["id"], data[half:], half, auth_headers)
+    assert resp.json()["offset"] == len(data)
+
+    resp = await client.post(
+        f"/projects/{pid}/uploads/{upload['id']}/complete", headers=auth_headers
+    )
+    assert resp.status_code == 201
+    doc = resp.json()
+    assert doc["status"] == "parsed"
+    assert doc["size_bytes"] == len(data)
+
+    resp = await client.get(f"/projects/{pid}/uploads/{upload['id']}", headers=auth_headers)
+    assert resp.json()["status"] == "completed"
+    assert resp.json()["document_id"] == doc["id"]
+    # Staging area is empty once the bytes are promoted.
+    assert not any((Path(storage_dir) / ".uploads").iterdir())
+
+
+@pytest.mark.asyncio
+async def test_hash_recomputed_when_digest_lost(client, auth_headers, storage_dir, parse_pool):
+    pid, paper_id = await make_paper(client, auth_headers)
+    data = make_pdf(SAMPLE_PAGES)
+    first = (await upload_pdf(client, pid, paper_id, data, auth_headers, parse=False)).json()
+
+    upload = await begin(client, pid, paper_id, data, auth_headers)
+    await send(client, pid, upload["id"], data[:100], 0, auth_headers)
+    # Simulates a restart, or the next chunk landing on another worker.
+    documents._upload_digests.clear()
+    await send(client, pid, upload["id"], data[100:], 100, auth_headers)
+    resp = await client.post(
+        f"/projects/{pid}/uploads/{upload['id']}/complete", headers=auth_headers
+    )
+    assert resp.json()["id"] == first["id"]
+
+
+@pytest.mark.asyncio
+async def test_conflicting_upload_fails_and_retry_is_rejected(
+    client, auth_headers, storage_dir, parse_pool
+):
+    pid, paper_id = await make_paper(client, auth_headers)
+    resp = await client.post(
+        f"/projects/{pid}/papers", json={"title": "Another Study"}, headers=auth_headers
+    )
+    other_id = resp.json()["paper_id"]
+    data = make_pdf(SAMPLE_PAGES)
+    await upload_pdf(client, pid, paper_id, data, auth_headers, parse=False)
+
+    upload = await begin(client, pid, other_id, data, auth_headers)
+    await send(client, pid, upload["id"], data, 0, auth_headers)
+    complete = f"/projects/{pid}/uploads/{upload['id']}/complete"
+    resp = await client.post(complete, headers=auth_headers)
+    assert resp.status_code == 409
+    assert resp.json()["detail"] == "PDF already attached to another paper"
+    resp = await client.get(f"/projects/{pid}/uploads/{upload['id']}", headers=auth_headers)
+    assert resp.json()["status"] == "failed"
+
+    resp = await client.post(complete, headers=auth_headers)
+    assert resp.status_code == 409
+    assert resp.json()["detail"] == "Upload is failed"
+    assert not any((Path(storage_dir) / ".uploads").iterdir())
+
+    # The single-request path leaves nothing behind either
+    resp = await upload_pdf(client, pid, other_id, data, auth_headers, parse=False)
+    assert resp.status_code == 409
+    assert not any((Path(storage_dir) / ".uploads").iterdir())
+
+
+@pytest.mark.asyncio
+async def test_offset_mismatch_rejected(client, auth_headers, storage_dir):
+    pid, paper_id = await make_paper(client, auth_headers)
+    data = make_pdf(SAMPLE_PAGES)
+    upload = await begin(client, pid, paper_id, data, auth_headers)
+
+    resp = await send(client, pid, upload["id"], data[10:20], 10, auth_headers)
+    assert resp.status_code == 409
+
+    resp = await send(client, pid, upload["id"], data + b"extra", 0, auth_headers)
+    assert resp.status_code == 413
+    assert resp.json()["detail"] == "Upload exceeds declared size"
+    resp = await client.get(f"/projects/{pid}/uploads/{upload['id']}", headers=auth_headers)
+    assert resp.json()["offset"] == 0
+
+
+@pytest.mark.asyncio
+async def test_incomplete_upload_cannot_complete(client, auth_headers, storage_dir, parse_pool):
+    pid, paper_id = await make_paper(client, auth_headers)
+    data = make_pdf(SAMPLE_PAGES)
+    upload = await begin(client, pid, paper_id, data, auth_headers)
+    await send(client, pid, upload["id"], data[:50], 0, auth_headers)
+
+    resp = await client.post(
+        f"/projects/{pid}/uploads/{upload['id']}/complete", headers=auth_headers
+    )
+    assert resp.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_abort_upload(client, auth_headers, storage_dir):
+    pid, paper_id = await make_paper(client, auth_headers)
+    data = make_pdf(SAMPLE_PAGES)
+    upload = await begin(client, pid, paper_id, data, auth_headers)
+    await send(client, pid, upload["id"], data[:50], 0, auth_headers)
+
+    resp = await client.delete(f"/projects/{pid}/uploads/{upload['id']}", headers=auth_headers)
+    assert resp.status_code == 204
+    resp = await client.get(f"/projects/{pid}/uploads/{upload['id']}", headers=auth_headers)
+    assert resp.json()["status"] == "aborted"
+    resp = await send(client, pid, upload["id"], data[50:], 50, auth_headers)
+    assert resp.status_code == 409
+    assert not (Path(storage_dir) / ".uploads" / upload["id"]).exists()
+
+
+@pytest.mark.asyncio
+async def test_upload_size_limit_and_ownership(client, auth_headers, storage_dir, monkeypatch):
+    pid, paper_id = await make_paper(client, auth_headers)
+    resp = await client.post(
+        f"/projects/{pid}/uploads",
+        json={"paper_id": paper_id, "filename": "huge.pdf", "size": 10**12},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 413
+
+    monkeypatch.setattr(settings, "max_upload_bytes", 100)
+    resp = await upload_pdf(client, pid, paper_id, make_pdf(SAMPLE_PAGES), auth_headers)
+    assert (resp.status_code, resp.json()["detail"]) == (413, "PDF too large")
+
+    upload = await begin(client, pid, paper_id, b"%PDF-1.4", auth_headers)
+    other = {"X-User-Id": str(uuid.uuid4())}
+    resp = await client.get(f"/projects/{pid}/uploads/{upload['id']}", headers=other)
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_abandoned_upload_digest_expires(client, auth_headers, storage_dir, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(auth.time, "monotonic", lambda: now[0])
+    pid, paper_id = await make_paper(client, auth_headers)
+    data = make_pdf(SAMPLE_PAGES)
+    upload = await begin(client, pid, paper_id, data, auth_headers)
+    await send(client, pid, upload["id"], data[:100], 0, auth_headers)
+    key = uuid.UUID(upload["id"])
+    assert documents._upload_digests.get(key) is not None
+
+    now[0] += documents.DIGEST_IDLE_SECONDS + 1
+    assert documents._upload_digests.get(key) is None
+    assert key not in documents._upload_digests._entries
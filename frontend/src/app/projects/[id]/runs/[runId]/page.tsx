@@ -1,21 +1,30 @@
 "use client";
 
-import { useQuery } from "@tanstack/react-query";
+import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 import Link from "next/link";
 import { useParams } from "next/navigation";
-import { api, type ProjectPaper, type Run } from "@/lib/api";
+import { api, type ProjectPaperListItem, type RunDetail } from "@/lib/api";
+
+type PaperRow = ProjectPaperListItem<"title" | "authors" | "year">;
 
 export default function RunDetailPage() {
   const { id, runId } = useParams<{ id: string; runId: string }>();
 
-  const { data: run, isLoading: loadingRun } = useQuery<Run>({
+  const { data: run, isLoading: loadingRun } = useQuery<RunDetail>({
     queryKey: ["run", id, runId],
     queryFn: () => api.runs.get(id, runId),
   });
 
-  const { data: papers, isLoading: loadingPapers } = useQuery<ProjectPaper[]>({
-    queryKey: ["papers", id],
-    queryFn: () => api.papers.list(id),
+  const qc = useQueryClient();
+  const cancelRun = useMutation({
+    mutationFn: () => api.runs.cancel(id, runId),
+    onSuccess: (updated) =>
+      qc.setQueryData<RunDetail>(["run", id, runId], (prev) => prev && { ...prev, ...updated }),
+  });
+
+  const { data: papers, isLoading: loadingPapers } = useQuery<PaperRow[]>({
+    queryKey: ["papers", id, "table"],
+    queryFn: () => api.papers.list(id, ["title", "authors", "year"]),
   });
 
   if (loadingRun) return <p className="text-cyber-cyan font-mono animate-pulse">&gt; Fetching run data...</p>;
@@ -48,8 +57,19 @@ export default function RunDetailPage() {
               run.status === "running"   ? "badge-running"   :
               run.status === "completed" ? "badge-completed" : "badge-failed"
             }`}>
-              {run.status.toUpperCase()}
+              {run.cancel_requested_at && run.status === "running"
+                ? "CANCELLING"
+                : run.status.toUpperCase()}
             </span>
+            {(run.status === "pending" || run.status === "running") && !run.cancel_requested_at && (
+              <button
+                onClick={() => cancelRun.mutate()}
+                disabled={cancelRun.isPending}
+                className="btn-pink ml-3 px-2 py-0.5 text-xs"
+              >
+                ✕ Cancel
+              </button>
+            )}
           </div>
           <div>
             <p className="text-xs text-cyber-muted uppercase tracking-widest mb-1">Run ID</p>
@@ -73,6 +93,23 @@ export default function RunDetailPage() {
         </div>
       </div>
 
+      {run.artifacts.length > 0 && (
+        <div className="cyber-card relative p-6 mb-8">
+          <p className="text-xs text-cyber-muted uppercase tracking-widest mb-3 font-mono">Artifacts</p>
+          <ul className="text-xs font-mono space-y-1">
+            {run.artifacts.map((a) => (
+              <li key={a.name} className="flex gap-4">
+                <span className="text-cyber-cyan">{a.name}</span>
+                <span className="text-cyber-muted">
+                  {a.shape ? a.shape.join("×") : `${a.rows ?? 0} rows`} · {a.format} ·{" "}
+                  {(a.size_bytes / 1024).toFixed(1)} KiB
+                </span>
+              </li>
+            ))}
+          </ul>
+        </div>
+      )}
+
       {/* Papers section */}
       <div className="mb-4">
         <p className="text-xs text-cyber-muted font-mono mb-1 uppercase tracking-widest">&gt; Indexed Papers</p>
@@ -2,10 +2,10 @@
 
 import { useQuery } from "@tanstack/react-query";
 import Link from "next/link";
-import { api, type Project } from "@/lib/api";
+import { api, type ProjectListItem } from "@/lib/api";
 
 export default function ProjectsPage() {
-  const { data: projects, isLoading, error } = useQuery<Project[]>({
+  const { data: projects, isLoading, error } = useQuery<ProjectListItem[]>({
     queryKey: ["projects"],
     queryFn: api.projects.list,
   });
@@ -81,6 +81,20 @@ export default function ProjectsPage() {
                 {p.description}
               </p>
             )}
+            <div className="text-xs text-cyber-muted font-mono mb-3 flex flex-wrap gap-x-3">
+              <span>{p.stats.paper_count} papers</span>
+              <span>{p.stats.run_count} runs</span>
+              {p.stats.year_min !== null && (
+                <span>
+                  {p.stats.year_min === p.stats.year_max
+                    ? p.stats.year_min
+                    : `${p.stats.year_min}–${p.stats.year_max}`}
+                </span>
+              )}
+              {p.stats.latest_run_status && (
+                <span className="text-cyber-cyan">last run: {p.stats.latest_run_status}</span>
+              )}
+            </div>
             <div className="border-t border-cyber-border/20 pt-3 flex justify-between items-center">
               <span className="text-xs text-cyber-muted font-mono">
                 {new Date(p.created_at).toLocaleDateString()}
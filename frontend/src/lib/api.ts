@@ -20,13 +20,51 @@ export interface Project {
   updated_at: string;
 }
 
+// Maintained on write by the backend; reading it costs no aggregation.
+export interface ProjectStats {
+  paper_count: number;
+  run_count: number;
+  latest_run_id: string | null;
+  latest_run_status: string | null;
+  latest_run_at: string | null;
+  year_min: number | null;
+  year_max: number | null;
+}
+
+export interface ProjectListItem extends Project {
+  stats: ProjectStats;
+}
+
+// "interactive" runs are scheduled ahead of "bulk" ones.
+export type RunLane = "interactive" | "bulk";
+
 export interface Run {
   id: string;
   project_id: string;
   status: string;
+  lane: RunLane;
   config_snapshot: Record<string, unknown>;
   created_at: string;
+  started_at: string | null;
   completed_at: string | null;
+  // Set while a running run is being cancelled
+  cancel_requested_at: string | null;
+}
+
+export interface ArtifactManifest {
+  name: string;
+  kind: "array" | "table";
+  format: string;
+  content_hash: string;
+  size_bytes: number;
+  rows: number | null;
+  shape: number[] | null;
+  dtype: string | null;
+  created_at: string;
+}
+
+export interface RunDetail extends Run {
+  artifacts: ArtifactManifest[];
 }
 
 export interface Paper {
@@ -50,6 +88,190 @@ export interface ProjectPaper {
   paper: Paper;
 }
 
+// api.papers.batchGet: found papers in the order asked, and ids not in the project
+export interface PaperBatch {
+  papers: ProjectPaper[];
+  missing: string[];
+}
+
+// List rows carry no abstract; fetch the full paper with api.papers.get.
+export type PaperSummary = Omit<Paper, "abstract">;
+export type PaperField = Exclude<keyof PaperSummary, "id">;
+
+// `paper` holds only the fields asked for with `fields` (plus id); all of them by default.
+export interface ProjectPaperListItem<F extends PaperField = PaperField>
+  extends Omit<ProjectPaper, "paper"> {
+  paper: Pick<PaperSummary, "id" | F>;
+}
+
+// Server-side filters shared by api.papers.list and api.papers.facets.
+export interface PaperFilter {
+  year_min?: number;
+  year_max?: number;
+  author?: string; // exact name
+  score_min?: number;
+  score_max?: number;
+  inclusion_reason?: string; // prefix
+}
+
+type PaperSortKey = "added_at" | "year" | "score" | "title";
+export type PaperSort = PaperSortKey | `-${PaperSortKey}`;
+
+export interface PaperFacets {
+  total: number;
+  years: { year: number | null; count: number }[];
+  authors: { author: string; count: number }[];
+  score_buckets: { min: number | null; max: number | null; count: number }[];
+}
+
+export interface IdeaTree {
+  id: string;
+  project_id: string;
+  source_run_id: string | null;
+  // Send back with every edit; a stale version is rejected with 409
+  version: number;
+  locked_at: string | null;
+  updated_at: string;
+}
+
+export interface IdeaNode {
+  id: string;
+  parent_id: string | null;
+  depth: number;
+  position: number;
+  label: string;
+  paper_count: number;
+  subtree_paper_count: number;
+  child_count: number;
+}
+
+export interface IdeaTreeLevel {
+  tree: IdeaTree;
+  parent_id: string | null;
+  nodes: IdeaNode[];
+}
+
+export type IdeaTreeOp =
+  | { op: "rename"; node_id: string; label: string }
+  | { op: "move"; node_id: string; parent_id: string; position?: number }
+  | { op: "move_papers"; paper_ids: string[]; node_id: string }
+  | { op: "merge"; source_id: string; target_id: string }
+  | { op: "split"; node_id: string; label: string; paper_ids: string[] };
+
+export interface GraphCluster {
+  id: number;
+  label: string;
+  size: number;
+  x: number;
+  y: number;
+}
+
+export interface GraphLayout {
+  // Bumped whenever any coordinate changes
+  version: number;
+  run_id: string | null;
+  seed: number;
+  node_count: number;
+  edge_count: number;
+  clusters: GraphCluster[];
+  updated_at: string;
+}
+
+export interface GraphNode {
+  paper_id: string;
+  title: string;
+  x: number;
+  y: number;
+  cluster: number | null;
+}
+
+export interface GraphEdge {
+  source_id: string;
+  target_id: string;
+  weight: number;
+  kind: "similar" | "cites";
+}
+
+export interface PaperGraph {
+  layout: GraphLayout;
+  nodes: GraphNode[];
+  edges: GraphEdge[];
+}
+
+// Layout-space rectangle currently on screen
+export interface GraphViewport {
+  x0: number;
+  y0: number;
+  x1: number;
+  y1: number;
+}
+
+export interface GraphView {
+  // Layout version; cached views of an older version are stale
+  version: number;
+  mode: "nodes" | "clusters";
+  visible: number;
+  nodes: GraphNode[];
+  edges: GraphEdge[];
+  clusters: GraphCluster[];
+  cluster_edges: { source: number; target: number; weight: number }[];
+}
+
+export interface ReportPart {
+  position: number;
+  depth: number;
+  // null for the introduction
+  node_id: string | null;
+  label: string;
+  content: string | null;
+  cached: boolean;
+  completed_at: string | null;
+}
+
+export interface Report {
+  run_id: string;
+  status: "writing" | "completed" | "failed" | "cancelled";
+  total: number;
+  done: number;
+  // Assembled Markdown once completed
+  content: string | null;
+  created_at: string;
+  completed_at: string | null;
+  parts: ReportPart[];
+}
+
+// One finished section from the report stream, in completion order
+export interface ReportSectionEvent {
+  sequence: number;
+  position: number;
+  depth: number;
+  node_id: string | null;
+  label: string;
+  cached: boolean;
+  content: string;
+  total: number | null;
+}
+
+export type ExportFormat = "markdown" | "latex" | "pdf" | "slides";
+
+// Rendered by export workers; poll api.exports.get until completed or failed
+export interface ExportJob {
+  id: string;
+  run_id: string;
+  format: ExportFormat;
+  filters: PaperFilter;
+  layout_version: number;
+  status: "queued" | "running" | "completed" | "failed";
+  error: string | null;
+  media_type: string | null;
+  filename: string | null;
+  size_bytes: number | null;
+  // Set once completed
+  download_url: string | null;
+  created_at: string;
+  completed_at: string | null;
+}
+
 // ---------------------------------------------------------------------------
 // Helpers
 // ---------------------------------------------------------------------------
@@ -65,14 +287,23 @@ function headers(): HeadersInit {
   };
 }
 
+// GETs may be served by a lagging read replica; for this long after a write,
+// ask for the primary so the user sees their own changes (DATABASE_REPLICA_STICKY_SECONDS)
+const PRIMARY_READ_MS = 5000;
+let lastWriteAt = 0;
+
 async function request<T>(
   path: string,
-  options: RequestInit = {}
+  options: RequestInit = {},
+  { readOnly = false }: { readOnly?: boolean } = {}
 ): Promise<T> {
+  const write = !readOnly && (options.method ?? "GET") !== "GET";
+  const sticky = !write && Date.now() - lastWriteAt < PRIMARY_READ_MS;
   const res = await fetch(`${BASE}${path}`, {
     ...options,
-    headers: { ...headers(), ...options.headers },
+    headers: { ...headers(), ...(sticky ? { "X-Read-Primary": "1" } : {}), ...options.headers },
   });
+  if (write) lastWriteAt = Date.now();
   if (!res.ok) {
     const text = await res.text();
     throw new Error(`${res.status}: ${text}`);
@@ -81,12 +312,105 @@ async function request<T>(
   return res.json() as Promise<T>;
 }
 
+// Minimal Server-Sent Events reader over fetch (EventSource cannot send our headers)
+async function readEvents(
+  path: string,
+  onEvent: (event: string, data: string, id: string | null) => void,
+  init: RequestInit = {}
+): Promise<void> {
+  const res = await fetch(`${BASE}${path}`, {
+    ...init,
+    headers: { ...headers(), Accept: "text/event-stream", ...init.headers },
+  });
+  if (!res.ok || !res.body) throw new Error(`${res.status}: ${await res.text()}`);
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) return;
+    buffer += value;
+    let end: number;
+    while ((end = buffer.indexOf("\n\n")) >= 0) {
+      const block = buffer.slice(0, end);
+      buffer = buffer.slice(end + 2);
+      let event = "message";
+      let data = "";
+      let id: string | null = null;
+      for (const line of block.split("\n")) {
+        if (line.startsWith("event: ")) event = line.slice(7);
+        else if (line.startsWith("data: ")) data += line.slice(6);
+        else if (line.startsWith("id: ")) id = line.slice(4);
+      }
+      if (data) onEvent(event, data, id);
+    }
+  }
+}
+
+// Papers asked for with api.papers.load during the current tick, per project,
+// with everyone waiting on each id
+type PaperWaiter = {
+  resolve: (paper: ProjectPaper | null) => void;
+  reject: (err: unknown) => void;
+};
+const BATCH_GET_LIMIT = 500;
+const pendingPapers = new Map<string, Map<string, PaperWaiter[]>>();
+
+function loadPaper(projectId: string, paperId: string): Promise<ProjectPaper | null> {
+  let pending = pendingPapers.get(projectId);
+  if (!pending) {
+    pending = new Map();
+    pendingPapers.set(projectId, pending);
+    setTimeout(() => void flushPapers(projectId), 0);
+  }
+  const waiting = pending;
+  return new Promise((resolve, reject) => {
+    const waiters = waiting.get(paperId);
+    if (waiters) waiters.push({ resolve, reject });
+    else waiting.set(paperId, [{ resolve, reject }]);
+  });
+}
+
+async function flushPapers(projectId: string): Promise<void> {
+  const pending = pendingPapers.get(projectId);
+  pendingPapers.delete(projectId);
+  if (!pending) return;
+  const ids = [...pending.keys()];
+  const chunks: string[][] = [];
+  for (let i = 0; i < ids.length; i += BATCH_GET_LIMIT) {
+    chunks.push(ids.slice(i, i + BATCH_GET_LIMIT));
+  }
+  await Promise.all(
+    chunks.map(async (chunk) => {
+      try {
+        const batch = await api.papers.batchGet(projectId, chunk);
+        const byId = new Map(batch.papers.map((p) => [p.paper_id, p]));
+        for (const id of chunk) {
+          for (const waiter of pending.get(id) ?? []) waiter.resolve(byId.get(id) ?? null);
+        }
+      } catch (err) {
+        for (const id of chunk) {
+          for (const waiter of pending.get(id) ?? []) waiter.reject(err);
+        }
+      }
+    })
+  );
+}
+
+function queryString(params: Record<string, string | number | undefined>): string {
+  const search = new URLSearchParams();
+  for (const [key, value] of Object.entries(params)) {
+    if (value !== undefined && value !== "") search.set(key, String(value));
+  }
+  const text = search.toString();
+  return text ? `?${text}` : "";
+}
+
 // ---------------------------------------------------------------------------
 // Projects
 // ---------------------------------------------------------------------------
 export const api = {
   projects: {
-    list: () => request<Project[]>("/projects"),
+    list: () => request<ProjectListItem[]>("/projects"),
     get: (id: string) => request<Project>(`/projects/${id}`),
     create: (body: { name: string; description?: string }) =>
       request<Project>("/projects", { method: "POST", body: JSON.stringify(body) }),
@@ -98,18 +422,50 @@ export const api = {
   runs: {
     list: (projectId: string) => request<Run[]>(`/projects/${projectId}/runs`),
     get: (projectId: string, runId: string) =>
-      request<Run>(`/projects/${projectId}/runs/${runId}`),
-    create: (projectId: string, body: { config_snapshot?: Record<string, unknown> }) =>
+      request<RunDetail>(`/projects/${projectId}/runs/${runId}`),
+    create: (
+      projectId: string,
+      body: { config_snapshot?: Record<string, unknown>; lane?: RunLane }
+    ) =>
       request<Run>(`/projects/${projectId}/runs`, {
         method: "POST",
         body: JSON.stringify(body),
       }),
+    cancel: (projectId: string, runId: string) =>
+      request<Run>(`/projects/${projectId}/runs/${runId}/cancel`, { method: "POST" }),
+    // Raw artifact bytes (.npy or compressed NDJSON)
+    artifact: async (projectId: string, runId: string, name: string): Promise<Blob> => {
+      const path = `/projects/${projectId}/runs/${runId}/artifacts/${encodeURIComponent(name)}`;
+      const res = await fetch(`${BASE}${path}`, { headers: headers() });
+      if (!res.ok) throw new Error(`${res.status}: ${await res.text()}`);
+      return res.blob();
+    },
   },
 
   papers: {
-    list: (projectId: string) => request<ProjectPaper[]>(`/projects/${projectId}/papers`),
+    // `fields` limits each paper to those columns (plus id), e.g. ["title", "authors", "year"].
+    list: <F extends PaperField = PaperField>(
+      projectId: string,
+      fields?: F[],
+      options: PaperFilter & { sort?: PaperSort; skip?: number; limit?: number } = {}
+    ) =>
+      request<ProjectPaperListItem<F>[]>(
+        `/projects/${projectId}/papers${queryString({ ...options, fields: fields?.join(",") })}`
+      ),
+    facets: (projectId: string, filter: PaperFilter = {}) =>
+      request<PaperFacets>(`/projects/${projectId}/papers/facets${queryString({ ...filter })}`),
     get: (projectId: string, paperId: string) =>
       request<ProjectPaper>(`/projects/${projectId}/papers/${paperId}`),
+    // Up to 500 full papers in one call (a POST for the body; it changes nothing)
+    batchGet: (projectId: string, paperIds: string[]) =>
+      request<PaperBatch>(
+        `/projects/${projectId}/papers/batch-get`,
+        { method: "POST", body: JSON.stringify({ paper_ids: paperIds }) },
+        { readOnly: true }
+      ),
+    // For views that need many papers at once (graph hovers, expanded tree nodes):
+    // lookups made in the same tick share one batchGet call. null = not in the project.
+    load: (projectId: string, paperId: string) => loadPaper(projectId, paperId),
     add: (
       projectId: string,
       body: {
@@ -126,4 +482,85 @@ export const api = {
         body: JSON.stringify(body),
       }),
   },
+
+  ideaTree: {
+    // One level at a time: the roots, or the children of `parentId`
+    level: (projectId: string, parentId?: string) =>
+      request<IdeaTreeLevel>(
+        `/projects/${projectId}/idea-tree${queryString({ parent_id: parentId })}`
+      ),
+    seed: (projectId: string, runId: string) =>
+      request<IdeaTree>(`/projects/${projectId}/idea-tree`, {
+        method: "POST",
+        body: JSON.stringify({ run_id: runId }),
+      }),
+    patch: (projectId: string, version: number, ops: IdeaTreeOp[]) =>
+      request<{ tree: IdeaTree; created: string[] }>(`/projects/${projectId}/idea-tree`, {
+        method: "PATCH",
+        body: JSON.stringify({ version, ops }),
+      }),
+    papers: (projectId: string, nodeId: string, skip = 0, limit = 50) =>
+      request<PaperSummary[]>(
+        `/projects/${projectId}/idea-tree/nodes/${nodeId}/papers${queryString({ skip, limit })}`
+      ),
+    lock: (projectId: string) =>
+      request<IdeaTree>(`/projects/${projectId}/idea-tree/lock`, { method: "PUT" }),
+    unlock: (projectId: string) =>
+      request<IdeaTree>(`/projects/${projectId}/idea-tree/lock`, { method: "DELETE" }),
+  },
+
+  reports: {
+    get: (projectId: string, runId: string) =>
+      request<Report>(`/projects/${projectId}/runs/${runId}/report`),
+    // Calls `onSection` as each section is written; resolves with the final status.
+    // Pass the last seen `sequence` as `after` to resume a dropped stream.
+    stream: async (
+      projectId: string,
+      runId: string,
+      onSection: (section: ReportSectionEvent) => void,
+      { after, signal }: { after?: number; signal?: AbortSignal } = {}
+    ): Promise<string> => {
+      let status = "missing";
+      await readEvents(
+        `/projects/${projectId}/runs/${runId}/report/stream`,
+        (event, data) => {
+          if (event === "section") onSection(JSON.parse(data) as ReportSectionEvent);
+          else if (event === "done") status = (JSON.parse(data) as { status: string }).status;
+        },
+        { signal, headers: after ? { "Last-Event-ID": String(after) } : {} }
+      );
+      return status;
+    },
+  },
+
+  exports: {
+    // Returns the finished job at once when the same run, filters, layout and format
+    // were exported before; otherwise a queued job.
+    create: (
+      projectId: string,
+      body: { run_id: string; format: ExportFormat; filters?: PaperFilter }
+    ) =>
+      request<ExportJob>(`/projects/${projectId}/exports`, {
+        method: "POST",
+        body: JSON.stringify(body),
+      }),
+    list: (projectId: string) => request<ExportJob[]>(`/projects/${projectId}/exports`),
+    get: (projectId: string, jobId: string) =>
+      request<ExportJob>(`/projects/${projectId}/exports/${jobId}`),
+    download: async (job: ExportJob): Promise<Blob> => {
+      if (!job.download_url) throw new Error(`Export is ${job.status}`);
+      const res = await fetch(`${BASE}${job.download_url}`, { headers: headers() });
+      if (!res.ok) throw new Error(`${res.status}: ${await res.text()}`);
+      return res.blob();
+    },
+  },
+
+  graph: {
+    // Coordinates are computed by the run pipeline; render them as-is
+    get: (projectId: string) => request<PaperGraph>(`/projects/${projectId}/graph`),
+    // Only what is inside `box`: papers when zoomed in, cluster super-nodes otherwise.
+    // `zoom` is screen pixels per layout unit.
+    view: (projectId: string, box: GraphViewport, zoom: number) =>
+      request<GraphView>(`/projects/${projectId}/graph/view${queryString({ ...box, zoom })}`),
+  },
 };